@@ -35,7 +35,8 @@ def create_alpha_blueprint():
     # Import and register route modules
     from stock_checker.alpha.routes import dashboard, comparison, financials
     from stock_checker.alpha.routes import trends, modelling, portfolio, export, scores, industry
-    from stock_checker.alpha.routes import news, company, recommendations
+    from stock_checker.alpha.routes import news, company, recommendations, weights, screener
+    from stock_checker.alpha.routes import universe, red_flags
 
     alpha_bp.register_blueprint(dashboard.bp)
     alpha_bp.register_blueprint(comparison.bp)
@@ -49,6 +50,10 @@ def create_alpha_blueprint():
     alpha_bp.register_blueprint(news.bp)
     alpha_bp.register_blueprint(company.bp)
     alpha_bp.register_blueprint(recommendations.bp)
+    alpha_bp.register_blueprint(weights.bp)
+    alpha_bp.register_blueprint(screener.bp)
+    alpha_bp.register_blueprint(universe.bp)
+    alpha_bp.register_blueprint(red_flags.bp)
 
     # Error handlers for the blueprint
     @alpha_bp.errorhandler(404)
@@ -78,6 +83,10 @@ def init_alpha(app):
     bp = create_alpha_blueprint()
     app.register_blueprint(bp)
 
+    # Maintenance commands (flask alpha ...)
+    from stock_checker.alpha.cli import alpha_cli
+    app.cli.add_command(alpha_cli)
+
     # Create tables
     with app.app_context():
         db.create_all()
@@ -63,6 +63,15 @@ def check_fcf_vs_net_income(fcf, net_income):
     if fcf is None or net_income is None or net_income == 0:
         return None
     ratio = fcf / net_income
+    # Checked before the divergence rule, which would otherwise catch every
+    # negative ratio first
+    if ratio < 0 and net_income > 0:
+        return {
+            "type": "fcf_negative",
+            "message": f"Free cash flow is negative ({fcf:,.0f}) despite "
+                       f"positive net income ({net_income:,.0f})",
+            "severity": "critical",
+        }
     if ratio < 0.5:
         return {
             "type": "fcf_divergence",
@@ -70,13 +79,6 @@ def check_fcf_vs_net_income(fcf, net_income):
                        f"net income ({net_income:,.0f}), ratio={ratio:.2f}",
             "severity": "warning",
         }
-    if ratio < 0:
-        return {
-            "type": "fcf_negative",
-            "message": f"Free cash flow is negative ({fcf:,.0f}) despite "
-                       f"positive net income ({net_income:,.0f})",
-            "severity": "critical",
-        }
     return None
 
 
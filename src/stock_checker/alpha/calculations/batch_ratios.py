@@ -0,0 +1,272 @@
+"""Cross-sectional ratio calculation for many tickers at once.
+
+calc_ratios_batch is the column-wise twin of ratios.calc_all_ratios: it reads
+a long-format statement table (one row per ticker × statement × item ×
+period) and an info table, and computes every ratio for every ticker as
+array operations. The per-ticker rules are kept exactly:
+
+  - statement values come from each statement's latest column (offset 0)
+  - primary/alternate items ("Basic EPS" or "Diluted EPS", "Stockholders
+    Equity" or "Total Stockholders Equity") follow the same `or` rule: the
+    alternate is used when the primary row is absent or zero
+  - divisions are NaN when the divisor is zero or the result is non-finite
+  - statement-derived ratios fall back to the info key of FALLBACK_MAP, with
+    ROE/ROA decimals scaled to percent, applied as masks
+
+Missing values are NaN in the output (None in calc_all_ratios).
+"""
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.calculations.valuation import calc_implied_growth
+
+LONG_COLUMNS = ['ticker', 'statement', 'item', 'period', 'offset', 'value']
+
+RATIO_COLUMNS = ['PER', 'PBV', 'ROE', 'ROA', 'NPM', 'GPM', 'DER', 'Current Ratio',
+                 'EV/EBITDA', 'PEG', 'Beta', 'Dividend Yield', 'P/S']
+
+FALLBACK_MAP = {
+    'PER': 'trailingPE',
+    'PBV': 'priceToBook',
+    'ROE': 'returnOnEquity',
+    'ROA': 'returnOnAssets',
+    'DER': 'debtToEquity',
+    'Current Ratio': 'currentRatio',
+    'EV/EBITDA': 'enterpriseToEbitda',
+    'PEG': 'pegRatio',
+}
+
+INFO_KEYS = ['currentPrice', 'regularMarketPrice', 'marketCap', 'sharesOutstanding',
+             'beta', 'dividendYield', 'priceToSalesTrailing12Months', *FALLBACK_MAP.values()]
+
+# Statement line items read by the ratios: statement -> items
+STATEMENT_ITEMS = {
+    'income': ['Total Revenue', 'Net Income', 'Gross Profit', 'Basic EPS', 'Diluted EPS',
+               'EBIT', 'EBITDA'],
+    'balance': ['Stockholders Equity', 'Total Stockholders Equity', 'Total Assets',
+                'Total Debt', 'Current Assets', 'Current Liabilities',
+                'Cash And Cash Equivalents'],
+    'cashflow': ['Free Cash Flow', 'Operating Cash Flow', 'Capital Expenditure'],
+}
+
+
+def statements_to_long(frames, items=None):
+    """Stack per-ticker statement DataFrames into the long format.
+
+    Args:
+        frames: {ticker: {'income': df, 'balance': df, 'cashflow': df}};
+                each df is a yfinance statement (items × periods, latest first).
+                Missing or empty statements are skipped.
+        items: optional {statement: [items]} to keep (default: all rows)
+
+    Returns:
+        DataFrame with LONG_COLUMNS; offset is the column position (0 = latest)
+    """
+    cols = {c: [] for c in LONG_COLUMNS}
+    for ticker, statements in frames.items():
+        for statement, df in (statements or {}).items():
+            if df is None or df.empty:
+                continue
+            if items and statement in items:
+                df = df.loc[df.index.isin(items[statement])]
+                if df.empty:
+                    continue
+            values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+            n_items, n_periods = values.shape
+            size = values.size
+            cols['ticker'].append(np.full(size, ticker, dtype=object))
+            cols['statement'].append(np.full(size, statement, dtype=object))
+            cols['item'].append(np.repeat(df.index.to_numpy(dtype=object), n_periods))
+            cols['period'].append(np.tile(df.columns.to_numpy(), n_items))
+            cols['offset'].append(np.tile(np.arange(n_periods), n_items))
+            cols['value'].append(values.ravel())
+    if not cols['value']:
+        return pd.DataFrame({c: [] for c in LONG_COLUMNS})
+    long = pd.DataFrame({c: np.concatenate(parts) for c, parts in cols.items()})
+    long['period'] = pd.to_datetime(long['period'], errors='coerce')
+    return long
+
+
+def _with_offset(long):
+    """Derive offsets (0 = latest period per ticker/statement) when absent."""
+    if 'offset' in long.columns:
+        return long
+    periods = long[['ticker', 'statement', 'period']].drop_duplicates()
+    periods['offset'] = (periods.groupby(['ticker', 'statement'])['period']
+                         .rank(method='dense', ascending=False).astype(int) - 1)
+    return long.merge(periods, on=['ticker', 'statement', 'period'], how='left')
+
+
+def statement_matrix(long, statement, offset, items, tickers):
+    """(values, present) arrays of shape (tickers × items) at one period offset.
+
+    present marks rows that exist in the statement (even if the value is NaN),
+    which the primary/alternate `or` rule needs.
+    """
+    sel = long[(long['statement'] == statement) & (long['offset'] == offset)
+               & long['item'].isin(items)]
+    sel = sel.drop_duplicates(['ticker', 'item'])
+    wide = sel.pivot(index='ticker', columns='item', values='value')
+    wide = wide.reindex(index=tickers, columns=items)
+    present = (sel.assign(present=True)
+               .pivot(index='ticker', columns='item', values='present')
+               .reindex(index=tickers, columns=items).notna().to_numpy())
+    return wide.to_numpy(dtype=np.float64, na_value=np.nan), present
+
+
+def item_history(long, statement, item, tickers):
+    """(tickers × periods) matrix of one item, oldest period first."""
+    sel = long[(long['statement'] == statement) & (long['item'] == item)]
+    sel = sel.drop_duplicates(['ticker', 'offset'])
+    wide = sel.pivot(index='ticker', columns='offset', values='value').reindex(tickers)
+    wide = wide[sorted(wide.columns, reverse=True)]
+    return wide.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def info_frame(info, tickers):
+    """Numeric info table (tickers × INFO_KEYS) from {ticker: info dict} or a DataFrame."""
+    if isinstance(info, dict):
+        info = pd.DataFrame.from_dict({t: info.get(t) or {} for t in tickers}, orient='index')
+    info = info.reindex(index=tickers, columns=INFO_KEYS)
+    return info.apply(pd.to_numeric, errors='coerce')
+
+
+# ── Column kernels ──────────────────────────────────────────────────────────
+
+def _finite(x):
+    return np.where(np.isfinite(x), x, np.nan)
+
+
+def _div(a, b):
+    """safe_div over arrays: NaN when b is zero/missing or the result is non-finite."""
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        r = a / b
+    return np.where((b == 0) | ~np.isfinite(r), np.nan, r)
+
+
+def _or(primary, primary_present, alternate):
+    """`primary or alternate` where primary may be an absent row (None)."""
+    use_alt = ~primary_present | (primary == 0)
+    return _finite(np.where(use_alt, alternate, primary))
+
+
+def _truthy(x):
+    """Python truthiness of a _safe'd value: present and non-zero."""
+    return np.isfinite(x) & (x != 0)
+
+
+def calc_ratios_batch(long, info=None):
+    """Calculate calc_all_ratios for every ticker as column operations.
+
+    Args:
+        long: long-format statements (LONG_COLUMNS; offset optional and
+              derived from period order when absent)
+        info: {ticker: info dict} or DataFrame indexed by ticker with
+              yfinance info keys (missing -> statement values only)
+
+    Returns:
+        DataFrame indexed by ticker with RATIO_COLUMNS (NaN when unavailable)
+    """
+    long = _with_offset(long)
+    tickers = list(dict.fromkeys(long['ticker'].tolist()))
+    if info is not None:
+        tickers = list(dict.fromkeys(tickers + list(info.index if hasattr(info, 'index') else info)))
+    inf = info_frame(info if info is not None else {}, tickers)
+    col = {k: inf[k].to_numpy(dtype=np.float64, na_value=np.nan) for k in INFO_KEYS}
+
+    inc_items = STATEMENT_ITEMS['income']
+    inc, inc_present = statement_matrix(long, 'income', 0, inc_items, tickers)
+    bs_items = STATEMENT_ITEMS['balance']
+    bs, bs_present = statement_matrix(long, 'balance', 0, bs_items, tickers)
+    I = {k: i for i, k in enumerate(inc_items)}
+    B = {k: i for i, k in enumerate(bs_items)}
+
+    revenue = _finite(inc[:, I['Total Revenue']])
+    net_income = _finite(inc[:, I['Net Income']])
+    gross_profit = _finite(inc[:, I['Gross Profit']])
+    eps = _or(inc[:, I['Basic EPS']], inc_present[:, I['Basic EPS']], inc[:, I['Diluted EPS']])
+    ebitda = _finite(inc[:, I['EBITDA']])
+
+    equity = _or(bs[:, B['Stockholders Equity']], bs_present[:, B['Stockholders Equity']],
+                 bs[:, B['Total Stockholders Equity']])
+    total_assets = _finite(bs[:, B['Total Assets']])
+    total_debt = _finite(bs[:, B['Total Debt']])
+    current_assets = _finite(bs[:, B['Current Assets']])
+    current_liab = _finite(bs[:, B['Current Liabilities']])
+    cash = _finite(bs[:, B['Cash And Cash Equivalents']])
+
+    price = _finite(np.where(np.isnan(col['currentPrice']) | (col['currentPrice'] == 0),
+                             col['regularMarketPrice'], col['currentPrice']))
+    market_cap = _finite(col['marketCap'])
+    shares = _finite(col['sharesOutstanding'])
+
+    bvps = np.where(_truthy(equity) & _truthy(shares), _div(equity, shares), np.nan)
+
+    # EPS growth for PEG: Basic EPS in the two latest columns
+    prev, _ = statement_matrix(long, 'income', 1, ['Basic EPS'], tickers)
+    eps_curr, eps_prev = _finite(inc[:, I['Basic EPS']]), _finite(prev[:, 0])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        eps_growth = np.where(_truthy(eps_curr) & _truthy(eps_prev),
+                              (eps_curr - eps_prev) / np.abs(eps_prev) * 100, np.nan)
+
+    per = _div(price, eps)
+    ev = market_cap + np.nan_to_num(total_debt) - np.nan_to_num(cash)
+    ratios = {
+        'PER': per,
+        'PBV': _div(price, bvps),
+        'ROE': _div(net_income, equity) * 100,
+        'ROA': _div(net_income, total_assets) * 100,
+        'NPM': _div(net_income, revenue) * 100,
+        'GPM': _div(gross_profit, revenue) * 100,
+        'DER': _div(total_debt, equity),
+        'Current Ratio': _div(current_assets, current_liab),
+        'EV/EBITDA': np.where(np.isnan(ebitda), np.nan, _div(ev, ebitda)),
+        'PEG': np.where(_truthy(per) & _truthy(eps_growth), _div(per, eps_growth), np.nan),
+        'Beta': _finite(col['beta']),
+        'Dividend Yield': _finite(col['dividendYield']),
+        'P/S': _finite(col['priceToSalesTrailing12Months']),
+    }
+
+    # Info fallbacks as masks
+    for ratio_key, info_key in FALLBACK_MAP.items():
+        v = _finite(col[info_key])
+        if ratio_key in ('ROE', 'ROA'):
+            v = np.where(np.abs(v) < 1, v * 100, v)
+        ratios[ratio_key] = np.where(np.isnan(ratios[ratio_key]), v, ratios[ratio_key])
+
+    dy = ratios['Dividend Yield']
+    ratios['Dividend Yield'] = np.where(dy < 1, dy * 100, dy)
+
+    return pd.DataFrame(ratios, index=pd.Index(tickers, name='ticker'))[RATIO_COLUMNS]
+
+
+def calc_implied_growth_batch(long, info=None, wacc=0.10, terminal_growth=0.03,
+                              projection_years=5):
+    """Reverse-DCF implied FCF growth (percent) for every ticker in one solve.
+
+    Market enterprise value is market cap (or price × shares) plus total debt
+    minus cash, as in EV/EBITDA; FCF is the latest statement column. The
+    assumptions are the DCF defaults.
+
+    Returns:
+        Series 'Implied Growth' indexed by ticker (NaN when FCF is not
+        positive or no growth rate in range reproduces the market value)
+    """
+    long = _with_offset(long)
+    tickers = list(dict.fromkeys(long['ticker'].tolist()))
+    if info is not None:
+        tickers = list(dict.fromkeys(tickers + list(info.index if hasattr(info, 'index') else info)))
+    inf = info_frame(info if info is not None else {}, tickers)
+    col = {k: inf[k].to_numpy(dtype=np.float64, na_value=np.nan) for k in INFO_KEYS}
+
+    bs, _ = statement_matrix(long, 'balance', 0, ['Total Debt', 'Cash And Cash Equivalents'], tickers)
+    cf, _ = statement_matrix(long, 'cashflow', 0, ['Free Cash Flow'], tickers)
+    price = _finite(np.where(np.isnan(col['currentPrice']) | (col['currentPrice'] == 0),
+                             col['regularMarketPrice'], col['currentPrice']))
+    market_cap = _finite(np.where(np.isnan(col['marketCap']),
+                                  price * col['sharesOutstanding'], col['marketCap']))
+    ev = market_cap + np.nan_to_num(_finite(bs[:, 0])) - np.nan_to_num(_finite(bs[:, 1]))
+
+    implied = calc_implied_growth(_finite(cf[:, 0]), ev, wacc, terminal_growth, projection_years)
+    return pd.Series(implied * 100, index=pd.Index(tickers, name='ticker'), name='Implied Growth')
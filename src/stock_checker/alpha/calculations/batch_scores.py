@@ -0,0 +1,434 @@
+"""Vectorized scoring engine: Quality, Valuation, Risk and Composite for a whole panel.
+
+Row-for-row equivalent of calc_quality_score / calc_valuation_score /
+calc_risk_score / calc_composite_score, but operating on a DataFrame with one
+row per ticker (or per ticker and date). The per-sector tables in scores.py are
+compiled once into dense (sector × metric) matrices, so scoring N rows is a
+handful of array operations instead of N Python calls.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.calculations.industry import INDUSTRY_CONFIG
+from stock_checker.alpha.calculations.scores import (
+    _QUALITY_WEIGHTS,
+    _QUALITY_DEFAULT,
+    _QUALITY_RANGES,
+    _VALUATION_PARAMS,
+    _VALUATION_DEFAULT,
+    _CAPEX_HEAVY,
+    _MODERATE_DER,
+    _RISK_WEIGHTS,
+    _PILLAR_WEIGHTS,
+)
+
+QUALITY_METRICS = ['ROE', 'ROA', 'NPM', 'GPM', 'Revenue CAGR', 'NI CAGR', 'FCF CAGR']
+VALUATION_METRICS = ['PER', 'PBV', 'EV/EBITDA', 'PEG', 'P/S']
+RISK_METRICS = ['DER', 'Beta', 'Current Ratio']
+PANEL_COLUMNS = QUALITY_METRICS + VALUATION_METRICS + RISK_METRICS
+
+# Every sector that has its own row in the matrices; anything else
+# (None, 'unknown', unseen keys) maps to the trailing default row.
+SECTOR_KEYS = sorted(
+    set(INDUSTRY_CONFIG) | set(_QUALITY_WEIGHTS) | set(_VALUATION_PARAMS)
+    | _CAPEX_HEAVY | _MODERATE_DER
+)
+_SECTOR_INDEX = {key: i for i, key in enumerate(SECTOR_KEYS)}
+_DEFAULT_ROW = len(SECTOR_KEYS)
+
+_BASE_VALUATION_KEYS = ['PER', 'PBV', 'EV/EBITDA', 'PEG']
+
+
+def sector_codes(sectors):
+    """Map an iterable of industry keys to matrix row indices (default row for unknown)."""
+    return np.fromiter(
+        (_SECTOR_INDEX.get(s, _DEFAULT_ROW) for s in sectors),
+        dtype=np.intp,
+    )
+
+
+_PROFILE_KEYS = {'pillars', 'quality', 'quality_ranges', 'valuation', 'risk', 'sectors'}
+_SECTOR_PROFILE_KEYS = {'quality', 'valuation'}
+
+
+def _number(value, what, allow_negative=False):
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{what} must be a number")
+    if not np.isfinite(v) or (v < 0 and not allow_negative):
+        raise ValueError(f"{what} must be a finite{'' if allow_negative else ' non-negative'} number")
+    return v
+
+
+def _check_keys(given, allowed, what):
+    if not isinstance(given, (dict, list)):
+        raise ValueError(f"Invalid {what} section")
+    unknown = set(given) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown {what}: {', '.join(sorted(map(str, unknown)))}")
+
+
+def _apply_weights(row, overrides, metrics, what):
+    _check_keys(overrides, metrics, what)
+    for m, w in overrides.items():
+        row[metrics.index(m)] = _number(w, f"{what} weight for {m}")
+
+
+def _apply_valuation(i, overrides, val_w, val_lo, val_hi, strict):
+    """Merge {metric: {lo, hi, weight}} into valuation row i.
+
+    A metric the row does not score yet needs both lo and hi; global overrides
+    (strict=False) skip such rows, sector overrides reject them.
+    """
+    _check_keys(overrides, VALUATION_METRICS, "valuation metric")
+    for metric, spec in overrides.items():
+        if not isinstance(spec, dict):
+            spec = {'weight': spec}
+        _check_keys(spec, ('lo', 'hi', 'weight'), f"{metric} valuation field")
+        j = VALUATION_METRICS.index(metric)
+        lo = _number(spec['lo'], f"{metric} lo", True) if 'lo' in spec else val_lo[i, j]
+        hi = _number(spec['hi'], f"{metric} hi", True) if 'hi' in spec else val_hi[i, j]
+        if np.isnan(lo) or np.isnan(hi):
+            if strict:
+                raise ValueError(f"{metric} needs lo and hi to be scored")
+            continue
+        if not lo < hi:
+            raise ValueError(f"{metric} lo must be below hi")
+        val_lo[i, j], val_hi[i, j] = lo, hi
+        if 'weight' in spec:
+            val_w[i, j] = _number(spec['weight'], f"{metric} weight")
+
+
+def compile_scoring_matrices(profile=None):
+    """Compile the scoring tables in scores.py into dense weight and range matrices.
+
+    Args:
+        profile: optional weight profile overriding the built-in tables:
+            {
+              "pillars": {"quality": w, "valuation": w, "risk": w},
+              "quality": {metric: w},                  # every sector
+              "quality_ranges": {metric: [lo, hi]},
+              "valuation": {metric: {"lo", "hi", "weight"}},   # every sector
+              "risk": {"DER": w, "Beta": w, "Current Ratio": w},
+              "sectors": {industry_key: {"quality": {...}, "valuation": {...}}},
+            }
+            Weights are relative (the weighted average rebalances over the
+            metrics that are present), so they need not sum to 1.
+
+    Returns:
+        dict of numpy arrays:
+          quality_w   (S+1, 7)  quality weights per sector
+          quality_lo  (7,)      quality normalization floor
+          quality_hi  (7,)      quality normalization ceiling
+          val_w       (S+1, 5)  valuation weights (0 where not applicable)
+          val_lo      (S+1, 5)  valuation "cheap" bound (NaN where not applicable)
+          val_hi      (S+1, 5)  valuation "expensive" bound
+          risk_w      (3,)      DER / Beta / Current Ratio weights
+          der_limit   (S+1,)    DER tolerance per sector
+          is_bank     (S+1,)    rows scored with the banking risk exception
+          pillar_w    (3,)      quality / valuation / risk composite weights
+
+    Raises:
+        ValueError: if the profile has unknown keys or invalid numbers.
+    """
+    rows = SECTOR_KEYS + [None]
+    quality_w = np.array([
+        [_QUALITY_WEIGHTS.get(s, _QUALITY_DEFAULT)[m] for m in QUALITY_METRICS]
+        for s in rows
+    ], dtype=float)
+
+    val_w = np.zeros((len(rows), len(VALUATION_METRICS)))
+    val_lo = np.full_like(val_w, np.nan)
+    val_hi = np.full_like(val_w, np.nan)
+    for i, s in enumerate(rows):
+        params = _VALUATION_PARAMS.get(s, _VALUATION_DEFAULT)
+        for j, m in enumerate(VALUATION_METRICS):
+            if m in params:
+                val_lo[i, j], val_hi[i, j], val_w[i, j] = params[m]
+
+    der_limit = np.array([
+        5.0 if s in _CAPEX_HEAVY else (4.0 if s in _MODERATE_DER else 3.0)
+        for s in rows
+    ])
+    quality_lo = np.array([_QUALITY_RANGES[m][0] for m in QUALITY_METRICS], dtype=float)
+    quality_hi = np.array([_QUALITY_RANGES[m][1] for m in QUALITY_METRICS], dtype=float)
+    risk_w = np.array([_RISK_WEIGHTS[m] for m in RISK_METRICS], dtype=float)
+    pillar_w = np.array([
+        _PILLAR_WEIGHTS['quality'], _PILLAR_WEIGHTS['valuation'], _PILLAR_WEIGHTS['risk'],
+    ])
+
+    profile = profile or {}
+    _check_keys(profile, _PROFILE_KEYS, "profile key")
+    if 'pillars' in profile:
+        _apply_weights(pillar_w, profile['pillars'], list(_PILLAR_WEIGHTS), "pillar")
+        if pillar_w.sum() == 0:
+            raise ValueError("At least one pillar weight must be positive")
+    if 'risk' in profile:
+        _apply_weights(risk_w, profile['risk'], RISK_METRICS, "risk metric")
+    for m, bounds in (profile.get('quality_ranges') or {}).items():
+        _check_keys([m], QUALITY_METRICS, "quality metric")
+        try:
+            lo, hi = bounds
+        except (TypeError, ValueError):
+            raise ValueError(f"{m} range must be [lo, hi]")
+        lo, hi = _number(lo, f"{m} lo", True), _number(hi, f"{m} hi", True)
+        if not lo < hi:
+            raise ValueError(f"{m} lo must be below hi")
+        j = QUALITY_METRICS.index(m)
+        quality_lo[j], quality_hi[j] = lo, hi
+    for i in range(len(rows)):
+        _apply_weights(quality_w[i], profile.get('quality') or {}, QUALITY_METRICS, "quality metric")
+        _apply_valuation(i, profile.get('valuation') or {}, val_w, val_lo, val_hi, strict=False)
+
+    sectors = profile.get('sectors') or {}
+    _check_keys(sectors, SECTOR_KEYS, "sector")
+    for sector, overrides in sectors.items():
+        _check_keys(overrides, _SECTOR_PROFILE_KEYS, f"{sector} profile key")
+        i = _SECTOR_INDEX[sector]
+        _apply_weights(quality_w[i], overrides.get('quality') or {}, QUALITY_METRICS, "quality metric")
+        _apply_valuation(i, overrides.get('valuation') or {}, val_w, val_lo, val_hi, strict=True)
+
+    return {
+        'quality_w': quality_w,
+        'quality_lo': quality_lo,
+        'quality_hi': quality_hi,
+        'val_w': val_w,
+        'val_lo': val_lo,
+        'val_hi': val_hi,
+        'risk_w': risk_w,
+        'der_limit': der_limit,
+        'is_bank': np.array([s == 'perbankan' for s in rows]),
+        'pillar_w': pillar_w,
+    }
+
+
+def stack_matrices(matrices_list):
+    """Stack compiled matrices along a leading profile axis for calc_scores_sweep.
+
+    Per-sector arrays become (P, S+1, k); per-metric vectors become (P, 1, k)
+    so they broadcast against (P, N, k) panels.
+    """
+    stacked = {}
+    for key in matrices_list[0]:
+        if key == 'is_bank':
+            stacked[key] = matrices_list[0][key]
+            continue
+        arr = np.stack([m[key] for m in matrices_list])
+        if key in ('quality_lo', 'quality_hi', 'risk_w', 'pillar_w'):
+            arr = arr[:, None, :]
+        stacked[key] = arr
+    return stacked
+
+
+def pillar_grid(step=0.1):
+    """All pillar weight triples on a simplex grid: every (q, v, r) >= 0 summing to 1."""
+    n = int(round(1 / step))
+    if n < 1 or n > 100:
+        raise ValueError("step must be between 0.01 and 1")
+    q, v = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing='ij')
+    keep = q + v <= n
+    q, v = q[keep], v[keep]
+    return np.column_stack([q, v, n - q - v]) / n
+
+
+DEFAULT_MATRICES = compile_scoring_matrices()
+
+
+def _panel_array(panel, columns):
+    """Extract columns as a float matrix; missing columns / None become NaN."""
+    out = np.full((len(panel), len(columns)), np.nan)
+    for j, col in enumerate(columns):
+        if col in panel.columns:
+            out[:, j] = pd.to_numeric(panel[col], errors='coerce').to_numpy(dtype=float)
+    return out
+
+
+def _round1(x):
+    """Round to 1 decimal exactly like Python's round(x, 1).
+
+    np.round scales first (fl(x * 10)), which can land on a spurious .5 tie;
+    the exact product is recovered as x*8 + x*2 (both exact) with a two-sum
+    error term, and ties are broken on that term (half-even when exact).
+    """
+    with np.errstate(invalid='ignore'):
+        a, b = x * 8, x * 2
+        y = a + b
+        err = (a - (y - (y - a))) + (b - (y - a))
+        r = np.rint(y)
+        tie = np.abs(y - np.floor(y) - 0.5) == 0
+        r = np.where(tie & (err > 0), np.floor(y) + 1, r)
+        r = np.where(tie & (err < 0), np.floor(y), r)
+    return r / 10
+
+
+def _weighted_avg_rows(scores, weights):
+    """Row-wise _weighted_avg: NaN scores drop out and remaining weights rebalance."""
+    valid = ~np.isnan(scores)
+    num = np.where(valid, scores * weights, 0.0).sum(axis=-1)
+    den = np.where(valid, weights, 0.0).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = np.where(den == 0, np.nan, num / den)
+    return _round1(avg)
+
+
+def _clip100(x):
+    return np.clip(x, 0.0, 100.0)
+
+
+def _quality_breakdown(values, m):
+    lo, hi = m['quality_lo'], m['quality_hi']
+    span = hi - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = np.where(span == 0, 50.0, _clip100((values - lo) / span * 100))
+    return np.where(np.isnan(values), np.nan, s)
+
+
+def _take_sector(arr, codes):
+    """Select per-ticker sector rows; works for (S+1, ...) and stacked (P, S+1, ...)."""
+    return np.take(arr, codes, axis=1 if arr.ndim == 3 else 0)
+
+
+def _valuation_breakdown(values, codes, m):
+    lo, hi = _take_sector(m['val_lo'], codes), _take_sector(m['val_hi'], codes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = _clip100((hi - values) / (hi - lo) * 100)
+        return np.where(values > 0, s, np.nan)
+
+
+def _risk_breakdown(values, codes, m):
+    der, beta, cr = values[:, 0], values[:, 1], values[:, 2]
+    limit = np.take(m['der_limit'], codes, axis=-1)
+    bank = m['is_bank'][codes]
+    der_s = np.where(bank, np.nan, _clip100((limit - np.abs(der)) / limit * 100))
+    beta_s = _clip100((3 - np.abs(beta)) / 3 * 100)
+    cr_s = np.where(bank, np.nan, _clip100(cr / 3 * 100))
+    return np.stack(np.broadcast_arrays(der_s, beta_s, cr_s), axis=-1), bank
+
+
+def _risk_scores(breakdown, bank, m):
+    # Banks: score driven by Beta alone (see calc_risk_score).
+    w = np.where(bank[:, None], (0.0, 1.0, 0.0), m['risk_w'])
+    return _weighted_avg_rows(breakdown, np.broadcast_to(w, breakdown.shape))
+
+
+def _recommend(composite, valuation):
+    """Vectorized calc_composite_score recommendation thresholds."""
+    has_val = ~np.isnan(valuation)
+    strong = (composite >= 75) & (~has_val | (valuation >= 60))
+    buy = (composite >= 60) & (~has_val | (valuation >= 45))
+    hold = composite >= 45
+    rec = np.select([strong, buy, hold], ['Strong Buy', 'Buy', 'Hold'], 'Avoid').astype(object)
+    rec[np.isnan(composite)] = None
+    return rec
+
+
+def _score_arrays(panel, m):
+    """Breakdowns and pillar scores as arrays; leading profile axis if m is stacked."""
+    sectors = panel['sector'] if 'sector' in panel.columns else [None] * len(panel)
+    codes = sector_codes(sectors)
+
+    q_vals = _panel_array(panel, QUALITY_METRICS)
+    v_vals = _panel_array(panel, VALUATION_METRICS)
+    r_vals = _panel_array(panel, RISK_METRICS)
+
+    q_bd = _quality_breakdown(q_vals, m)
+    quality = _weighted_avg_rows(q_bd, _take_sector(m['quality_w'], codes))
+
+    v_bd = _valuation_breakdown(v_vals, codes, m)
+    valuation = _weighted_avg_rows(v_bd, _take_sector(m['val_w'], codes))
+
+    r_bd, bank = _risk_breakdown(r_vals, codes, m)
+    risk = _risk_scores(r_bd, bank, m)
+
+    quality, valuation, risk = np.broadcast_arrays(quality, valuation, risk)
+    pillars = np.stack([quality, valuation, risk], axis=-1)
+    composite = _weighted_avg_rows(pillars, np.broadcast_to(m['pillar_w'], pillars.shape))
+    return {
+        'breakdown': (q_bd, v_bd, r_bd),
+        'scores': (quality, valuation, risk, composite),
+    }
+
+
+def calc_scores_batch(panel, matrices=None):
+    """Score every row of a ratio panel in one vectorized pass.
+
+    Args:
+        panel: DataFrame with one row per ticker (or ticker/date). Columns are
+               any of PANEL_COLUMNS (ratios as produced by calc_all_ratios plus
+               'Revenue CAGR', 'NI CAGR', 'FCF CAGR' from the trend analysis)
+               and an optional 'sector' column of industry keys.
+        matrices: compiled matrices from compile_scoring_matrices()
+                  (default: the built-in sector tables)
+
+    Returns:
+        dict with:
+          scores    — DataFrame (same index as panel) with quality_score,
+                      valuation_score, risk_score, composite_score, recommendation
+          breakdown — {'quality': DataFrame, 'valuation': DataFrame, 'risk': DataFrame}
+    """
+    m = matrices or DEFAULT_MATRICES
+    arrays = _score_arrays(panel, m)
+    q_bd, v_bd, r_bd = arrays['breakdown']
+    quality, valuation, risk, composite = arrays['scores']
+
+    scores = pd.DataFrame({
+        'quality_score': quality,
+        'valuation_score': valuation,
+        'risk_score': risk,
+        'composite_score': composite,
+        'recommendation': _recommend(composite, valuation),
+    }, index=panel.index)
+
+    return {
+        'scores': scores,
+        'breakdown': {
+            'quality': pd.DataFrame(q_bd, index=panel.index, columns=QUALITY_METRICS),
+            'valuation': pd.DataFrame(v_bd, index=panel.index, columns=VALUATION_METRICS),
+            'risk': pd.DataFrame(_round1(r_bd), index=panel.index, columns=RISK_METRICS),
+        },
+    }
+
+
+def breakdown_row(breakdown, i, sector=None):
+    """Convert row i of calc_scores_batch breakdowns to the scalar score_details shape."""
+    def _row(df, keys):
+        vals = df.iloc[i]
+        return {k: (None if np.isnan(vals[k]) else float(vals[k])) for k in keys}
+
+    valuation_keys = list(_BASE_VALUATION_KEYS)
+    if 'P/S' in _VALUATION_PARAMS.get(sector, _VALUATION_DEFAULT):
+        valuation_keys.append('P/S')
+    return {
+        'quality': _row(breakdown['quality'], QUALITY_METRICS),
+        'valuation': _row(breakdown['valuation'], valuation_keys),
+        'risk': _row(breakdown['risk'], RISK_METRICS),
+    }
+
+
+def calc_scores_sweep(panel, matrices_list):
+    """Score one panel under many weight profiles in a single vectorized pass.
+
+    Args:
+        panel: ratio panel as for calc_scores_batch
+        matrices_list: list of P compiled matrices (compile_scoring_matrices)
+
+    Returns:
+        dict of (N tickers × P profiles) DataFrames: quality_score,
+        valuation_score, risk_score, composite_score, recommendation
+    """
+    m = stack_matrices(matrices_list)
+    quality, valuation, risk, composite = _score_arrays(panel, m)['scores']
+    profiles = range(len(matrices_list))
+    frames = {
+        'quality_score': quality,
+        'valuation_score': valuation,
+        'risk_score': risk,
+        'composite_score': composite,
+        'recommendation': _recommend(composite, valuation),
+    }
+    return {
+        name: pd.DataFrame(np.asarray(arr).T, index=panel.index, columns=profiles)
+        for name, arr in frames.items()
+    }
@@ -2,6 +2,9 @@
 
 import math
 
+import numpy as np
+import pandas as pd
+
 
 def calc_yoy_growth(current, previous):
     """Year-over-Year growth rate (%)."""
@@ -62,3 +65,73 @@ def calc_growth_series(series):
         })
 
     return results
+
+
+# ── Vectorized statement helpers ────────────────────────────────────────────
+
+def period_labels(index):
+    """'YYYY-MM-DD' labels for a statement's period axis, converted in one pass."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.strftime("%Y-%m-%d").tolist()
+    return [p.strftime("%Y-%m-%d") if hasattr(p, 'strftime') else str(p) for p in index]
+
+
+def statement_values(df):
+    """Float matrix of a statement with non-finite cells as NaN, or None if non-numeric."""
+    try:
+        values = np.array(df.to_numpy(dtype=np.float64, na_value=np.nan), dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def calc_growth_matrix(values):
+    """Period-over-period growth (%) for every row of a (rows × periods) matrix.
+
+    Columns are ordered oldest-to-newest. Same rule as calc_yoy_growth: NaN
+    where either value is missing or the previous value is zero. The first
+    column is always NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    growth = np.full(values.shape, np.nan)
+    if values.shape[-1] < 2:
+        return growth
+    cur, prev = values[..., 1:], values[..., :-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        g = (cur - prev) / np.abs(prev) * 100
+    growth[..., 1:] = np.where((prev == 0) | ~np.isfinite(g), np.nan, g)
+    return growth
+
+
+def calc_cagr_matrix(values):
+    """CAGR (%) per row from its first to last finite value, like calc_cagr.
+
+    The period count is the number of finite values minus one (gaps are
+    skipped, as the per-series path does). NaN when fewer than two values
+    or either endpoint is not positive.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    count = finite.sum(axis=-1)
+    n = values.shape[-1]
+    if n == 0:
+        return np.full(values.shape[:-1], np.nan)
+    first_idx = np.argmax(finite, axis=-1)
+    last_idx = n - 1 - np.argmax(finite[..., ::-1], axis=-1)
+    first = np.take_along_axis(values, first_idx[..., None], axis=-1)[..., 0]
+    last = np.take_along_axis(values, last_idx[..., None], axis=-1)[..., 0]
+    years = count - 1
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        cagr = ((last / first) ** (1 / years) - 1) * 100
+    ok = (years > 0) & (first > 0) & (last > 0) & np.isfinite(cagr)
+    return np.where(ok, cagr, np.nan)
+
+
+def growth_records(labels, values, growth):
+    """[{period, value, growth_pct}] for one row, matching calc_growth_series."""
+    vals = np.where(np.isnan(values), None, values).tolist()
+    return [
+        {"period": p, "value": v, "growth_pct": None if g != g else round(g, 2)}
+        for p, v, g in zip(labels, vals, growth.tolist())
+    ]
@@ -613,8 +613,14 @@ def calc_specific_ratios(industry_key: str, ratios: dict, highlights: dict,
     return by_industry.get(industry_key, default)
 
 
-def detect_valuation_zone(specific_ratios: dict, config: dict) -> dict:
-    """Determine where the current valuation sits within the industry bands."""
+def detect_valuation_zone(specific_ratios: dict, config: dict,
+                          sector_stats=None, sector: str = None) -> dict:
+    """Determine where the current valuation sits within the industry bands.
+
+    When sector_stats (calculations.sector_stats.SectorStats) is given, the
+    result also carries the metric's percentile rank among sector peers and
+    a zone from the peer quartiles (cheap below Q1, expensive above Q3).
+    """
     metric = config.get('valuation_metric', 'PER')
     bands  = config.get('valuation_bands', {})
 
@@ -636,9 +642,37 @@ def detect_valuation_zone(specific_ratios: dict, config: dict) -> dict:
         else:
             zone = 'expensive'
 
-    return {
+    result = {
         'metric':  metric,
         'current': current,
         'bands':   bands,
         'zone':    zone,
     }
+    if sector_stats:
+        result['sector_relative'] = _sector_relative(sector_stats, sector, metric, current)
+    return result
+
+
+def _sector_relative(sector_stats, sector, metric, current):
+    """Peer percentile and quartile zone for detect_valuation_zone, or None."""
+    summary = sector_stats.summary(sector, metric)
+    if summary is None:
+        return None
+    percentile = sector_stats.percentile(sector, metric, current)
+    zone = 'unknown'
+    if percentile is not None:
+        if current <= summary['q1']:
+            zone = 'cheap'
+        elif current <= summary['q3']:
+            zone = 'fair'
+        else:
+            zone = 'expensive'
+    return {
+        'percentile': None if percentile is None else round(percentile, 1),
+        'median':     round(summary['median'], 2),
+        'q1':         round(summary['q1'], 2),
+        'q3':         round(summary['q3'], 2),
+        'peer_count': summary['count'],
+        'basis':      'universe' if summary['sector'] != sector else 'sector',
+        'zone':       zone,
+    }
@@ -0,0 +1,80 @@
+"""Canonical statement line items and label normalization.
+
+yfinance row labels vary between tickers and library versions: IDX filers
+using the IFRS direct method report operating cash flow under different
+names, older versions return CamelCase keys ('TotalRevenue'), and some
+labels carry stray whitespace. Labels are mapped to one canonical name
+(the standard yfinance label) so warehouse rows and trend lookups agree.
+"""
+
+import re
+
+# Canonical line item -> alternative labels seen in yfinance statements
+ITEM_ALIASES = {
+    "Operating Cash Flow": [
+        "Cash Flowsfromusedin Operating Activities Direct",
+        "Operating Activities",
+        "Cash Flow From Continuing Operating Activities",
+    ],
+    "Stockholders Equity": [
+        "Total Stockholders Equity",
+    ],
+}
+
+_ALIAS_LOOKUP = {
+    alias.lower(): canonical
+    for canonical, aliases in ITEM_ALIASES.items()
+    for alias in aliases
+}
+
+_CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+
+def clean_label(label):
+    """Whitespace-normalized label with CamelCase keys split into words."""
+    text = ' '.join(str(label).split())
+    if ' ' not in text:
+        text = _CAMEL_RE.sub(' ', text)
+    return text
+
+
+def canonical_item(label):
+    """Canonical line item name for a raw statement label."""
+    text = clean_label(label)
+    return _ALIAS_LOOKUP.get(text.lower(), text)
+
+
+def normalize_statement(df):
+    """Rename a statement's rows to canonical items.
+
+    When a canonical row and its aliases are both present they are merged
+    into one row: each period takes the canonical value, falling back to
+    the alias where the canonical cell is missing or zero (the per-column
+    `primary or alias` rule the ratio code applies). The merged row keeps
+    the canonical row's position; other rows keep their order.
+
+    Returns:
+        DataFrame with unique canonical row labels
+    """
+    if df is None or df.empty:
+        return df
+    cleaned = [clean_label(label) for label in df.index]
+    canonical = [_ALIAS_LOOKUP.get(c.lower(), c) for c in cleaned]
+
+    groups = {}
+    for i, k in enumerate(canonical):
+        groups.setdefault(k, []).append(i)
+    for rows in groups.values():
+        # Canonical rows first, then aliases in statement order
+        rows.sort(key=lambda i: (cleaned[i] != canonical[i], i))
+
+    keep = sorted(rows[0] for rows in groups.values())
+    out = df.iloc[keep].copy()
+    out.index = [canonical[i] for i in keep]
+    for k, rows in groups.items():
+        if len(rows) > 1:
+            merged = df.iloc[rows[0]]
+            for i in rows[1:]:
+                merged = merged.mask(merged == 0).combine_first(df.iloc[i])
+            out.loc[k] = merged.to_numpy()
+    return out
@@ -0,0 +1,233 @@
+"""Monte Carlo DCF: fair value as a distribution over sampled assumptions.
+
+Growth, WACC, terminal growth and (optionally) FCF margin are each a fixed
+number or a distribution:
+
+    {"dist": "normal", "mean": 0.10, "std": 0.03}
+    {"dist": "uniform", "low": 0.08, "high": 0.12}
+    {"dist": "triangular", "low": 0.02, "mode": 0.03, "high": 0.04}
+
+with optional "min" / "max" clips. Correlations between sampled inputs use a
+Gaussian copula: correlated standard normals (Cholesky of the correlation
+matrix) are mapped to each marginal through its inverse CDF, so every input
+keeps its own distribution. All paths are valued in one call to
+valuation.calc_dcf_grid; paths with WACC <= terminal growth are dropped.
+"""
+
+import numpy as np
+from scipy.special import ndtr
+
+from stock_checker.alpha.calculations.valuation import calc_dcf_grid
+
+VARIABLES = ('growth', 'wacc', 'terminal_growth', 'fcf_margin')
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+DEFAULT_PATHS = 100_000
+MAX_PATHS = 1_000_000
+DEFAULT_BINS = 50
+MAX_BINS = 500
+
+_PARAMS = {
+    'fixed': ('value',),
+    'normal': ('mean', 'std'),
+    'uniform': ('low', 'high'),
+    'triangular': ('low', 'mode', 'high'),
+}
+
+
+def parse_distribution(name, spec):
+    """Normalize one input spec (number or dict) into {'dist', params..., 'min', 'max'}.
+
+    Raises:
+        ValueError: unknown distribution or invalid parameters
+    """
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return {'dist': 'fixed', 'value': float(spec), 'min': None, 'max': None}
+    if not isinstance(spec, dict):
+        raise ValueError(f"{name}: expected a number or a distribution object")
+    dist = spec.get('dist', 'normal')
+    if dist not in _PARAMS:
+        raise ValueError(f"{name}: unknown distribution '{dist}' "
+                         f"(use one of {', '.join(_PARAMS)})")
+    out = {'dist': dist}
+    try:
+        for key in _PARAMS[dist]:
+            out[key] = float(spec[key])
+        for key in ('min', 'max'):
+            out[key] = None if spec.get(key) is None else float(spec[key])
+    except KeyError as exc:
+        raise ValueError(f"{name}: {dist} needs {', '.join(_PARAMS[dist])}") from exc
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{name}: distribution parameters must be numbers") from exc
+
+    if dist == 'normal' and out['std'] < 0:
+        raise ValueError(f"{name}: std must be non-negative")
+    if dist in ('uniform', 'triangular') and not out['low'] <= out['high']:
+        raise ValueError(f"{name}: low must not exceed high")
+    if dist == 'triangular' and not out['low'] <= out['mode'] <= out['high']:
+        raise ValueError(f"{name}: mode must lie between low and high")
+    return out
+
+
+def _correlation_matrix(names, correlation):
+    """Correlation matrix over names from {'a': {'b': rho}}; identity by default."""
+    index = {n: i for i, n in enumerate(names)}
+    corr = np.eye(len(names))
+    for a, row in (correlation or {}).items():
+        if not isinstance(row, dict):
+            raise ValueError("correlation must map variable -> {variable: rho}")
+        for b, rho in row.items():
+            if a not in index or b not in index:
+                raise ValueError(f"correlation {a}/{b}: both variables must be sampled "
+                                 f"(not fixed) inputs")
+            rho = float(rho)
+            if a == b or not -1 <= rho <= 1:
+                raise ValueError(f"correlation {a}/{b} must be between -1 and 1 "
+                                 f"for two different variables")
+            corr[index[a], index[b]] = corr[index[b], index[a]] = rho
+    return corr
+
+
+def _marginal(spec, z):
+    """Map standard normals z to spec's distribution (inverse CDF)."""
+    dist = spec['dist']
+    if dist == 'normal':
+        x = spec['mean'] + spec['std'] * z
+    else:
+        u = ndtr(z)
+        low, high = spec['low'], spec['high']
+        if dist == 'uniform':
+            x = low + (high - low) * u
+        else:
+            width = high - low
+            c = (spec['mode'] - low) / width if width else 0.0
+            with np.errstate(invalid='ignore'):
+                x = np.where(u < c,
+                             low + np.sqrt(u * width * (spec['mode'] - low)),
+                             high - np.sqrt((1 - u) * width * (high - spec['mode'])))
+    if spec['min'] is not None or spec['max'] is not None:
+        x = np.clip(x, spec['min'], spec['max'])
+    return x
+
+
+def sample_inputs(specs, n_paths, correlation=None, seed=None):
+    """Draw n_paths joint samples of the given inputs.
+
+    Args:
+        specs: {name: parse_distribution() output}
+        n_paths: number of paths
+        correlation: {'a': {'b': rho}} between sampled (non-fixed) inputs
+        seed: seed for numpy's default_rng (reproducible when set)
+
+    Returns:
+        {name: array of n_paths} (fixed inputs are scalars)
+    """
+    sampled = [n for n, s in specs.items() if s['dist'] != 'fixed']
+    corr = _correlation_matrix(sampled, correlation)
+    try:
+        chol = np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError as exc:
+        raise ValueError("correlation matrix is not positive definite") from exc
+
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n_paths, len(sampled))) @ chol.T
+    out = {n: s['value'] for n, s in specs.items() if s['dist'] == 'fixed'}
+    for j, name in enumerate(sampled):
+        out[name] = _marginal(specs[name], z[:, j])
+    return out
+
+
+def _summary(values):
+    finite = values[np.isfinite(values)]
+    return {
+        'mean': round(float(finite.mean()), 2),
+        'std': round(float(finite.std()), 2),
+        'percentiles': {f'p{q}': round(float(v), 2)
+                        for q, v in zip(PERCENTILES, np.percentile(finite, PERCENTILES))},
+    }
+
+
+def _histogram(values, bins):
+    """Counts over the 1st-99th percentile range; tails counted separately."""
+    lo, hi = np.percentile(values, [1, 99])
+    if hi <= lo:
+        hi = lo + 1.0
+    counts, edges = np.histogram(values, bins=bins, range=(lo, hi))
+    return {
+        'edges': np.round(edges, 2).tolist(),
+        'counts': counts.tolist(),
+        'below': int((values < lo).sum()),
+        'above': int((values > hi).sum()),
+    }
+
+
+def calc_monte_carlo_dcf(fcf_base, inputs, n_paths=DEFAULT_PATHS, projection_years=5,
+                         shares_outstanding=None, net_debt=0, current_price=None,
+                         revenue_base=None, correlation=None, seed=None, bins=DEFAULT_BINS):
+    """Distribution of DCF fair value over sampled assumptions.
+
+    Args:
+        fcf_base: base free cash flow (used unless fcf_margin is given)
+        inputs: {'growth', 'wacc', 'terminal_growth'[, 'fcf_margin']} specs
+                (numbers or distribution dicts, see module docstring)
+        n_paths: number of simulated paths
+        revenue_base: base revenue; required with fcf_margin
+                      (base FCF per path = revenue_base × margin)
+        correlation: {'a': {'b': rho}} between sampled inputs
+        seed: random seed
+        bins: histogram bins
+        projection_years, shares_outstanding, net_debt: same as calc_dcf
+
+    Returns:
+        dict with per-share (or equity) fair value summary, percentiles,
+        probability of upside vs current_price and a histogram
+    """
+    unknown = set(inputs) - set(VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+    for name in ('growth', 'wacc', 'terminal_growth'):
+        if inputs.get(name) is None:
+            raise ValueError(f"{name} is required")
+    n_paths = int(n_paths)
+    if not 1 <= n_paths <= MAX_PATHS:
+        raise ValueError(f"n_paths must be between 1 and {MAX_PATHS:,}")
+    if not 1 <= int(bins) <= MAX_BINS:
+        raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+    if seed is not None and not isinstance(seed, int):
+        raise ValueError("seed must be an integer")
+
+    specs = {n: parse_distribution(n, s) for n, s in inputs.items() if s is not None}
+    if 'fcf_margin' in specs:
+        if not revenue_base:
+            return {"error": "Revenue data not available for FCF margin sampling"}
+    elif fcf_base is None:
+        return {"error": "Free Cash Flow data not available"}
+
+    draws = sample_inputs(specs, n_paths, correlation, seed)
+    base = revenue_base * draws['fcf_margin'] if 'fcf_margin' in specs else fcf_base
+    grid = calc_dcf_grid(base, draws['growth'], draws['terminal_growth'], draws['wacc'],
+                         projection_years, shares_outstanding, net_debt)
+    per_share = grid['intrinsic_per_share'] is not None
+    values = np.broadcast_to(grid['intrinsic_per_share'] if per_share else grid['equity_value'],
+                             (n_paths,))
+    values = values[np.isfinite(values)]
+
+    result = {
+        'n_paths': n_paths,
+        'valid_paths': int(values.size),
+        'seed': seed,
+        'basis': 'per_share' if per_share else 'equity_value',
+        'inputs': specs,
+        'current_price': current_price,
+    }
+    if not values.size:
+        result['error'] = "No valid paths: WACC must exceed terminal growth"
+        return result
+
+    result.update(_summary(values))
+    result['histogram'] = _histogram(values, int(bins))
+    if per_share and current_price:
+        result['prob_upside'] = round(float((values > current_price).mean()), 4)
+        result['median_upside_pct'] = round(
+            (float(np.median(values)) - current_price) / current_price * 100, 2)
+    return result
@@ -0,0 +1,184 @@
+"""Nearest-neighbor peer discovery over standardized ratio and size vectors.
+
+Each ticker is a point in PEER_FEATURES space: profitability, leverage,
+valuation, growth and risk ratios plus log revenue and log total assets for
+size. Columns are standardized across the universe (median centre, robust
+scale, clipped to ±CLIP) so no single ratio dominates the distance; a
+missing value sits at the median and adds no distance.
+
+PeerIndex keeps the raw feature rows and one scikit-learn KDTree over the
+whole universe plus one per sector (built on first query). update() swaps
+in new rows for the tickers whose fundamentals changed and drops the trees,
+which rebuild lazily — a few milliseconds for the full IDX universe.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+PEER_FEATURES = [
+    'ROE', 'ROA', 'NPM', 'GPM', 'DER', 'Current Ratio',
+    'PER', 'PBV', 'Revenue CAGR', 'Beta',
+    'Log Revenue', 'Log Assets',
+]
+
+CLIP = 4.0
+_MAD_SCALE = 1.4826   # MAD -> standard deviation for normal data
+
+
+def size_features(revenue, assets):
+    """'Log Revenue' / 'Log Assets' columns (log10, NaN when not positive)."""
+    def _log(x):
+        x = np.asarray(x, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(x > 0, np.log10(x), np.nan)
+    return {'Log Revenue': _log(revenue), 'Log Assets': _log(assets)}
+
+
+def standardize(raw):
+    """Robust z-scores of a (rows × features) matrix; NaN -> 0 (the median).
+
+    Returns:
+        (z, centre, scale)
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    finite = np.where(np.isfinite(raw), raw, np.nan)
+    n_features = raw.shape[1] if raw.ndim == 2 else 0
+    centre = np.zeros(n_features)
+    scale = np.ones(n_features)
+    for j in range(n_features):
+        col = finite[:, j]
+        col = col[~np.isnan(col)]
+        if not len(col):
+            continue
+        centre[j] = np.median(col)
+        mad = np.median(np.abs(col - centre[j])) * _MAD_SCALE
+        sd = mad if mad > 0 else col.std()
+        scale[j] = sd if sd > 0 else 1.0
+    z = np.clip((finite - centre) / scale, -CLIP, CLIP)
+    return np.nan_to_num(z, nan=0.0), centre, scale
+
+
+class PeerIndex:
+    """KD-tree peer index over a feature panel."""
+
+    def __init__(self, features=None, sectors=None, leaf_size=16):
+        """
+        Args:
+            features: DataFrame indexed by ticker with PEER_FEATURES columns
+                      (missing columns count as unknown)
+            sectors: industry key per ticker (Series or mapping); default unknown
+            leaf_size: KDTree leaf size
+        """
+        self.leaf_size = leaf_size
+        self._raw = pd.DataFrame(columns=PEER_FEATURES, dtype=np.float64)
+        self._sectors = pd.Series(dtype=object)
+        self._reset()
+        if features is not None:
+            self.update(features, sectors)
+
+    def _reset(self):
+        self._z = None
+        self._trees = {}
+        self._arrays = None
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, ticker):
+        return ticker in self._raw.index
+
+    @property
+    def tickers(self):
+        return self._raw.index.tolist()
+
+    def copy(self):
+        """A new index over the same rows (trees rebuild on its first query)."""
+        other = PeerIndex(leaf_size=self.leaf_size)
+        other._raw = self._raw.copy()
+        other._sectors = self._sectors.copy()
+        return other
+
+    def update(self, features, sectors=None):
+        """Insert or replace rows for the given tickers; trees rebuild on next query."""
+        if features is None or len(features) == 0:
+            return self
+        rows = features.reindex(columns=PEER_FEATURES).apply(pd.to_numeric, errors='coerce')
+        rows = rows[~rows.index.duplicated(keep='last')].astype(np.float64)
+        if sectors is None:
+            sectors = pd.Series('unknown', index=rows.index, dtype=object)
+        sectors = pd.Series(sectors, dtype=object).reindex(rows.index).fillna('unknown')
+
+        keep = self._raw.index.difference(rows.index, sort=False)
+        self._raw = pd.concat([self._raw.loc[keep], rows]) if len(keep) else rows
+        self._sectors = pd.concat([self._sectors.loc[keep], sectors]) if len(keep) else sectors
+        self._reset()
+        return self
+
+    def remove(self, tickers):
+        drop = self._raw.index.intersection(list(tickers))
+        if len(drop):
+            self._raw = self._raw.drop(drop)
+            self._sectors = self._sectors.drop(drop)
+            self._reset()
+        return self
+
+    def _matrix(self):
+        if self._z is None:
+            self._z, _, _ = standardize(self._raw.to_numpy())
+        return self._z
+
+    def _lookup(self):
+        """(ticker -> row, tickers, sectors) as plain arrays for fast queries."""
+        if self._arrays is None:
+            tickers = self._raw.index.to_numpy()
+            self._arrays = ({t: i for i, t in enumerate(tickers)}, tickers,
+                            self._sectors.to_numpy())
+        return self._arrays
+
+    def _tree(self, sector=None):
+        """(KDTree, row positions) for the universe or one sector."""
+        if sector not in self._trees:
+            z = self._matrix()
+            if sector is None:
+                rows = np.arange(len(z))
+            else:
+                rows = np.flatnonzero(self._lookup()[2] == sector)
+            tree = KDTree(z[rows], leaf_size=self.leaf_size) if len(rows) else None
+            self._trees[sector] = (tree, rows)
+        return self._trees[sector]
+
+    def sector_of(self, ticker):
+        return self._sectors.get(ticker)
+
+    def query(self, ticker, k=5, same_sector=True):
+        """The k nearest tickers to ticker (itself excluded).
+
+        Args:
+            ticker: an indexed ticker
+            k: number of peers
+            same_sector: only consider tickers with the same industry key
+                         (unknown-sector tickers search the whole universe)
+
+        Returns:
+            list of {'ticker', 'sector', 'distance'}, nearest first; [] when
+            the ticker is not indexed
+        """
+        position, tickers, sectors = self._lookup()
+        pos = position.get(ticker)
+        if pos is None or k <= 0:
+            return []
+        sector = sectors[pos]
+        scope = sector if same_sector and sector != 'unknown' else None
+        tree, rows = self._tree(scope)
+        if tree is None:
+            return []
+        point = self._matrix()[pos:pos + 1]
+        dist, idx = tree.query(point, k=min(k + 1, len(rows)))
+        out = []
+        for d, i in zip(dist[0], idx[0]):
+            row = rows[i]
+            if row == pos:
+                continue
+            out.append({'ticker': tickers[row], 'sector': sectors[row], 'distance': round(float(d), 4)})
+        return out[:k]
@@ -0,0 +1,154 @@
+"""Point-in-time fundamentals: what was known about each ticker on a date.
+
+A statement value for period end P is treated as known from P + lag days
+(the reporting delay: IDX issuers file annual reports within ~90 days of
+year end). For each item, facts are stored as one array sorted by
+(ticker, available date), so an as-of query for every ticker is a single
+np.searchsorted over composite keys, and a query for many dates at once is
+the same call on a 2-D array of keys.
+
+Values that were later restated are only known in their latest form (the
+warehouse keeps one value per period), which is the one remaining source of
+lookahead.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Items used by the point-in-time valuation and quality factors
+PIT_ITEMS = ['Basic EPS', 'Net Income', 'Stockholders Equity', 'Ordinary Shares Number']
+
+ANNUAL_LAG_DAYS = 90
+QUARTERLY_LAG_DAYS = 45
+
+_SPAN = np.int64(1) << 32   # day numbers fit comfortably below 2**32
+
+
+def _day(dates):
+    """Days since epoch as int64 (scalar or array)."""
+    return pd.to_datetime(dates).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+class PointInTimeStore:
+    """Sorted per-item fact arrays with vectorized as-of lookups."""
+
+    def __init__(self, facts=None, lag_days=ANNUAL_LAG_DAYS):
+        """Build from facts with columns ticker, item, period (period end), value.
+
+        Args:
+            facts: long DataFrame (e.g. fundamentals.load_long output)
+            lag_days: days after period end before a value counts as known
+        """
+        self.lag_days = lag_days
+        self._items = {}
+        if facts is None or len(facts) == 0:
+            self.tickers = []
+            self._code = {}
+            return
+
+        facts = facts.loc[np.isfinite(pd.to_numeric(facts['value'], errors='coerce')),
+                          ['ticker', 'item', 'period', 'value']]
+        self.tickers = sorted(facts['ticker'].unique().tolist())
+        self._code = {t: i for i, t in enumerate(self.tickers)}
+
+        codes = facts['ticker'].map(self._code).to_numpy(dtype=np.int64)
+        avail = _day(facts['period']) + lag_days
+        keys = codes * _SPAN + avail
+        values = facts['value'].to_numpy(dtype=np.float64)
+        items = facts['item'].to_numpy()
+        for item in np.unique(items):
+            sel = items == item
+            k, v = keys[sel], values[sel]
+            order = np.argsort(k, kind='stable')
+            self._items[item] = (k[order], v[order])
+
+    @classmethod
+    def empty(cls):
+        return cls()
+
+    @property
+    def items(self):
+        return sorted(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def _lookup(self, item, codes, days):
+        """Latest known value of item for (codes, days) of any matching shape."""
+        out = np.full(np.broadcast(codes, days).shape, np.nan)
+        if item not in self._items:
+            return out
+        keys, values = self._items[item]
+        query = codes * _SPAN + days
+        pos = np.searchsorted(keys, query, side='right') - 1
+        ok = (pos >= 0) & (codes >= 0)
+        pos = np.where(ok, pos, 0)
+        # The hit must belong to the same ticker
+        ok &= (keys[pos] // _SPAN) == np.broadcast_to(codes, pos.shape)
+        out[ok] = values[pos[ok]]
+        return out
+
+    def _codes(self, tickers):
+        return np.array([self._code.get(t, -1) for t in tickers], dtype=np.int64)
+
+    def as_of(self, date, tickers=None, items=None):
+        """Panel of values known on date.
+
+        Returns:
+            DataFrame (tickers × items), NaN where nothing was known yet
+        """
+        tickers = list(tickers) if tickers is not None else self.tickers
+        items = list(items) if items is not None else self.items
+        codes = self._codes(tickers)
+        day = np.int64(_day([date])[0])
+        data = {item: self._lookup(item, codes, day) for item in items}
+        return pd.DataFrame(data, index=pd.Index(tickers, name='ticker'), columns=items)
+
+    def as_of_many(self, dates, item, tickers=None):
+        """One item known at each date, for many dates in one lookup.
+
+        Returns:
+            DataFrame (dates × tickers)
+        """
+        tickers = list(tickers) if tickers is not None else self.tickers
+        codes = self._codes(tickers)
+        days = _day(dates)
+        values = self._lookup(item, codes[None, :], days[:, None])
+        return pd.DataFrame(values, index=pd.DatetimeIndex(pd.to_datetime(dates)), columns=tickers)
+
+
+def calc_value_quality(panel, price):
+    """Value and quality factor inputs from a point-in-time panel.
+
+    Mirrors the live factors built from yfinance info: value averages
+    min(10 / PE, 1) and min(1 / PBV, 1) over the positive ratios available;
+    quality is ROE (decimal) clipped to [0, 0.5]. Missing inputs give 0.
+
+    Args:
+        panel: PointInTimeStore.as_of() output (tickers × PIT_ITEMS)
+        price: prices on the as-of date, aligned with panel.index
+
+    Returns:
+        DataFrame with 'value' and 'quality' columns
+    """
+    def col(name):
+        if name in panel.columns:
+            return panel[name].to_numpy(dtype=np.float64)
+        return np.full(len(panel), np.nan)
+
+    price = np.asarray(price, dtype=np.float64)
+    eps, ni = col('Basic EPS'), col('Net Income')
+    equity, shares = col('Stockholders Equity'), col('Ordinary Shares Number')
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pe = price / eps
+        pbv = price / (equity / shares)
+        roe = np.where(equity > 0, ni / equity, np.nan)
+        parts = np.stack([
+            np.where(pe > 0, np.minimum(10.0 / pe, 1.0), np.nan),
+            np.where(pbv > 0, np.minimum(1.0 / pbv, 1.0), np.nan),
+        ])
+    counts = np.isfinite(parts).sum(axis=0)
+    value = np.where(counts > 0, np.nansum(parts, axis=0) / np.maximum(counts, 1), 0.0)
+    quality = np.where(np.isfinite(roe), np.clip(roe, 0.0, 0.5), 0.0)
+    return pd.DataFrame({'value': value, 'quality': quality}, index=panel.index)
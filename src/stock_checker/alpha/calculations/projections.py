@@ -0,0 +1,169 @@
+"""Batched trend projections for many metrics (and tickers) in one fit.
+
+calc_projections takes a (series × periods) matrix, oldest period first,
+with NaN for missing values, and fits every row against its period index:
+
+  - 'linear': ordinary least squares, as calc_linear_projection
+  - 'log':    OLS on ln(value) (non-positive values are ignored), projected
+              back with exp — constant-growth trends
+  - 'robust': Huber-weighted IRLS, so one outlier year does not tilt the line
+
+Rows sharing the same missing-value pattern (usually all of them) share one
+design matrix and are solved together in a single numpy.linalg.lstsq call;
+the robust fit solves every row's weighted 2×2 normal equations as one
+stacked np.linalg.solve per iteration.
+"""
+
+import numpy as np
+
+METHODS = ('linear', 'log', 'robust')
+
+HUBER_K = 1.345
+ROBUST_ITERATIONS = 20
+Z_95 = 1.96
+
+
+def _ols(x, y, mask):
+    """(intercept, slope) per row via one lstsq per distinct mask pattern."""
+    n_rows = y.shape[0]
+    coef = np.full((n_rows, 2), np.nan)
+    patterns, inverse = np.unique(mask, axis=0, return_inverse=True)
+    for p, pattern in enumerate(patterns):
+        rows = np.flatnonzero(inverse.ravel() == p)
+        if pattern.sum() < 2:
+            continue
+        xp = x[pattern]
+        if np.all(xp == xp[0]):
+            continue
+        design = np.column_stack([np.ones(len(xp)), xp])
+        solution, *_ = np.linalg.lstsq(design, y[np.ix_(rows, pattern)].T, rcond=None)
+        coef[rows] = solution.T
+    return coef
+
+
+def _weighted(x, y, w):
+    """(intercept, slope) per row from stacked weighted normal equations."""
+    yw = np.where(w > 0, y, 0.0)
+    s0, s1, s2 = w.sum(axis=1), (w * x).sum(axis=1), (w * x * x).sum(axis=1)
+    t0, t1 = (w * yw).sum(axis=1), (w * x * yw).sum(axis=1)
+    a = np.stack([np.stack([s0, s1], -1), np.stack([s1, s2], -1)], -2)
+    b = np.stack([t0, t1], -1)
+    det = s0 * s2 - s1 * s1
+    ok = det > 1e-12 * np.maximum(s0 * s2, 1.0)
+    coef = np.full(b.shape, np.nan)
+    if ok.any():
+        coef[ok] = np.linalg.solve(a[ok], b[ok][..., None])[..., 0]
+    return coef
+
+
+def _huber(x, y, mask, coef):
+    """Iteratively reweighted least squares with Huber weights."""
+    for _ in range(ROBUST_ITERATIONS):
+        resid = np.where(mask, y - (coef[:, :1] + coef[:, 1:] * x), np.nan)
+        with np.errstate(invalid='ignore'):
+            mad = np.nanmedian(np.abs(resid), axis=1, keepdims=True) / 0.6745
+        scale = np.where(np.isfinite(mad) & (mad > 0), mad, np.inf)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = np.where(mask, np.minimum(1.0, HUBER_K * scale / np.abs(resid)), 0.0)
+        new = _weighted(x, y, w)
+        new = np.where(np.isnan(new), coef, new)
+        if np.allclose(new, coef, equal_nan=True, rtol=1e-10, atol=1e-12):
+            return new
+        coef = new
+    return coef
+
+
+def calc_projections(values, periods_ahead=4, method='linear'):
+    """Fit and extend a trend line for every row of values.
+
+    Args:
+        values: (series × periods) array, oldest period first, NaN = missing
+        periods_ahead: periods to project past the last column
+        method: 'linear', 'log' or 'robust'
+
+    Returns:
+        dict of arrays: slope, intercept, r_squared, se, n_points (per row),
+        fitted (series × periods), projected / upper / lower
+        (series × periods_ahead) and valid (rows with at least two points and
+        a fit); for 'log' the line parameters are on the log scale and the
+        value arrays are back-transformed
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown projection method: {method} (use one of {', '.join(METHODS)})")
+    y = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n_rows, n = y.shape
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'log':
+            y = np.where(y > 0, np.log(y), np.nan)
+    mask = np.isfinite(y)
+    y = np.where(mask, y, 0.0)
+    x = np.arange(n, dtype=np.float64)
+
+    coef = _ols(x, y, mask)
+    if method == 'robust':
+        coef = _huber(x, y, mask, coef)
+    intercept, slope = coef[:, 0], coef[:, 1]
+
+    n_points = mask.sum(axis=1)
+    line = intercept[:, None] + slope[:, None] * x
+    resid = np.where(mask, y - line, 0.0)
+    sse = (resid ** 2).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n_points > 0, (y * mask).sum(axis=1) / n_points, np.nan)
+        sst = (np.where(mask, y - mean[:, None], 0.0) ** 2).sum(axis=1)
+        se = np.where(n_points > 2, np.sqrt(sse / (n_points - 2)), 0.0)
+    r_squared = 1 - sse / np.maximum(sst, 1e-10)
+
+    ahead = np.arange(n, n + periods_ahead, dtype=np.float64)
+    projected = intercept[:, None] + slope[:, None] * ahead
+    upper = projected + Z_95 * se[:, None]
+    lower = projected - Z_95 * se[:, None]
+    fitted = line
+    if method == 'log':
+        fitted, projected, upper, lower = (np.exp(a) for a in (fitted, projected, upper, lower))
+
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r_squared': r_squared,
+        'se': se,
+        'n_points': n_points,
+        'fitted': fitted,
+        'projected': projected,
+        'upper': upper,
+        'lower': lower,
+        'valid': np.isfinite(slope),
+    }
+
+
+def projection_row(fit, i, start=0, method='linear'):
+    """One row of calc_projections as a calc_linear_projection-style dict.
+
+    Args:
+        fit: calc_projections output
+        i: row number
+        start: first column belonging to this series (rows padded on the
+               left are re-indexed so period 0 is their first column)
+    """
+    if not fit['valid'][i]:
+        return {"error": "Need at least 2 valid data points"}
+    n = fit['fitted'].shape[1]
+    slope = float(fit['slope'][i])
+    # Period indices restart at the series' first column
+    intercept = float(fit['intercept'][i]) + slope * start
+    return {
+        "method": method,
+        "slope": round(slope, 4),
+        "intercept": round(intercept, 2),
+        "r_squared": round(float(fit['r_squared'][i]), 4),
+        "fitted": [round(float(v), 2) for v in fit['fitted'][i, start:]],
+        "projections": [
+            {
+                "period_index": n - start + k,
+                "value": round(float(v), 2),
+                "upper": round(float(u), 2),
+                "lower": round(float(lo), 2),
+            }
+            for k, (v, u, lo) in enumerate(zip(fit['projected'][i], fit['upper'][i], fit['lower'][i]))
+        ],
+    }
@@ -0,0 +1,180 @@
+"""Universe-wide financial red flags as vectorized rules.
+
+calc_red_flags runs the anomaly.py checks for every ticker and every
+stored annual period at once. Inputs are (tickers × periods) matrices
+pivoted from the long fact table (offset 0 = latest period, compared with
+offset + 1), each rule is one boolean mask over those matrices, and only the
+flagged cells are formatted — through the scalar check functions, so
+messages and severities match the per-ticker page exactly.
+
+Rules: revenue decline, receivables growing faster than revenue, FCF below
+(or negative against) net income, net margin decline, leverage (DER), and
+the z-score outlier check on each ticker's NPM and ROE history. The z-score
+rule uses anomaly.z_score_check's population z and threshold; |z| is at
+most sqrt(n - 1), so it cannot fire with fewer than five periods and starts
+firing as the warehouse accumulates history.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.calculations.anomaly import (
+    check_receivables_vs_revenue,
+    check_fcf_vs_net_income,
+    check_margin_decline,
+    check_debt_ratio,
+    check_revenue_decline,
+)
+
+FLAG_COLUMNS = ['ticker', 'period', 'offset', 'type', 'severity', 'metric', 'value', 'message']
+
+# Statement line items the rules read: statement -> items
+FLAG_ITEMS = {
+    'income': ['Total Revenue', 'Net Income'],
+    'balance': ['Net Receivables', 'Total Debt', 'Stockholders Equity'],
+    'cashflow': ['Free Cash Flow'],
+}
+
+Z_THRESHOLD = 2.0
+Z_MIN_PERIODS = 3
+
+
+def _matrices(long, tickers):
+    """{(statement, item): (T × P) values} and {statement: (T × P) periods}."""
+    n_periods = int(long['offset'].max()) + 1 if len(long) else 0
+    row = pd.Index(tickers).get_indexer(long['ticker'])
+    col = long['offset'].to_numpy(dtype=np.int64)
+    values = pd.to_numeric(long['value'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.where(np.isfinite(values), values, np.nan)
+    statements = long['statement'].to_numpy(dtype=object)
+    items = long['item'].to_numpy(dtype=object)
+
+    mats = {}
+    for statement, names in FLAG_ITEMS.items():
+        for item in names:
+            m = np.full((len(tickers), n_periods), np.nan)
+            sel = (statements == statement) & (items == item)
+            m[row[sel], col[sel]] = values[sel]
+            mats[statement, item] = m
+
+    periods = {}
+    days = long['period'].to_numpy(dtype='datetime64[D]')
+    for statement in FLAG_ITEMS:
+        p = np.full((len(tickers), n_periods), np.datetime64('NaT', 'D'), dtype='datetime64[D]')
+        sel = statements == statement
+        p[row[sel], col[sel]] = days[sel]
+        periods[statement] = p
+    return mats, periods
+
+
+def _prev(m):
+    """Values one period earlier (offset + 1) aligned with m."""
+    out = np.full_like(m, np.nan)
+    out[:, :-1] = m[:, 1:]
+    return out
+
+
+def _growth(cur, prev):
+    """calc_yoy_growth over arrays (NaN where it returns None)."""
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        g = (cur - prev) / np.abs(prev) * 100
+    return np.where((prev == 0) | ~np.isfinite(g), np.nan, g)
+
+
+def _ratio(num, den, pct=False):
+    """num / den where both are truthy (present and non-zero), as the page computes it."""
+    ok = np.isfinite(num) & (num != 0) & np.isfinite(den) & (den != 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.where(ok, num / den, np.nan)
+    return r * 100 if pct else r
+
+
+def _opt(v):
+    return None if not np.isfinite(v) else float(v)
+
+
+def _zscores(history):
+    """Population z-scores per row, NaN where fewer than Z_MIN_PERIODS values or no variance."""
+    finite = np.isfinite(history)
+    n = finite.sum(axis=1, keepdims=True)
+    x = np.where(finite, history, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = x.sum(axis=1, keepdims=True) / n
+        var = (np.where(finite, history - mean, 0.0) ** 2).sum(axis=1, keepdims=True) / n
+        z = (history - mean) / np.sqrt(var)
+    return np.where(finite & (n >= Z_MIN_PERIODS) & (var > 0), z, np.nan)
+
+
+def calc_red_flags(long, tickers=None):
+    """Red flags for every ticker and stored period.
+
+    Args:
+        long: annual facts with ticker, statement, item, period, offset, value
+              (fundamentals.load_long(freq='annual') output)
+        tickers: restrict/order the tickers (default: those in long)
+
+    Returns:
+        DataFrame with FLAG_COLUMNS, one row per flag
+    """
+    if long is None or len(long) == 0:
+        return pd.DataFrame(columns=FLAG_COLUMNS)
+    long = long[long['offset'].notna()]
+    if tickers is None:
+        tickers = list(dict.fromkeys(long['ticker']))
+    long = long[long['ticker'].isin(tickers)]
+    mats, periods = _matrices(long, tickers)
+
+    revenue = mats['income', 'Total Revenue']
+    net_income = mats['income', 'Net Income']
+    receivables = mats['balance', 'Net Receivables']
+    debt = mats['balance', 'Total Debt']
+    equity = mats['balance', 'Stockholders Equity']
+    fcf = mats['cashflow', 'Free Cash Flow']
+
+    revenue_growth = _growth(revenue, _prev(revenue))
+    receivables_growth = _growth(receivables, _prev(receivables))
+    npm = _ratio(net_income, revenue, pct=True)
+    prev_npm = _prev(npm)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fcf_ratio = np.where((net_income != 0) & np.isfinite(fcf), fcf / net_income, np.nan)
+        der = np.where(np.isfinite(debt) & np.isfinite(equity) & (equity != 0), debt / equity, np.nan)
+    roe = _ratio(net_income, equity, pct=True)
+
+    with np.errstate(invalid='ignore'):
+        rules = [
+            # (mask, statement for the period label, value, metric, formatter)
+            (revenue_growth < -10, 'income', revenue_growth, 'Revenue Growth',
+             lambda i, j: check_revenue_decline(_opt(revenue_growth[i, j]))),
+            (receivables_growth > revenue_growth + 15, 'balance', receivables_growth,
+             'Receivables Growth',
+             lambda i, j: check_receivables_vs_revenue(_opt(revenue_growth[i, j]),
+                                                       _opt(receivables_growth[i, j]))),
+            (fcf_ratio < 0.5, 'cashflow', fcf_ratio, 'FCF / Net Income',
+             lambda i, j: check_fcf_vs_net_income(_opt(fcf[i, j]), _opt(net_income[i, j]))),
+            (prev_npm - npm > 5, 'income', npm, 'NPM',
+             lambda i, j: check_margin_decline(_opt(npm[i, j]), _opt(prev_npm[i, j]))),
+            (der > 2.0, 'balance', der, 'DER',
+             lambda i, j: check_debt_ratio(_opt(der[i, j]))),
+        ]
+
+    rows = []
+    for mask, statement, value, metric, check in rules:
+        for i, j in zip(*np.nonzero(mask)):
+            flag = check(i, j)
+            if flag is None:
+                continue
+            rows.append((tickers[i], periods[statement][i, j], j, flag['type'], flag['severity'],
+                         metric, float(value[i, j]), flag['message']))
+
+    for metric, history in (('NPM', npm), ('ROE', roe)):
+        z = _zscores(history)
+        for i, j in zip(*np.nonzero(np.abs(np.nan_to_num(z)) >= Z_THRESHOLD)):
+            direction = 'high' if z[i, j] > 0 else 'low'
+            rows.append((tickers[i], periods['income'][i, j], j, 'z_score', 'info', metric,
+                         round(float(z[i, j]), 2),
+                         f"{metric} of {history[i, j]:.2f} is an outlier in its own history "
+                         f"(z={z[i, j]:.2f}, {direction})"))
+
+    flags = pd.DataFrame(rows, columns=FLAG_COLUMNS)
+    flags['period'] = pd.to_datetime(flags['period'])
+    return flags.sort_values(['ticker', 'offset', 'type'], kind='stable', ignore_index=True)
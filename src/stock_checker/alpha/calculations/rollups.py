@@ -0,0 +1,114 @@
+"""Quarterly rollups: trailing-twelve-month values and QoQ / YoY growth.
+
+calc_rollups works on the long fact table (ticker, statement, item, period,
+value) for many tickers at once. Rows are sorted by series (ticker ×
+statement × item) and period, and every lookback — previous quarter, same
+quarter last year, the three quarters summed into TTM — is a shifted view
+of the same arrays, valid only where the shifted row belongs to the same
+series and sits the expected distance back in time (the year-ago quarter
+is found with one searchsorted over (series, date) keys, so a missing
+quarter does not misalign it). Nothing loops per ticker.
+
+Income and cash flow items are flows: TTM is the sum of four consecutive
+quarters. Balance sheet items are stocks: TTM is the latest quarter.
+Growth rates follow growth.calc_yoy_growth ((cur - prev) / |prev| × 100).
+"""
+
+import numpy as np
+import pandas as pd
+
+FLOW_STATEMENTS = ('income', 'cashflow')
+
+ROLLUP_COLUMNS = ['ticker', 'statement', 'item', 'period', 'value',
+                  'ttm', 'qoq', 'yoy', 'ttm_yoy']
+
+# Day gaps accepted as "the previous quarter" and "a year earlier"
+QUARTER_GAP_DAYS = (75, 105)
+YEAR_GAP_DAYS = (340, 390)
+
+_SPAN = np.int64(1) << 32   # composite (series, day) keys
+
+
+def _back(arr, n, fill):
+    """arr shifted n rows down (row i holds arr[i - n]); the first n rows get fill."""
+    out = np.empty_like(arr)
+    out[:n] = fill
+    out[n:] = arr[:-n] if n else arr
+    return out
+
+
+def _growth(cur, prev):
+    """Vectorized calc_yoy_growth; NaN when prev is 0/missing or the result is non-finite."""
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        g = (cur - prev) / np.abs(prev) * 100
+    return np.where((prev == 0) | ~np.isfinite(g), np.nan, g)
+
+
+def calc_rollups(long):
+    """TTM and growth columns for every (ticker, statement, item, quarter).
+
+    Args:
+        long: quarterly facts with ticker, statement, item, period, value
+              (e.g. fundamentals.load_long(freq='quarterly'))
+
+    Returns:
+        DataFrame with ROLLUP_COLUMNS, sorted by ticker, statement, item and
+        period (oldest first); NaN where a lookback quarter is missing
+    """
+    if long is None or len(long) == 0:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    df = long[['ticker', 'statement', 'item', 'period', 'value']].copy()
+    df['period'] = pd.to_datetime(df['period'], errors='coerce')
+    df = df.dropna(subset=['period'])
+    df = df.drop_duplicates(['ticker', 'statement', 'item', 'period'], keep='last')
+    df = df.sort_values(['ticker', 'statement', 'item', 'period'], kind='stable', ignore_index=True)
+
+    series = df.groupby(['ticker', 'statement', 'item'], sort=False).ngroup().to_numpy()
+    day = df['period'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    value = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    value = np.where(np.isfinite(value), value, np.nan)
+
+    # Previous quarter: the prior row of the same series, one quarter back
+    lo, hi = QUARTER_GAP_DAYS
+    gap = day - _back(day, 1, 0)
+    prev_q = (_back(series, 1, -1) == series) & (gap >= lo) & (gap <= hi)
+
+    # A year earlier: searched by date, so a missing quarter in between
+    # does not shift the comparison
+    key = series.astype(np.int64) * _SPAN + day
+    lo, hi = YEAR_GAP_DAYS
+    pos = np.searchsorted(key, key - hi, side='left')
+    pos = np.minimum(pos, len(key) - 1)
+    year_gap = day - day[pos]
+    prev_y = (series[pos] == series) & (year_gap >= lo) & (year_gap <= hi)
+
+    # TTM for flows: four finite values over three consecutive quarter gaps
+    window = np.stack([value] + [_back(value, n, np.nan) for n in (1, 2, 3)])
+    contiguous = prev_q & _back(prev_q, 1, False) & _back(prev_q, 2, False)
+    flow_ttm = np.where(contiguous & np.isfinite(window).all(axis=0), window.sum(axis=0), np.nan)
+    is_flow = df['statement'].isin(FLOW_STATEMENTS).to_numpy()
+    ttm = np.where(is_flow, flow_ttm, value)
+
+    df['value'] = value
+    df['ttm'] = ttm
+    df['qoq'] = np.where(prev_q, _growth(value, _back(value, 1, np.nan)), np.nan)
+    df['yoy'] = np.where(prev_y, _growth(value, value[pos]), np.nan)
+    df['ttm_yoy'] = np.where(prev_y, _growth(ttm, ttm[pos]), np.nan)
+    return df[ROLLUP_COLUMNS]
+
+
+def latest_rollups(rollups):
+    """The latest quarter of every series."""
+    if rollups is None or len(rollups) == 0:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    last = ~rollups.duplicated(['ticker', 'statement', 'item'], keep='last')
+    return rollups.loc[last].reset_index(drop=True)
+
+
+def ttm_panel(rollups, items, column='ttm'):
+    """(tickers × items) of one rollup column at each series' latest quarter."""
+    latest = latest_rollups(rollups)
+    latest = latest[latest['item'].isin(items)].drop_duplicates(['ticker', 'item'], keep='last')
+    if latest.empty:
+        return pd.DataFrame(columns=list(items))
+    return latest.pivot(index='ticker', columns='item', values=column).reindex(columns=list(items))
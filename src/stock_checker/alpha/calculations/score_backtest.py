@@ -0,0 +1,166 @@
+"""Vectorized backtest of composite scores: quantile portfolios, hit rates and IC."""
+
+import numpy as np
+import pandas as pd
+
+
+def calc_forward_returns(prices, dates, horizon=21):
+    """Simple forward returns over `horizon` trading days from each date.
+
+    Each date is aligned to the last trading day on or before it, so scores
+    recorded on weekends/holidays use the prior close (no lookahead).
+
+    Args:
+        prices: DataFrame of closes (trading days × tickers)
+        dates: DatetimeIndex of signal dates
+        horizon: holding period in trading days
+
+    Returns:
+        DataFrame (dates × tickers) of forward returns; NaN where the window
+        runs past the end of the price history.
+    """
+    px = prices.to_numpy(dtype=float)
+    pos = prices.index.searchsorted(dates, side='right') - 1
+    end = pos + horizon
+    valid = (pos >= 0) & (end < len(prices))
+
+    fwd = np.full((len(dates), px.shape[1]), np.nan)
+    start_px = px[pos[valid]]
+    end_px = px[end[valid]]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fwd[valid] = end_px / start_px - 1
+    return pd.DataFrame(fwd, index=dates, columns=prices.columns)
+
+
+def _rank_rows(values):
+    """Average ranks per row (NaN stays NaN), as a float array."""
+    return pd.DataFrame(values).rank(axis=1, method='average').to_numpy()
+
+
+def _row_corr(x, y):
+    """Pearson correlation per row over positions where both are finite."""
+    mask = ~(np.isnan(x) | np.isnan(y))
+    n = mask.sum(axis=1)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx = x.sum(axis=1) / n
+        my = y.sum(axis=1) / n
+        dx = np.where(mask, x - mx[:, None], 0.0)
+        dy = np.where(mask, y - my[:, None], 0.0)
+        cov = (dx * dy).sum(axis=1)
+        corr = cov / np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    corr[n < 3] = np.nan
+    return corr
+
+
+def _nan_stats(values):
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return None, None
+    std = float(finite.std(ddof=1)) if len(finite) > 1 else None
+    return float(finite.mean()), std
+
+
+def _r(v, nd=4):
+    return round(float(v), nd) if v is not None and np.isfinite(v) else None
+
+
+def calc_quantile_backtest(scores, prices, n_quantiles=5, horizon=21, freq='ME'):
+    """Backtest a score signal by sorting tickers into quantile portfolios.
+
+    At each rebalance date the latest score per ticker within the period is
+    ranked cross-sectionally; quantile 1 holds the lowest scores and quantile
+    `n_quantiles` the highest. Every rebalance is evaluated in one pass:
+    forward returns, quantile means, rank IC and hit rates are all computed
+    on (dates × tickers) arrays.
+
+    Args:
+        scores: DataFrame of scores (signal dates × tickers), NaN = no score
+        prices: DataFrame of closes (trading days × tickers)
+        n_quantiles: number of buckets
+        horizon: forward-return window in trading days
+        freq: pandas offset alias for rebalancing (None = every score date)
+
+    Returns:
+        dict with per-date series and summary statistics
+    """
+    tickers = [t for t in scores.columns if t in prices.columns]
+    if not tickers:
+        return {"error": "No overlap between scored tickers and price history"}
+
+    sig = scores[tickers].sort_index()
+    if freq:
+        sig = sig.resample(freq).last().dropna(how='all')
+    fwd = calc_forward_returns(prices[tickers], sig.index, horizon)
+
+    s = sig.to_numpy(dtype=float)
+    f = fwd.to_numpy(dtype=float)
+    both = ~(np.isnan(s) | np.isnan(f))
+    s = np.where(both, s, np.nan)
+    f = np.where(both, f, np.nan)
+
+    keep = both.sum(axis=1) >= n_quantiles
+    if not keep.any():
+        return {"error": "Insufficient overlapping scores and forward returns"}
+    s, f = s[keep], f[keep]
+    dates = sig.index[keep]
+
+    # Quantile buckets from percentile ranks: 1 (lowest score) .. n_quantiles
+    s_rank = _rank_rows(s)
+    count = np.sum(~np.isnan(s), axis=1, keepdims=True)
+    with np.errstate(invalid='ignore'):
+        bucket = np.ceil(s_rank / count * n_quantiles)
+
+    q_returns = np.full((len(dates), n_quantiles), np.nan)
+    for q in range(1, n_quantiles + 1):
+        in_q = bucket == q
+        n_q = in_q.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            q_returns[:, q - 1] = np.where(in_q, f, 0.0).sum(axis=1) / n_q
+
+    universe_ret = np.nanmean(f, axis=1)
+    median_ret = np.nanmedian(f, axis=1)
+    spread = q_returns[:, -1] - q_returns[:, 0]
+
+    top = bucket == n_quantiles
+    with np.errstate(invalid='ignore', divide='ignore'):
+        top_hits = (top & (f > median_ret[:, None])).sum(axis=1) / top.sum(axis=1)
+
+    ic = _row_corr(s_rank, _rank_rows(f))
+    ic_mean, ic_std = _nan_stats(ic)
+    n_ic = int(np.isfinite(ic).sum())
+    periods_per_year = 252 / horizon
+    ic_ir = ic_mean / ic_std * np.sqrt(periods_per_year) if ic_std else None
+    ic_t = ic_mean / ic_std * np.sqrt(n_ic) if ic_std else None
+
+    # Growth curve per quantile, compounding one forward window per rebalance
+    cum = np.nancumsum(np.log1p(q_returns), axis=0)
+
+    date_labels = [d.strftime("%Y-%m-%d") for d in dates]
+    mean_q = np.nanmean(q_returns, axis=0)
+
+    return {
+        "dates": date_labels,
+        "n_quantiles": n_quantiles,
+        "horizon_days": horizon,
+        "n_periods": len(dates),
+        "quantile_returns": {
+            f"Q{q + 1}": [_r(v) for v in q_returns[:, q]] for q in range(n_quantiles)
+        },
+        "quantile_cumulative": {
+            f"Q{q + 1}": [_r(np.expm1(v) * 100, 2) for v in cum[:, q]] for q in range(n_quantiles)
+        },
+        "mean_quantile_return": {f"Q{q + 1}": _r(mean_q[q]) for q in range(n_quantiles)},
+        "universe_return": [_r(v) for v in universe_ret],
+        "spread": [_r(v) for v in spread],
+        "mean_spread": _r(np.nanmean(spread)),
+        "ic": [_r(v) for v in ic],
+        "ic_mean": _r(ic_mean),
+        "ic_std": _r(ic_std),
+        "ic_ir": _r(ic_ir, 3),
+        "ic_t_stat": _r(ic_t, 3),
+        "hit_rate": _r(np.nanmean(top_hits)),
+        "spread_hit_rate": _r(np.mean(spread[np.isfinite(spread)] > 0))
+        if np.isfinite(spread).any() else None,
+    }
@@ -66,6 +66,12 @@ _QUALITY_DEFAULT = {
     'Revenue CAGR': 0.10, 'NI CAGR': 0.10, 'FCF CAGR': 0.10,
 }
 
+# Universal normalization ranges (lo → 0, hi → 100) for the quality metrics.
+_QUALITY_RANGES = {
+    'ROE': (0, 30), 'ROA': (0, 15), 'NPM': (0, 30), 'GPM': (0, 60),
+    'Revenue CAGR': (-10, 30), 'NI CAGR': (-10, 30), 'FCF CAGR': (-10, 30),
+}
+
 
 def calc_quality_score(ratios, trends, sector=None):
     """Compute Quality Score (0-100) from profitability + growth metrics.
@@ -111,14 +117,15 @@ def calc_quality_score(ratios, trends, sector=None):
         if annual.get('Free Cash Flow') and annual['Free Cash Flow'].get('cagr') is not None:
             fcf_cagr = annual['Free Cash Flow']['cagr']
 
+    r = _QUALITY_RANGES
     breakdown = {
-        'ROE': _norm(roe, 0, 30),
-        'ROA': _norm(roa, 0, 15),
-        'NPM': _norm(npm, 0, 30),
-        'GPM': _norm(gpm, 0, 60),
-        'Revenue CAGR': _norm(rev_cagr, -10, 30),
-        'NI CAGR': _norm(ni_cagr, -10, 30),
-        'FCF CAGR': _norm(fcf_cagr, -10, 30),
+        'ROE': _norm(roe, *r['ROE']),
+        'ROA': _norm(roa, *r['ROA']),
+        'NPM': _norm(npm, *r['NPM']),
+        'GPM': _norm(gpm, *r['GPM']),
+        'Revenue CAGR': _norm(rev_cagr, *r['Revenue CAGR']),
+        'NI CAGR': _norm(ni_cagr, *r['NI CAGR']),
+        'FCF CAGR': _norm(fcf_cagr, *r['FCF CAGR']),
     }
 
     w = _QUALITY_WEIGHTS.get(sector, _QUALITY_DEFAULT)
@@ -135,6 +142,71 @@ def calc_quality_score(ratios, trends, sector=None):
     return {'score': score, 'breakdown': breakdown}
 
 
+# ── Sector-specific valuation ranges ────────────────────────────────────────
+# Per metric: (lo, hi, weight) — lo maps to 100 (cheap), hi maps to 0 (expensive).
+# Metrics absent from a sector's table are not applicable and excluded from score.
+_VALUATION_PARAMS = {
+    'perbankan': {
+        # EV/EBITDA not meaningful for deposit-funded institutions.
+        # PBV is the primary metric (franchise premium over book value).
+        # Tighter PER range: banks in emerging markets rarely exceed 20x.
+        # PBV ceiling raised to 5.5x: BBCA regularly trades at 4-5x — that's a
+        # quality premium, not a penalisation trigger.
+        'PER': (5, 20, 0.50),
+        'PBV': (0.5, 5.5, 0.50),
+    },
+    'consumer_goods': {
+        # Brand intangibles (trademarks, distribution) are NOT on the balance sheet
+        # → PBV is structurally inflated (UNVR 30-50x, ICBP 5-10x) and non-comparable.
+        # EV/EBITDA is the global standard for FMCG valuation.
+        # Wide PER range (10-40x): quality FMCG commands premium earnings multiples.
+        # PBV included at 5% weight with wide range so it never distorts the score.
+        'PER':       (10, 40, 0.35),
+        'PBV':       (2, 20, 0.05),
+        'EV/EBITDA': (8, 25, 0.45),
+        'PEG':       (0.5, 3, 0.15),
+    },
+    'telekomunikasi': {
+        # Capex-intensive, high EBITDA margin; EV/EBITDA is the primary metric.
+        'PER':       (5, 30, 0.20),
+        'PBV':       (0.5, 5, 0.05),
+        'EV/EBITDA': (4, 20, 0.60),
+        'PEG':       (0.5, 4, 0.15),
+    },
+    'energi_pertambangan': {
+        # Commodity cycles mean EV/EBITDA is the most cycle-adjusted metric.
+        # PEG excluded: forward earnings estimates are notoriously unreliable for
+        # cyclical commodities — a "low PEG" at cycle peak is meaningless.
+        'PER':       (5, 30, 0.25),
+        'PBV':       (0.5, 5, 0.10),
+        'EV/EBITDA': (4, 20, 0.65),
+    },
+    'properti_konstruksi': {
+        # Land/building assets = book value. PBV is the anchor metric.
+        # Tighter PBV range: IDX property stocks rarely trade above 2x book.
+        'PER':       (5, 30, 0.25),
+        'PBV':       (0.3, 2.0, 0.60),
+        'EV/EBITDA': (4, 20, 0.15),
+    },
+    'teknologi': {
+        # P/S supplements PER for pre-profit names (GOTO, BUKA).
+        # Extended EV/EBITDA range (30x): tech companies trade at higher multiples.
+        'PER':       (5, 40, 0.30),
+        'PBV':       (0.5, 5, 0.10),
+        'EV/EBITDA': (4, 30, 0.20),
+        'PEG':       (0.5, 4, 0.10),
+        'P/S':       (3, 20, 0.30),
+    },
+}
+
+_VALUATION_DEFAULT = {
+    'PER':       (5, 40, 0.30),
+    'PBV':       (0.5, 5, 0.25),
+    'EV/EBITDA': (4, 20, 0.25),
+    'PEG':       (0.5, 4, 0.20),
+}
+
+
 def calc_valuation_score(ratios, sector=None):
     """Compute Valuation Score (0-100): cheap = high score.
 
@@ -144,7 +216,7 @@ def calc_valuation_score(ratios, sector=None):
       EV/EBITDA 20x→0,  4x→100  weight 25%
       PEG       4x→0,   0.5x→100 weight 20%
 
-    Sector adjustments:
+    Sector adjustments (see _VALUATION_PARAMS):
       perbankan          — PER range 5-20x; PBV range 0.5-5.5x (extended: BBCA ~4.5x is normal premium);
                            EV/EBITDA and PEG excluded (not applicable).
                            Weights: PER 50%, PBV 50%.
@@ -159,7 +231,8 @@ def calc_valuation_score(ratios, sector=None):
                            EV/EBITDA range extended to 30x (tech trades at higher multiples).
                            Weights: PER 30%, P/S 30%, EV/EBITDA 20%, PBV 10%, PEG 10%.
 
-    Missing metrics use weighted average of available ones (_weighted_avg auto-rebalances).
+    Non-positive multiples are treated as missing. Missing metrics use weighted
+    average of available ones (_weighted_avg auto-rebalances).
 
     Args:
         ratios: dict from calc_all_ratios (includes 'P/S' for teknologi)
@@ -175,142 +248,26 @@ def calc_valuation_score(ratios, sector=None):
         score = (hi - v) / (hi - lo) * 100
         return max(0.0, min(100.0, score))
 
-    per = ratios.get('PER')
-    pbv = ratios.get('PBV')
-    ev_ebitda = ratios.get('EV/EBITDA')
-    peg = ratios.get('PEG')
-    ps = ratios.get('P/S')
+    params = _VALUATION_PARAMS.get(sector, _VALUATION_DEFAULT)
 
-    # ── Banking ────────────────────────────────────────────────────────────
-    if sector == 'perbankan':
-        # EV/EBITDA not meaningful for deposit-funded institutions.
-        # PBV is the primary metric (franchise premium over book value).
-        # Tighter PER range: banks in emerging markets rarely exceed 20x.
-        # PBV ceiling raised to 5.5x: BBCA regularly trades at 4-5x — that's a
-        # quality premium, not a penalisation trigger.
-        per_s = _norm_inv(per, 5, 20) if per is not None and per > 0 else None
-        pbv_s = _norm_inv(pbv, 0.5, 5.5) if pbv is not None and pbv > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': None,
-            'PEG': None,
-        }
-        score = _weighted_avg([(per_s, 0.50), (pbv_s, 0.50)])
-        return {'score': score, 'breakdown': breakdown}
+    breakdown = {'PER': None, 'PBV': None, 'EV/EBITDA': None, 'PEG': None}
+    scores_weights = []
+    for metric, (lo, hi, weight) in params.items():
+        v = ratios.get(metric)
+        s = _norm_inv(v, lo, hi) if v is not None and v > 0 else None
+        breakdown[metric] = s
+        scores_weights.append((s, weight))
 
-    # ── Consumer Goods / FMCG ─────────────────────────────────────────────
-    if sector == 'consumer_goods':
-        # Brand intangibles (trademarks, distribution) are NOT on the balance sheet
-        # → PBV is structurally inflated (UNVR 30-50x, ICBP 5-10x) and non-comparable.
-        # EV/EBITDA is the global standard for FMCG valuation.
-        # Wide PER range (10-40x): quality FMCG commands premium earnings multiples.
-        # PBV included at 5% weight with wide range so it never distorts the score.
-        per_s = _norm_inv(per,      10, 40) if per      is not None and per      > 0 else None
-        pbv_s = _norm_inv(pbv,       2, 20) if pbv      is not None and pbv      > 0 else None
-        ev_s  = _norm_inv(ev_ebitda, 8, 25) if ev_ebitda is not None and ev_ebitda > 0 else None
-        peg_s = _norm_inv(peg,     0.5,  3) if peg      is not None and peg      > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': ev_s,
-            'PEG': peg_s,
-        }
-        score = _weighted_avg([
-            (per_s, 0.35), (pbv_s, 0.05), (ev_s, 0.45), (peg_s, 0.15),
-        ])
-        return {'score': score, 'breakdown': breakdown}
+    return {'score': _weighted_avg(scores_weights), 'breakdown': breakdown}
 
-    # ── Telco ──────────────────────────────────────────────────────────────
-    if sector == 'telekomunikasi':
-        # Capex-intensive, high EBITDA margin; EV/EBITDA is the primary metric.
-        per_s = _norm_inv(per, 5, 30) if per is not None and per > 0 else None
-        pbv_s = _norm_inv(pbv, 0.5, 5) if pbv is not None and pbv > 0 else None
-        ev_s = _norm_inv(ev_ebitda, 4, 20) if ev_ebitda is not None and ev_ebitda > 0 else None
-        peg_s = _norm_inv(peg, 0.5, 4) if peg is not None and peg > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': ev_s,
-            'PEG': peg_s,
-        }
-        score = _weighted_avg([
-            (per_s, 0.20), (pbv_s, 0.05), (ev_s, 0.60), (peg_s, 0.15),
-        ])
-        return {'score': score, 'breakdown': breakdown}
 
-    # ── Mining / Energy ────────────────────────────────────────────────────
-    if sector == 'energi_pertambangan':
-        # Commodity cycles mean EV/EBITDA is the most cycle-adjusted metric.
-        # PEG excluded: forward earnings estimates are notoriously unreliable for
-        # cyclical commodities — a "low PEG" at cycle peak is meaningless.
-        per_s = _norm_inv(per, 5, 30) if per is not None and per > 0 else None
-        pbv_s = _norm_inv(pbv, 0.5, 5) if pbv is not None and pbv > 0 else None
-        ev_s  = _norm_inv(ev_ebitda, 4, 20) if ev_ebitda is not None and ev_ebitda > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': ev_s,
-            'PEG': None,
-        }
-        score = _weighted_avg([
-            (per_s, 0.25), (pbv_s, 0.10), (ev_s, 0.65),
-        ])
-        return {'score': score, 'breakdown': breakdown}
+# ── Sector DER tolerance ────────────────────────────────────────────────────
+_CAPEX_HEAVY  = {'telekomunikasi', 'properti_konstruksi', 'logistik_transportasi', 'infrastruktur'}
+# FMCG companies like UNVR run high DER by design (aggressive dividend → low equity),
+# not financial distress. 4x tolerance avoids unfairly penalising them.
+_MODERATE_DER = {'consumer_goods', 'healthcare'}
 
-    # ── Property / Construction ────────────────────────────────────────────
-    if sector == 'properti_konstruksi':
-        # Land/building assets = book value. PBV is the anchor metric.
-        # Tighter PBV range: IDX property stocks rarely trade above 2x book.
-        per_s = _norm_inv(per, 5, 30) if per is not None and per > 0 else None
-        pbv_s = _norm_inv(pbv, 0.3, 2.0) if pbv is not None and pbv > 0 else None
-        ev_s = _norm_inv(ev_ebitda, 4, 20) if ev_ebitda is not None and ev_ebitda > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': ev_s,
-            'PEG': None,
-        }
-        score = _weighted_avg([
-            (per_s, 0.25), (pbv_s, 0.60), (ev_s, 0.15),
-        ])
-        return {'score': score, 'breakdown': breakdown}
-
-    # ── Technology ────────────────────────────────────────────────────────
-    if sector == 'teknologi':
-        # P/S supplements PER for pre-profit names (GOTO, BUKA).
-        # Extended EV/EBITDA range (30x): tech companies trade at higher multiples.
-        per_s = _norm_inv(per, 5, 40) if per is not None and per > 0 else None
-        pbv_s = _norm_inv(pbv, 0.5, 5) if pbv is not None and pbv > 0 else None
-        ev_s = _norm_inv(ev_ebitda, 4, 30) if ev_ebitda is not None and ev_ebitda > 0 else None
-        peg_s = _norm_inv(peg, 0.5, 4) if peg is not None and peg > 0 else None
-        ps_s = _norm_inv(ps, 3, 20) if ps is not None and ps > 0 else None
-        breakdown = {
-            'PER': per_s,
-            'PBV': pbv_s,
-            'EV/EBITDA': ev_s,
-            'PEG': peg_s,
-            'P/S': ps_s,
-        }
-        score = _weighted_avg([
-            (per_s, 0.30), (pbv_s, 0.10), (ev_s, 0.20), (peg_s, 0.10), (ps_s, 0.30),
-        ])
-        return {'score': score, 'breakdown': breakdown}
-
-    # ── Default ────────────────────────────────────────────────────────────
-    breakdown = {
-        'PER': _norm_inv(per, 5, 40) if per is not None and per > 0 else None,
-        'PBV': _norm_inv(pbv, 0.5, 5) if pbv is not None and pbv > 0 else None,
-        'EV/EBITDA': _norm_inv(ev_ebitda, 4, 20) if ev_ebitda is not None and ev_ebitda > 0 else None,
-        'PEG': _norm_inv(peg, 0.5, 4) if peg is not None and peg > 0 else None,
-    }
-    score = _weighted_avg([
-        (breakdown['PER'], 0.30),
-        (breakdown['PBV'], 0.25),
-        (breakdown['EV/EBITDA'], 0.25),
-        (breakdown['PEG'], 0.20),
-    ])
-    return {'score': score, 'breakdown': breakdown}
+_RISK_WEIGHTS = {'DER': 0.40, 'Beta': 0.30, 'Current Ratio': 0.30}
 
 
 def calc_risk_score(ratios, sector=None):
@@ -334,11 +291,6 @@ def calc_risk_score(ratios, sector=None):
     Returns:
         dict with score and breakdown
     """
-    _CAPEX_HEAVY  = {'telekomunikasi', 'properti_konstruksi', 'logistik_transportasi', 'infrastruktur'}
-    # FMCG companies like UNVR run high DER by design (aggressive dividend → low equity),
-    # not financial distress. 4x tolerance avoids unfairly penalising them.
-    _MODERATE_DER = {'consumer_goods', 'healthcare'}
-
     der = ratios.get('DER')
     beta = ratios.get('Beta')
     current_ratio = ratios.get('Current Ratio')
@@ -383,14 +335,17 @@ def calc_risk_score(ratios, sector=None):
     }
 
     score = _weighted_avg([
-        (der_score, 0.40),
-        (beta_score, 0.30),
-        (cr_score, 0.30),
+        (der_score, _RISK_WEIGHTS['DER']),
+        (beta_score, _RISK_WEIGHTS['Beta']),
+        (cr_score, _RISK_WEIGHTS['Current Ratio']),
     ])
 
     return {'score': score, 'breakdown': breakdown}
 
 
+_PILLAR_WEIGHTS = {'quality': 0.35, 'valuation': 0.35, 'risk': 0.30}
+
+
 def calc_composite_score(quality_score, valuation_score, risk_score):
     """Compute composite score and auto recommendation.
 
@@ -411,9 +366,9 @@ def calc_composite_score(quality_score, valuation_score, risk_score):
         dict with composite_score and recommendation
     """
     composite = _weighted_avg([
-        (quality_score, 0.35),
-        (valuation_score, 0.35),
-        (risk_score, 0.30),
+        (quality_score, _PILLAR_WEIGHTS['quality']),
+        (valuation_score, _PILLAR_WEIGHTS['valuation']),
+        (risk_score, _PILLAR_WEIGHTS['risk']),
     ])
 
     recommendation = None
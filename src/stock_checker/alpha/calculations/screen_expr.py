@@ -0,0 +1,352 @@
+"""Safe screener expression language compiled to vectorized NumPy evaluations.
+
+Expressions use Python-like syntax but only a small whitelist of constructs:
+
+    ROE > 15 and PER < sector_median(PER) and close > sma200
+    sector in ('perbankan', 'teknologi') and not DER > 2
+    rank(ROE) + rank(-PER)                       # a score, not a mask
+
+  - field names: any ScreenerTable column, case-insensitive, with
+    non-alphanumerics as underscores (EV/EBITDA → ev_ebitda,
+    Current Ratio → current_ratio)
+  - sector: compare with == / != / in / not in against string literals
+  - operators: and, or, not, comparisons (chainable), + - * / unary -
+  - functions: see FUNCTIONS
+  - missing values: a comparison with a missing (NaN) value is unknown,
+    neither true nor false, and `not` keeps it unknown, so `not DER > 2`
+    excludes tickers without a DER just like `DER <= 2` does. `and` / `or`
+    follow SQL's three-valued logic (unknown and false is false, unknown or
+    true is true); only rows that come out true pass the screen. Use
+    exists(x) to test for a value explicitly.
+
+Parsing goes through the stdlib ``ast`` module and every node is checked
+against the whitelist before anything is built, so there is no eval and no
+attribute, subscript or call access beyond the listed helpers. Compiled
+expressions are cached by text; evaluation is a tree of NumPy operations over
+whole columns, and sector aggregates of plain fields are memoized per table.
+"""
+
+import ast
+from functools import lru_cache, reduce
+
+import numpy as np
+from scipy.stats import rankdata
+
+from stock_checker.alpha.calculations.screener import normalize_field
+
+MAX_EXPRESSION_LENGTH = 500
+MAX_NODES = 200
+
+_CMP_OPS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+_BIN_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+
+class ExpressionError(ValueError):
+    """Raised for syntax errors, disallowed constructs and unknown names."""
+
+
+# ── Sector and universe helpers ─────────────────────────────────────────────
+
+def _per_sector(table, x, reducer):
+    out = np.full(table.size, np.nan)
+    for bitmap in table.sector_bitmaps.values():
+        vals = x[bitmap]
+        vals = vals[np.isfinite(vals)]
+        if len(vals):
+            out[bitmap] = reducer(vals)
+    return out
+
+
+def _pct_rank(vals):
+    """Percentile rank (0-100] of finite values, NaN elsewhere; ties averaged."""
+    out = np.full(len(vals), np.nan)
+    finite = np.isfinite(vals)
+    n = int(finite.sum())
+    if n:
+        out[finite] = rankdata(vals[finite]) / n * 100
+    return out
+
+
+def _sector_rank(table, x):
+    out = np.full(table.size, np.nan)
+    for bitmap in table.sector_bitmaps.values():
+        out[bitmap] = _pct_rank(x[bitmap])
+    return out
+
+
+def _zscore(vals):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (vals - np.nanmean(vals)) / np.nanstd(vals)
+
+
+def _sector_zscore(table, x):
+    out = np.full(table.size, np.nan)
+    for bitmap in table.sector_bitmaps.values():
+        if np.isfinite(x[bitmap]).sum() > 1:
+            out[bitmap] = _zscore(x[bitmap])
+    return out
+
+
+# name -> (arity, function(table, *arrays), memoizable per table)
+FUNCTIONS = {
+    'sector_median': (1, lambda t, x: _per_sector(t, x, np.median), True),
+    'sector_mean': (1, lambda t, x: _per_sector(t, x, np.mean), True),
+    'sector_rank': (1, _sector_rank, True),
+    'sector_zscore': (1, _sector_zscore, True),
+    'median': (1, lambda t, x: np.nanmedian(x) if np.isfinite(x).any() else np.nan, True),
+    'rank': (1, lambda t, x: _pct_rank(x), True),
+    'zscore': (1, lambda t, x: _zscore(x), True),
+    'abs': (1, lambda t, x: np.abs(x), False),
+    'log': (1, lambda t, x: np.log(np.where(x > 0, x, np.nan)), False),
+    'min': (2, lambda t, a, b: np.fmin(a, b), False),
+    'max': (2, lambda t, a, b: np.fmax(a, b), False),
+    'exists': (1, lambda t, x: np.isfinite(x), False),
+}
+_BOOL_FUNCTIONS = {'exists'}
+
+
+# ── Compilation ─────────────────────────────────────────────────────────────
+
+class CompiledExpression:
+    """A checked expression tree; evaluate against any ScreenerTable."""
+
+    def __init__(self, text, kind, fn, fields):
+        self.text = text
+        self.kind = kind          # 'mask' or 'score'
+        self.fields = fields      # canonical field names referenced
+        self._fn = fn
+
+    def evaluate(self, table):
+        """Boolean mask ('mask' kind) or float array ('score' kind) over the table."""
+        result = self._fn(table)
+        if self.kind == 'mask':
+            return np.broadcast_to(np.asarray(result[0], dtype=bool), (table.size,))
+        return np.broadcast_to(np.asarray(result, dtype=float), (table.size,))
+
+
+def _field_getter(key):
+    def get(table):
+        name = table.field_lookup.get(key)
+        if name is None:
+            raise ExpressionError(f"Unknown field: {key}")
+        return table.columns[name]
+    return get
+
+
+def _const(value):
+    return lambda table: value
+
+
+def _known(mask):
+    """A two-valued condition as its (true, false) masks."""
+    mask = np.asarray(mask, dtype=bool)
+    return mask, ~mask
+
+
+# Conditions evaluate to (true, false) mask pairs; rows in neither are unknown
+def _and(a, b):
+    return a[0] & b[0], a[1] | b[1]
+
+
+def _or(a, b):
+    return a[0] | b[0], a[1] & b[1]
+
+
+class _Compiler:
+    def __init__(self):
+        self.fields = set()
+
+    def compile(self, node):
+        """Returns (kind, fn) where kind is 'num', 'bool' or 'str'.
+
+        'bool' functions return (true, false) mask pairs.
+        """
+        method = getattr(self, '_' + type(node).__name__, None)
+        if method is None:
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        return method(node)
+
+    def _num(self, node):
+        kind, fn = self.compile(node)
+        if kind != 'num':
+            raise ExpressionError("Expected a numeric expression")
+        return fn
+
+    def _bool(self, node):
+        kind, fn = self.compile(node)
+        if kind != 'bool':
+            raise ExpressionError("Expected a condition (comparison, and/or/not)")
+        return fn
+
+    def _Expression(self, node):
+        return self.compile(node.body)
+
+    def _Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float, str)):
+            raise ExpressionError(f"Unsupported literal: {node.value!r}")
+        if isinstance(node.value, str):
+            return 'str', _const(node.value)
+        return 'num', _const(float(node.value))
+
+    def _Name(self, node):
+        key = normalize_field(node.id)
+        if key == 'sector':
+            return 'sector', lambda table: table.sectors
+        self.fields.add(key)
+        return 'num', _field_getter(key)
+
+    def _BoolOp(self, node):
+        fns = [self._bool(v) for v in node.values]
+        combine = _and if isinstance(node.op, ast.And) else _or
+        return 'bool', lambda table: reduce(combine, (f(table) for f in fns))
+
+    def _UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            fn = self._bool(node.operand)
+            # Swapping the masks keeps unknown rows unknown
+            return 'bool', lambda table: fn(table)[::-1]
+        if isinstance(node.op, ast.USub):
+            fn = self._num(node.operand)
+            return 'num', lambda table: np.negative(fn(table))
+        if isinstance(node.op, ast.UAdd):
+            return 'num', self._num(node.operand)
+        raise ExpressionError("Unsupported unary operator")
+
+    def _BinOp(self, node):
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError("Unsupported arithmetic operator")
+        left, right = self._num(node.left), self._num(node.right)
+
+        def binop(table):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return op(left(table), right(table))
+        return 'num', binop
+
+    def _sector_compare(self, op, right):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(right, (ast.Tuple, ast.List, ast.Set)):
+                raise ExpressionError("sector in (...) needs a list of names")
+            names = []
+            for elt in right.elts:
+                if not (isinstance(elt, ast.Constant) and isinstance(elt.value, str)):
+                    raise ExpressionError("sector in (...) needs string literals")
+                names.append(elt.value)
+        elif isinstance(op, (ast.Eq, ast.NotEq)):
+            if not (isinstance(right, ast.Constant) and isinstance(right.value, str)):
+                raise ExpressionError("sector can only be compared with a string")
+            names = [right.value]
+        else:
+            raise ExpressionError("sector supports ==, !=, in, not in")
+        negate = isinstance(op, (ast.NotEq, ast.NotIn))
+
+        def sector_mask(table):
+            mask = np.zeros(table.size, dtype=bool)
+            for name in names:
+                bitmap = table.sector_bitmaps.get(name)
+                if bitmap is not None:
+                    mask |= bitmap
+            return _known(~mask if negate else mask)
+        return sector_mask
+
+    def _Compare(self, node):
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(left, ast.Name) and normalize_field(left.id) == 'sector':
+                parts.append(self._sector_compare(op, right))
+            else:
+                cmp = _CMP_OPS.get(type(op))
+                if cmp is None:
+                    raise ExpressionError("'in' is only supported for sector")
+                parts.append(self._numeric_compare(cmp, left, right))
+            left = right
+
+        def compare(table):
+            return reduce(_and, (p(table) for p in parts))
+        return 'bool', compare
+
+    def _numeric_compare(self, cmp, left, right):
+        lf, rf = self._num(left), self._num(right)
+
+        def numeric_compare(table):
+            a, b = lf(table), rf(table)
+            known = np.isfinite(a) & np.isfinite(b)
+            with np.errstate(invalid='ignore'):
+                result = cmp(a, b)
+            return result & known, ~result & known
+        return numeric_compare
+
+    def _Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ExpressionError("Only plain helper calls are allowed")
+        name = node.func.id.lower()
+        spec = FUNCTIONS.get(name)
+        if spec is None:
+            raise ExpressionError(f"Unknown function: {node.func.id}")
+        arity, func, memoize = spec
+        if len(node.args) != arity:
+            raise ExpressionError(f"{name}() takes {arity} argument{'s' if arity > 1 else ''}")
+        args = [self._num(a) for a in node.args]
+        kind = 'bool' if name in _BOOL_FUNCTIONS else 'num'
+
+        # Aggregates over a plain field depend only on the (immutable) table
+        if memoize and isinstance(node.args[0], ast.Name):
+            key = (name, normalize_field(node.args[0].id))
+
+            def call(table):
+                cached = table.memo.get(key)
+                if cached is None:
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        cached = table.memo[key] = func(table, *(a(table) for a in args))
+                return cached
+            return kind, call
+
+        def call(table):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = func(table, *(a(table) for a in args))
+            return _known(result) if kind == 'bool' else result
+        return kind, call
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """Parse and compile an expression; results are cached by text.
+
+    Returns:
+        CompiledExpression whose kind is 'mask' (a condition) or 'score'
+        (a numeric expression, usable for ranking)
+
+    Raises:
+        ExpressionError: on syntax errors, disallowed constructs or misuse
+    """
+    text = (text or '').strip()
+    if not text:
+        raise ExpressionError("Expression is empty")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as exc:
+        raise ExpressionError(f"Syntax error: {exc.msg}")
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise ExpressionError("Expression is too complex")
+
+    compiler = _Compiler()
+    kind, fn = compiler.compile(tree)
+    if kind not in ('bool', 'num'):
+        raise ExpressionError("Expression must be a condition or a number")
+    return CompiledExpression(text, 'mask' if kind == 'bool' else 'score', fn,
+                              frozenset(compiler.fields))
@@ -0,0 +1,260 @@
+"""Columnar in-memory screener over a universe ratio/score table.
+
+Each numeric metric is stored as a contiguous float64 column with a
+precomputed sort order, so a range predicate is two binary searches plus a
+slice of the order array. Sectors are stored as one boolean bitmap per
+sector. Filters AND their masks together; sorting reuses the precomputed
+order, so a full filter + sort + limit over ~1,000 tickers is a handful of
+array operations.
+
+Tables are immutable once built — refreshing means building a new table and
+swapping the reference.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+RANGE_OPS = {'<', '<=', '>', '>=', '==', '!=', 'between'}
+SET_OPS = {'in', 'not_in'}
+
+# Columns that are labels, not metrics
+_LABEL_COLUMNS = ('ticker', 'sector', 'recommendation', 'as_of')
+
+# Price-derived columns added by calc_indicator_columns
+INDICATOR_COLUMNS = ['close', 'sma20', 'sma50', 'sma200', 'rsi14',
+                     'ret_1m', 'ret_3m', 'high_52w', 'low_52w']
+
+
+def normalize_field(name):
+    """Canonical identifier for a column name: 'EV/EBITDA' -> 'ev_ebitda'."""
+    return re.sub(r'[^0-9a-z]+', '_', str(name).lower()).strip('_')
+
+
+def calc_indicator_columns(closes):
+    """Latest technical indicators for every ticker from a close-price matrix.
+
+    Matches stock_checker.indicators (simple rolling SMA and RSI) evaluated on
+    the last row, computed for all tickers at once.
+
+    Args:
+        closes: DataFrame (trading days × tickers), oldest first
+
+    Returns:
+        DataFrame indexed by ticker with INDICATOR_COLUMNS
+    """
+    px = closes.to_numpy(dtype=float)
+    n = len(px)
+
+    def tail_mean(values, w):
+        if n < w:
+            return np.full(values.shape[1], np.nan)
+        return values[-w:].mean(axis=0)
+
+    def ret(days):
+        if n <= days:
+            return np.full(px.shape[1], np.nan)
+        return (px[-1] / px[-1 - days] - 1) * 100
+
+    last = px[-1] if n else np.full(px.shape[1], np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = np.diff(px[-15:], axis=0)
+        gain = tail_mean(np.where(delta > 0, delta, 0.0), 14) if len(delta) >= 14 else np.nan
+        loss = tail_mean(np.where(delta < 0, -delta, 0.0), 14) if len(delta) >= 14 else np.nan
+        rsi = 100 - 100 / (1 + gain / loss)
+        year = px[-252:]
+        out = {
+            'close': last,
+            'sma20': tail_mean(px, 20),
+            'sma50': tail_mean(px, 50),
+            'sma200': tail_mean(px, 200),
+            'rsi14': np.broadcast_to(rsi, last.shape),
+            'ret_1m': ret(21),
+            'ret_3m': ret(63),
+            'high_52w': np.nanmax(year, axis=0) if n else last,
+            'low_52w': np.nanmin(year, axis=0) if n else last,
+        }
+    return pd.DataFrame(out, index=closes.columns)[INDICATOR_COLUMNS]
+
+
+class ScreenerTable:
+    """Immutable columnar snapshot of the screening universe."""
+
+    def __init__(self, frame, as_of=None):
+        """Build typed columns and indexes from a DataFrame indexed by ticker.
+
+        Args:
+            frame: DataFrame indexed by ticker; numeric columns become metrics,
+                   'sector' becomes bitmap indexes, 'recommendation' is a label.
+            as_of: timestamp of the underlying data (informational)
+        """
+        self.as_of = as_of
+        self.tickers = np.asarray(frame.index.astype(str), dtype=object)
+        self.size = len(self.tickers)
+
+        self.columns = {}
+        self._order = {}
+        self._sorted = {}
+        for col in frame.columns:
+            if col in _LABEL_COLUMNS:
+                continue
+            values = pd.to_numeric(frame[col], errors='coerce')
+            if values.isna().all():
+                continue
+            arr = np.array(values.to_numpy(dtype=np.float64), dtype=np.float64)
+            arr[np.isinf(arr)] = np.nan
+            # argsort puts NaN last, so the finite prefix is searchable
+            order = np.argsort(arr, kind='stable')
+            n_finite = int(np.isfinite(arr).sum())
+            self.columns[col] = arr
+            self._order[col] = order[:n_finite]
+            self._sorted[col] = arr[order[:n_finite]]
+
+        sectors = (frame['sector'].fillna('unknown').astype(str).to_numpy()
+                   if 'sector' in frame.columns else np.full(self.size, 'unknown', dtype=object))
+        self.sectors = np.asarray(sectors, dtype=object)
+        self.sector_bitmaps = {s: self.sectors == s for s in np.unique(self.sectors)}
+
+        self.field_lookup = {normalize_field(c): c for c in self.columns}
+        # Per-table cache for derived arrays (e.g. sector medians); safe
+        # because the table never changes after construction.
+        self.memo = {}
+
+        self.labels = {
+            col: np.asarray(frame[col].to_numpy(), dtype=object)
+            for col in ('recommendation',) if col in frame.columns
+        }
+
+    @property
+    def fields(self):
+        return sorted(self.columns)
+
+    # ── Predicates ───────────────────────────────────────────────────────
+
+    def _range_mask(self, field, op, value):
+        if field not in self.columns:
+            raise ValueError(f"Unknown field: {field}")
+        keys = self._sorted[field]
+        order = self._order[field]
+
+        if op == 'between':
+            try:
+                lo, hi = (float(v) for v in value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} between needs [low, high]")
+            start = np.searchsorted(keys, lo, side='left')
+            stop = np.searchsorted(keys, hi, side='right')
+        else:
+            try:
+                v = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} {op} needs a number")
+            if op == '<':
+                start, stop = 0, np.searchsorted(keys, v, side='left')
+            elif op == '<=':
+                start, stop = 0, np.searchsorted(keys, v, side='right')
+            elif op == '>':
+                start, stop = np.searchsorted(keys, v, side='right'), len(keys)
+            elif op == '>=':
+                start, stop = np.searchsorted(keys, v, side='left'), len(keys)
+            else:  # '==' and '!='
+                start = np.searchsorted(keys, v, side='left')
+                stop = np.searchsorted(keys, v, side='right')
+
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        if op == '!=':
+            # Missing values never match a numeric predicate
+            mask = ~mask
+            mask[~np.isfinite(self.columns[field])] = False
+        return mask
+
+    def _sector_mask(self, op, value):
+        values = [value] if isinstance(value, str) else list(value or [])
+        mask = np.zeros(self.size, dtype=bool)
+        for s in values:
+            bitmap = self.sector_bitmaps.get(s)
+            if bitmap is not None:
+                mask |= bitmap
+        return ~mask if op in ('!=', 'not_in') else mask
+
+    def mask(self, filters):
+        """AND together a list of {field, op, value} predicates."""
+        mask = np.ones(self.size, dtype=bool)
+        for f in filters or []:
+            field, op, value = f.get('field'), f.get('op', '=='), f.get('value')
+            if field == 'sector':
+                if op not in SET_OPS | {'==', '!='}:
+                    raise ValueError(f"Unsupported operator for sector: {op}")
+                mask &= self._sector_mask(op, value)
+            elif op in RANGE_OPS:
+                mask &= self._range_mask(field, op, value)
+            else:
+                raise ValueError(f"Unsupported operator: {op}")
+        return mask
+
+    # ── Query ────────────────────────────────────────────────────────────
+
+    def query(self, filters=None, sort=None, descending=True, limit=50, columns=None,
+              where=None, sort_values=None):
+        """Filter, sort and limit the universe.
+
+        Args:
+            filters: list of {"field", "op", "value"}; op is one of
+                     <, <=, >, >=, ==, !=, between (value = [low, high]);
+                     for field "sector": ==, !=, in, not_in
+            sort: metric to sort by (missing values always last); None keeps
+                  ticker order
+            descending: sort direction
+            limit: maximum rows returned
+            columns: metrics to include per row (default: all)
+            where: optional extra boolean mask (e.g. a compiled expression)
+            sort_values: optional float array to sort by instead of a metric;
+                         returned per row as 'score'
+
+        Returns:
+            dict with count (total matches) and rows (list of dicts)
+        """
+        mask = self.mask(filters)
+        if where is not None:
+            mask &= where
+
+        if sort_values is not None:
+            idx = np.flatnonzero(mask)
+            vals = sort_values[idx]
+            finite = np.isfinite(vals)
+            keyed = np.where(finite, -vals if descending else vals, np.inf)
+            idx = idx[np.argsort(keyed, kind='stable')]
+        elif sort is not None:
+            if sort not in self.columns:
+                raise ValueError(f"Unknown sort field: {sort}")
+            order = self._order[sort]
+            if descending:
+                order = order[::-1]
+            idx = order[mask[order]]
+            missing = np.flatnonzero(mask & ~np.isfinite(self.columns[sort]))
+            if len(idx) < limit:
+                idx = np.concatenate([idx, missing])
+        else:
+            idx = np.flatnonzero(mask)
+        idx = idx[:limit]
+
+        cols = columns or self.fields
+        unknown = [c for c in cols if c not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown field: {unknown[0]}")
+
+        # Materialize column-wise (NaN -> None) and zip into row dicts once
+        out = {'ticker': self.tickers[idx].tolist(), 'sector': self.sectors[idx].tolist()}
+        for label, arr in self.labels.items():
+            out[label] = arr[idx].tolist()
+        for c in cols:
+            vals = self.columns[c][idx]
+            out[c] = np.where(np.isnan(vals), None, vals).tolist()
+        if sort_values is not None:
+            vals = sort_values[idx]
+            out['score'] = np.where(np.isfinite(vals), vals, None).tolist()
+        keys = list(out)
+        rows = [dict(zip(keys, vals)) for vals in zip(*out.values())]
+        return {'count': int(mask.sum()), 'rows': rows}
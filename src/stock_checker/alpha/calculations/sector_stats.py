@@ -0,0 +1,204 @@
+"""Per-sector ratio distributions with constant-time percentile lookups.
+
+Each (sector, metric) distribution is summarized by its count, mean,
+quartiles and a fixed grid of GRID_POINTS quantiles (0th..100th
+percentile). A value's percentile rank within its sector is then a
+searchsorted/interp over that fixed-size grid — independent of how many
+tickers the universe holds — so it is cheap enough to compute on every
+score and valuation request.
+
+Distributions are built from the scoring panel (batch_scores.PANEL_COLUMNS
+plus a 'sector' column of industry keys). The universe-wide distribution is
+stored under ALL_SECTORS and used when a sector has too few members.
+Valuation multiples only count when positive, as in the valuation score.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.calculations.batch_scores import PANEL_COLUMNS, VALUATION_METRICS
+
+GRID_POINTS = 101
+ALL_SECTORS = '_all'
+MIN_COUNT = 5
+
+_GRID_Q = np.linspace(0.0, 1.0, GRID_POINTS)
+_GRID_PCT = _GRID_Q * 100
+
+DISTRIBUTION_COLUMNS = ['sector', 'metric', 'count', 'mean', 'median', 'q1', 'q3', 'grid']
+
+
+def _panel_arrays(panel, metrics):
+    """(values, sectors): finite float matrix (NaN elsewhere) and sector keys."""
+    values = panel.reindex(columns=metrics).apply(pd.to_numeric, errors='coerce')
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    values[~np.isfinite(values)] = np.nan
+    for j, metric in enumerate(metrics):
+        if metric in VALUATION_METRICS:
+            values[values[:, j] <= 0, j] = np.nan
+    sectors = panel['sector'] if 'sector' in panel.columns else pd.Series(None, index=panel.index)
+    return values, sectors.fillna('unknown').to_numpy(dtype=object)
+
+
+def _summarize(values):
+    """Distribution rows for a (tickers × metrics) block; NaN cells ignored."""
+    counts = np.isfinite(values).sum(axis=0)
+    with warnings.catch_warnings():
+        # All-NaN columns are expected (and dropped by the caller)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        grid = np.nanquantile(values, _GRID_Q, axis=0)   # (GRID_POINTS × metrics)
+        mean = np.nanmean(values, axis=0)
+    return counts, mean, grid
+
+
+def calc_sector_distributions(panel, metrics=None, min_count=MIN_COUNT):
+    """Summarize each metric's distribution per sector and across the universe.
+
+    Args:
+        panel: DataFrame indexed by ticker with metric columns and 'sector'
+        metrics: columns to summarize (default: the PANEL_COLUMNS present)
+        min_count: sectors with fewer finite values for a metric are skipped
+                   (lookups fall back to the universe distribution)
+
+    Returns:
+        DataFrame with DISTRIBUTION_COLUMNS; 'grid' holds GRID_POINTS quantiles
+    """
+    if panel is None or panel.empty:
+        return pd.DataFrame(columns=DISTRIBUTION_COLUMNS)
+    if metrics is None:
+        metrics = [c for c in PANEL_COLUMNS if c in panel.columns]
+    if not metrics:
+        return pd.DataFrame(columns=DISTRIBUTION_COLUMNS)
+
+    values, sectors = _panel_arrays(panel, metrics)
+    groups = [(ALL_SECTORS, np.ones(len(values), dtype=bool))]
+    groups += [(s, sectors == s) for s in sorted(set(sectors))]
+
+    rows = []
+    for sector, mask in groups:
+        counts, mean, grid = _summarize(values[mask])
+        for j, metric in enumerate(metrics):
+            if counts[j] < min_count:
+                continue
+            g = grid[:, j]
+            rows.append({
+                'sector': sector, 'metric': metric, 'count': int(counts[j]),
+                'mean': float(mean[j]), 'median': float(g[50]),
+                'q1': float(g[25]), 'q3': float(g[75]), 'grid': g.copy(),
+            })
+    return pd.DataFrame(rows, columns=DISTRIBUTION_COLUMNS)
+
+
+def _rank(grid, values):
+    """Percentile rank (0-100) of values against a quantile grid.
+
+    Values tied with a run of equal grid points get the middle of the run.
+    """
+    # np.interp lands on the last of equal xp points; the mirrored call
+    # finds the first, so their mean is the mid-rank
+    hi = np.interp(values, grid, _GRID_PCT)
+    lo = np.interp(-values, -grid[::-1], _GRID_PCT[::-1])
+    return (lo + hi) / 2
+
+
+class SectorStats:
+    """Lookup table over calc_sector_distributions output."""
+
+    def __init__(self, distributions=None, as_of=None):
+        self.as_of = as_of
+        self._grids = {}
+        self._summary = {}
+        if distributions is None:
+            return
+        for row in distributions.itertuples(index=False):
+            key = (row.sector, row.metric)
+            self._grids[key] = np.asarray(row.grid, dtype=np.float64)
+            self._summary[key] = {
+                'count': int(row.count),
+                'mean': float(row.mean),
+                'median': float(row.median),
+                'q1': float(row.q1),
+                'q3': float(row.q3),
+            }
+
+    def __bool__(self):
+        return bool(self._grids)
+
+    @property
+    def sectors(self):
+        return sorted({s for s, _ in self._grids if s != ALL_SECTORS})
+
+    def metrics(self, sector):
+        """Metrics with a distribution of their own for sector."""
+        return sorted(m for s, m in self._grids if s == sector)
+
+    def _key(self, sector, metric):
+        if (sector, metric) in self._grids:
+            return sector, metric
+        if (ALL_SECTORS, metric) in self._grids:
+            return ALL_SECTORS, metric
+        return None
+
+    def summary(self, sector, metric):
+        """Distribution summary with the sector actually used, or None."""
+        key = self._key(sector, metric)
+        if key is None:
+            return None
+        return {'sector': key[0], 'metric': metric, **self._summary[key]}
+
+    def percentile(self, sector, metric, value):
+        """Percentile rank (0-100) of value within its sector, or None."""
+        if value is None:
+            return None
+        value = float(value)
+        key = self._key(sector, metric)
+        if key is None or not np.isfinite(value) or (metric in VALUATION_METRICS and value <= 0):
+            return None
+        return float(_rank(self._grids[key], np.array([value]))[0])
+
+    def percentile_frame(self, panel, metrics=None):
+        """Percentile ranks for every panel row, vectorized per sector.
+
+        Args:
+            panel: DataFrame with metric columns and 'sector'
+            metrics: columns to rank (default: the PANEL_COLUMNS present)
+
+        Returns:
+            DataFrame (same index as panel) of percentiles, NaN when unavailable
+        """
+        if metrics is None:
+            metrics = [c for c in PANEL_COLUMNS if c in panel.columns]
+        values, sectors = _panel_arrays(panel, metrics)
+        out = np.full(values.shape, np.nan)
+        for sector in set(sectors):
+            rows = sectors == sector
+            for j, metric in enumerate(metrics):
+                key = self._key(sector, metric)
+                if key is None:
+                    continue
+                col = values[rows, j]
+                ok = np.isfinite(col)
+                ranked = np.full(col.shape, np.nan)
+                ranked[ok] = _rank(self._grids[key], col[ok])
+                out[rows, j] = ranked
+        return pd.DataFrame(out, index=panel.index, columns=metrics)
+
+
+def relative_valuation_scores(percentiles):
+    """Sector-relative valuation score (0-100, cheaper is higher) per row.
+
+    The mean of 100 - percentile over the valuation multiples ranked for
+    each row; NaN where none are available.
+
+    Args:
+        percentiles: SectorStats.percentile_frame() output
+    """
+    cols = [c for c in VALUATION_METRICS if c in percentiles.columns]
+    if not cols:
+        return pd.Series(np.nan, index=percentiles.index)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        score = np.nanmean(100.0 - percentiles[cols].to_numpy(dtype=np.float64), axis=1)
+    return pd.Series(score, index=percentiles.index)
@@ -0,0 +1,166 @@
+"""Valuation synthesis: DCF, PBV, DDM and ROE-growth fair values for many tickers.
+
+calc_model_values runs the four valuation.py models as column operations
+over an inputs table (one row per ticker), with the per-ticker rules of
+calc_dcf / calc_pbv / calc_ddm / calc_roe_sustainable_growth kept as masks
+(a model is NaN where its scalar version returns an error). Assumptions
+come from SYNTHESIS_PARAMS per sector.
+
+calc_valuation_synthesis blends the positive model values with the sector's
+SECTOR_MODEL_WEIGHTS, renormalized over the models available for each
+ticker, into one weighted fair value — the same blend as the Valuation
+Synthesis card.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.calculations.valuation import calc_dcf_grid
+
+MODELS = ('dcf', 'pbv', 'ddm', 'roe')
+
+# Model weights per industry key; banks lean on book value, growth sectors on DCF
+SECTOR_MODEL_WEIGHTS = {
+    'perbankan':             {'dcf': 0.10, 'pbv': 0.60, 'ddm': 0.20, 'roe': 0.10},
+    'telekomunikasi':        {'dcf': 0.40, 'pbv': 0.15, 'ddm': 0.25, 'roe': 0.20},
+    'energi_pertambangan':   {'dcf': 0.50, 'pbv': 0.15, 'ddm': 0.15, 'roe': 0.20},
+    'consumer_goods':        {'dcf': 0.35, 'pbv': 0.25, 'ddm': 0.20, 'roe': 0.20},
+    'manufaktur':            {'dcf': 0.40, 'pbv': 0.25, 'ddm': 0.15, 'roe': 0.20},
+    'properti_konstruksi':   {'dcf': 0.30, 'pbv': 0.45, 'ddm': 0.10, 'roe': 0.15},
+    'logistik_transportasi': {'dcf': 0.40, 'pbv': 0.20, 'ddm': 0.15, 'roe': 0.25},
+    'healthcare':            {'dcf': 0.40, 'pbv': 0.20, 'ddm': 0.15, 'roe': 0.25},
+    'teknologi':             {'dcf': 0.50, 'pbv': 0.15, 'ddm': 0.10, 'roe': 0.25},
+    '_default':              {'dcf': 0.35, 'pbv': 0.25, 'ddm': 0.20, 'roe': 0.20},
+}
+
+# Sector WACC / growth defaults: BI rate (~5.75%) + equity risk premium
+# (5-8%) + sector beta adjustment
+SYNTHESIS_PARAMS = {
+    'perbankan':             {'wacc': 0.12, 'growth_rate': 0.08, 'terminal_growth': 0.04},
+    'telekomunikasi':        {'wacc': 0.11, 'growth_rate': 0.06, 'terminal_growth': 0.03},
+    'energi_pertambangan':   {'wacc': 0.14, 'growth_rate': 0.05, 'terminal_growth': 0.02},
+    'consumer_goods':        {'wacc': 0.11, 'growth_rate': 0.09, 'terminal_growth': 0.04},
+    'manufaktur':            {'wacc': 0.12, 'growth_rate': 0.07, 'terminal_growth': 0.03},
+    'properti_konstruksi':   {'wacc': 0.12, 'growth_rate': 0.08, 'terminal_growth': 0.03},
+    'logistik_transportasi': {'wacc': 0.12, 'growth_rate': 0.07, 'terminal_growth': 0.03},
+    'healthcare':            {'wacc': 0.12, 'growth_rate': 0.10, 'terminal_growth': 0.04},
+    'teknologi':             {'wacc': 0.14, 'growth_rate': 0.20, 'terminal_growth': 0.05},
+    '_default':              {'wacc': 0.11, 'growth_rate': 0.10, 'terminal_growth': 0.03},
+}
+
+# Inputs table columns (one row per ticker); roe and payout are decimals
+INPUT_COLUMNS = ['sector', 'price', 'fcf', 'shares', 'net_debt', 'roe', 'bvps',
+                 'dividend', 'eps', 'payout']
+
+PROJECTION_YEARS = 5
+VERDICT_BAND = 5.0   # |upside| % within which a ticker counts as fair value
+
+
+def sector_params(sectors):
+    """(tickers × wacc/growth_rate/terminal_growth) assumptions for each sector key."""
+    rows = [SYNTHESIS_PARAMS.get(s, SYNTHESIS_PARAMS['_default']) for s in sectors]
+    return pd.DataFrame(rows, index=getattr(sectors, 'index', None),
+                        columns=['wacc', 'growth_rate', 'terminal_growth'], dtype=np.float64)
+
+
+def sector_weights(sectors):
+    """(tickers × MODELS) raw model weights for each sector key."""
+    rows = [SECTOR_MODEL_WEIGHTS.get(s, SECTOR_MODEL_WEIGHTS['_default']) for s in sectors]
+    return pd.DataFrame(rows, index=getattr(sectors, 'index', None), columns=list(MODELS),
+                        dtype=np.float64)
+
+
+def _col(inputs, name):
+    values = pd.to_numeric(inputs[name], errors='coerce') if name in inputs else np.nan
+    return np.asarray(np.broadcast_to(values, (len(inputs),)), dtype=np.float64)
+
+
+def calc_model_values(inputs, params=None):
+    """Intrinsic value per share of every model for every ticker.
+
+    Args:
+        inputs: DataFrame indexed by ticker with INPUT_COLUMNS (missing -> NaN)
+        params: per-ticker wacc / growth_rate / terminal_growth
+                (default: sector_params(inputs['sector']))
+
+    Returns:
+        DataFrame (same index) with one column per model, rounded like the
+        scalar models; NaN where a model does not apply
+    """
+    if params is None:
+        params = sector_params(inputs['sector'])
+    wacc = params['wacc'].to_numpy(dtype=np.float64)
+    growth = params['growth_rate'].to_numpy(dtype=np.float64)
+    tg = params['terminal_growth'].to_numpy(dtype=np.float64)
+
+    fcf, shares, net_debt = _col(inputs, 'fcf'), _col(inputs, 'shares'), _col(inputs, 'net_debt')
+    roe, bvps = _col(inputs, 'roe'), _col(inputs, 'bvps')
+    dividend, eps, payout = _col(inputs, 'dividend'), _col(inputs, 'eps'), _col(inputs, 'payout')
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # DCF (calc_dcf): equity / shares when shares > 0
+        equity = calc_dcf_grid(fcf, growth, tg, wacc, PROJECTION_YEARS)['enterprise_value']
+        equity = equity - np.nan_to_num(net_debt)
+        dcf = np.where(shares > 0, equity / shares, np.nan)
+
+        # PBV (calc_pbv): cost of equity = WACC
+        pbv = np.where((wacc > tg) & (bvps > 0),
+                       (roe - tg) / (wacc - tg) * bvps, np.nan)
+
+        # DDM (calc_ddm): dividends grow at the terminal rate
+        ddm = np.where((dividend > 0) & (wacc > tg), dividend * (1 + tg) / (wacc - tg), np.nan)
+
+        # ROE sustainable growth: payout missing -> 0, clipped to [0, 1]
+        retention = 1 - np.clip(np.nan_to_num(payout), 0.0, 1.0)
+        g = roe * retention
+        roe_model = np.where(wacc > g, eps * (1 + g) / (wacc - g), np.nan)
+
+    values = pd.DataFrame({'dcf': dcf, 'pbv': pbv, 'ddm': ddm, 'roe': roe_model},
+                          index=inputs.index)
+    values = values.where(np.isfinite(values))
+    return values.map(lambda v: v if v != v else round(v, 2))
+
+
+def calc_valuation_synthesis(inputs, params=None, weights=None):
+    """Weighted fair value per ticker from the positive model values.
+
+    Args:
+        inputs: calc_model_values inputs
+        params: per-ticker assumptions (default: by sector)
+        weights: per-ticker raw model weights (default: by sector)
+
+    Returns:
+        dict with values (model intrinsic values), weights (normalized over the
+        available models) and summary (fair_value, upside_pct, verdict) frames
+    """
+    if params is None:
+        params = sector_params(inputs['sector'])
+    if weights is None:
+        weights = sector_weights(inputs['sector'])
+    values = calc_model_values(inputs, params)
+
+    v = values.to_numpy(dtype=np.float64)
+    available = np.isfinite(v) & (v > 0)
+    raw = np.where(available, weights.reindex(columns=list(MODELS)).to_numpy(dtype=np.float64), 0.0)
+    total = raw.sum(axis=1, keepdims=True)
+    n_available = available.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norm = np.where(total > 0, raw / total, np.where(available, 1.0 / n_available, 0.0))
+        fair = np.where(n_available[:, 0] > 0, (np.where(available, v, 0.0) * norm).sum(axis=1), np.nan)
+        price = _col(inputs, 'price')
+        upside = np.where(price > 0, (fair - price) / price * 100, np.nan)
+
+    verdict = np.where(upside > VERDICT_BAND, 'undervalued',
+                       np.where(upside < -VERDICT_BAND, 'overvalued', 'fair_value'))
+    summary = pd.DataFrame({
+        'fair_value': fair,
+        'upside_pct': upside,
+        'verdict': np.where(np.isnan(upside), None, verdict),
+        'models_used': n_available[:, 0],
+    }, index=inputs.index)
+    return {
+        'values': values,
+        'weights': pd.DataFrame(np.where(available, norm, np.nan), index=inputs.index,
+                                columns=list(MODELS)),
+        'summary': summary,
+    }
@@ -2,6 +2,11 @@
 
 import math
 
+import numpy as np
+
+# Upper bound on sensitivity grid cells (e.g. 100 × 100 × 100)
+MAX_GRID_CELLS = 1_000_000
+
 
 def calc_dcf(fcf_base, growth_rate, terminal_growth, wacc, projection_years=5,
              shares_outstanding=None, net_debt=0):
@@ -76,6 +81,75 @@ def calc_scenario(fcf_base, scenarios, wacc, terminal_growth, projection_years=5
     return results
 
 
+def calc_dcf_grid(fcf_base, growth_rate, terminal_growth, wacc, projection_years=5,
+                  shares_outstanding=None, net_debt=0):
+    """calc_dcf over arrays of base FCF, growth, terminal growth and WACC at once.
+
+    The four arguments broadcast against each other (e.g. wacc[:, None]
+    and growth[None, :] give a WACC × growth grid; add a third axis for
+    terminal growth, or pass one sampled FCF per path with fixed rates). The loop runs over projection years only; each step
+    discounts the whole grid. Projected and discounted FCFs are rounded to
+    cents per year as in calc_dcf, so rounded intrinsic_per_share matches it
+    to the cent. Enterprise and equity values only agree to floating-point
+    precision (off by a cent or more around 1e14) because the terms are
+    summed in a different order.
+
+    Returns:
+        dict of arrays in the broadcast shape: enterprise_value, equity_value,
+        intrinsic_per_share (None without shares) and valid (wacc > terminal
+        growth); invalid cells are NaN
+    """
+    _, _, tg, w = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64)
+                                        for x in (fcf_base, growth_rate, terminal_growth, wacc)))
+    shape = w.shape
+    fcf_base = np.asarray(fcf_base, dtype=np.float64)
+    growth = np.asarray(growth_rate, dtype=np.float64)
+    discount = np.asarray(wacc, dtype=np.float64)
+
+    sum_pv = np.zeros(shape)
+    fcf = np.zeros(shape)
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        for year in range(1, projection_years + 1):
+            raw = fcf_base * (1 + growth) ** year
+            fcf = np.round(raw, 2)
+            sum_pv += np.round(raw / (1 + discount) ** year, 2)
+
+        valid = w > tg
+        terminal_value = fcf * (1 + tg) / (w - tg)
+        pv_terminal = terminal_value / (1 + w) ** projection_years
+        enterprise_value = np.where(valid, sum_pv + pv_terminal, np.nan)
+    equity_value = enterprise_value - net_debt
+
+    per_share = None
+    if shares_outstanding and shares_outstanding > 0:
+        per_share = equity_value / shares_outstanding
+    return {
+        "enterprise_value": enterprise_value,
+        "equity_value": equity_value,
+        "intrinsic_per_share": per_share,
+        "valid": valid,
+    }
+
+
+def _grid_values(grid):
+    """Intrinsic value per share if available, else equity value."""
+    values = grid["intrinsic_per_share"]
+    return grid["equity_value"] if values is None else values
+
+
+def _rounded_list(values):
+    """Nested lists rounded like calc_dcf (round(x, 2)), None where NaN."""
+    flat = [None if v != v else round(v, 2) for v in values.ravel().tolist()]
+    return np.array(flat, dtype=object).reshape(values.shape).tolist()
+
+
+def _compact(values):
+    """Flat list rounded with np.round (fast for large cubes), None where NaN."""
+    flat = np.round(values.ravel(), 2).astype(object)
+    flat[~np.isfinite(values.ravel())] = None
+    return flat.tolist()
+
+
 def calc_sensitivity(fcf_base, wacc_range, growth_range, terminal_growth,
                      projection_years=5, shares_outstanding=None, net_debt=0):
     """2D sensitivity matrix: WACC vs Growth Rate.
@@ -89,21 +163,14 @@ def calc_sensitivity(fcf_base, wacc_range, growth_range, terminal_growth,
     Returns:
         dict with wacc_labels, growth_labels, and matrix (2D list of intrinsic values)
     """
-    matrix = []
-    for wacc in wacc_range:
-        row = []
-        for growth in growth_range:
-            result = calc_dcf(
-                fcf_base, growth, terminal_growth, wacc,
-                projection_years, shares_outstanding, net_debt
-            )
-            if "error" in result:
-                row.append(None)
-            elif "intrinsic_per_share" in result:
-                row.append(result["intrinsic_per_share"])
-            else:
-                row.append(result["equity_value"])
-        matrix.append(row)
+    wacc = np.asarray(wacc_range, dtype=np.float64)
+    growth = np.asarray(growth_range, dtype=np.float64)
+    if fcf_base is None:
+        matrix = [[None] * growth.size for _ in range(wacc.size)]
+    else:
+        grid = calc_dcf_grid(fcf_base, growth[None, :], terminal_growth, wacc[:, None],
+                             projection_years, shares_outstanding, net_debt)
+        matrix = _rounded_list(_grid_values(grid))
 
     return {
         "wacc_labels": [f"{w*100:.1f}%" for w in wacc_range],
@@ -112,6 +179,136 @@ def calc_sensitivity(fcf_base, wacc_range, growth_range, terminal_growth,
     }
 
 
+def calc_sensitivity_cube(fcf_base, wacc_range, growth_range, terminal_range,
+                          projection_years=5, shares_outstanding=None, net_debt=0):
+    """3D sensitivity cube: WACC × growth × terminal growth, as compact arrays.
+
+    Returns:
+        dict with the three axes, shape, values (flat, row-major, 2 dp,
+        None where WACC <= terminal growth) and min/max for heatmap scaling
+    """
+    wacc = np.asarray(wacc_range, dtype=np.float64)
+    growth = np.asarray(growth_range, dtype=np.float64)
+    terminal = np.asarray(terminal_range, dtype=np.float64)
+    shape = (wacc.size, growth.size, terminal.size)
+    if fcf_base is None:
+        return {"error": "Free Cash Flow data not available"}
+    if math.prod(shape) > MAX_GRID_CELLS:
+        return {"error": f"Grid too large: at most {MAX_GRID_CELLS:,} cells"}
+
+    grid = calc_dcf_grid(fcf_base, growth[None, :, None], terminal[None, None, :],
+                         wacc[:, None, None], projection_years, shares_outstanding, net_debt)
+    values = _grid_values(grid)
+    finite = values[np.isfinite(values)]
+    return {
+        "wacc": wacc.tolist(),
+        "growth": growth.tolist(),
+        "terminal_growth": terminal.tolist(),
+        "shape": list(shape),
+        "values": _compact(values),
+        "min": round(float(finite.min()), 2) if finite.size else None,
+        "max": round(float(finite.max()), 2) if finite.size else None,
+    }
+
+
+# Search brackets for the reverse DCF (decimal rates)
+IMPLIED_GROWTH_BOUNDS = (-0.5, 1.0)
+IMPLIED_WACC_MAX = 1.0
+
+
+def _bracketed_root(f, lo, hi, tol=1e-7, max_iter=100):
+    """Vectorized Illinois (modified regula falsi) root search.
+
+    f maps an array of x to residuals; lo/hi are per-element brackets.
+    Elements whose residuals at lo and hi share a sign have no root in
+    the bracket and come back NaN.
+    """
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=np.float64),
+                                 np.asarray(hi, dtype=np.float64))
+    lo, hi = lo.copy(), hi.copy()
+    f_lo, f_hi = f(lo), f(hi)
+    with np.errstate(invalid='ignore'):
+        bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi))
+    x = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, np.nan))
+    active = bracketed & np.isnan(x)
+    side = np.zeros(lo.shape, dtype=np.int8)   # last endpoint replaced: -1 lo, +1 hi
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        with np.errstate(invalid='ignore', divide='ignore'):
+            guess = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        guess = np.where(np.isfinite(guess), guess, (lo + hi) / 2)
+        f_guess = f(guess)
+        done = active & ((f_guess == 0) | (np.abs(hi - lo) < tol))
+        x[done] = guess[done]
+        active &= ~done
+
+        move_hi = active & (np.sign(f_guess) == np.sign(f_hi))
+        move_lo = active & ~move_hi
+        # Illinois step: halve the residual kept on the side that did not move twice
+        f_lo = np.where(move_hi & (side == 1), f_lo / 2, f_lo)
+        f_hi = np.where(move_lo & (side == -1), f_hi / 2, f_hi)
+        hi, f_hi = np.where(move_hi, guess, hi), np.where(move_hi, f_guess, f_hi)
+        lo, f_lo = np.where(move_lo, guess, lo), np.where(move_lo, f_guess, f_lo)
+        side = np.where(move_hi, 1, np.where(move_lo, -1, side)).astype(np.int8)
+        # Stop when successive guesses agree
+        x = np.where(active & (np.abs(hi - lo) < tol), guess, x)
+        active &= np.isnan(x)
+
+    x[active] = ((lo + hi) / 2)[active]
+    return x
+
+
+def calc_implied_growth(fcf_base, enterprise_value, wacc=0.10, terminal_growth=0.03,
+                        projection_years=5, bounds=IMPLIED_GROWTH_BOUNDS):
+    """FCF growth rate at which the DCF enterprise value equals the market's.
+
+    All arguments broadcast, so a whole watchlist or universe is solved in
+    one call. Enterprise value is market cap + net debt.
+
+    Returns:
+        array of implied growth rates (decimal); NaN when FCF is not positive,
+        WACC <= terminal growth, or no rate within bounds reproduces the value
+    """
+    fcf = np.asarray(fcf_base, dtype=np.float64)
+    target = np.asarray(enterprise_value, dtype=np.float64)
+    ok = (fcf > 0) & (target > 0) & (np.asarray(wacc) > np.asarray(terminal_growth))
+    fcf, target = np.where(ok, fcf, np.nan), np.where(ok, target, np.nan)
+
+    def residual(g):
+        ev = calc_dcf_grid(fcf, g, terminal_growth, wacc, projection_years)["enterprise_value"]
+        return ev - target
+
+    lo, hi = bounds
+    return _bracketed_root(residual, np.full(np.broadcast(fcf, target).shape, lo), hi)
+
+
+def calc_implied_wacc(fcf_base, enterprise_value, growth_rate=0.10, terminal_growth=0.03,
+                      projection_years=5, upper=IMPLIED_WACC_MAX):
+    """Discount rate at which the DCF enterprise value equals the market's.
+
+    Searched between just above terminal growth and upper; broadcasts like
+    calc_implied_growth.
+
+    Returns:
+        array of implied WACCs (decimal); NaN when FCF is not positive or no
+        rate in the bracket reproduces the value
+    """
+    fcf = np.asarray(fcf_base, dtype=np.float64)
+    target = np.asarray(enterprise_value, dtype=np.float64)
+    ok = (fcf > 0) & (target > 0)
+    fcf, target = np.where(ok, fcf, np.nan), np.where(ok, target, np.nan)
+    tg = np.asarray(terminal_growth, dtype=np.float64)
+
+    def residual(w):
+        ev = calc_dcf_grid(fcf, growth_rate, terminal_growth, w, projection_years)["enterprise_value"]
+        return ev - target
+
+    shape = np.broadcast(fcf, target, tg).shape
+    return _bracketed_root(residual, np.broadcast_to(tg + 1e-6, shape), np.full(shape, upper))
+
+
 def calc_pbv(roe, book_value_per_share, cost_of_equity=0.10, terminal_growth=0.05):
     """PBV (Justified Price-to-Book) valuation model. Best for banks/financials.
 
@@ -0,0 +1,108 @@
+"""Flask CLI commands for Alpha maintenance jobs (``flask alpha ...``)."""
+
+import json
+from pathlib import Path
+
+import click
+from flask.cli import AppGroup
+
+alpha_cli = AppGroup("alpha", help="Stock Alpha maintenance jobs.")
+
+
+def _load_json(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+@alpha_cli.command("universe-refresh")
+@click.option("--file", "file_path", type=click.Path(exists=True, dir_okay=False),
+              help="JSON list of listings (default: download from IDX).")
+@click.option("--keep-missing", is_flag=True, help="Do not deactivate tickers absent from the set.")
+def universe_refresh_cmd(file_path, keep_missing):
+    """Bulk-refresh the IDX universe registry."""
+    from stock_checker.alpha.services.universe import refresh_universe
+
+    listings = None
+    if file_path:
+        data = _load_json(file_path)
+        listings = data.get("data", data) if isinstance(data, dict) else data
+    result = refresh_universe(listings, deactivate_missing=not keep_missing)
+    click.echo(f"Universe: {result['total']} listings, {result['added']} added, "
+               f"{result['deactivated']} deactivated")
+
+
+@alpha_cli.command("index-constituents")
+@click.argument("index_code")
+@click.argument("file_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--as-of", help="Effective date (YYYY-MM-DD, default today).")
+def index_constituents_cmd(index_code, file_path, as_of):
+    """Record INDEX_CODE constituents from a JSON list of tickers (or {"tickers": [...]})."""
+    from stock_checker.alpha.services.universe import record_index_constituents
+
+    data = _load_json(file_path)
+    tickers = data.get("tickers", []) if isinstance(data, dict) else data
+    result = record_index_constituents(index_code, tickers, as_of)
+    click.echo(f"{result['index_code']} as of {result['as_of']}: {result['members']} members, "
+               f"+{len(result['added'])} / -{len(result['removed'])}")
+
+
+@alpha_cli.command("score-universe")
+@click.option("--index", "index_code", help="Only score members of this index (e.g. LQ45).")
+@click.option("--industry", "industry_key", help="Only score this industry key.")
+@click.option("--batch-size", default=50, show_default=True, help="Tickers per scoring batch.")
+def score_universe_cmd(index_code, industry_key, batch_size):
+    """Score registered tickers and record the snapshot in the score history."""
+    from stock_checker.alpha.services.scores import get_scores_batch
+    from stock_checker.alpha.services.universe import universe_tickers
+
+    tickers = universe_tickers(industry_key=industry_key, index_code=index_code)
+    failed = 0
+    for start in range(0, len(tickers), batch_size):
+        results = get_scores_batch(tickers[start:start + batch_size], record=True)
+        failed += sum(1 for r in results if "error" in r)
+    click.echo(f"Scored {len(tickers) - failed}/{len(tickers)} tickers")
+
+
+@alpha_cli.command("fundamentals-refresh")
+@click.option("--index", "index_code", help="Only refresh members of this index (e.g. LQ45).")
+@click.option("--quarterly", is_flag=True, help="Refresh quarterly statements instead of annual.")
+@click.option("--force", is_flag=True, help="Refetch even if the stored slice is fresh.")
+def fundamentals_refresh_cmd(index_code, quarterly, force):
+    """Load statements for registered tickers into the fundamentals warehouse."""
+    from datetime import timedelta
+
+    from stock_checker.alpha.services.fundamentals import ensure_fundamentals, FRESH_FOR
+    from stock_checker.alpha.services.universe import universe_tickers
+
+    tickers = universe_tickers(index_code=index_code)
+    result = ensure_fundamentals(tickers, freq="quarterly" if quarterly else "annual",
+                                 max_age=timedelta(0) if force else FRESH_FOR)
+    click.echo(f"Refreshed {len(result['refreshed'])} tickers, "
+               f"{len(result['failed'])} failed, {len(tickers)} in scope")
+
+
+@alpha_cli.command("sector-stats")
+@click.option("--as-of", "as_of", help="Store the set under this date (YYYY-MM-DD); default today.")
+def sector_stats_cmd(as_of):
+    """Recompute per-sector ratio distributions from the latest score snapshots.
+
+    Run nightly after score-universe.
+    """
+    from datetime import date
+
+    from stock_checker.alpha.services.sector_stats import refresh_sector_stats
+
+    result = refresh_sector_stats(date.fromisoformat(as_of) if as_of else None)
+    click.echo(f"Sector stats as of {result['as_of']}: {result['rows']} distributions, "
+               f"{len(result['sectors'])} sectors, {result['tickers']} tickers")
+
+
+@alpha_cli.command("red-flags")
+@click.option("--index", "index_code", help="Only scan members of this index (e.g. LQ45).")
+def red_flags_cmd(index_code):
+    """Scan stored fundamentals for red flags and store them per ticker and period."""
+    from stock_checker.alpha.services.red_flags import scan_red_flags
+    from stock_checker.alpha.services.universe import universe_tickers
+
+    result = scan_red_flags(universe_tickers(index_code=index_code) if index_code else None)
+    counts = ", ".join(f"{n} {s}" for s, n in sorted(result["by_severity"].items())) or "none"
+    click.echo(f"Scanned {result['tickers']} tickers: {result['flagged']} flagged ({counts})")
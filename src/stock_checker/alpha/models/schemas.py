@@ -123,3 +123,243 @@ class ComparisonSession(db.Model):
             "results": json.loads(self.results_json),
             "created_at": self.created_at.isoformat(),
         }
+
+
+class ScoreHistory(db.Model):
+    __tablename__ = "score_history"
+    __table_args__ = (
+        db.UniqueConstraint("ticker", "as_of", name="uq_score_history_ticker_as_of"),
+        db.Index("ix_score_history_as_of", "as_of"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(20), nullable=False, index=True)
+    as_of = db.Column(db.Date, nullable=False)
+    sector = db.Column(db.String(50), default="unknown")
+    quality_score = db.Column(db.Float)
+    valuation_score = db.Column(db.Float)
+    risk_score = db.Column(db.Float)
+    composite_score = db.Column(db.Float)
+    recommendation = db.Column(db.String(20))
+    ratios_json = db.Column(db.Text, nullable=False, default="{}")
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        import json
+        return {
+            "id": self.id,
+            "ticker": self.ticker,
+            "as_of": self.as_of.isoformat(),
+            "sector": self.sector,
+            "quality_score": self.quality_score,
+            "valuation_score": self.valuation_score,
+            "risk_score": self.risk_score,
+            "composite_score": self.composite_score,
+            "recommendation": self.recommendation,
+            "ratios": json.loads(self.ratios_json),
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class WeightProfile(db.Model):
+    __tablename__ = "weight_profile"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    owner = db.Column(db.String(100), default="", index=True)
+    watchlist_id = db.Column(db.Integer, db.ForeignKey("watchlist.id"),
+                             nullable=True, index=True)
+    weights_json = db.Column(db.Text, nullable=False, default="{}")
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        import json
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner": self.owner,
+            "watchlist_id": self.watchlist_id,
+            "weights": json.loads(self.weights_json),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class SavedScreen(db.Model):
+    __tablename__ = "saved_screen"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    expression = db.Column(db.Text, nullable=False)
+    rank_by = db.Column(db.Text, default="")
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "expression": self.expression,
+            "rank_by": self.rank_by,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class UniverseTicker(db.Model):
+    __tablename__ = "universe_ticker"
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(20), nullable=False, unique=True)
+    name = db.Column(db.String(200), default="")
+    idx_sector = db.Column(db.String(100), default="")
+    idx_industry = db.Column(db.String(100), default="")
+    industry_key = db.Column(db.String(50), default="unknown", index=True)
+    board = db.Column(db.String(30), default="", index=True)
+    listing_date = db.Column(db.Date, nullable=True)
+    active = db.Column(db.Boolean, default=True, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "ticker": self.ticker,
+            "name": self.name,
+            "idx_sector": self.idx_sector,
+            "idx_industry": self.idx_industry,
+            "industry_key": self.industry_key,
+            "board": self.board,
+            "listing_date": self.listing_date.isoformat() if self.listing_date else None,
+            "active": self.active,
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class IndexMembership(db.Model):
+    __tablename__ = "index_membership"
+    __table_args__ = (
+        db.UniqueConstraint("index_code", "ticker", "start_date",
+                            name="uq_index_membership_period"),
+        db.Index("ix_index_membership_index_end", "index_code", "end_date"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    index_code = db.Column(db.String(20), nullable=False)
+    ticker = db.Column(db.String(20), nullable=False, index=True)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=True)  # NULL = still a member
+
+    def to_dict(self):
+        return {
+            "index_code": self.index_code,
+            "ticker": self.ticker,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat() if self.end_date else None,
+        }
+
+
+class FundamentalFact(db.Model):
+    """One statement line item value: the long-format fundamentals warehouse."""
+    __tablename__ = "fundamental_fact"
+    __table_args__ = (
+        db.UniqueConstraint("ticker", "statement", "freq", "item", "period_end",
+                            name="uq_fundamental_fact"),
+        db.Index("ix_fundamental_fact_ticker_item", "ticker", "item"),
+        db.Index("ix_fundamental_fact_item_period", "item", "period_end"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(20), nullable=False)
+    statement = db.Column(db.String(20), nullable=False)   # income / balance / cashflow
+    freq = db.Column(db.String(10), nullable=False)        # annual / quarterly
+    item = db.Column(db.String(120), nullable=False)       # canonical line item
+    period_end = db.Column(db.Date, nullable=False)
+    value = db.Column(db.Float, nullable=True)             # NULL = reported as missing
+    position = db.Column(db.Integer, default=0)            # row order in the source statement
+    fetched_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "ticker": self.ticker,
+            "statement": self.statement,
+            "freq": self.freq,
+            "item": self.item,
+            "period_end": self.period_end.isoformat(),
+            "value": self.value,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+        }
+
+
+class FundamentalFetch(db.Model):
+    """Last ingest of one (ticker, statement, freq) slice, including empty fetches."""
+    __tablename__ = "fundamental_fetch"
+    __table_args__ = (
+        db.UniqueConstraint("ticker", "statement", "freq", name="uq_fundamental_fetch"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(20), nullable=False)
+    statement = db.Column(db.String(20), nullable=False)
+    freq = db.Column(db.String(10), nullable=False)
+    rows = db.Column(db.Integer, default=0)
+    fetched_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class SectorDistribution(db.Model):
+    """Nightly per-sector distribution of one scoring ratio (see calculations/sector_stats.py)."""
+    __tablename__ = "sector_distribution"
+    __table_args__ = (
+        db.UniqueConstraint("as_of", "sector", "metric", name="uq_sector_distribution"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    as_of = db.Column(db.Date, nullable=False, index=True)
+    sector = db.Column(db.String(50), nullable=False)      # industry key, or '_all'
+    metric = db.Column(db.String(30), nullable=False)
+    count = db.Column(db.Integer, default=0)
+    mean = db.Column(db.Float)
+    median = db.Column(db.Float)
+    q1 = db.Column(db.Float)
+    q3 = db.Column(db.Float)
+    grid = db.Column(db.LargeBinary, nullable=False)       # float64 quantiles, 0th..100th
+
+    def to_dict(self):
+        return {
+            "as_of": self.as_of.isoformat(),
+            "sector": self.sector,
+            "metric": self.metric,
+            "count": self.count,
+            "mean": self.mean,
+            "median": self.median,
+            "q1": self.q1,
+            "q3": self.q3,
+        }
+
+
+class RedFlag(db.Model):
+    """One red flag raised by the universe scan for a ticker's statement period."""
+    __tablename__ = "red_flag"
+    __table_args__ = (
+        db.UniqueConstraint("ticker", "period_end", "flag_type", "metric", name="uq_red_flag"),
+        db.Index("ix_red_flag_severity", "severity", "is_latest"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(20), nullable=False, index=True)
+    period_end = db.Column(db.Date, nullable=False)
+    is_latest = db.Column(db.Boolean, default=False, nullable=False)   # ticker's latest period
+    flag_type = db.Column(db.String(30), nullable=False)
+    severity = db.Column(db.String(10), nullable=False)     # info / warning / critical
+    metric = db.Column(db.String(30), default="")
+    value = db.Column(db.Float)
+    message = db.Column(db.String(300), default="")
+    scanned_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "ticker": self.ticker,
+            "period_end": self.period_end.isoformat(),
+            "is_latest": self.is_latest,
+            "type": self.flag_type,
+            "severity": self.severity,
+            "metric": self.metric,
+            "value": self.value,
+            "message": self.message,
+            "scanned_at": self.scanned_at.isoformat() if self.scanned_at else None,
+        }
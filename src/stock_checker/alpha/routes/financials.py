@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify
 from stock_checker.alpha.services.financials import get_financial_analysis
+from stock_checker.alpha.services.rollups import get_ttm
 
 bp = Blueprint("alpha_financials", __name__)
 
@@ -21,3 +22,21 @@ def financials():
         return jsonify({"error": "Financial data not found for this ticker"}), 404
     except Exception:
         return jsonify({"error": "Failed to fetch financial data"}), 500
+
+
+@bp.route("/api/financials/ttm", methods=["POST"])
+def financials_ttm():
+    """Latest-quarter TTM / QoQ / YoY per line item, from stored quarterly statements."""
+    data = request.get_json() or {}
+    ticker = (data.get("ticker") or "").strip().upper()
+    items = data.get("items")
+
+    if not ticker:
+        return jsonify({"error": "Ticker is required"}), 400
+    if items is not None and not isinstance(items, list):
+        return jsonify({"error": "items must be a list"}), 400
+
+    try:
+        return jsonify({"ticker": ticker, "items": get_ttm(ticker, items)})
+    except Exception:
+        return jsonify({"error": "Failed to compute quarterly rollups"}), 500
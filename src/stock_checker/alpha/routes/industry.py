@@ -6,6 +6,17 @@ from stock_checker.alpha.services.industry import get_industry_context
 bp = Blueprint('alpha_industry', __name__)
 
 
+def _parse_bool(value, default):
+    """JSON bool or 'true'/'false' string; ValueError otherwise."""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+        return value.strip().lower() == 'true'
+    raise ValueError(value)
+
+
 @bp.route('/api/industry', methods=['POST'])
 def industry():
     data   = request.get_json() or {}
@@ -13,7 +24,17 @@ def industry():
     if not ticker:
         return jsonify({'error': 'ticker required'}), 400
     try:
-        result = get_industry_context(ticker)
+        k = int(data.get('k', 2))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k must be an integer'}), 400
+    if not 1 <= k <= 20:
+        return jsonify({'error': 'k must be between 1 and 20'}), 400
+    try:
+        same_sector = _parse_bool(data.get('same_sector'), True)
+    except ValueError:
+        return jsonify({'error': 'same_sector must be true or false'}), 400
+    try:
+        result = get_industry_context(ticker, k=k, same_sector=same_sector)
         return jsonify(result)
     except Exception:
         return jsonify({'error': 'Failed to fetch industry data'}), 500
@@ -1,13 +1,19 @@
-"""Modelling API routes: DCF, scenario, sensitivity, projection."""
+"""Modelling API routes: DCF, scenario, sensitivity, Monte Carlo, reverse DCF, projections."""
 
 from flask import Blueprint, request, jsonify
 from stock_checker.alpha.services.modelling import (
-    run_dcf, run_scenario, run_sensitivity, run_projection,
-    run_pbv, run_ddm, run_roe_model,
+    run_dcf, run_scenario, run_sensitivity, run_projection, run_projections,
+    run_pbv, run_ddm, run_roe_model, run_monte_carlo, run_reverse_dcf,
+    run_valuation_batch,
 )
+from stock_checker.alpha.services.portfolio import get_watchlist
 
 bp = Blueprint("alpha_modelling", __name__)
 
+MAX_REVERSE_DCF_TICKERS = 200
+MAX_VALUATION_TICKERS = 100
+MAX_PROJECTION_TICKERS = 100
+
 
 @bp.route("/api/model/dcf", methods=["POST"])
 def dcf():
@@ -64,12 +70,92 @@ def sensitivity():
             growth_range=data.get("growth_range"),
             terminal_growth=data.get("terminal_growth", 0.03),
             projection_years=data.get("projection_years", 5),
+            terminal_range=data.get("terminal_range"),
         )
         return jsonify(result)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     except Exception:
         return jsonify({"error": "Failed to run sensitivity analysis"}), 500
 
 
+@bp.route("/api/model/monte-carlo", methods=["POST"])
+def monte_carlo():
+    data = request.get_json()
+    ticker = data.get("ticker", "").strip().upper()
+    if not ticker:
+        return jsonify({"error": "Ticker is required"}), 400
+
+    inputs = {k: data[k] for k in ("growth", "wacc", "terminal_growth", "fcf_margin") if k in data}
+    try:
+        result = run_monte_carlo(
+            ticker,
+            inputs=inputs,
+            n_paths=data.get("n_paths", 100_000),
+            projection_years=data.get("projection_years", 5),
+            correlation=data.get("correlation"),
+            seed=data.get("seed"),
+            bins=data.get("bins", 50),
+        )
+        return jsonify(result)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        return jsonify({"error": "Failed to run Monte Carlo valuation"}), 500
+
+
+@bp.route("/api/model/reverse-dcf", methods=["POST"])
+def reverse_dcf():
+    data = request.get_json()
+    tickers = data.get("tickers") or [data.get("ticker", "")]
+    tickers = [t.strip().upper() for t in tickers if isinstance(t, str) and t.strip()]
+    if not tickers:
+        return jsonify({"error": "Ticker is required"}), 400
+    if len(tickers) > MAX_REVERSE_DCF_TICKERS:
+        return jsonify({"error": f"At most {MAX_REVERSE_DCF_TICKERS} tickers per request"}), 400
+
+    try:
+        results = run_reverse_dcf(
+            tickers,
+            solve_for=data.get("solve_for", "growth"),
+            growth_rate=data.get("growth_rate", 0.10),
+            wacc=data.get("wacc", 0.10),
+            terminal_growth=data.get("terminal_growth", 0.03),
+            projection_years=data.get("projection_years", 5),
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        return jsonify({"error": "Failed to run reverse DCF"}), 500
+    if "ticker" in data and "tickers" not in data:
+        return jsonify(results[0])
+    return jsonify({"results": results})
+
+
+@bp.route("/api/model/valuation-batch", methods=["POST"])
+def valuation_batch():
+    data = request.get_json()
+    if data.get("watchlist_id") is not None:
+        tickers = [i["ticker"] for i in get_watchlist(data["watchlist_id"])["items"]]
+    else:
+        tickers = data.get("tickers") or []
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers
+                                 if isinstance(t, str) and t.strip()))
+    if not tickers:
+        return jsonify({"error": "Tickers or watchlist_id is required"}), 400
+    if len(tickers) > MAX_VALUATION_TICKERS:
+        return jsonify({"error": f"At most {MAX_VALUATION_TICKERS} tickers per request"}), 400
+
+    overrides = {k: data[k] for k in ("wacc", "growth_rate", "terminal_growth") if k in data}
+    try:
+        results = run_valuation_batch(tickers, overrides=overrides)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        return jsonify({"error": "Failed to run batch valuation"}), 500
+    return jsonify({"results": results})
+
+
 @bp.route("/api/model/projection", methods=["POST"])
 def projection():
     data = request.get_json()
@@ -82,12 +168,42 @@ def projection():
             ticker,
             metric=data.get("metric", "Total Revenue"),
             periods_ahead=data.get("periods_ahead", 4),
+            method=data.get("method", "linear"),
         )
         return jsonify(result)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     except Exception:
         return jsonify({"error": "Failed to run projection"}), 500
 
 
+@bp.route("/api/model/projections", methods=["POST"])
+def projections():
+    data = request.get_json()
+    tickers = data.get("tickers") or [data.get("ticker", "")]
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers
+                                 if isinstance(t, str) and t.strip()))
+    if not tickers:
+        return jsonify({"error": "Ticker is required"}), 400
+    if len(tickers) > MAX_PROJECTION_TICKERS:
+        return jsonify({"error": f"At most {MAX_PROJECTION_TICKERS} tickers per request"}), 400
+
+    try:
+        results = run_projections(
+            tickers,
+            metrics=data.get("metrics"),
+            periods_ahead=data.get("periods_ahead", 4),
+            method=data.get("method", "linear"),
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except Exception:
+        return jsonify({"error": "Failed to run projections"}), 500
+    if "ticker" in data and "tickers" not in data:
+        return jsonify(results[0])
+    return jsonify({"results": results})
+
+
 @bp.route("/api/model/pbv", methods=["POST"])
 def pbv():
     data = request.get_json()
@@ -1,7 +1,7 @@
 """Daily Recommendations API routes."""
 
 from flask import Blueprint, request, jsonify
-from stock_checker.alpha.services.scores import get_scores
+from stock_checker.alpha.services.scores import get_scores_batch
 from stock_checker.alpha.services.ai_analysis import analyze_watchlist, get_provider_status
 
 bp = Blueprint("alpha_recommendations", __name__)
@@ -22,18 +22,8 @@ def scores_batch():
         return jsonify({"error": "tickers (list) required"}), 400
 
     tickers = tickers[:20]  # cap batch size
-    results = []
-    for ticker in tickers:
-        ticker = ticker.strip().upper()
-        if not ticker:
-            continue
-        try:
-            result = get_scores(ticker)
-            results.append(result)
-        except Exception:
-            results.append({"ticker": ticker, "error": "Failed to compute scores"})
-
-    return jsonify(results)
+    tickers = [t.strip().upper() for t in tickers if isinstance(t, str) and t.strip()]
+    return jsonify(get_scores_batch(tickers, record=True))
 
 
 @bp.route("/api/recommendations/ai-analyze", methods=["POST"])
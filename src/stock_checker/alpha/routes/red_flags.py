@@ -0,0 +1,36 @@
+"""Red-flag scan routes: universe-wide financial anomaly listing."""
+
+import logging
+
+from flask import Blueprint, request, jsonify
+from stock_checker.alpha.services.red_flags import scan_red_flags, list_red_flags
+
+bp = Blueprint("alpha_red_flags", __name__)
+
+
+@bp.route("/api/red-flags", methods=["GET"])
+def red_flags_list():
+    """Query: severity (minimum), type, ticker, all_periods=1."""
+    try:
+        return jsonify(list_red_flags(
+            severity=request.args.get("severity"),
+            flag_type=request.args.get("type"),
+            latest_only=request.args.get("all_periods") not in ("1", "true"),
+            ticker=request.args.get("ticker"),
+        ))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+
+@bp.route("/api/red-flags/scan", methods=["POST"])
+def red_flags_scan():
+    """Body (optional): { "tickers": [...] }; default scans every stored ticker."""
+    data = request.get_json(silent=True) or {}
+    tickers = data.get("tickers")
+    if tickers is not None and not isinstance(tickers, list):
+        return jsonify({"error": "tickers must be a list"}), 400
+    try:
+        return jsonify(scan_red_flags(tickers))
+    except Exception:
+        logging.exception("Red-flag scan failed")
+        return jsonify({"error": "Failed to scan red flags"}), 500
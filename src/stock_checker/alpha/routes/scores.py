@@ -1,11 +1,21 @@
-"""Scores API route: POST /api/scores."""
+"""Scores API routes: POST /api/scores, score history and score backtests."""
+
+import logging
 
 from flask import Blueprint, request, jsonify
 from stock_checker.alpha.services.scores import get_scores
+from stock_checker.alpha.services.score_history import list_score_history, run_score_backtest
 
 bp = Blueprint("alpha_scores", __name__)
 
 
+def _clamp_int(value, default, lo, hi):
+    try:
+        return max(lo, min(hi, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
 @bp.route("/api/scores", methods=["POST"])
 def scores():
     data = request.get_json()
@@ -18,3 +28,46 @@ def scores():
         return jsonify(result)
     except Exception:
         return jsonify({"error": "Failed to compute scores"}), 500
+
+
+@bp.route("/api/scores/history", methods=["GET"])
+def scores_history():
+    ticker = (request.args.get("ticker") or "").strip().upper()
+    if not ticker:
+        return jsonify({"error": "Ticker is required"}), 400
+    return jsonify(list_score_history(
+        ticker, request.args.get("start"), request.args.get("end"),
+    ))
+
+
+@bp.route("/api/scores/backtest", methods=["POST"])
+def scores_backtest():
+    """Quantile backtest of recorded composite scores.
+
+    Body: { "tickers": [...] (optional, default all recorded), "start": "YYYY-MM-DD",
+            "end": "YYYY-MM-DD", "n_quantiles": 5, "horizon": 21, "freq": "ME" }
+    """
+    data = request.get_json() or {}
+    tickers = data.get("tickers") or None
+    if tickers is not None and not isinstance(tickers, list):
+        return jsonify({"error": "tickers must be a list"}), 400
+    freq = data.get("freq", "ME")
+    if freq not in ("W", "ME", "QE", None):
+        return jsonify({"error": "freq must be one of W, ME, QE"}), 400
+
+    try:
+        result = run_score_backtest(
+            tickers=tickers,
+            start=data.get("start"),
+            end=data.get("end"),
+            n_quantiles=_clamp_int(data.get("n_quantiles"), 5, 2, 10),
+            horizon=_clamp_int(data.get("horizon"), 21, 1, 252),
+            freq=freq,
+        )
+    except Exception:
+        logging.exception("Score backtest failed")
+        return jsonify({"error": "Failed to run score backtest"}), 500
+
+    if "error" in result:
+        return jsonify(result), 422
+    return jsonify(result)
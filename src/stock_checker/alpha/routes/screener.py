@@ -0,0 +1,107 @@
+"""Screener API routes: filter the scored universe in memory."""
+
+from flask import Blueprint, request, jsonify
+from stock_checker.alpha.services.screener import (
+    screen, screener_fields, refresh_screener,
+    list_saved_screens, save_screen, delete_saved_screen, run_saved_screen,
+)
+
+bp = Blueprint("alpha_screener", __name__)
+
+MAX_LIMIT = 1000
+
+
+def _limit(data):
+    try:
+        return max(1, min(MAX_LIMIT, int(data.get("limit", 50))))
+    except (TypeError, ValueError):
+        return None
+
+
+@bp.route("/api/screener", methods=["POST"])
+def screener():
+    """Filter + sort + limit over the latest score snapshot of every ticker.
+
+    Body: {
+      "filters": [{"field": "PER", "op": "<", "value": 15},
+                  {"field": "ROE", "op": ">", "value": 15},
+                  {"field": "sector", "op": "in", "value": ["perbankan"]}],
+      "sort": "composite_score", "order": "desc", "limit": 50,
+      "columns": ["PER", "ROE", "composite_score"],  (optional)
+      "where": "ROE > 15 and PER < sector_median(PER) and close > sma200",  (optional)
+      "rank_by": "rank(ROE) - rank(PER)"   (optional, overrides sort)
+    }
+    """
+    data = request.get_json() or {}
+    filters = data.get("filters") or []
+    if not isinstance(filters, list) or not all(isinstance(f, dict) for f in filters):
+        return jsonify({"error": "filters must be a list of {field, op, value}"}), 400
+    columns = data.get("columns")
+    if columns is not None and not isinstance(columns, list):
+        return jsonify({"error": "columns must be a list"}), 400
+    limit = _limit(data)
+    if limit is None:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        result = screen(
+            filters,
+            sort=data.get("sort", "composite_score"),
+            descending=data.get("order", "desc") != "asc",
+            limit=limit,
+            columns=columns,
+            where=data.get("where") or None,
+            rank_by=data.get("rank_by") or None,
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(result)
+
+
+@bp.route("/api/screener/fields", methods=["GET"])
+def screener_fields_list():
+    return jsonify(screener_fields())
+
+
+@bp.route("/api/screener/refresh", methods=["POST"])
+def screener_refresh():
+    table = refresh_screener()
+    return jsonify({"universe": table.size, "as_of": table.as_of})
+
+
+# --- Saved screens ---
+
+@bp.route("/api/screener/screens", methods=["GET"])
+def saved_screens_list():
+    return jsonify(list_saved_screens())
+
+
+@bp.route("/api/screener/screens", methods=["POST"])
+def saved_screens_create():
+    data = request.get_json() or {}
+    name = (data.get("name") or "").strip()
+    expression = (data.get("expression") or "").strip()
+    if not name or not expression:
+        return jsonify({"error": "Name and expression are required"}), 400
+    try:
+        return jsonify(save_screen(name, expression, (data.get("rank_by") or "").strip())), 201
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+
+@bp.route("/api/screener/screens/<int:sid>", methods=["DELETE"])
+def saved_screens_delete(sid):
+    delete_saved_screen(sid)
+    return jsonify({"ok": True})
+
+
+@bp.route("/api/screener/screens/<int:sid>/run", methods=["POST"])
+def saved_screens_run(sid):
+    data = request.get_json(silent=True) or {}
+    limit = _limit(data)
+    if limit is None:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        return jsonify(run_saved_screen(sid, limit, data.get("columns")))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
@@ -0,0 +1,80 @@
+"""Universe registry routes: IDX listings and index membership."""
+
+import logging
+
+from flask import Blueprint, request, jsonify
+from stock_checker.alpha.services.universe import (
+    list_universe, refresh_universe, index_members, index_history,
+    record_index_constituents, import_index_history,
+)
+from stock_checker.alpha.services.sector_stats import refresh_sector_stats, sector_summary
+
+bp = Blueprint("alpha_universe", __name__)
+
+
+@bp.route("/api/universe", methods=["GET"])
+def universe_list():
+    return jsonify(list_universe(
+        industry_key=request.args.get("industry_key"),
+        board=request.args.get("board"),
+        index_code=request.args.get("index"),
+        as_of=request.args.get("as_of"),
+    ))
+
+
+@bp.route("/api/universe/refresh", methods=["POST"])
+def universe_refresh():
+    """Bulk refresh. Body (optional): { "listings": [...] }; default downloads from IDX."""
+    data = request.get_json(silent=True) or {}
+    listings = data.get("listings")
+    if listings is not None and not isinstance(listings, list):
+        return jsonify({"error": "listings must be a list"}), 400
+    try:
+        return jsonify(refresh_universe(listings))
+    except Exception:
+        logging.exception("Universe refresh failed")
+        return jsonify({"error": "Failed to refresh universe"}), 502
+
+
+@bp.route("/api/universe/indices/<code>", methods=["GET"])
+def universe_index_members(code):
+    return jsonify({
+        "index_code": code.upper(),
+        "as_of": request.args.get("as_of"),
+        "tickers": index_members(code, request.args.get("as_of")),
+    })
+
+
+@bp.route("/api/universe/indices/<code>/history", methods=["GET"])
+def universe_index_history(code):
+    return jsonify(index_history(code, request.args.get("ticker")))
+
+
+@bp.route("/api/universe/indices/<code>", methods=["POST"])
+def universe_index_update(code):
+    """Body: { "tickers": [...], "as_of": "YYYY-MM-DD" } or { "history": [periods] }."""
+    data = request.get_json() or {}
+    if isinstance(data.get("history"), list):
+        try:
+            return jsonify(import_index_history(code, data["history"]))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+    tickers = data.get("tickers")
+    if not isinstance(tickers, list) or not tickers:
+        return jsonify({"error": "tickers (list) or history (list) required"}), 400
+    return jsonify(record_index_constituents(code, tickers, data.get("as_of")))
+
+
+@bp.route("/api/universe/sector-stats/<sector>", methods=["GET"])
+def universe_sector_stats(sector):
+    """Latest stored distribution summaries (count, mean, median, quartiles) for a sector."""
+    return jsonify(sector_summary(sector))
+
+
+@bp.route("/api/universe/sector-stats/refresh", methods=["POST"])
+def universe_sector_stats_refresh():
+    try:
+        return jsonify(refresh_sector_stats())
+    except Exception:
+        logging.exception("Sector statistics refresh failed")
+        return jsonify({"error": "Failed to refresh sector statistics"}), 500
@@ -0,0 +1,116 @@
+"""Scoring weight profile routes: CRUD, rescoring and what-if sweeps."""
+
+import logging
+
+from flask import Blueprint, request, jsonify
+from werkzeug.exceptions import HTTPException
+from stock_checker.alpha.services.weight_profiles import (
+    list_profiles, get_profile, create_profile, update_profile, delete_profile,
+    rescore, rescore_watchlist, run_weight_sweep,
+)
+
+bp = Blueprint("alpha_weights", __name__)
+
+MAX_RESCORE_TICKERS = 500
+
+
+def _tickers(data):
+    tickers = data.get("tickers") or []
+    if not isinstance(tickers, list):
+        return None
+    return [t.strip().upper() for t in tickers[:MAX_RESCORE_TICKERS]
+            if isinstance(t, str) and t.strip()]
+
+
+@bp.route("/api/weight-profiles", methods=["GET"])
+def profiles_list():
+    return jsonify(list_profiles(
+        request.args.get("owner"),
+        request.args.get("watchlist_id", type=int),
+    ))
+
+
+@bp.route("/api/weight-profiles", methods=["POST"])
+def profiles_create():
+    data = request.get_json() or {}
+    name = (data.get("name") or "").strip()
+    if not name:
+        return jsonify({"error": "Name is required"}), 400
+    try:
+        profile = create_profile(name, data.get("weights") or {},
+                                 data.get("owner", ""), data.get("watchlist_id"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(profile), 201
+
+
+@bp.route("/api/weight-profiles/<int:pid>", methods=["GET"])
+def profiles_get(pid):
+    return jsonify(get_profile(pid))
+
+
+@bp.route("/api/weight-profiles/<int:pid>", methods=["PUT"])
+def profiles_update(pid):
+    data = request.get_json() or {}
+    try:
+        profile = update_profile(pid, data.get("name"), data.get("weights"),
+                                 data.get("owner"), data.get("watchlist_id"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(profile)
+
+
+@bp.route("/api/weight-profiles/<int:pid>", methods=["DELETE"])
+def profiles_delete(pid):
+    delete_profile(pid)
+    return jsonify({"ok": True})
+
+
+@bp.route("/api/weight-profiles/rescore", methods=["POST"])
+def profiles_rescore():
+    """Rescore cached ratio panels under a profile.
+
+    Body: { "watchlist_id": 1 } or { "tickers": [...] },
+          plus optional "profile_id" or ad-hoc "weights".
+    """
+    data = request.get_json() or {}
+    try:
+        if data.get("watchlist_id") is not None:
+            return jsonify(rescore_watchlist(int(data["watchlist_id"]), data.get("profile_id")))
+        tickers = _tickers(data)
+        if not tickers:
+            return jsonify({"error": "tickers (list) or watchlist_id required"}), 400
+        return jsonify(rescore(tickers, data.get("profile_id"), data.get("weights")))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except HTTPException:
+        raise  # unknown profile / watchlist ids are 404s, not failures
+    except Exception:
+        logging.exception("Rescore failed")
+        return jsonify({"error": "Failed to rescore"}), 500
+
+
+@bp.route("/api/weight-profiles/sweep", methods=["POST"])
+def profiles_sweep():
+    """What-if sweep: score the same tickers under many profiles at once.
+
+    Body: { "tickers": [...], "profiles": [ {weights...} | profile_id, ... ],
+            "pillar_step": 0.1 }
+    """
+    data = request.get_json() or {}
+    tickers = _tickers(data)
+    if not tickers:
+        return jsonify({"error": "tickers (list) required"}), 400
+    profiles = data.get("profiles") or []
+    if not isinstance(profiles, list):
+        return jsonify({"error": "profiles must be a list"}), 400
+    try:
+        step = float(data["pillar_step"]) if data.get("pillar_step") else None
+        return jsonify(run_weight_sweep(tickers, profiles, step))
+    except (TypeError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    except HTTPException:
+        raise  # unknown profile / watchlist ids are 404s, not failures
+    except Exception:
+        logging.exception("Weight sweep failed")
+        return jsonify({"error": "Failed to run weight sweep"}), 500
@@ -1,8 +1,15 @@
 """Multi-ticker comparison service."""
 
+import logging
 import math
-from stock_checker.alpha.services.data_fetcher import get_info, get_financials, get_balance_sheet, get_cashflow
-from stock_checker.alpha.calculations.ratios import calc_all_ratios
+
+import pandas as pd
+
+from stock_checker.alpha.services.data_fetcher import get_info
+from stock_checker.alpha.services.fundamentals import get_financials, get_balance_sheet, get_cashflow
+from stock_checker.alpha.calculations.batch_ratios import (
+    calc_ratios_batch, statements_to_long, STATEMENT_ITEMS,
+)
 from stock_checker.indicators import format_number
 
 
@@ -22,6 +29,33 @@ def _safe_val(v):
     return v
 
 
+def _ratio_table(frames, infos):
+    """Ratios for every loaded ticker in one cross-sectional pass.
+
+    If the batch pass fails, each ticker is computed alone so only the
+    tickers with bad data lose their ratios.
+
+    Returns:
+        (ratio DataFrame indexed by ticker, {ticker: error message})
+    """
+    try:
+        return calc_ratios_batch(statements_to_long(frames, STATEMENT_ITEMS), infos), {}
+    except Exception:
+        logging.exception("Batch comparison ratios failed; retrying per ticker (tickers=%s)",
+                          list(frames))
+
+    tables, errors = [], {}
+    for symbol in frames:
+        try:
+            tables.append(calc_ratios_batch(
+                statements_to_long({symbol: frames[symbol]}, STATEMENT_ITEMS),
+                {symbol: infos[symbol]},
+            ))
+        except Exception as e:
+            errors[symbol] = str(e)
+    return (pd.concat(tables) if tables else pd.DataFrame()), errors
+
+
 def compare_tickers(tickers, categories=None):
     """Compare multiple tickers across metric categories.
 
@@ -39,42 +73,52 @@ def compare_tickers(tickers, categories=None):
         categories = list(METRIC_CATEGORIES.keys())
 
     results = {}
+    frames, infos = {}, {}
     for symbol in tickers:
         try:
             info = get_info(symbol)
             financials = get_financials(symbol)
-            balance = get_balance_sheet(symbol)
-            cashflow = get_cashflow(symbol)
-
             if not info and (financials is None or financials.empty):
                 results[symbol] = {"error": f"No data for {symbol}"}
                 continue
-
-            ratios = calc_all_ratios(info, financials, balance, cashflow)
-
-            ticker_data = {
-                "name": info.get("longName") or info.get("shortName", symbol),
-                "sector": info.get("sector", "N/A"),
-                "metrics": {},
+            frames[symbol] = {
+                "income": financials,
+                "balance": get_balance_sheet(symbol),
+                "cashflow": get_cashflow(symbol),
             }
-
-            # Add market data
-            ticker_data["metrics"]["Market Cap"] = _safe_val(info.get("marketCap"))
-            ticker_data["metrics"]["Current Price"] = _safe_val(
-                info.get("currentPrice") or info.get("regularMarketPrice")
-            )
-
-            # Add ratios by category
-            for cat in categories:
-                if cat in METRIC_CATEGORIES:
-                    for metric in METRIC_CATEGORIES[cat]:
-                        if metric in ratios:
-                            ticker_data["metrics"][metric] = _safe_val(ratios[metric])
-
-            results[symbol] = ticker_data
+            infos[symbol] = info
         except Exception as e:
             results[symbol] = {"error": str(e)}
 
+    ratio_table, errors = _ratio_table(frames, infos) if frames else (None, {})
+    for symbol, message in errors.items():
+        results[symbol] = {"error": message}
+        del infos[symbol]
+
+    for symbol, info in infos.items():
+        ratios = ratio_table.loc[symbol]
+        ticker_data = {
+            "name": info.get("longName") or info.get("shortName", symbol),
+            "sector": info.get("sector", "N/A"),
+            "metrics": {},
+        }
+
+        # Add market data
+        ticker_data["metrics"]["Market Cap"] = _safe_val(info.get("marketCap"))
+        ticker_data["metrics"]["Current Price"] = _safe_val(
+            info.get("currentPrice") or info.get("regularMarketPrice")
+        )
+
+        # Add ratios by category
+        for cat in categories:
+            if cat in METRIC_CATEGORIES:
+                for metric in METRIC_CATEGORIES[cat]:
+                    if metric in ratios.index:
+                        ticker_data["metrics"][metric] = _safe_val(float(ratios[metric]))
+
+        results[symbol] = ticker_data
+    results = {symbol: results[symbol] for symbol in tickers if symbol in results}
+
     # Build comparison table structure
     all_metrics = []
     for cat in categories:
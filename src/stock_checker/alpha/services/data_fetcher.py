@@ -1,26 +1,36 @@
 """Enhanced data fetcher with TTL caching."""
 
 import logging
+import threading
+import warnings
+
+import pandas as pd
 from cachetools import TTLCache
 import yfinance as yf
 
 logging.getLogger("yfinance").setLevel(logging.CRITICAL)
 
-# Cache: max 100 tickers, 5-minute TTL
+# Cache: max 100 tickers, 5-minute TTL. TTLCache is not thread-safe, so
+# every read and write goes through _cache_lock; fetches run outside it.
 _ticker_cache = TTLCache(maxsize=100, ttl=300)
 _info_cache = TTLCache(maxsize=100, ttl=300)
+_cache_lock = threading.Lock()
 
 
 def get_ticker(symbol):
     """Get or create a cached yfinance Ticker object."""
-    if symbol not in _ticker_cache:
-        _ticker_cache[symbol] = yf.Ticker(symbol)
-    return _ticker_cache[symbol]
+    with _cache_lock:
+        ticker = _ticker_cache.get(symbol)
+        if ticker is None:
+            ticker = _ticker_cache[symbol] = yf.Ticker(symbol)
+        return ticker
 
 
 def get_info(symbol):
     """Get cached ticker info dict. Falls back to fast_info on auth errors."""
-    if symbol not in _info_cache:
+    with _cache_lock:
+        info = _info_cache.get(symbol)
+    if info is None:
         ticker = get_ticker(symbol)
         info = {}
         try:
@@ -50,8 +60,10 @@ def get_info(symbol):
             except Exception:
                 pass
 
-        _info_cache[symbol] = info
-    return _info_cache[symbol]
+        with _cache_lock:
+            # Keep the first result if another thread fetched it meanwhile
+            info = _info_cache.setdefault(symbol, info)
+    return info
 
 
 def get_history(symbol, period="1y"):
@@ -63,6 +75,29 @@ def get_history(symbol, period="1y"):
     return hist
 
 
+def get_closes(tickers, start=None, period=None):
+    """Adjusted closes for many tickers in one batched download.
+
+    Returns:
+        DataFrame (trading days × tickers), tz-naive index, forward-filled
+    """
+    tickers = list(tickers)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        raw = yf.download(tickers, start=start, period=None if start else (period or "1y"),
+                          auto_adjust=True, progress=False)
+    if raw is None or raw.empty:
+        raise ValueError("No price data returned from yfinance")
+    if isinstance(raw.columns, pd.MultiIndex):
+        closes = raw["Close"].copy()
+    else:
+        closes = raw[["Close"]].copy()
+        closes.columns = tickers[:1]
+    if closes.index.tz is not None:
+        closes.index = closes.index.tz_localize(None)
+    return closes.ffill()
+
+
 _MAX_PERIODS = 5
 
 
@@ -115,6 +150,28 @@ def get_quarterly_cashflow(symbol):
     """Get cash flow statement (quarterly)."""
     ticker = get_ticker(symbol)
     df = ticker.quarterly_cashflow
+    if df is None or df.empty:
+        return None
+    return _trim(df)
+
+
+# (statement, freq) -> yfinance Ticker attribute
+STATEMENT_ATTRS = {
+    ("income", "annual"): "financials",
+    ("income", "quarterly"): "quarterly_financials",
+    ("balance", "annual"): "balance_sheet",
+    ("balance", "quarterly"): "quarterly_balance_sheet",
+    ("cashflow", "annual"): "cashflow",
+    ("cashflow", "quarterly"): "quarterly_cashflow",
+}
+
+
+def get_raw_statement(symbol, statement, freq="annual"):
+    """Untrimmed statement DataFrame (items × periods), or None if unavailable."""
+    attr = STATEMENT_ATTRS.get((statement, freq))
+    if attr is None:
+        raise ValueError(f"Unknown statement: {statement}/{freq}")
+    df = getattr(get_ticker(symbol), attr)
     if df is None or df.empty:
         return None
     return df
@@ -122,5 +179,6 @@ def get_quarterly_cashflow(symbol):
 
 def clear_cache():
     """Clear all caches."""
-    _ticker_cache.clear()
-    _info_cache.clear()
+    with _cache_lock:
+        _ticker_cache.clear()
+        _info_cache.clear()
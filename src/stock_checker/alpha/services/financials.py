@@ -2,13 +2,15 @@
 
 import math
 import numpy as np
-from stock_checker.alpha.services.data_fetcher import (
-    get_info, get_financials, get_quarterly_financials,
-    get_balance_sheet, get_cashflow,
+from stock_checker.alpha.services.data_fetcher import get_info
+from stock_checker.alpha.services.fundamentals import (
+    get_financials, get_quarterly_financials, get_balance_sheet, get_cashflow,
 )
 from stock_checker.alpha.calculations.ratios import calc_all_ratios
 from stock_checker.alpha.calculations.anomaly import detect_anomalies
-from stock_checker.alpha.calculations.growth import calc_yoy_growth
+from stock_checker.alpha.calculations.growth import (
+    calc_yoy_growth, period_labels, statement_values,
+)
 
 
 def _safe(val):
@@ -25,16 +27,23 @@ def _safe(val):
 
 
 def _df_to_dict(df):
-    """Convert a financial statement DataFrame to a dict of {row_label: {date: value}}."""
+    """Convert a financial statement DataFrame to a dict of {row_label: {date: value}}.
+
+    The whole statement is converted at once: one finite mask over the value
+    matrix, one date-label conversion and a single tolist per row.
+    """
     if df is None or df.empty:
         return {}
-    result = {}
-    for row_label in df.index:
-        result[row_label] = {}
-        for col in df.columns:
-            date_str = col.strftime("%Y-%m-%d") if hasattr(col, 'strftime') else str(col)
-            result[row_label][date_str] = _safe(df.loc[row_label, col])
-    return result
+    values = statement_values(df)
+    labels = period_labels(df.columns)
+    if values is None:
+        # Non-numeric cells (rare): fall back to per-cell conversion
+        return {
+            row_label: {d: _safe(v) for d, v in zip(labels, row)}
+            for row_label, row in zip(df.index, df.to_numpy(dtype=object))
+        }
+    cells = np.where(np.isnan(values), None, values).tolist()
+    return {row_label: dict(zip(labels, row)) for row_label, row in zip(df.index, cells)}
 
 
 def get_financial_analysis(symbol):
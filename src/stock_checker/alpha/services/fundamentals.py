@@ -0,0 +1,330 @@
+"""Fundamentals warehouse: normalized long-format statement facts in SQLite.
+
+Every statement fetched from yfinance is normalized once at ingest (canonical
+line items, see calculations/line_items.py) and stored as one row per
+ticker × statement × frequency × item × period end. Statement, trend and
+ratio code reads slices back instead of reparsing yfinance DataFrames:
+
+  - get_statement() and the get_financials()-style wrappers return the same
+    (items × periods, latest first) frames as data_fetcher, served from the
+    warehouse and refreshed from yfinance when the slice is stale
+  - load_long() returns a cross-ticker long table for batch ratio work
+  - item_panel() returns one item for many tickers (period × ticker)
+  - load_point_in_time() builds an as-of store for lookahead-free backtests
+  - services/rollups.py derives TTM / QoQ / YoY figures from stored quarters
+
+Outside an app context, or if the database is unavailable, the getters fall
+back to data_fetcher so callers never depend on the warehouse being present.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+from flask import has_app_context
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import FundamentalFact, FundamentalFetch
+from stock_checker.alpha.services import data_fetcher
+from stock_checker.alpha.services.data_fetcher import STATEMENT_ATTRS, get_raw_statement, _trim
+from stock_checker.alpha.calculations.line_items import canonical_item, normalize_statement
+from stock_checker.alpha.calculations.point_in_time import (
+    PointInTimeStore, PIT_ITEMS, ANNUAL_LAG_DAYS, QUARTERLY_LAG_DAYS,
+)
+
+# Statements are published quarterly; a daily refresh is plenty. Empty
+# fetches (often transient yfinance failures) are retried sooner.
+FRESH_FOR = timedelta(hours=24)
+EMPTY_RETRY_AFTER = timedelta(hours=1)
+
+# Decoded frames, keyed (ticker, statement, freq); dropped on ingest
+_frame_cache = TTLCache(maxsize=256, ttl=300)
+
+# data_fetcher getter used when the warehouse is unavailable
+_DIRECT = {
+    ("income", "annual"): data_fetcher.get_financials,
+    ("income", "quarterly"): data_fetcher.get_quarterly_financials,
+    ("balance", "annual"): data_fetcher.get_balance_sheet,
+    ("cashflow", "annual"): data_fetcher.get_cashflow,
+    ("cashflow", "quarterly"): data_fetcher.get_quarterly_cashflow,
+}
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _aware(dt):
+    return dt.replace(tzinfo=timezone.utc) if dt is not None and dt.tzinfo is None else dt
+
+
+def _check_slice(statement, freq):
+    if (statement, freq) not in STATEMENT_ATTRS:
+        raise ValueError(f"Unknown statement: {statement}/{freq}")
+
+
+# --- Ingest ---
+
+def ingest_statement(ticker, statement, freq, df, fetched_at=None):
+    """Normalize a statement DataFrame and upsert its facts.
+
+    Periods present in df replace the stored values for those periods (so
+    restatements win); older periods already in the warehouse are kept.
+
+    Returns:
+        number of facts written
+    """
+    _check_slice(statement, freq)
+    ticker = ticker.upper()
+    fetched_at = fetched_at or _utcnow()
+    records = []
+    periods = []
+    if df is not None and not df.empty:
+        df = normalize_statement(df)
+        period_ends = pd.to_datetime(df.columns, errors="coerce")
+        valid = ~pd.isna(period_ends) & ~period_ends.duplicated()
+        periods = [p.date() for p in period_ends[valid]]
+        values = df.to_numpy(dtype=np.float64, na_value=np.nan)[:, valid]
+        # Missing cells are kept as NULL so stored statements keep their shape
+        cells = np.where(np.isfinite(values), values, None).tolist()
+        records = [
+            {"ticker": ticker, "statement": statement, "freq": freq,
+             "item": item, "period_end": period, "value": value,
+             "position": r, "fetched_at": fetched_at}
+            for r, (item, row) in enumerate(zip(df.index, cells))
+            for period, value in zip(periods, row)
+        ]
+
+    if periods:
+        FundamentalFact.query.filter(
+            FundamentalFact.ticker == ticker,
+            FundamentalFact.statement == statement,
+            FundamentalFact.freq == freq,
+            FundamentalFact.period_end.in_(periods),
+        ).delete(synchronize_session=False)
+    if records:
+        db.session.execute(insert(FundamentalFact), records)
+
+    log = FundamentalFetch.query.filter_by(ticker=ticker, statement=statement, freq=freq).first()
+    if log is None:
+        log = FundamentalFetch(ticker=ticker, statement=statement, freq=freq)
+        db.session.add(log)
+    log.rows = len(records)
+    log.fetched_at = fetched_at
+    db.session.commit()
+    _frame_cache.pop((ticker, statement, freq), None)
+    return len(records)
+
+
+def refresh_statement(ticker, statement, freq="annual"):
+    """Fetch one statement from yfinance and ingest it.
+
+    An empty statement is recorded too, so it is not refetched until stale.
+    Fetch errors propagate and leave the slice marked stale.
+    """
+    df = get_raw_statement(ticker, statement, freq)
+    return ingest_statement(ticker, statement, freq, df)
+
+
+def _log_is_fresh(log, max_age):
+    if log.rows == 0:
+        max_age = min(max_age, EMPTY_RETRY_AFTER)
+    return _utcnow() - _aware(log.fetched_at) < max_age
+
+
+def is_fresh(ticker, statement, freq="annual", max_age=FRESH_FOR):
+    log = FundamentalFetch.query.filter_by(ticker=ticker.upper(), statement=statement,
+                                           freq=freq).first()
+    return log is not None and _log_is_fresh(log, max_age)
+
+
+def stale_statements(tickers, statements=("income", "balance", "cashflow"),
+                     freq="annual", max_age=FRESH_FOR):
+    """{ticker: [stale statements]} for the tickers, from one freshness query.
+
+    Tickers whose slices are all fresh are left out.
+    """
+    tickers = [t.upper() for t in tickers]
+    fresh = {
+        (log.ticker, log.statement)
+        for log in FundamentalFetch.query.filter(
+            FundamentalFetch.ticker.in_(tickers),
+            FundamentalFetch.freq == freq,
+            FundamentalFetch.statement.in_(statements),
+        ).all()
+        if _log_is_fresh(log, max_age)
+    }
+    stale = {}
+    for ticker in tickers:
+        missing = [s for s in statements if (ticker, s) not in fresh]
+        if missing:
+            stale[ticker] = missing
+    return stale
+
+
+def ensure_fundamentals(tickers, statements=("income", "balance", "cashflow"),
+                        freq="annual", max_age=FRESH_FOR):
+    """Refresh every stale (ticker, statement) slice; one freshness query for all.
+
+    Returns:
+        dict with refreshed and failed ticker lists
+    """
+    refreshed, failed = [], []
+    for ticker, stale in stale_statements(tickers, statements, freq, max_age).items():
+        try:
+            for statement in stale:
+                refresh_statement(ticker, statement, freq)
+            refreshed.append(ticker)
+        except Exception:
+            db.session.rollback()
+            logging.warning("Fundamentals refresh failed for %s", ticker)
+            failed.append(ticker)
+    return {"refreshed": refreshed, "failed": failed}
+
+
+# --- Reads ---
+
+def load_statement(ticker, statement, freq="annual"):
+    """Stored statement as a yfinance-shaped DataFrame (items × periods, latest first)."""
+    key = (ticker.upper(), statement, freq)
+    if key in _frame_cache:
+        return _frame_cache[key]
+    rows = (db.session.query(FundamentalFact.item, FundamentalFact.period_end,
+                             FundamentalFact.value, FundamentalFact.position)
+            .filter_by(ticker=key[0], statement=statement, freq=freq).all())
+    df = None
+    if rows:
+        facts = pd.DataFrame(rows, columns=["item", "period_end", "value", "position"])
+        facts["period_end"] = pd.to_datetime(facts["period_end"])
+        order = facts.groupby("item")["position"].min().sort_values(kind="stable")
+        df = facts.pivot(index="item", columns="period_end", values="value")
+        df = df.reindex(index=order.index, columns=sorted(df.columns, reverse=True))
+        df.index.name = None
+        df.columns.name = None
+    _frame_cache[key] = df
+    return df
+
+
+def get_statement(symbol, statement, freq="annual", trim=True):
+    """Statement frame from the warehouse, refreshed from yfinance when stale.
+
+    Returns the same shape as the data_fetcher getters (ghost columns dropped
+    and at most the latest five periods when trim is set), or None.
+    """
+    _check_slice(statement, freq)
+    if not has_app_context():
+        return _direct(symbol, statement, freq)
+    try:
+        if (symbol.upper(), statement, freq) not in _frame_cache and not is_fresh(symbol, statement, freq):
+            refresh_statement(symbol, statement, freq)
+        df = load_statement(symbol, statement, freq)
+    except SQLAlchemyError:
+        db.session.rollback()
+        logging.warning("Fundamentals warehouse unavailable; reading %s directly", symbol)
+        return _direct(symbol, statement, freq)
+    if df is None or df.empty:
+        return None
+    return _trim(df) if trim else df
+
+
+def _direct(symbol, statement, freq):
+    getter = _DIRECT.get((statement, freq))
+    if getter is not None:
+        return getter(symbol)
+    return _trim(get_raw_statement(symbol, statement, freq))
+
+
+def get_financials(symbol):
+    return get_statement(symbol, "income", "annual")
+
+
+def get_quarterly_financials(symbol):
+    return get_statement(symbol, "income", "quarterly")
+
+
+def get_balance_sheet(symbol):
+    return get_statement(symbol, "balance", "annual")
+
+
+def get_cashflow(symbol):
+    return get_statement(symbol, "cashflow", "annual")
+
+
+def get_quarterly_cashflow(symbol):
+    return get_statement(symbol, "cashflow", "quarterly")
+
+
+def load_long(tickers=None, items=None, statement=None, freq="annual", start=None, end=None):
+    """Facts for many tickers in the batch_ratios long format.
+
+    Args:
+        tickers / items: optional filters (items are canonicalized)
+        statement: optional statement filter
+        freq: 'annual' or 'quarterly'
+        start / end: optional period_end bounds (inclusive)
+
+    Returns:
+        DataFrame with ticker, statement, item, period, offset, value, fetched_at;
+        offset 0 is each (ticker, statement)'s latest stored period
+    """
+    q = db.session.query(FundamentalFact.ticker, FundamentalFact.statement,
+                         FundamentalFact.item, FundamentalFact.period_end,
+                         FundamentalFact.value, FundamentalFact.fetched_at)
+    q = q.filter(FundamentalFact.freq == freq)
+    if tickers is not None:
+        q = q.filter(FundamentalFact.ticker.in_([t.upper() for t in tickers]))
+    if items is not None:
+        q = q.filter(FundamentalFact.item.in_([canonical_item(i) for i in items]))
+    if statement:
+        q = q.filter(FundamentalFact.statement == statement)
+    if start:
+        q = q.filter(FundamentalFact.period_end >= start)
+    if end:
+        q = q.filter(FundamentalFact.period_end <= end)
+
+    columns = ["ticker", "statement", "item", "period", "offset", "value", "fetched_at"]
+    long = pd.DataFrame(q.all(), columns=["ticker", "statement", "item", "period",
+                                          "value", "fetched_at"])
+    if long.empty:
+        return pd.DataFrame(columns=columns)
+    long["period"] = pd.to_datetime(long["period"])
+    long["offset"] = (long.groupby(["ticker", "statement"])["period"]
+                      .rank(method="dense", ascending=False).astype(int) - 1)
+    return long[columns]
+
+
+def item_panel(item, freq="annual", tickers=None, start=None, end=None):
+    """One canonical item for many tickers as a (period × ticker) DataFrame."""
+    long = load_long(tickers=tickers, items=[item], freq=freq, start=start, end=end)
+    if long.empty:
+        return pd.DataFrame()
+    panel = long.drop_duplicates(["ticker", "period"]).pivot(
+        index="period", columns="ticker", values="value")
+    return panel.sort_index()
+
+
+def load_point_in_time(tickers=None, items=PIT_ITEMS, freq="annual"):
+    """PointInTimeStore over the stored facts; reads the warehouse only (no fetch)."""
+    lag = ANNUAL_LAG_DAYS if freq == "annual" else QUARTERLY_LAG_DAYS
+    return PointInTimeStore(load_long(tickers=tickers, items=items, freq=freq), lag_days=lag)
+
+
+def clear_cache():
+    """Drop decoded statement frames (the stored facts are untouched)."""
+    _frame_cache.clear()
+
+
+def warehouse_stats():
+    """Row counts per statement/frequency and the number of tickers covered."""
+    rows = (db.session.query(FundamentalFact.statement, FundamentalFact.freq,
+                             db.func.count(FundamentalFact.id))
+            .group_by(FundamentalFact.statement, FundamentalFact.freq).all())
+    tickers = db.session.query(db.func.count(db.distinct(FundamentalFact.ticker))).scalar()
+    return {
+        "tickers": tickers or 0,
+        "facts": {f"{s}/{f}": n for s, f, n in rows},
+    }
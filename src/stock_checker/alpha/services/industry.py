@@ -1,8 +1,13 @@
 """Industry analysis service."""
 
+import logging
+
 import yfinance as yf
 
 from stock_checker.alpha.services.financials import get_financial_analysis
+from stock_checker.alpha.services.universe import universe_peers
+from stock_checker.alpha.services.peers import find_peers
+from stock_checker.alpha.services.sector_stats import get_sector_stats
 from stock_checker.alpha.calculations.industry import (
     detect_industry,
     get_industry_config,
@@ -11,8 +16,12 @@ from stock_checker.alpha.calculations.industry import (
 )
 
 
-def get_industry_context(symbol: str) -> dict:
-    """Return full industry analysis context for a ticker."""
+def get_industry_context(symbol: str, k: int = 2, same_sector: bool = True) -> dict:
+    """Return full industry analysis context for a ticker.
+
+    Peers are the k nearest tickers in the ratio/size peer index (optionally
+    across sectors); the registry and static lists are fallbacks.
+    """
     fin = get_financial_analysis(symbol)
 
     sector        = fin.get('sector', '')  or ''
@@ -37,12 +46,31 @@ def get_industry_context(symbol: str) -> dict:
         info,
     )
 
-    valuation = detect_valuation_zone(specific_ratios, config)
+    # Sector percentiles come from the nightly distributions; absent until
+    # the first `flask alpha sector-stats` run
+    try:
+        sector_stats = get_sector_stats()
+    except Exception:
+        logging.warning("Sector statistics unavailable for %s", symbol)
+        sector_stats = None
+    valuation = detect_valuation_zone(specific_ratios, config, sector_stats, industry_key)
 
-    # Select peers: IDX list for .JK tickers, US list otherwise; exclude self
+    # Select peers: nearest neighbours in the peer index, then the universe
+    # registry for .JK tickers, then the static IDX/US lists; exclude self
     is_idx   = symbol.upper().endswith('.JK')
-    all_peers = config.get('peers_IDX' if is_idx else 'peers_US', [])
-    peers     = [p for p in all_peers if p.upper() != symbol.upper()][:2]
+    similar  = find_peers(symbol, k=k, same_sector=same_sector)
+    peers    = [p['ticker'] for p in similar]
+    source   = 'similarity'
+    if not peers and is_idx and industry_key != 'unknown':
+        try:
+            peers = universe_peers(symbol, industry_key, limit=k)
+        except Exception:
+            peers = []
+        source = 'registry'
+    if not peers:
+        all_peers = config.get('peers_IDX' if is_idx else 'peers_US', [])
+        peers     = [p for p in all_peers if p.upper() != symbol.upper()][:k]
+        source    = 'static'
 
     return {
         'ticker':          symbol,
@@ -56,6 +84,8 @@ def get_industry_context(symbol: str) -> dict:
         'peers': {
             'tickers': peers,
             'metrics': config.get('peer_metrics', []),
+            'source':  source,
+            'similar': similar,
         },
         'thesis':   config.get('thesis', {}),
         'currency': currency,
@@ -1,22 +1,76 @@
 """Modelling service: DCF, scenarios, sensitivity, projections."""
 
-from stock_checker.alpha.services.data_fetcher import get_info, get_cashflow, get_balance_sheet
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from flask import has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.services.data_fetcher import get_info, get_raw_statement
+from stock_checker.alpha.services.fundamentals import (
+    get_financials, get_cashflow, get_balance_sheet, ingest_statement, stale_statements,
+)
+from stock_checker.alpha.services.rollups import get_ttm
 from stock_checker.alpha.calculations.valuation import (
-    calc_dcf, calc_scenario, calc_sensitivity, calc_linear_projection,
-    calc_pbv, calc_ddm, calc_roe_sustainable_growth,
+    calc_dcf, calc_scenario, calc_sensitivity, calc_sensitivity_cube,
+    calc_pbv, calc_ddm, calc_roe_sustainable_growth, calc_implied_growth, calc_implied_wacc,
+    MAX_GRID_CELLS,
+)
+from stock_checker.alpha.calculations.monte_carlo import calc_monte_carlo_dcf, DEFAULT_PATHS
+from stock_checker.alpha.calculations.projections import (
+    METHODS as PROJECTION_METHODS, calc_projections, projection_row,
+)
+from stock_checker.alpha.calculations.synthesis import (
+    INPUT_COLUMNS, MODELS, calc_valuation_synthesis, sector_params,
 )
-from stock_checker.alpha.services.trends import _safe, _extract_row
+from stock_checker.alpha.services.trends import KEY_METRICS, _safe, _extract_row
+from stock_checker.alpha.services.valuation_cache import memoized
+
+
+def _fresh_quarters(symbol, annual, items):
+    """Latest stored quarterly rollups for items, if newer than the annual statement.
+
+    Reads the warehouse only; empty when no quarters are stored (or the
+    warehouse is unavailable) so callers keep the annual figures.
+    """
+    try:
+        ttm = get_ttm(symbol, items)
+    except Exception:
+        logging.debug("Quarterly rollups unavailable for %s", symbol)
+        return {}
+    if annual is not None and not annual.empty:
+        latest_annual = pd.Timestamp(annual.columns[0])
+        ttm = {k: v for k, v in ttm.items() if pd.Timestamp(v["period"]) > latest_annual}
+    return ttm
 
 
 def _get_fcf_base(symbol):
-    """Extract latest FCF, shares outstanding, and net debt from statements."""
+    """Extract latest FCF, shares outstanding, and net debt from statements.
+
+    FCF is the trailing-twelve-month figure and debt/cash the latest quarter
+    when stored quarterly statements are newer than the annual report.
+
+    Returns:
+        (fcf, shares, net_debt, basis) — basis is {'fcf': 'ttm'|'annual', 'period': ...}
+    """
     cashflow = get_cashflow(symbol)
     balance = get_balance_sheet(symbol)
     info = get_info(symbol)
 
     fcf = None
+    basis = {"fcf": "annual", "period": None}
     if cashflow is not None and "Free Cash Flow" in cashflow.index:
         fcf = _safe(cashflow.loc["Free Cash Flow"].iloc[0])
+        basis["period"] = pd.Timestamp(cashflow.columns[0]).strftime("%Y-%m-%d")
+
+    quarters = _fresh_quarters(symbol, cashflow, ["Free Cash Flow"])
+    ttm_fcf = (quarters.get("Free Cash Flow") or {}).get("ttm")
+    if ttm_fcf is not None:
+        fcf = ttm_fcf
+        basis = {"fcf": "ttm", "period": quarters["Free Cash Flow"]["period"]}
 
     shares = info.get("sharesOutstanding")
 
@@ -32,6 +86,13 @@ def _get_fcf_base(symbol):
         if c is not None:
             cash = c
 
+    # Latest quarter's balance sheet when it is newer than the annual one
+    quarters = _fresh_quarters(symbol, balance, ["Total Debt", "Cash And Cash Equivalents"])
+    if (quarters.get("Total Debt") or {}).get("ttm") is not None:
+        total_debt = quarters["Total Debt"]["ttm"]
+    if (quarters.get("Cash And Cash Equivalents") or {}).get("ttm") is not None:
+        cash = quarters["Cash And Cash Equivalents"]["ttm"]
+
     # Fallback to info dict if balance sheet didn't have data
     if total_debt == 0:
         total_debt = info.get("totalDebt", 0) or 0
@@ -39,16 +100,18 @@ def _get_fcf_base(symbol):
         cash = info.get("totalCash", 0) or 0
 
     net_debt = total_debt - cash
-    return fcf, shares, net_debt
+    return fcf, shares, net_debt, basis
 
 
+@memoized("dcf")
 def run_dcf(symbol, growth_rate=0.10, terminal_growth=0.03, wacc=0.10,
             projection_years=5, fcf_override=None):
     """Run DCF valuation for a ticker."""
-    fcf_base, shares, net_debt = _get_fcf_base(symbol)
+    fcf_base, shares, net_debt, basis = _get_fcf_base(symbol)
 
     if fcf_override is not None:
         fcf_base = fcf_override
+        basis = {"fcf": "override", "period": None}
 
     if fcf_base is None:
         return {"error": "Free Cash Flow data not available for this ticker"}
@@ -61,6 +124,7 @@ def run_dcf(symbol, growth_rate=0.10, terminal_growth=0.03, wacc=0.10,
 
     result["current_price"] = _safe(current_price)
     result["fcf_base"] = fcf_base
+    result["fcf_basis"] = basis
     result["shares_outstanding"] = shares
     result["net_debt"] = net_debt
 
@@ -73,13 +137,14 @@ def run_dcf(symbol, growth_rate=0.10, terminal_growth=0.03, wacc=0.10,
     return result
 
 
+@memoized("scenario")
 def run_scenario(symbol, scenarios=None, terminal_growth=0.03, wacc=0.10,
                  projection_years=5):
     """Run bull/base/bear scenario analysis."""
     if scenarios is None:
         scenarios = {"bull": 0.15, "base": 0.10, "bear": 0.05}
 
-    fcf_base, shares, net_debt = _get_fcf_base(symbol)
+    fcf_base, shares, net_debt, basis = _get_fcf_base(symbol)
     if fcf_base is None:
         return {"error": "Free Cash Flow data not available"}
 
@@ -91,27 +156,153 @@ def run_scenario(symbol, scenarios=None, terminal_growth=0.03, wacc=0.10,
 
     return {
         "fcf_base": fcf_base,
+        "fcf_basis": basis,
         "current_price": _safe(current_price),
         "scenarios": results,
     }
 
 
-def run_sensitivity(symbol, wacc_range=None, growth_range=None,
+def run_reverse_dcf(tickers, solve_for="growth", growth_rate=0.10, wacc=0.10,
                     terminal_growth=0.03, projection_years=5):
-    """Run 2D sensitivity analysis."""
+    """Implied FCF growth (or WACC) that prices each ticker at its market value.
+
+    Inputs are gathered per ticker (same FCF base as run_dcf); every ticker
+    is then solved in one vectorized root search.
+
+    Returns:
+        list of dicts in input order with implied_growth or implied_wacc
+        (percent), or an error per ticker
+    """
+    if solve_for not in ("growth", "wacc"):
+        raise ValueError("solve_for must be 'growth' or 'wacc'")
+
+    rows, errors = [], {}
+    for symbol in tickers:
+        try:
+            fcf_base, shares, net_debt, basis = _get_fcf_base(symbol)
+            info = get_info(symbol)
+        except Exception:
+            errors[symbol] = "Failed to load valuation inputs"
+            continue
+        price = _safe(info.get("currentPrice") or info.get("regularMarketPrice"))
+        market_cap = _safe(info.get("marketCap")) or (price * shares if price and shares else None)
+        if fcf_base is None or not market_cap:
+            errors[symbol] = "Free Cash Flow or market value not available"
+            continue
+        rows.append({"ticker": symbol, "fcf_base": fcf_base, "fcf_basis": basis,
+                     "current_price": price, "market_cap": market_cap,
+                     "enterprise_value": market_cap + net_debt})
+
+    if rows:
+        fcf = np.array([r["fcf_base"] for r in rows], dtype=np.float64)
+        ev = np.array([r["enterprise_value"] for r in rows], dtype=np.float64)
+        if solve_for == "growth":
+            implied = calc_implied_growth(fcf, ev, wacc, terminal_growth, projection_years)
+        else:
+            implied = calc_implied_wacc(fcf, ev, growth_rate, terminal_growth, projection_years)
+        for row, value in zip(rows, implied):
+            row[f"implied_{solve_for}"] = None if np.isnan(value) else round(float(value) * 100, 2)
+
+    results = {symbol: {"ticker": symbol, "error": msg} for symbol, msg in errors.items()}
+    results.update({r["ticker"]: r for r in rows})
+    return [results[symbol] for symbol in tickers]
+
+
+# Default Monte Carlo inputs: the DCF defaults with moderate uncertainty
+MONTE_CARLO_DEFAULTS = {
+    "growth": {"dist": "normal", "mean": 0.10, "std": 0.03},
+    "wacc": {"dist": "normal", "mean": 0.10, "std": 0.01},
+    "terminal_growth": {"dist": "triangular", "low": 0.02, "mode": 0.03, "high": 0.04},
+}
+
+
+def _revenue_base(symbol):
+    """Latest revenue (TTM when stored quarters are newer than the annual report)."""
+    income = get_financials(symbol)
+    revenue = None
+    if income is not None and "Total Revenue" in income.index:
+        revenue = _safe(income.loc["Total Revenue"].iloc[0])
+    ttm = (_fresh_quarters(symbol, income, ["Total Revenue"]).get("Total Revenue") or {}).get("ttm")
+    return ttm if ttm is not None else revenue
+
+
+@memoized("monte_carlo", when=lambda a: a["seed"] is not None)
+def run_monte_carlo(symbol, inputs=None, n_paths=DEFAULT_PATHS, projection_years=5,
+                    correlation=None, seed=None, bins=50):
+    """Monte Carlo DCF: fair value distribution over sampled assumptions.
+
+    inputs overrides MONTE_CARLO_DEFAULTS per variable; invalid distributions
+    or correlations raise ValueError.
+    """
+    inputs = {**MONTE_CARLO_DEFAULTS, **(inputs or {})}
+    fcf_base, shares, net_debt, basis = _get_fcf_base(symbol)
+    revenue = _revenue_base(symbol) if inputs.get("fcf_margin") is not None else None
+
+    info = get_info(symbol)
+    current_price = _safe(info.get("currentPrice") or info.get("regularMarketPrice"))
+
+    result = calc_monte_carlo_dcf(fcf_base, inputs, n_paths, projection_years, shares,
+                                  net_debt, current_price, revenue_base=revenue,
+                                  correlation=correlation, seed=seed, bins=bins)
+    result["fcf_base"] = fcf_base
+    result["fcf_basis"] = basis
+    if revenue is not None:
+        result["revenue_base"] = revenue
+    return result
+
+
+def _rate_axis(spec, name):
+    """Sensitivity axis from a list of rates or {start, stop, steps}."""
+    if isinstance(spec, dict):
+        try:
+            start, stop = float(spec["start"]), float(spec["stop"])
+            steps = int(spec.get("steps", 5))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"{name} needs numeric start, stop and steps")
+        if steps < 1:
+            raise ValueError(f"{name} needs at least one step")
+        return np.linspace(start, stop, steps).tolist()
+    try:
+        values = [float(v) for v in spec]
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a list of numbers or {{start, stop, steps}}")
+    if not values:
+        raise ValueError(f"{name} is empty")
+    return values
+
+
+@memoized("sensitivity")
+def run_sensitivity(symbol, wacc_range=None, growth_range=None,
+                    terminal_growth=0.03, projection_years=5, terminal_range=None):
+    """Run 2D sensitivity analysis, or a 3D cube when terminal_range is given.
+
+    Ranges are lists of rates or {start, stop, steps}; grids above
+    MAX_GRID_CELLS raise ValueError.
+    """
     if wacc_range is None:
         wacc_range = [0.08, 0.09, 0.10, 0.11, 0.12]
     if growth_range is None:
         growth_range = [0.05, 0.08, 0.10, 0.12, 0.15]
-
-    fcf_base, shares, net_debt = _get_fcf_base(symbol)
+    wacc_range = _rate_axis(wacc_range, "wacc_range")
+    growth_range = _rate_axis(growth_range, "growth_range")
+    if terminal_range is not None:
+        terminal_range = _rate_axis(terminal_range, "terminal_range")
+    cells = len(wacc_range) * len(growth_range) * len(terminal_range or [0])
+    if cells > MAX_GRID_CELLS:
+        raise ValueError(f"Grid too large: {cells:,} cells (max {MAX_GRID_CELLS:,})")
+
+    fcf_base, shares, net_debt, _ = _get_fcf_base(symbol)
     if fcf_base is None:
         return {"error": "Free Cash Flow data not available"}
 
+    if terminal_range is not None:
+        return calc_sensitivity_cube(fcf_base, wacc_range, growth_range, terminal_range,
+                                     projection_years, shares, net_debt)
     return calc_sensitivity(fcf_base, wacc_range, growth_range,
                             terminal_growth, projection_years, shares, net_debt)
 
 
+@memoized("pbv")
 def run_pbv(symbol, cost_of_equity=0.10, terminal_growth=0.05):
     """Run PBV valuation for a ticker."""
     info = get_info(symbol)
@@ -150,6 +341,7 @@ def run_pbv(symbol, cost_of_equity=0.10, terminal_growth=0.05):
     return result
 
 
+@memoized("ddm")
 def run_ddm(symbol, growth_rate=0.05, cost_of_equity=0.10):
     """Run DDM (Gordon Growth Model) valuation for a ticker."""
     info = get_info(symbol)
@@ -171,6 +363,7 @@ def run_ddm(symbol, growth_rate=0.05, cost_of_equity=0.10):
     return result
 
 
+@memoized("roe")
 def run_roe_model(symbol, cost_of_equity=0.10):
     """Run ROE Sustainable Growth Model valuation for a ticker."""
     info = get_info(symbol)
@@ -197,28 +390,276 @@ def run_roe_model(symbol, cost_of_equity=0.10):
     return result
 
 
-def run_projection(symbol, metric="Total Revenue", periods_ahead=4):
-    """Run linear projection on a financial metric."""
-    from stock_checker.alpha.services.data_fetcher import get_financials
+# Tickers whose inputs are fetched concurrently in run_valuation_batch
+VALUATION_FETCH_WORKERS = 8
+# Warehouse statements _valuation_inputs reads
+_VALUATION_STATEMENTS = ("balance", "cashflow")
 
-    # Try income statement first, then cashflow, then balance sheet
-    series = None
-    for fetcher in [get_financials, get_cashflow, get_balance_sheet]:
-        df = fetcher(symbol)
-        series = _extract_row(df, metric)
-        if series is not None:
-            break
 
-    if series is None:
-        return {"error": f"Metric '{metric}' not available"}
+def _valuation_inputs(symbol):
+    """One INPUT_COLUMNS row for the synthesis; the same sources as the run_* models."""
+    from stock_checker.alpha.services.scores import _detect_sector
 
+    fcf, shares, net_debt, basis = _get_fcf_base(symbol)
+    info = get_info(symbol)
+    bvps = _safe(info.get("bookValue"))
+    if bvps is None and shares:
+        balance = get_balance_sheet(symbol)
+        if balance is not None and not balance.empty:
+            equity = _safe(balance.iloc[:, 0].get("Stockholders Equity"))
+            if equity and shares > 0:
+                bvps = equity / shares
+    return {
+        "sector": _detect_sector(symbol),
+        "price": _safe(info.get("currentPrice") or info.get("regularMarketPrice")),
+        "fcf": fcf,
+        "shares": shares,
+        "net_debt": net_debt,
+        "roe": _safe(info.get("returnOnEquity")),
+        "bvps": bvps,
+        "dividend": _safe(info.get("lastDividendValue") or info.get("dividendRate")),
+        "eps": _safe(info.get("trailingEps") or info.get("epsTrailingTwelveMonths")),
+        "payout": _safe(info.get("payoutRatio")),
+        "fcf_basis": basis["fcf"],
+    }
+
+
+def _prefetch_valuation_data(symbol, stale):
+    """Network part of the inputs: warm the info cache and fetch stale statements.
+
+    Returns:
+        {statement: raw DataFrame or None} for the stale statements
+    """
+    get_info(symbol)
+    return {statement: get_raw_statement(symbol, statement) for statement in stale}
+
+
+def _gather_valuation_inputs(tickers):
+    """Inputs for every ticker, with the yfinance fetches run concurrently.
+
+    Only network calls run on the worker threads. Stale statements are
+    fetched there and ingested afterwards, and every warehouse read and
+    write happens on the calling thread, so the database session is never
+    shared between threads. Without an app context there is no warehouse,
+    and the inputs are built entirely on the workers.
+
+    Returns:
+        ({ticker: inputs row}, {ticker: error message})
+    """
+    workers = min(VALUATION_FETCH_WORKERS, max(len(tickers), 1))
+    rows, errors = {}, {}
+
+    def collect(futures):
+        for symbol, future in futures.items():
+            try:
+                rows[symbol] = future.result()
+            except Exception:
+                logging.warning("Valuation inputs unavailable for %s", symbol)
+                errors[symbol] = "Failed to load valuation inputs"
+
+    if not has_app_context():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            collect({symbol: pool.submit(_valuation_inputs, symbol) for symbol in tickers})
+        return rows, errors
+
+    try:
+        stale = stale_statements(tickers, _VALUATION_STATEMENTS)
+    except SQLAlchemyError:
+        db.session.rollback()
+        stale = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetches = {symbol: pool.submit(_prefetch_valuation_data, symbol, stale.get(symbol.upper(), ()))
+                   for symbol in tickers}
+        fetched = {}
+        for symbol, future in fetches.items():
+            try:
+                fetched[symbol] = future.result()
+            except Exception:
+                # Left stale; _valuation_inputs retries (and reports) the fetch
+                logging.warning("Prefetch failed for %s", symbol)
+
+    for symbol, statements in fetched.items():
+        try:
+            for statement, df in statements.items():
+                ingest_statement(symbol, statement, "annual", df)
+        except Exception:
+            db.session.rollback()
+            logging.warning("Could not store fetched statements for %s", symbol)
+    for symbol in tickers:
+        try:
+            rows[symbol] = _valuation_inputs(symbol)
+        except Exception:
+            logging.warning("Valuation inputs unavailable for %s", symbol)
+            errors[symbol] = "Failed to load valuation inputs"
+    return rows, errors
+
+
+def _opt_round(v, digits=2):
+    return None if v is None or v != v else round(float(v), digits)
+
+
+def run_valuation_batch(tickers, overrides=None):
+    """Fair-value synthesis for many tickers in one pass.
+
+    Inputs are gathered once per ticker (concurrently), then DCF, PBV, DDM and
+    ROE-growth are valued for all tickers at once and blended with sector
+    model weights.
+
+    Args:
+        tickers: ticker symbols
+        overrides: optional wacc / growth_rate / terminal_growth applied to
+                   every ticker instead of the sector defaults
+
+    Returns:
+        list of dicts in input order (or {ticker, error})
+    """
+    rows, errors = _gather_valuation_inputs(tickers)
+    results = {symbol: {"ticker": symbol, "error": msg} for symbol, msg in errors.items()}
+    if rows:
+        inputs = pd.DataFrame.from_dict(rows, orient="index")
+        frame = inputs.reindex(columns=INPUT_COLUMNS)
+        params = sector_params(frame["sector"])
+        for key, value in (overrides or {}).items():
+            if key not in params.columns:
+                raise ValueError(f"Unknown assumption: {key}")
+            try:
+                params[key] = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number")
+        synthesis = calc_valuation_synthesis(frame, params)
+        values, weights, summary = synthesis["values"], synthesis["weights"], synthesis["summary"]
+
+        for symbol in inputs.index:
+            s = summary.loc[symbol]
+            results[symbol] = {
+                "ticker": symbol,
+                "sector": inputs.at[symbol, "sector"],
+                "current_price": _opt_round(inputs.at[symbol, "price"]),
+                "fair_value": _opt_round(s["fair_value"]),
+                "upside_pct": _opt_round(s["upside_pct"]),
+                "verdict": s["verdict"],
+                "models": {
+                    m: {"intrinsic_per_share": _opt_round(values.at[symbol, m]),
+                        "weight": _opt_round(weights.at[symbol, m], 4)}
+                    for m in MODELS
+                },
+                "assumptions": {k: float(v) for k, v in params.loc[symbol].items()},
+                "fcf_basis": inputs.at[symbol, "fcf_basis"],
+            }
+    return [results[symbol] for symbol in tickers]
+
+
+# Statement each KEY_METRICS metric is read from
+_METRIC_STATEMENTS = {m: category for category, metrics in KEY_METRICS.items() for m in metrics}
+_STATEMENT_FETCHERS = {
+    "income": get_financials,
+    "balance": get_balance_sheet,
+    "cashflow": get_cashflow,
+}
+
+
+def _metric_series(symbol, metrics):
+    """{metric: series (oldest first)} for the metrics available for symbol.
+
+    Known metrics are read from their own statement; others fall back to
+    trying the income statement, cash flow, then balance sheet. Each
+    statement is fetched at most once.
+    """
+    frames = {}
+
+    def statement(category):
+        if category not in frames:
+            frames[category] = _STATEMENT_FETCHERS[category](symbol)
+        return frames[category]
+
+    found = {}
+    for metric in metrics:
+        home = _METRIC_STATEMENTS.get(metric)
+        for category in [home] if home else ["income", "cashflow", "balance"]:
+            series = _extract_row(statement(category), metric)
+            if series is not None:
+                found[metric] = series
+                break
+    return found
+
+
+def _series_payload(series):
     values = [_safe(v) for v in series.values]
     labels = [s.strftime("%Y-%m-%d") if hasattr(s, 'strftime') else str(s)
               for s in series.index]
+    return values, labels
+
+
+def run_projection(symbol, metric="Total Revenue", periods_ahead=4, method="linear"):
+    """Run a trend projection ('linear', 'log' or 'robust') on a financial metric."""
+    series = _metric_series(symbol, [metric]).get(metric)
+    if series is None:
+        return {"error": f"Metric '{metric}' not available"}
 
-    result = calc_linear_projection(values, periods_ahead)
+    values, labels = _series_payload(series)
+    # The same fit as run_projections, so both endpoints agree to the cent
+    fit = calc_projections([[np.nan if v is None else v for v in values]],
+                           periods_ahead, method)
+    result = projection_row(fit, 0, method=method)
+    result["method"] = method
     result["metric"] = metric
     result["historical_labels"] = labels
     result["historical_values"] = values
 
     return result
+
+
+def run_projections(tickers, metrics=None, periods_ahead=4, method="linear"):
+    """Projections for many metrics of many tickers in one vectorized fit.
+
+    Every available (ticker, metric) series is stacked into one matrix,
+    aligned on its most recent period, and fitted with a single
+    calc_projections call. Each result matches run_projection for that
+    ticker and metric.
+
+    Args:
+        tickers: ticker symbols
+        metrics: metric names (default: every KEY_METRICS metric)
+        periods_ahead: periods to project
+        method: 'linear', 'log' or 'robust'
+
+    Returns:
+        list of {ticker, projections: {metric: result}, missing: [metrics]}
+        in input order
+    """
+    if metrics is None:
+        metrics = [m for group in KEY_METRICS.values() for m in group]
+    if method not in PROJECTION_METHODS:
+        raise ValueError(f"Unknown projection method: {method} "
+                         f"(use one of {', '.join(PROJECTION_METHODS)})")
+
+    keys, payloads, results = [], [], {}
+    for symbol in tickers:
+        results[symbol] = {"ticker": symbol, "projections": {}, "missing": []}
+        try:
+            found = _metric_series(symbol, metrics)
+        except Exception:
+            logging.warning("Statements unavailable for %s", symbol)
+            results[symbol]["error"] = "Failed to load financial statements"
+            continue
+        for metric in metrics:
+            if metric in found:
+                keys.append((symbol, metric))
+                payloads.append(_series_payload(found[metric]))
+            else:
+                results[symbol]["missing"].append(metric)
+
+    if keys:
+        width = max(len(values) for values, _ in payloads)
+        matrix = np.full((len(keys), width), np.nan)
+        for i, (values, _) in enumerate(payloads):
+            matrix[i, width - len(values):] = [np.nan if v is None else v for v in values]
+        fit = calc_projections(matrix, periods_ahead, method)
+
+        for i, ((symbol, metric), (values, labels)) in enumerate(zip(keys, payloads)):
+            result = projection_row(fit, i, width - len(values), method)
+            result["metric"] = metric
+            result["historical_labels"] = labels
+            result["historical_values"] = values
+            results[symbol]["projections"][metric] = result
+    return [results[symbol] for symbol in tickers]
@@ -0,0 +1,137 @@
+"""Dynamic peer discovery: a KD-tree index over the scored universe.
+
+Features are the latest stored ratios per ticker (score_history) plus size
+from the fundamentals warehouse (latest annual revenue and total assets);
+sectors come from the universe registry when present. The index is built
+once per process and kept current incrementally: a periodic check picks up
+tickers whose statements or score snapshots changed since the last build
+and replaces just their rows.
+"""
+
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import FundamentalFetch, ScoreHistory
+from stock_checker.alpha.calculations.peers import PeerIndex, size_features
+from stock_checker.alpha.services.fundamentals import load_long
+from stock_checker.alpha.services.score_history import load_latest_ratio_panel
+from stock_checker.alpha.services.universe import get_universe_arrays
+
+# How often (seconds) a query may check the stores for changed tickers
+REFRESH_CHECK_SECONDS = 60
+
+_SIZE_ITEMS = ["Total Revenue", "Total Assets"]
+
+_lock = threading.Lock()
+_state = {"index": None, "watermark": (None, None), "checked_at": 0.0}
+
+
+def _watermark():
+    """Latest (statement fetch, score snapshot write) times."""
+    fetched = db.session.query(db.func.max(FundamentalFetch.fetched_at)).scalar()
+    scored = db.session.query(db.func.max(ScoreHistory.updated_at)).scalar()
+    return fetched, scored
+
+
+def _changed_tickers(watermark):
+    """Tickers with statements fetched or snapshots written after watermark."""
+    fetched, scored = watermark
+    q1 = db.session.query(FundamentalFetch.ticker)
+    if fetched is not None:
+        q1 = q1.filter(FundamentalFetch.fetched_at > fetched)
+    q2 = db.session.query(ScoreHistory.ticker)
+    if scored is not None:
+        q2 = q2.filter(ScoreHistory.updated_at > scored)
+    return sorted({r[0] for r in q1.all()} | {r[0] for r in q2.all()})
+
+
+def load_peer_features(tickers=None):
+    """(features DataFrame, sector Series) for the index, indexed by ticker."""
+    panel = load_latest_ratio_panel(tickers)
+    long = load_long(tickers=tickers, items=_SIZE_ITEMS, freq="annual")
+    latest = long[long["offset"] == 0].drop_duplicates(["ticker", "item"])
+    size = latest.pivot(index="ticker", columns="item", values="value") if len(latest) else pd.DataFrame()
+    size = size.reindex(columns=_SIZE_ITEMS)
+
+    index = panel.index.union(size.index) if len(panel) else size.index
+    if not len(index):
+        return pd.DataFrame(), pd.Series(dtype=object)
+    features = panel.reindex(index) if len(panel) else pd.DataFrame(index=index)
+    size = size.reindex(index)
+    for col, values in size_features(size["Total Revenue"], size["Total Assets"]).items():
+        features[col] = values
+
+    sectors = (features["sector"] if "sector" in features.columns
+               else pd.Series(None, index=index, dtype=object))
+    arr = get_universe_arrays()
+    registry = pd.Series(arr["industry_key"], index=arr["tickers"], dtype=object)
+    registry = registry[registry != "unknown"].reindex(index)
+    sectors = registry.fillna(sectors).fillna("unknown")
+    return features, sectors
+
+
+def refresh_peer_index():
+    """Rebuild the index from scratch and swap it in."""
+    watermark = _watermark()
+    features, sectors = load_peer_features()
+    index = PeerIndex(features, sectors)
+    with _lock:
+        _state.update(index=index, watermark=watermark, checked_at=time.monotonic())
+    return index
+
+
+def update_peer_index(tickers=None):
+    """Replace the rows of tickers (default: those changed since the last build).
+
+    The update is applied to a copy that is swapped in under the lock, so
+    queries running against the current index never see it half-updated.
+    """
+    with _lock:
+        current, last_watermark = _state["index"], _state["watermark"]
+    if current is None:
+        return refresh_peer_index()
+    watermark = _watermark()
+    if tickers is None:
+        tickers = _changed_tickers(last_watermark)
+    index = current
+    if tickers:
+        features, sectors = load_peer_features(tickers)
+        index = current.copy().update(features, sectors)
+    with _lock:
+        if _state["index"] is not current:
+            # Rebuilt or invalidated meanwhile; keep the newer state
+            return _state["index"] or index
+        _state.update(index=index, watermark=watermark, checked_at=time.monotonic())
+    return index
+
+
+def get_peer_index():
+    """Current index, built on first use and updated when the stores change."""
+    index = _state["index"]
+    if index is None:
+        return refresh_peer_index()
+    if time.monotonic() - _state["checked_at"] > REFRESH_CHECK_SECONDS:
+        if _watermark() != _state["watermark"]:
+            return update_peer_index()
+        with _lock:
+            _state["checked_at"] = time.monotonic()
+    return index
+
+
+def find_peers(symbol, k=5, same_sector=True):
+    """k most similar tickers to symbol ([] when it is not in the index)."""
+    try:
+        index = get_peer_index()
+    except Exception:
+        logging.warning("Peer index unavailable for %s", symbol)
+        return []
+    return index.query(symbol.upper(), k=k, same_sector=same_sector)
+
+
+def invalidate_peer_index():
+    with _lock:
+        _state.update(index=None, watermark=(None, None), checked_at=0.0)
@@ -6,6 +6,7 @@ from stock_checker.alpha.models.database import db
 from stock_checker.alpha.models.schemas import (
     Watchlist, WatchlistItem, AnalysisNote, RatioSnapshot, ValuationResult
 )
+from stock_checker.alpha.services.valuation_cache import CACHE_PREFIX
 
 
 # --- Watchlists ---
@@ -128,7 +129,10 @@ def save_valuation(ticker, model_type, assumptions, results):
 
 
 def list_valuations(ticker=None):
-    q = ValuationResult.query.order_by(ValuationResult.created_at.desc())
+    # Rows written by the valuation result cache are not saved valuations
+    q = (ValuationResult.query
+         .filter(~ValuationResult.model_type.startswith(CACHE_PREFIX))
+         .order_by(ValuationResult.created_at.desc()))
     if ticker:
         q = q.filter_by(ticker=ticker.upper())
     return [v.to_dict() for v in q.all()]
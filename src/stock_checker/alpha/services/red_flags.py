@@ -0,0 +1,99 @@
+"""Universe red-flag scan over the fundamentals warehouse.
+
+scan_red_flags() runs calculations/red_flags.py over the stored annual
+facts of many tickers in one pass and replaces those tickers' stored flags,
+so listing flagged companies is a single indexed query.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import RedFlag
+from stock_checker.alpha.calculations.red_flags import FLAG_ITEMS, calc_red_flags
+from stock_checker.alpha.services.fundamentals import load_long
+
+SEVERITY_ORDER = {"critical": 0, "warning": 1, "info": 2}
+
+# Tickers per warehouse read; keeps the IN clause and the matrices small
+SCAN_BATCH = 200
+
+
+def _scan_batch(tickers, scanned_at):
+    items = [item for names in FLAG_ITEMS.values() for item in names]
+    long = load_long(tickers=tickers, items=items, freq="annual")
+    flags = calc_red_flags(long)
+
+    RedFlag.query.filter(RedFlag.ticker.in_(tickers)).delete(synchronize_session=False)
+    if len(flags):
+        records = [
+            {"ticker": r.ticker, "period_end": r.period.date(), "is_latest": r.offset == 0,
+             "flag_type": r.type, "severity": r.severity, "metric": r.metric,
+             "value": r.value, "message": r.message[:300], "scanned_at": scanned_at}
+            for r in flags.itertuples(index=False)
+        ]
+        db.session.execute(insert(RedFlag), records)
+    db.session.commit()
+    return flags
+
+
+def scan_red_flags(tickers=None):
+    """Scan tickers (default: every ticker in the warehouse) and store their flags.
+
+    Reads the warehouse only; load statements first with
+    `flask alpha fundamentals-refresh`.
+
+    Returns:
+        dict with tickers scanned, flagged tickers and flag counts by severity
+    """
+    if tickers is None:
+        long = load_long(items=["Total Revenue"], freq="annual")
+        tickers = sorted(set(long["ticker"]))
+    tickers = [t.upper() for t in tickers]
+    scanned_at = datetime.now(timezone.utc)
+
+    flagged, counts = set(), {}
+    for start in range(0, len(tickers), SCAN_BATCH):
+        flags = _scan_batch(tickers[start:start + SCAN_BATCH], scanned_at)
+        flagged.update(flags["ticker"])
+        for severity, n in flags["severity"].value_counts().items():
+            counts[severity] = counts.get(severity, 0) + int(n)
+    return {"tickers": len(tickers), "flagged": len(flagged), "by_severity": counts}
+
+
+def list_red_flags(severity=None, flag_type=None, latest_only=True, ticker=None):
+    """Stored flags grouped by ticker, worst first.
+
+    Args:
+        severity: minimum severity ('info', 'warning' or 'critical')
+        flag_type: only this flag type
+        latest_only: only flags on each ticker's latest period
+        ticker: only this ticker (all its periods when latest_only is False)
+
+    Returns:
+        list of {ticker, worst, flags: [...]}
+    """
+    q = RedFlag.query
+    if severity:
+        if severity not in SEVERITY_ORDER:
+            raise ValueError(f"Unknown severity: {severity}")
+        allowed = [s for s, rank in SEVERITY_ORDER.items() if rank <= SEVERITY_ORDER[severity]]
+        q = q.filter(RedFlag.severity.in_(allowed))
+    if flag_type:
+        q = q.filter(RedFlag.flag_type == flag_type)
+    if latest_only:
+        q = q.filter(RedFlag.is_latest.is_(True))
+    if ticker:
+        q = q.filter(RedFlag.ticker == ticker.upper())
+
+    grouped = {}
+    for flag in q.order_by(RedFlag.ticker, RedFlag.period_end.desc()).all():
+        grouped.setdefault(flag.ticker, []).append(flag.to_dict())
+    out = [
+        {"ticker": t, "worst": min((f["severity"] for f in flags), key=SEVERITY_ORDER.get),
+         "flags": sorted(flags, key=lambda f: SEVERITY_ORDER[f["severity"]])}
+        for t, flags in grouped.items()
+    ]
+    out.sort(key=lambda g: (SEVERITY_ORDER[g["worst"]], -len(g["flags"]), g["ticker"]))
+    return out
@@ -0,0 +1,95 @@
+"""Quarterly rollups (TTM, QoQ, YoY) over the fundamentals warehouse.
+
+Rollups are computed from stored quarterly facts only — no upstream calls
+— in one calc_rollups pass per batch and cached per ticker. Each cached
+entry remembers the fetch times of the ticker's quarterly slices, so when a
+new quarter is ingested only that ticker is recomputed on the next read.
+Quarterly slices are loaded by `flask alpha fundamentals-refresh --quarterly`.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import FundamentalFetch
+from stock_checker.alpha.calculations.rollups import (
+    ROLLUP_COLUMNS, calc_rollups, latest_rollups,
+)
+from stock_checker.alpha.services.fundamentals import load_long
+
+_lock = threading.Lock()
+# ticker -> (quarterly fetch marker, rollup DataFrame)
+_cache = {}
+
+
+def _fetch_markers(tickers=None):
+    """{ticker: ((statement, fetched_at), ...)} for stored quarterly slices."""
+    q = db.session.query(FundamentalFetch.ticker, FundamentalFetch.statement,
+                         FundamentalFetch.fetched_at).filter(FundamentalFetch.freq == "quarterly")
+    if tickers is not None:
+        q = q.filter(FundamentalFetch.ticker.in_(tickers))
+    markers = {}
+    for ticker, statement, fetched_at in q.order_by(FundamentalFetch.statement).all():
+        markers.setdefault(ticker, []).append((statement, fetched_at))
+    return {t: tuple(m) for t, m in markers.items()}
+
+
+def get_rollups(tickers=None):
+    """Rollup rows (ROLLUP_COLUMNS) for tickers, recomputing only stale ones.
+
+    Args:
+        tickers: symbols (default: every ticker with stored quarterly data)
+
+    Returns:
+        DataFrame sorted by ticker, statement, item, period
+    """
+    if tickers is not None:
+        tickers = [t.upper() for t in tickers]
+    markers = _fetch_markers(tickers)
+    stale = [t for t, m in markers.items() if _cache.get(t, (None,))[0] != m]
+    if stale:
+        rolled = calc_rollups(load_long(tickers=stale, freq="quarterly"))
+        groups = dict(tuple(rolled.groupby("ticker", sort=False))) if len(rolled) else {}
+        with _lock:
+            for t in stale:
+                frame = groups.get(t, pd.DataFrame(columns=ROLLUP_COLUMNS))
+                _cache[t] = (markers[t], frame.reset_index(drop=True))
+
+    frames = [_cache[t][1] for t in sorted(markers) if len(_cache[t][1])]
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _opt(v):
+    return None if v is None or not np.isfinite(v) else float(v)
+
+
+def get_ttm(symbol, items=None):
+    """Latest-quarter rollup per item for one ticker.
+
+    Returns:
+        {item: {'period', 'statement', 'value', 'ttm', 'qoq', 'yoy', 'ttm_yoy'}}
+    """
+    latest = latest_rollups(get_rollups([symbol]))
+    if items is not None:
+        latest = latest[latest["item"].isin(items)]
+    out = {}
+    for row in latest.itertuples(index=False):
+        out[row.item] = {
+            "period": row.period.strftime("%Y-%m-%d"),
+            "statement": row.statement,
+            "value": _opt(row.value),
+            "ttm": _opt(row.ttm),
+            "qoq": None if _opt(row.qoq) is None else round(row.qoq, 2),
+            "yoy": None if _opt(row.yoy) is None else round(row.yoy, 2),
+            "ttm_yoy": None if _opt(row.ttm_yoy) is None else round(row.ttm_yoy, 2),
+        }
+    return out
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,189 @@
+"""Point-in-time score history store and composite-score backtests."""
+
+import json
+import math
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import ScoreHistory
+from stock_checker.alpha.calculations.batch_scores import calc_scores_batch
+from stock_checker.alpha.calculations.score_backtest import calc_quantile_backtest
+from stock_checker.alpha.services.data_fetcher import get_closes
+
+_SCORE_FIELDS = ("quality_score", "valuation_score", "risk_score", "composite_score")
+
+
+def _json_safe(v):
+    if v is None:
+        return None
+    if isinstance(v, (np.integer,)):
+        return int(v)
+    if isinstance(v, (np.floating, float)):
+        return None if math.isnan(v) or math.isinf(v) else float(v)
+    return v
+
+
+def record_scores(panel, scores, as_of=None):
+    """Upsert one score snapshot per ticker for the given date.
+
+    Args:
+        panel: DataFrame indexed by ticker with a 'sector' column and the ratio
+               inputs that were scored (stored so history can be re-scored later)
+        scores: DataFrame from calc_scores_batch()['scores'], same index as panel
+        as_of: snapshot date (default: today)
+
+    Returns:
+        number of rows written
+    """
+    as_of = as_of or date.today()
+    tickers = [t.upper() for t in panel.index]
+    existing = {
+        row.ticker: row
+        for row in ScoreHistory.query.filter(
+            ScoreHistory.as_of == as_of, ScoreHistory.ticker.in_(tickers)
+        ).all()
+    }
+
+    ratio_cols = [c for c in panel.columns if c != "sector"]
+    for ticker, (_, inputs), (_, scored) in zip(tickers, panel.iterrows(), scores.iterrows()):
+        row = existing.get(ticker) or ScoreHistory(ticker=ticker, as_of=as_of)
+        row.sector = inputs.get("sector") or "unknown"
+        for field in _SCORE_FIELDS:
+            setattr(row, field, _json_safe(scored[field]))
+        row.recommendation = scored["recommendation"]
+        row.ratios_json = json.dumps({c: _json_safe(inputs[c]) for c in ratio_cols})
+        if ticker not in existing:
+            db.session.add(row)
+
+    db.session.commit()
+    return len(tickers)
+
+
+def _history_query(tickers=None, start=None, end=None):
+    q = ScoreHistory.query
+    if tickers:
+        q = q.filter(ScoreHistory.ticker.in_([t.upper() for t in tickers]))
+    if start:
+        q = q.filter(ScoreHistory.as_of >= start)
+    if end:
+        q = q.filter(ScoreHistory.as_of <= end)
+    return q.order_by(ScoreHistory.as_of, ScoreHistory.ticker)
+
+
+def list_score_history(ticker, start=None, end=None):
+    """Score snapshots for one ticker, oldest first."""
+    return [r.to_dict() for r in _history_query([ticker], start, end).all()]
+
+
+def load_ratio_panel(tickers=None, start=None, end=None):
+    """Load stored snapshots as a long panel: one row per (as_of, ticker).
+
+    Columns: as_of, ticker, sector, the stored score fields, plus every ratio
+    input that was recorded. Ready to feed straight back into calc_scores_batch.
+    """
+    rows = _history_query(tickers, start, end).with_entities(
+        ScoreHistory.as_of, ScoreHistory.ticker, ScoreHistory.sector,
+        ScoreHistory.quality_score, ScoreHistory.valuation_score,
+        ScoreHistory.risk_score, ScoreHistory.composite_score,
+        ScoreHistory.ratios_json,
+    ).all()
+    if not rows:
+        return pd.DataFrame()
+
+    meta = pd.DataFrame.from_records(
+        [r[:7] for r in rows],
+        columns=["as_of", "ticker", "sector", *_SCORE_FIELDS],
+    )
+    ratios = pd.DataFrame.from_records([json.loads(r[7]) for r in rows])
+    panel = pd.concat([meta, ratios], axis=1)
+    panel["as_of"] = pd.to_datetime(panel["as_of"])
+    return panel
+
+
+def load_latest_ratio_panel(tickers=None, with_scores=False):
+    """Most recent stored snapshot per ticker, indexed by ticker.
+
+    Returns the ratio inputs plus 'sector' and 'as_of', ready for
+    calc_scores_batch; tickers with no history are simply absent.
+
+    Args:
+        tickers: restrict to these tickers (default: every recorded ticker)
+        with_scores: also include the stored score fields and recommendation
+    """
+    latest = db.session.query(
+        ScoreHistory.ticker, db.func.max(ScoreHistory.as_of).label("as_of")
+    )
+    if tickers is not None:
+        tickers = [t.upper() for t in tickers]
+        if not tickers:
+            return pd.DataFrame()
+        latest = latest.filter(ScoreHistory.ticker.in_(tickers))
+    latest = latest.group_by(ScoreHistory.ticker).subquery()
+
+    fields = [ScoreHistory.ticker, ScoreHistory.as_of, ScoreHistory.sector, ScoreHistory.ratios_json]
+    if with_scores:
+        fields += [getattr(ScoreHistory, f) for f in _SCORE_FIELDS] + [ScoreHistory.recommendation]
+    rows = (
+        db.session.query(*fields)
+        .join(latest, (ScoreHistory.ticker == latest.c.ticker)
+              & (ScoreHistory.as_of == latest.c.as_of))
+        .all()
+    )
+    if not rows:
+        return pd.DataFrame()
+    panel = pd.DataFrame.from_records(
+        [json.loads(r.ratios_json) for r in rows],
+        index=pd.Index([r.ticker for r in rows], name="ticker"),
+    )
+    panel["sector"] = [r.sector for r in rows]
+    panel["as_of"] = [r.as_of for r in rows]
+    if with_scores:
+        for f in (*_SCORE_FIELDS, "recommendation"):
+            panel[f] = [getattr(r, f) for r in rows]
+    return panel
+
+
+def load_score_panel(tickers=None, start=None, end=None, field="composite_score"):
+    """Stored scores pivoted to (as_of dates × tickers)."""
+    panel = load_ratio_panel(tickers, start, end)
+    if panel.empty:
+        return pd.DataFrame()
+    return panel.pivot_table(index="as_of", columns="ticker", values=field, aggfunc="last")
+
+
+def run_score_backtest(tickers=None, start=None, end=None, n_quantiles=5,
+                       horizon=21, freq="ME", rescore=True):
+    """Backtest stored composite scores against subsequent price returns.
+
+    The stored ratio inputs are re-scored in one calc_scores_batch call so the
+    backtest always reflects the current scoring logic, even for snapshots
+    recorded before a weight change. Prices for every ticker come from a
+    single batched download.
+
+    Returns:
+        dict from calc_quantile_backtest plus the tickers and date range used
+    """
+    panel = load_ratio_panel(tickers, start, end)
+    if panel.empty:
+        return {"error": "No score history recorded for these tickers"}
+
+    if rescore:
+        panel["composite_score"] = calc_scores_batch(panel)["scores"]["composite_score"].to_numpy()
+
+    scores = panel.pivot_table(
+        index="as_of", columns="ticker", values="composite_score", aggfunc="last"
+    )
+    if scores.shape[1] < n_quantiles:
+        return {"error": f"Need at least {n_quantiles} scored tickers for {n_quantiles} quantiles"}
+
+    prices = get_closes(scores.columns, start=scores.index.min().strftime("%Y-%m-%d"))
+    result = calc_quantile_backtest(scores, prices, n_quantiles, horizon, freq)
+    if "error" not in result:
+        result["tickers"] = list(scores.columns)
+        result["start"] = scores.index.min().strftime("%Y-%m-%d")
+        result["end"] = scores.index.max().strftime("%Y-%m-%d")
+        result["rescored"] = rescore
+    return result
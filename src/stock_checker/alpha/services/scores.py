@@ -1,15 +1,82 @@
 """Scoring service: computes Quality, Valuation, Risk, and Composite scores."""
 
+import logging
+
+import numpy as np
+import pandas as pd
+
 from stock_checker.alpha.services.financials import get_financial_analysis
 from stock_checker.alpha.services.trends import get_trend_analysis
 from stock_checker.alpha.services.data_fetcher import get_info
+from stock_checker.alpha.services.fundamentals import (
+    get_financials, get_balance_sheet, get_cashflow,
+)
 from stock_checker.alpha.calculations.scores import (
     calc_quality_score,
     calc_valuation_score,
     calc_risk_score,
     calc_composite_score,
 )
+from stock_checker.alpha.calculations.batch_scores import calc_scores_batch, breakdown_row
+from stock_checker.alpha.calculations.batch_ratios import (
+    statements_to_long, calc_ratios_batch, calc_implied_growth_batch, item_history,
+)
+from stock_checker.alpha.calculations.growth import calc_cagr_matrix
 from stock_checker.alpha.calculations.industry import detect_industry
+from stock_checker.alpha.calculations.sector_stats import relative_valuation_scores
+from stock_checker.alpha.services.universe import registry_industry_key
+
+# Panel column -> trend metric whose annual CAGR feeds the quality pillar
+_CAGR_METRICS = {
+    'Revenue CAGR': 'Total Revenue',
+    'NI CAGR': 'Net Income',
+    'FCF CAGR': 'Free Cash Flow',
+}
+_CAGR_STATEMENTS = {
+    'Total Revenue': 'income',
+    'Net Income': 'income',
+    'Free Cash Flow': 'cashflow',
+}
+
+
+def _detect_sector(symbol):
+    """Industry key for sector-aware scoring; 'unknown' when info is unavailable.
+
+    The universe registry is consulted first so registered tickers need no
+    info lookup.
+    """
+    key = registry_industry_key(symbol)
+    if key:
+        return key
+    try:
+        info = get_info(symbol)
+        return detect_industry(info.get('sector', ''), info.get('industry', ''))
+    except Exception:
+        return 'unknown'
+
+
+def _sector_stats():
+    """Latest sector distributions, or None when not computed/unavailable."""
+    try:
+        from stock_checker.alpha.services.sector_stats import get_sector_stats
+        return get_sector_stats() or None
+    except Exception:
+        return None
+
+
+def _sector_relative(stats, panel):
+    """Per-row {'percentiles': {...}, 'valuation_score': x} from the sector distributions."""
+    pct = stats.percentile_frame(panel)
+    rel = relative_valuation_scores(pct)
+    out = []
+    for i in range(len(panel)):
+        row = pct.iloc[i]
+        out.append({
+            'as_of': stats.as_of.isoformat() if stats.as_of else None,
+            'percentiles': {k: round(float(v), 1) for k, v in row.items() if not np.isnan(v)},
+            'valuation_score': None if np.isnan(rel.iloc[i]) else round(float(rel.iloc[i]), 1),
+        })
+    return out
 
 
 def get_scores(symbol):
@@ -28,15 +95,7 @@ def get_scores(symbol):
     ratios = fin.get('ratios', {})
 
     # Detect sector for context-aware scoring (e.g. banking DER exception)
-    sector_key = 'unknown'
-    try:
-        info = get_info(symbol)
-        sector_key = detect_industry(
-            info.get('sector', ''),
-            info.get('industry', ''),
-        )
-    except Exception:
-        pass
+    sector_key = _detect_sector(symbol)
 
     quality = calc_quality_score(ratios, trends, sector=sector_key)
     valuation = calc_valuation_score(ratios, sector=sector_key)
@@ -47,6 +106,20 @@ def get_scores(symbol):
         risk['score'],
     )
 
+    details = {
+        'quality': quality['breakdown'],
+        'valuation': valuation['breakdown'],
+        'risk': risk['breakdown'],
+    }
+    stats = _sector_stats()
+    if stats:
+        row = dict(ratios)
+        annual = (trends or {}).get('annual', {})
+        for col, metric in _CAGR_METRICS.items():
+            row[col] = (annual.get(metric) or {}).get('cagr')
+        row['sector'] = sector_key
+        details['sector_relative'] = _sector_relative(stats, pd.DataFrame([row]))[0]
+
     return {
         'ticker': symbol,
         'pbv': ratios.get('PBV'),
@@ -57,9 +130,142 @@ def get_scores(symbol):
         'risk_score': risk['score'],
         'composite_score': composite['composite_score'],
         'recommendation': composite['recommendation'],
-        'score_details': {
-            'quality': quality['breakdown'],
-            'valuation': valuation['breakdown'],
-            'risk': risk['breakdown'],
-        },
+        'score_details': details,
     }
+
+
+def get_score_inputs(symbol):
+    """Gather one scoring panel row for a ticker: ratios, growth CAGRs and sector.
+
+    Returns:
+        dict of ratio name -> value, the three CAGR columns, and 'sector'
+    """
+    fin = get_financial_analysis(symbol)
+    trends = get_trend_analysis(symbol)
+
+    row = dict(fin.get('ratios', {}))
+    annual = (trends or {}).get('annual', {})
+    for col, metric in _CAGR_METRICS.items():
+        row[col] = (annual.get(metric) or {}).get('cagr')
+    row['sector'] = _detect_sector(symbol)
+    return row
+
+
+def _round2(frame):
+    """round(v, 2) per cell, as get_financial_analysis rounds its ratios."""
+    return frame.map(lambda v: round(float(v), 2))
+
+
+def _score_panel(frames, infos):
+    """Ratios, CAGRs, implied growth and sector for the loaded tickers in one pass."""
+    long = statements_to_long(frames)
+    panel = _round2(calc_ratios_batch(long, infos).reindex(list(frames)))
+    for col, metric in _CAGR_METRICS.items():
+        cagr = calc_cagr_matrix(item_history(long, _CAGR_STATEMENTS[metric], metric, panel.index))
+        panel[col] = _round2(pd.DataFrame({col: cagr}, index=panel.index))[col]
+    implied = calc_implied_growth_batch(long, infos).reindex(panel.index)
+    panel['Implied Growth'] = _round2(implied.to_frame())['Implied Growth']
+    panel['sector'] = [_detect_sector(symbol) for symbol in panel.index]
+    return panel
+
+
+def get_score_inputs_batch(tickers):
+    """Scoring panel for many tickers with one cross-sectional ratio pass.
+
+    Statements are still fetched per ticker (cached), then stacked into the
+    long format; ratios and CAGRs are computed for all tickers at once and
+    match get_score_inputs row for row. 'Implied Growth' (reverse DCF at the
+    default assumptions) is added for the screener; scoring ignores it.
+
+    If the batch pass fails, each ticker is computed alone so only the
+    tickers with bad data are reported as errors.
+
+    Returns:
+        (panel DataFrame indexed by ticker, {ticker: error message})
+    """
+    frames, infos, errors = {}, {}, {}
+    for symbol in tickers:
+        try:
+            info = get_info(symbol)
+            financials = get_financials(symbol)
+            if not info and (financials is None or financials.empty):
+                raise ValueError(f"No data available for {symbol}")
+            frames[symbol] = {
+                'income': financials,
+                'balance': get_balance_sheet(symbol),
+                'cashflow': get_cashflow(symbol),
+            }
+            infos[symbol] = info
+        except Exception:
+            errors[symbol] = "Failed to compute scores"
+    if not frames:
+        return pd.DataFrame(), errors
+
+    try:
+        return _score_panel(frames, infos), errors
+    except Exception:
+        logging.exception("Batch score inputs failed; retrying per ticker (tickers=%s)", list(frames))
+
+    rows = []
+    for symbol in frames:
+        try:
+            rows.append(_score_panel({symbol: frames[symbol]}, {symbol: infos[symbol]}))
+        except Exception:
+            errors[symbol] = "Failed to compute scores"
+    if not rows:
+        return pd.DataFrame(), errors
+    return pd.concat(rows), errors
+
+
+def _opt(v):
+    return None if v is None or (isinstance(v, float) and np.isnan(v)) else float(v)
+
+
+def get_scores_batch(tickers, record=False):
+    """Score many tickers with a single vectorized scoring pass.
+
+    Statements are fetched per ticker, ratios are computed cross-sectionally
+    (get_score_inputs_batch) and the whole panel is scored by calc_scores_batch. Each entry has the same
+    shape as get_scores(); tickers that fail to load get {ticker, error}.
+
+    Args:
+        tickers: list of ticker symbols
+        record: persist the snapshot to the score history store
+
+    Returns:
+        list of score dicts, in input order
+    """
+    panel, errors = get_score_inputs_batch(tickers)
+
+    results = {symbol: {'ticker': symbol, 'error': msg} for symbol, msg in errors.items()}
+    if not panel.empty:
+        scored = calc_scores_batch(panel)
+        scores = scored['scores']
+        stats = _sector_stats()
+        relative = _sector_relative(stats, panel) if stats else None
+        for i, symbol in enumerate(panel.index):
+            inputs = panel.iloc[i]
+            s = scores.iloc[i]
+            results[symbol] = {
+                'ticker': symbol,
+                'pbv': _opt(inputs['PBV']),
+                'per': _opt(inputs['PER']),
+                'ev_ebitda': _opt(inputs['EV/EBITDA']),
+                'quality_score': _opt(s['quality_score']),
+                'valuation_score': _opt(s['valuation_score']),
+                'risk_score': _opt(s['risk_score']),
+                'composite_score': _opt(s['composite_score']),
+                'recommendation': s['recommendation'],
+                'score_details': breakdown_row(scored['breakdown'], i, inputs['sector']),
+            }
+            if relative:
+                results[symbol]['score_details']['sector_relative'] = relative[i]
+
+        if record:
+            try:
+                from stock_checker.alpha.services.score_history import record_scores
+                record_scores(panel, scores)
+            except Exception:
+                logging.exception("Failed to record score history (tickers=%s)", list(panel.index))
+
+    return [results[symbol] for symbol in tickers]
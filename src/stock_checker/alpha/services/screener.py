@@ -0,0 +1,179 @@
+"""Universe screener service: keeps a columnar table of the latest scores in memory."""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import ScoreHistory, SavedScreen
+from stock_checker.alpha.calculations.screener import ScreenerTable, calc_indicator_columns
+from stock_checker.alpha.calculations.screen_expr import (
+    FUNCTIONS, ExpressionError, compile_expression,
+)
+from stock_checker.alpha.services.data_fetcher import get_closes
+from stock_checker.alpha.services.score_history import load_latest_ratio_panel
+from stock_checker.alpha.services.universe import get_universe_arrays, TRACKED_INDICES
+
+# How often (seconds) a query may check the store for newer snapshots
+REFRESH_CHECK_SECONDS = 60
+# Rebuild at least this often so price indicators do not go stale
+MAX_TABLE_AGE_SECONDS = 6 * 3600
+
+_lock = threading.Lock()
+_state = {"table": None, "version": None, "checked_at": 0.0, "built_at": 0.0}
+
+
+def _store_version():
+    """Cheap change marker for the score store: (row count, last write)."""
+    count, last = db.session.query(
+        db.func.count(ScoreHistory.id), db.func.max(ScoreHistory.updated_at)
+    ).one()
+    return count, last.isoformat() if last else None
+
+
+def _add_indicators(panel):
+    """Join close/SMA/RSI columns from one batched 1y price download."""
+    try:
+        closes = get_closes(panel.index, period="1y")
+        return panel.join(calc_indicator_columns(closes))
+    except Exception:
+        logging.warning("Screener indicators unavailable; continuing without price columns")
+        return panel
+
+
+def _add_registry(panel):
+    """Index-membership flags (in_lq45, in_idx30) from the universe registry."""
+    arr = get_universe_arrays()
+    pos = np.array([arr["position"].get(t, -1) for t in panel.index])
+    for code in TRACKED_INDICES:
+        bitmap = arr["members"].get(code)
+        if bitmap is None or not len(bitmap):
+            continue
+        panel[f"in_{code.lower()}"] = np.where(pos >= 0, bitmap[np.maximum(pos, 0)], False).astype(float)
+    return panel
+
+
+def refresh_screener(with_indicators=True):
+    """Rebuild the table from the latest snapshot per ticker and swap it in.
+
+    The new table is built off to the side; readers keep using the old one
+    until the single reference assignment, so a query never sees a
+    half-built table.
+    """
+    version = _store_version()
+    panel = load_latest_ratio_panel(with_scores=True)
+    if with_indicators and not panel.empty:
+        panel = _add_indicators(panel)
+    if not panel.empty:
+        panel = _add_registry(panel)
+    as_of = panel["as_of"].max().isoformat() if not panel.empty else None
+    table = ScreenerTable(panel, as_of=as_of)
+    with _lock:
+        now = time.monotonic()
+        _state.update(table=table, version=version, checked_at=now, built_at=now)
+    return table
+
+
+def get_screener_table():
+    """Current table, rebuilt when the store has changed since the last check."""
+    table = _state["table"]
+    if table is None:
+        return refresh_screener()
+    now = time.monotonic()
+    if now - _state["built_at"] > MAX_TABLE_AGE_SECONDS:
+        return refresh_screener()
+    if now - _state["checked_at"] > REFRESH_CHECK_SECONDS:
+        _state["checked_at"] = now
+        if _store_version() != _state["version"]:
+            return refresh_screener()
+    return table
+
+
+def screen(filters=None, sort="composite_score", descending=True, limit=50, columns=None,
+           where=None, rank_by=None):
+    """Run a screen against the in-memory universe table.
+
+    Args:
+        filters: list of {field, op, value} predicates
+        sort: metric to sort by (ignored when rank_by is given)
+        descending: sort direction
+        limit: maximum rows
+        columns: metrics to include per row
+        where: expression text that must hold, e.g.
+               "ROE > 15 and PER < sector_median(PER) and close > sma200"
+        rank_by: numeric expression text to sort by, e.g. "rank(ROE) - rank(PER)"
+
+    Returns:
+        dict with count, rows, universe size, data as_of and elapsed_ms
+        (time spent evaluating the screen itself)
+
+    Raises:
+        ValueError: for unknown fields/operators or invalid expressions
+    """
+    where_expr = compile_expression(where) if where else None
+    if where_expr is not None and where_expr.kind != "mask":
+        raise ExpressionError("where must be a condition")
+    rank_expr = compile_expression(rank_by) if rank_by else None
+    if rank_expr is not None and rank_expr.kind != "score":
+        raise ExpressionError("rank_by must be a numeric expression")
+
+    table = get_screener_table()
+    if table.size == 0:
+        return {"count": 0, "rows": [], "elapsed_ms": 0.0, "universe": 0, "as_of": None}
+    start = time.perf_counter()
+    result = table.query(
+        filters, sort=sort, descending=descending, limit=limit, columns=columns,
+        where=where_expr.evaluate(table) if where_expr else None,
+        sort_values=rank_expr.evaluate(table) if rank_expr else None,
+    )
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    result["universe"] = table.size
+    result["as_of"] = table.as_of
+    return result
+
+
+def screener_fields():
+    """Screenable metrics and sectors in the current table."""
+    table = get_screener_table()
+    return {
+        "fields": table.fields,
+        "expression_names": sorted(table.field_lookup),
+        "functions": sorted(FUNCTIONS),
+        "sectors": sorted(table.sector_bitmaps),
+        "universe": table.size,
+        "as_of": table.as_of,
+    }
+
+
+# --- Saved screens ---
+
+def list_saved_screens():
+    return [x.to_dict() for x in SavedScreen.query.order_by(SavedScreen.updated_at.desc()).all()]
+
+
+def save_screen(name, expression, rank_by=""):
+    """Validate and store a screen; raises ValueError for invalid expressions."""
+    if compile_expression(expression).kind != "mask":
+        raise ExpressionError("expression must be a condition")
+    if rank_by and compile_expression(rank_by).kind != "score":
+        raise ExpressionError("rank_by must be a numeric expression")
+    screen_row = SavedScreen(name=name, expression=expression, rank_by=rank_by or "")
+    db.session.add(screen_row)
+    db.session.commit()
+    return screen_row.to_dict()
+
+
+def delete_saved_screen(sid):
+    screen_row = SavedScreen.query.get_or_404(sid)
+    db.session.delete(screen_row)
+    db.session.commit()
+
+
+def run_saved_screen(sid, limit=50, columns=None):
+    screen_row = SavedScreen.query.get_or_404(sid)
+    result = screen(where=screen_row.expression, rank_by=screen_row.rank_by or None,
+                    limit=limit, columns=columns)
+    result["screen"] = screen_row.to_dict()
+    return result
@@ -0,0 +1,95 @@
+"""Nightly sector distributions and cached percentile lookups.
+
+refresh_sector_stats() summarizes the latest stored score snapshot of every
+ticker (score_history) into per-sector distributions and stores them for
+the day. get_sector_stats() serves the most recent set as an in-memory
+SectorStats, so valuation zones and score breakdowns can attach
+sector-relative percentiles without touching the database per request.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import SectorDistribution
+from stock_checker.alpha.calculations.sector_stats import (
+    SectorStats, calc_sector_distributions, DISTRIBUTION_COLUMNS,
+)
+from stock_checker.alpha.services.score_history import load_latest_ratio_panel
+
+# The stored set only changes on refresh (which clears this); the TTL picks up
+# refreshes made by another process, e.g. the nightly CLI job.
+_stats_cache = TTLCache(maxsize=1, ttl=3600)
+
+
+def refresh_sector_stats(as_of=None, tickers=None):
+    """Recompute and store sector distributions from the latest score snapshots.
+
+    Args:
+        as_of: date the set is stored under (default: today); replaces any set
+               already stored for that date
+        tickers: restrict the universe (default: every ticker with history)
+
+    Returns:
+        dict with as_of, tickers, sectors and rows written
+    """
+    as_of = as_of or date.today()
+    panel = load_latest_ratio_panel(tickers)
+    dist = calc_sector_distributions(panel)
+
+    SectorDistribution.query.filter_by(as_of=as_of).delete(synchronize_session=False)
+    for row in dist.itertuples(index=False):
+        db.session.add(SectorDistribution(
+            as_of=as_of, sector=row.sector, metric=row.metric, count=row.count,
+            mean=row.mean, median=row.median, q1=row.q1, q3=row.q3,
+            grid=np.asarray(row.grid, dtype=np.float64).tobytes(),
+        ))
+    db.session.commit()
+    clear_cache()
+    return {
+        "as_of": as_of.isoformat(),
+        "tickers": len(panel),
+        "sectors": sorted(set(dist["sector"])) if len(dist) else [],
+        "rows": len(dist),
+    }
+
+
+def load_sector_stats(as_of=None):
+    """SectorStats for the set stored on as_of (default: the latest set)."""
+    if as_of is None:
+        as_of = db.session.query(db.func.max(SectorDistribution.as_of)).scalar()
+        if as_of is None:
+            return SectorStats()
+    rows = SectorDistribution.query.filter_by(as_of=as_of).all()
+    dist = pd.DataFrame(
+        [(r.sector, r.metric, r.count, r.mean, r.median, r.q1, r.q3,
+          np.frombuffer(r.grid, dtype=np.float64)) for r in rows],
+        columns=DISTRIBUTION_COLUMNS,
+    )
+    return SectorStats(dist, as_of=as_of)
+
+
+def get_sector_stats():
+    """Latest stored SectorStats, cached in memory (empty if never refreshed)."""
+    stats = _stats_cache.get("latest")
+    if stats is None:
+        stats = load_sector_stats()
+        _stats_cache["latest"] = stats
+    return stats
+
+
+def sector_summary(sector):
+    """Stored distribution summaries for one sector, keyed by metric."""
+    stats = get_sector_stats()
+    return {
+        "sector": sector,
+        "as_of": stats.as_of.isoformat() if stats.as_of else None,
+        "metrics": {m: stats.summary(sector, m) for m in stats.metrics(sector)},
+    }
+
+
+def clear_cache():
+    _stats_cache.clear()
@@ -2,10 +2,13 @@
 
 import math
 import numpy as np
-from stock_checker.alpha.services.data_fetcher import (
+from stock_checker.alpha.services.fundamentals import (
     get_financials, get_quarterly_financials, get_balance_sheet, get_cashflow
 )
-from stock_checker.alpha.calculations.growth import calc_growth_series, calc_cagr
+from stock_checker.alpha.calculations.line_items import ITEM_ALIASES
+from stock_checker.alpha.calculations.growth import (
+    calc_growth_matrix, calc_cagr_matrix, growth_records, period_labels, statement_values,
+)
 
 
 def _safe(val):
@@ -22,11 +25,9 @@ def _safe(val):
 
 # Some IDX tickers (IFRS direct method) use different field names than the standard ones.
 # Maps canonical metric name -> list of alternative yfinance field names to try.
+# Warehouse statements are already canonical; this covers raw yfinance frames.
 METRIC_ALIASES = {
-    "Operating Cash Flow": [
-        "Cash Flowsfromusedin Operating Activities Direct",
-        "Operating Activities",
-    ],
+    **ITEM_ALIASES,
     "Free Cash Flow": [
         "Free Cash Flow",  # already canonical, kept for completeness
     ],
@@ -63,9 +64,48 @@ KEY_METRICS = {
 }
 
 
+def _resolve_rows(df, metrics):
+    """Map each available metric to its row label in df (canonical name or alias)."""
+    found = {}
+    for metric in metrics:
+        for name in [metric] + [a for a in METRIC_ALIASES.get(metric, []) if a != metric]:
+            if name in df.index:
+                found[metric] = name
+                break
+    return found
+
+
+def _statement_trends(df, metrics, category, with_cagr=True):
+    """Growth series (and CAGR) for all requested rows of one statement at once."""
+    if df is None or df.empty or len(df.columns) < 2:
+        return {}
+    rows = _resolve_rows(df, metrics)
+    if not rows:
+        return {}
+    values = statement_values(df)
+    if values is None:
+        return {}
+    position = {label: i for i, label in enumerate(df.index)}
+    values = values[[position[name] for name in rows.values()], ::-1]   # oldest first
+    labels = period_labels(df.columns)[::-1]
+    growth = calc_growth_matrix(values)
+    cagr = calc_cagr_matrix(values) if with_cagr else None
+
+    out = {}
+    for i, metric in enumerate(rows):
+        entry = {"category": category, "data": growth_records(labels, values[i], growth[i])}
+        if with_cagr:
+            entry["cagr"] = None if np.isnan(cagr[i]) else round(float(cagr[i]), 2)
+        out[metric] = entry
+    return out
+
+
 def get_trend_analysis(symbol):
     """Analyze YoY trends for key financial metrics.
 
+    Each statement is processed as one (metrics × periods) matrix: growth and
+    CAGR for every metric come from a single vectorized pass.
+
     Returns:
         dict with trend data per metric category
     """
@@ -74,45 +114,19 @@ def get_trend_analysis(symbol):
     balance = get_balance_sheet(symbol)
     cashflow = get_cashflow(symbol)
 
-    trends = {"annual": {}, "quarterly": {}}
-
-    # Annual trends
     source_map = {
         "income": financials,
         "balance": balance,
         "cashflow": cashflow,
     }
 
+    # Annual trends
+    annual = {}
     for category, metrics in KEY_METRICS.items():
-        df = source_map.get(category)
-        for metric in metrics:
-            series = _extract_row(df, metric)
-            if series is not None and len(series) >= 2:
-                safe_series = series.map(_safe)
-                growth_data = calc_growth_series(safe_series)
-
-                # Calculate CAGR if enough data
-                values = [g["value"] for g in growth_data if g["value"] is not None]
-                cagr = None
-                if len(values) >= 2:
-                    cagr = calc_cagr(values[0], values[-1], len(values) - 1)
-
-                trends["annual"][metric] = {
-                    "category": category,
-                    "data": growth_data,
-                    "cagr": round(cagr, 2) if cagr is not None else None,
-                }
+        annual.update(_statement_trends(source_map.get(category), metrics, category))
 
     # Quarterly trends (income statement only)
-    if quarterly is not None and not quarterly.empty:
-        for metric in KEY_METRICS["income"]:
-            series = _extract_row(quarterly, metric)
-            if series is not None and len(series) >= 2:
-                safe_series = series.map(_safe)
-                growth_data = calc_growth_series(safe_series)
-                trends["quarterly"][metric] = {
-                    "category": "income",
-                    "data": growth_data,
-                }
-
-    return trends
+    quarterly_trends = _statement_trends(quarterly, KEY_METRICS["income"], "income",
+                                         with_cagr=False)
+
+    return {"annual": annual, "quarterly": quarterly_trends}
@@ -0,0 +1,299 @@
+"""IDX universe registry: listings, industry keys, boards and index membership history.
+
+The registry is refreshed in bulk (one IDX listing download or a local file)
+and mirrored into in-memory arrays, so universe-wide screens, scoring and peer
+selection filter NumPy arrays instead of making per-ticker discovery calls.
+"""
+
+import logging
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import UniverseTicker, IndexMembership
+from stock_checker.alpha.calculations.industry import detect_industry
+
+IDX_COMPANY_PROFILES_URL = "https://www.idx.co.id/primary/ListedCompany/GetCompanyProfiles"
+TRACKED_INDICES = ("LQ45", "IDX30")
+
+# IDX-IC sector names -> the yfinance-style sector strings detect_industry knows.
+# Industry names are matched first, so these only matter as the fallback pass.
+_IDX_SECTOR_ALIASES = {
+    "financials": "financial services",
+    "consumer non-cyclicals": "consumer defensive",
+    "consumer cyclicals": "consumer cyclical",
+    "properties & real estate": "real estate",
+    "transportation & logistic": "industrials",
+    "energy": "energy",
+    "basic materials": "basic materials",
+    "industrials": "industrials",
+    "healthcare": "healthcare",
+    "technology": "technology",
+}
+
+_lock = threading.Lock()
+_arrays = {"data": None}
+
+
+def _normalize_ticker(raw):
+    t = (raw or "").strip().upper()
+    if t and "." not in t:
+        t += ".JK"
+    return t
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except ValueError:
+        return None
+
+
+def detect_idx_industry(sector, sub_sector="", industry=""):
+    """Industry key for an IDX-IC classification (sector / sub-sector / industry)."""
+    s = _IDX_SECTOR_ALIASES.get((sector or "").strip().lower(), "")
+    return detect_industry(s, f"{sub_sector or ''} {industry or ''}".strip())
+
+
+def _normalize_listing(rec):
+    """Accept both raw IDX profile records and {ticker, name, sector, ...} dicts."""
+    ticker = _normalize_ticker(rec.get("KodeEmiten") or rec.get("ticker"))
+    sector = rec.get("Sektor") or rec.get("sector") or ""
+    sub_sector = rec.get("SubSektor") or rec.get("sub_sector") or ""
+    industry = rec.get("Industri") or rec.get("industry") or ""
+    return {
+        "ticker": ticker,
+        "name": (rec.get("NamaEmiten") or rec.get("name") or "").strip(),
+        "idx_sector": sector,
+        "idx_industry": industry or sub_sector,
+        "industry_key": rec.get("industry_key") or detect_idx_industry(sector, sub_sector, industry),
+        "board": rec.get("PapanPencatatan") or rec.get("board") or "",
+        "listing_date": _parse_date(rec.get("TanggalPencatatan") or rec.get("listing_date")),
+    }
+
+
+def fetch_idx_listings():
+    """Download every listed company profile from IDX in a single request."""
+    from stock_checker.idx_anomaly.utils.http import get_json
+
+    data = get_json(
+        IDX_COMPANY_PROFILES_URL,
+        params={"start": 0, "length": 9999},
+        headers={
+            "Referer": "https://www.idx.co.id/",
+            "X-Requested-With": "XMLHttpRequest",
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+        },
+        timeout=30,
+    )
+    records = data.get("data") if isinstance(data, dict) else data
+    if not records:
+        raise ValueError("IDX returned no listings")
+    return records
+
+
+# --- Bulk refresh ---
+
+def refresh_universe(listings=None, deactivate_missing=True):
+    """Upsert the full listing set in one transaction.
+
+    Args:
+        listings: list of listing records (default: download from IDX)
+        deactivate_missing: mark registry tickers absent from this set as inactive
+
+    Returns:
+        dict with total, added and deactivated counts
+    """
+    if listings is None:
+        listings = fetch_idx_listings()
+    records = {}
+    for rec in listings:
+        norm = _normalize_listing(rec)
+        if norm["ticker"]:
+            records[norm["ticker"]] = norm
+
+    existing = {u.ticker: u for u in UniverseTicker.query.all()}
+    added = 0
+    for ticker, rec in records.items():
+        row = existing.get(ticker)
+        if row is None:
+            row = UniverseTicker(ticker=ticker)
+            db.session.add(row)
+            added += 1
+        for field, value in rec.items():
+            if field != "ticker":
+                setattr(row, field, value)
+        row.active = True
+
+    deactivated = 0
+    if deactivate_missing:
+        for ticker, row in existing.items():
+            if ticker not in records and row.active:
+                row.active = False
+                deactivated += 1
+
+    db.session.commit()
+    invalidate_universe()
+    return {"total": len(records), "added": added, "deactivated": deactivated}
+
+
+def record_index_constituents(index_code, tickers, as_of=None):
+    """Record an index's constituent list as of a date, extending its history.
+
+    New members open a period starting at as_of; members that dropped out
+    have their open period closed at as_of.
+    """
+    index_code = index_code.upper()
+    as_of = _parse_date(as_of) or date.today()
+    new = {_normalize_ticker(t) for t in tickers if t}
+    current = {
+        m.ticker: m
+        for m in IndexMembership.query.filter_by(index_code=index_code, end_date=None).all()
+    }
+    added = sorted(new - set(current))
+    removed = sorted(set(current) - new)
+    for ticker in added:
+        db.session.add(IndexMembership(index_code=index_code, ticker=ticker, start_date=as_of))
+    for ticker in removed:
+        current[ticker].end_date = as_of
+    db.session.commit()
+    invalidate_universe()
+    return {"index_code": index_code, "as_of": as_of.isoformat(),
+            "added": added, "removed": removed, "members": len(new)}
+
+
+def import_index_history(index_code, periods):
+    """Replace an index's membership history with [{ticker, start_date, end_date}, ...]."""
+    index_code = index_code.upper()
+    rows = []
+    for p in periods:
+        start = _parse_date(p.get("start_date"))
+        if not start or not p.get("ticker"):
+            raise ValueError("Each period needs ticker and start_date")
+        rows.append(IndexMembership(index_code=index_code, ticker=_normalize_ticker(p["ticker"]),
+                                    start_date=start, end_date=_parse_date(p.get("end_date"))))
+    IndexMembership.query.filter_by(index_code=index_code).delete()
+    db.session.add_all(rows)
+    db.session.commit()
+    invalidate_universe()
+    return {"index_code": index_code, "periods": len(rows)}
+
+
+# --- Queries ---
+
+def index_members(index_code, as_of=None):
+    """Tickers in an index on a given date (default: today)."""
+    as_of = _parse_date(as_of) or date.today()
+    q = IndexMembership.query.filter(
+        IndexMembership.index_code == index_code.upper(),
+        IndexMembership.start_date <= as_of,
+        db.or_(IndexMembership.end_date.is_(None), IndexMembership.end_date > as_of),
+    )
+    return sorted(m.ticker for m in q.all())
+
+
+def index_history(index_code, ticker=None):
+    q = IndexMembership.query.filter_by(index_code=index_code.upper())
+    if ticker:
+        q = q.filter_by(ticker=_normalize_ticker(ticker))
+    return [m.to_dict() for m in q.order_by(IndexMembership.start_date, IndexMembership.ticker).all()]
+
+
+def invalidate_universe():
+    with _lock:
+        _arrays["data"] = None
+
+
+def get_universe_arrays():
+    """Active universe as parallel arrays plus current index-membership bitmaps."""
+    data = _arrays["data"]
+    if data is not None:
+        return data
+
+    rows = (db.session.query(UniverseTicker.ticker, UniverseTicker.industry_key, UniverseTicker.board)
+            .filter(UniverseTicker.active.is_(True))
+            .order_by(UniverseTicker.ticker).all())
+    tickers = np.array([r[0] for r in rows], dtype=object)
+    position = {t: i for i, t in enumerate(tickers)}
+    members = {}
+    for m in IndexMembership.query.filter(IndexMembership.end_date.is_(None)).all():
+        bitmap = members.setdefault(m.index_code, np.zeros(len(tickers), dtype=bool))
+        if m.ticker in position:
+            bitmap[position[m.ticker]] = True
+
+    data = {
+        "tickers": tickers,
+        "industry_key": np.array([r[1] or "unknown" for r in rows], dtype=object),
+        "board": np.array([r[2] or "" for r in rows], dtype=object),
+        "position": position,
+        "members": members,
+    }
+    with _lock:
+        _arrays["data"] = data
+    return data
+
+
+def universe_tickers(industry_key=None, board=None, index_code=None, as_of=None):
+    """Active tickers filtered by industry key, board and index membership.
+
+    Current membership is a bitmap lookup; as_of queries the stored history.
+    """
+    arr = get_universe_arrays()
+    mask = np.ones(len(arr["tickers"]), dtype=bool)
+    if industry_key:
+        mask &= arr["industry_key"] == industry_key
+    if board:
+        mask &= arr["board"] == board
+    if index_code:
+        if as_of:
+            mask &= np.isin(arr["tickers"], index_members(index_code, as_of))
+        else:
+            bitmap = arr["members"].get(index_code.upper())
+            mask &= bitmap if bitmap is not None else False
+    return arr["tickers"][mask].tolist()
+
+
+def lookup_industry_key(symbol):
+    """Registry industry key for a ticker, or None when it is not registered."""
+    arr = get_universe_arrays()
+    i = arr["position"].get(symbol.upper())
+    return None if i is None else arr["industry_key"][i]
+
+
+def universe_peers(symbol, industry_key, limit=2):
+    """Same-industry tickers from the registry, index constituents first."""
+    arr = get_universe_arrays()
+    mask = (arr["industry_key"] == industry_key) & (arr["tickers"] != symbol.upper())
+    if not mask.any():
+        return []
+    # Rank: IDX30 member, then LQ45 member, then the rest (alphabetical within tier)
+    tier = np.full(len(mask), 2)
+    for rank, code in reversed(list(enumerate(("IDX30", "LQ45")))):
+        bitmap = arr["members"].get(code)
+        if bitmap is not None:
+            tier = np.where(bitmap, np.minimum(tier, rank), tier)
+    idx = np.flatnonzero(mask)
+    idx = idx[np.argsort(tier[idx], kind="stable")]
+    return arr["tickers"][idx[:limit]].tolist()
+
+
+def list_universe(industry_key=None, board=None, index_code=None, as_of=None):
+    tickers = universe_tickers(industry_key, board, index_code, as_of)
+    rows = UniverseTicker.query.filter(UniverseTicker.ticker.in_(tickers)).order_by(UniverseTicker.ticker)
+    return [u.to_dict() for u in rows.all()]
+
+
+def registry_industry_key(symbol):
+    """lookup_industry_key that tolerates a missing app context or empty registry."""
+    try:
+        key = lookup_industry_key(symbol)
+    except Exception:
+        logging.debug("Universe registry unavailable for %s", symbol)
+        return None
+    return key if key and key != "unknown" else None
@@ -0,0 +1,192 @@
+"""Memoized valuation results keyed by inputs and assumptions.
+
+A model run is identified by (ticker, model, normalized assumptions, data
+version). The data version hashes what the models read: the fetch times of
+the ticker's stored statements (so a statement refresh changes it) and the
+info fields used for price, shares, debt and per-share inputs. A hit is
+served from an in-process LRU, or from the ValuationResult table as a
+persistent second tier (rows with model_type 'cache:<model>', hidden from
+the saved-valuations list). Only the current version's rows are kept per
+ticker and model. Callers always get their own copy of a result, so
+mutating it never changes what later hits return.
+
+Runs that return an error, and results larger than MAX_RESULT_BYTES once
+serialized (big sensitivity cubes), are not cached.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+
+from cachetools import LRUCache
+from flask import has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import FundamentalFetch, ValuationResult
+from stock_checker.alpha.services.data_fetcher import get_info
+
+CACHE_PREFIX = "cache:"
+MAX_RESULT_BYTES = 1_000_000
+
+# Info fields any valuation model reads
+VERSION_INFO_KEYS = (
+    "currentPrice", "regularMarketPrice", "sharesOutstanding", "marketCap",
+    "totalDebt", "totalCash", "returnOnEquity", "bookValue", "lastDividendValue",
+    "dividendRate", "trailingEps", "epsTrailingTwelveMonths", "payoutRatio",
+)
+
+_lock = threading.Lock()
+_results = LRUCache(maxsize=512)
+_stats = {"hits": 0, "db_hits": 0, "misses": 0}
+
+
+def _normalize(value):
+    """JSON-ready copy with numbers as floats rounded to 10 places."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 10)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return str(value)
+
+
+def normalize_assumptions(assumptions):
+    """Canonical JSON for an assumptions dict (sorted keys, 5 == 5.0)."""
+    return json.dumps(_normalize(assumptions), sort_keys=True, separators=(",", ":"))
+
+
+def data_version(ticker):
+    """Hash of the ticker's statement fetch times and model-relevant info fields."""
+    fetches = (db.session.query(FundamentalFetch.statement, FundamentalFetch.freq,
+                                FundamentalFetch.fetched_at, FundamentalFetch.rows)
+               .filter(FundamentalFetch.ticker == ticker.upper())
+               .order_by(FundamentalFetch.statement, FundamentalFetch.freq).all())
+    info = get_info(ticker) or {}
+    payload = json.dumps({
+        "fetches": [[s, f, t.isoformat() if t else None, n] for s, f, t, n in fetches],
+        "info": {k: _normalize(info.get(k)) for k in VERSION_INFO_KEYS},
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _load(ticker, model, key_json):
+    row = (ValuationResult.query
+           .filter_by(ticker=ticker, model_type=CACHE_PREFIX + model, assumptions_json=key_json)
+           .order_by(ValuationResult.id.desc()).first())
+    return json.loads(row.results_json) if row else None
+
+
+def _store(ticker, model, key_json, version, results_json):
+    model_type = CACHE_PREFIX + model
+    # Drop rows computed from older data for this ticker and model
+    (ValuationResult.query
+     .filter(ValuationResult.ticker == ticker, ValuationResult.model_type == model_type,
+             ~ValuationResult.assumptions_json.contains(f'"version":"{version}"'))
+     .delete(synchronize_session=False))
+    db.session.add(ValuationResult(ticker=ticker, model_type=model_type,
+                                   assumptions_json=key_json, results_json=results_json))
+    db.session.commit()
+
+
+def cached_valuation(ticker, model, assumptions, compute):
+    """compute() memoized on (ticker, model, assumptions, data version).
+
+    Falls back to compute() outside an app context or when the database is
+    unavailable.
+    """
+    if not has_app_context():
+        return compute()
+    ticker = ticker.upper()
+    try:
+        version = data_version(ticker)
+        key_json = normalize_assumptions({"assumptions": assumptions, "version": version})
+        key = (ticker, model, key_json)
+        with _lock:
+            result = _results.get(key)
+            if result is not None:
+                _stats["hits"] += 1
+        if result is not None:
+            return copy.deepcopy(result)
+        result = _load(ticker, model, key_json)
+    except SQLAlchemyError:
+        db.session.rollback()
+        logging.warning("Valuation cache unavailable; computing %s/%s directly", ticker, model)
+        return compute()
+    if result is not None:
+        with _lock:
+            _stats["db_hits"] += 1
+            _results[key] = result
+        return copy.deepcopy(result)
+
+    with _lock:
+        _stats["misses"] += 1
+    result = compute()
+    if not isinstance(result, dict) or "error" in result:
+        return result
+    results_json = json.dumps(result)
+    if len(results_json) > MAX_RESULT_BYTES:
+        return result
+    # The caller owns result; the cache keeps its own copy
+    with _lock:
+        _results[key] = copy.deepcopy(result)
+    try:
+        _store(ticker, model, key_json, version, results_json)
+    except SQLAlchemyError:
+        db.session.rollback()
+        logging.warning("Failed to persist cached valuation for %s/%s", ticker, model)
+    return result
+
+
+def memoized(model, when=None):
+    """Decorator for run_* functions taking (symbol, **assumptions).
+
+    Args:
+        model: model name used in the cache key
+        when: optional predicate on the bound assumptions; the run is not
+              cached when it returns False (e.g. unseeded Monte Carlo)
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(symbol, *args, **kwargs):
+            bound = signature.bind(symbol, *args, **kwargs)
+            bound.apply_defaults()
+            assumptions = dict(bound.arguments)
+            assumptions.pop(next(iter(signature.parameters)))
+            if when is not None and not when(assumptions):
+                return fn(symbol, *args, **kwargs)
+            return cached_valuation(symbol, model, assumptions,
+                                    lambda: fn(symbol, *args, **kwargs))
+        wrapper.uncached = fn
+        return wrapper
+    return decorate
+
+
+def cache_stats():
+    with _lock:
+        return {**_stats, "entries": len(_results), "maxsize": _results.maxsize}
+
+
+def clear_cache(ticker=None, persistent=False):
+    """Drop in-process entries (for one ticker or all); optionally the stored rows too."""
+    with _lock:
+        if ticker is None:
+            _results.clear()
+        else:
+            for key in [k for k in _results if k[0] == ticker.upper()]:
+                del _results[key]
+    if persistent:
+        q = ValuationResult.query.filter(ValuationResult.model_type.startswith(CACHE_PREFIX))
+        if ticker is not None:
+            q = q.filter(ValuationResult.ticker == ticker.upper())
+        q.delete(synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,237 @@
+"""Scoring weight profiles: CRUD, cached compilation and profile-based rescoring."""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from stock_checker.alpha.models.database import db
+from stock_checker.alpha.models.schemas import WeightProfile, Watchlist
+from stock_checker.alpha.calculations.batch_scores import (
+    DEFAULT_MATRICES,
+    calc_scores_batch,
+    calc_scores_sweep,
+    compile_scoring_matrices,
+    pillar_grid,
+)
+from stock_checker.alpha.services.score_history import load_latest_ratio_panel, record_scores
+from stock_checker.alpha.services.scores import get_score_inputs_batch
+
+MAX_SWEEP_PROFILES = 1000
+
+# (profile id, updated_at) -> compiled matrices; editing a profile changes the key
+_matrix_cache = LRUCache(maxsize=128)
+
+
+def _opt(v):
+    return None if v is None or (isinstance(v, float) and np.isnan(v)) else float(v)
+
+
+# --- Profiles ---
+
+def list_profiles(owner=None, watchlist_id=None):
+    q = WeightProfile.query.order_by(WeightProfile.updated_at.desc())
+    if owner:
+        q = q.filter_by(owner=owner)
+    if watchlist_id is not None:
+        q = q.filter_by(watchlist_id=watchlist_id)
+    return [p.to_dict() for p in q.all()]
+
+
+def get_profile(pid):
+    return WeightProfile.query.get_or_404(pid).to_dict()
+
+
+def create_profile(name, weights, owner="", watchlist_id=None):
+    """Create a profile; raises ValueError if the weights do not compile."""
+    compile_scoring_matrices(weights)
+    if watchlist_id is not None:
+        Watchlist.query.get_or_404(watchlist_id)
+    p = WeightProfile(name=name, owner=owner or "", watchlist_id=watchlist_id,
+                      weights_json=json.dumps(weights or {}))
+    db.session.add(p)
+    db.session.commit()
+    return p.to_dict()
+
+
+def update_profile(pid, name=None, weights=None, owner=None, watchlist_id=None):
+    p = WeightProfile.query.get_or_404(pid)
+    if weights is not None:
+        compile_scoring_matrices(weights)
+        p.weights_json = json.dumps(weights)
+    if name is not None:
+        p.name = name
+    if owner is not None:
+        p.owner = owner
+    if watchlist_id is not None:
+        Watchlist.query.get_or_404(watchlist_id)
+        p.watchlist_id = watchlist_id
+    p.updated_at = datetime.now(timezone.utc)
+    db.session.commit()
+    return p.to_dict()
+
+
+def delete_profile(pid):
+    p = WeightProfile.query.get_or_404(pid)
+    db.session.delete(p)
+    db.session.commit()
+
+
+def get_profile_matrices(pid):
+    """Compiled scoring matrices for a stored profile (compiled once per revision)."""
+    p = WeightProfile.query.get_or_404(pid)
+    key = (p.id, p.updated_at.isoformat())
+    if key not in _matrix_cache:
+        _matrix_cache[key] = compile_scoring_matrices(json.loads(p.weights_json))
+    return _matrix_cache[key]
+
+
+def _watchlist_profile_id(wid):
+    p = (WeightProfile.query.filter_by(watchlist_id=wid)
+         .order_by(WeightProfile.updated_at.desc()).first())
+    return p.id if p else None
+
+
+# --- Rescoring ---
+
+def load_score_panel_cached(tickers, refresh_missing=True):
+    """Ratio panel for tickers from the latest stored snapshots.
+
+    Tickers never scored before are fetched once (and recorded) when
+    refresh_missing is set; everything else is served from the store.
+
+    Returns:
+        (panel DataFrame indexed by ticker, list of tickers that could not be loaded)
+    """
+    tickers = [t.upper() for t in tickers]
+    panel = load_latest_ratio_panel(tickers)
+    missing = [t for t in tickers if t not in panel.index]
+    failed = []
+    if missing and refresh_missing:
+        new, errors = get_score_inputs_batch(missing)
+        failed = list(errors)
+        if not new.empty:
+            try:
+                record_scores(new, calc_scores_batch(new)["scores"])
+            except Exception:
+                logging.exception("Failed to record score history (tickers=%s)", list(new.index))
+            new["as_of"] = datetime.now(timezone.utc).date()
+            panel = pd.concat([panel, new]) if not panel.empty else new
+    else:
+        failed = missing
+    present = [t for t in tickers if t in panel.index]
+    return panel.loc[present], failed
+
+
+def rescore(tickers, profile_id=None, weights=None):
+    """Score tickers from cached ratio panels under a profile, without refetching.
+
+    Args:
+        tickers: list of ticker symbols
+        profile_id: stored WeightProfile id (takes precedence over weights)
+        weights: ad-hoc profile dict (see compile_scoring_matrices)
+
+    Returns:
+        dict with profile_id, results (sorted by composite score, best first)
+        and tickers that could not be scored
+    """
+    if profile_id is not None:
+        matrices = get_profile_matrices(profile_id)
+    elif weights:
+        matrices = compile_scoring_matrices(weights)
+    else:
+        matrices = DEFAULT_MATRICES
+
+    panel, failed = load_score_panel_cached(tickers)
+    if panel.empty:
+        return {"profile_id": profile_id, "results": [], "failed": failed}
+
+    scores = calc_scores_batch(panel, matrices)["scores"]
+    results = []
+    for ticker, s in scores.iterrows():
+        as_of = panel.at[ticker, "as_of"]
+        results.append({
+            "ticker": ticker,
+            "sector": panel.at[ticker, "sector"],
+            "as_of": as_of.isoformat() if hasattr(as_of, "isoformat") else as_of,
+            "quality_score": _opt(s["quality_score"]),
+            "valuation_score": _opt(s["valuation_score"]),
+            "risk_score": _opt(s["risk_score"]),
+            "composite_score": _opt(s["composite_score"]),
+            "recommendation": s["recommendation"],
+        })
+    results.sort(key=lambda r: -1 if r["composite_score"] is None else r["composite_score"],
+                 reverse=True)
+    return {"profile_id": profile_id, "results": results, "failed": failed}
+
+
+def rescore_watchlist(wid, profile_id=None):
+    """Rescore every ticker in a watchlist, by default under the watchlist's own profile."""
+    w = Watchlist.query.get_or_404(wid)
+    if profile_id is None:
+        profile_id = _watchlist_profile_id(wid)
+    result = rescore([i.ticker for i in w.items], profile_id=profile_id)
+    result["watchlist_id"] = wid
+    return result
+
+
+def run_weight_sweep(tickers, profiles=None, step=None):
+    """Evaluate many weight profiles on the same cached panel in one vectorized call.
+
+    Args:
+        tickers: list of ticker symbols
+        profiles: list of profile dicts and/or stored profile ids
+        step: if given, add every pillar-weight triple on a grid of this step
+
+    Returns:
+        dict with one entry per profile (weights, ranking, mean composite) and,
+        per ticker, the composite score under each profile plus rank range.
+    """
+    grid = pillar_grid(step) if step else []
+    n_profiles = len(profiles or []) + len(grid)
+    if not n_profiles:
+        raise ValueError("Provide profiles or a pillar grid step")
+    if n_profiles > MAX_SWEEP_PROFILES:
+        raise ValueError(f"At most {MAX_SWEEP_PROFILES} profiles per sweep")
+
+    matrices, labels = [], []
+    for item in profiles or []:
+        if isinstance(item, int):
+            matrices.append(get_profile_matrices(item))
+            labels.append({"profile_id": item})
+        else:
+            matrices.append(compile_scoring_matrices(item))
+            labels.append({"weights": item})
+    for q, v, r in grid:
+        weights = {"pillars": {"quality": q, "valuation": v, "risk": r}}
+        matrices.append(compile_scoring_matrices(weights))
+        labels.append({"weights": weights})
+
+    panel, failed = load_score_panel_cached(tickers)
+    if panel.empty:
+        return {"profiles": [], "tickers": {}, "failed": failed}
+
+    composite = calc_scores_sweep(panel, matrices)["composite_score"]
+    ranks = composite.rank(axis=0, ascending=False, method="min")
+
+    out_profiles = []
+    for k, label in enumerate(labels):
+        col = composite[k].dropna().sort_values(ascending=False)
+        out_profiles.append({
+            **label,
+            "ranking": list(col.index),
+            "mean_composite": _opt(col.mean()) if len(col) else None,
+        })
+
+    out_tickers = {
+        t: {
+            "composite_scores": [_opt(v) for v in composite.loc[t]],
+            "best_rank": _opt(ranks.loc[t].min()),
+            "worst_rank": _opt(ranks.loc[t].max()),
+        }
+        for t in composite.index
+    }
+    return {"profiles": out_profiles, "tickers": out_tickers, "failed": failed}
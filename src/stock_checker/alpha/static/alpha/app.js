@@ -1288,79 +1288,37 @@ const App = {
         if (el) el.classList.toggle('hidden');
     },
 
-    // Q5: Valuation synthesis
-    SECTOR_WEIGHTS: {
-        'perbankan':             { dcf: 0.10, pbv: 0.60, ddm: 0.20, roe: 0.10 },
-        'telekomunikasi':        { dcf: 0.40, pbv: 0.15, ddm: 0.25, roe: 0.20 },
-        'energi_pertambangan':   { dcf: 0.50, pbv: 0.15, ddm: 0.15, roe: 0.20 },
-        'consumer_goods':        { dcf: 0.35, pbv: 0.25, ddm: 0.20, roe: 0.20 },
-        'manufaktur':            { dcf: 0.40, pbv: 0.25, ddm: 0.15, roe: 0.20 },
-        'properti_konstruksi':   { dcf: 0.30, pbv: 0.45, ddm: 0.10, roe: 0.15 },
-        'logistik_transportasi': { dcf: 0.40, pbv: 0.20, ddm: 0.15, roe: 0.25 },
-        'healthcare':            { dcf: 0.40, pbv: 0.20, ddm: 0.15, roe: 0.25 },
-        'teknologi':             { dcf: 0.50, pbv: 0.15, ddm: 0.10, roe: 0.25 },
-        '_default':              { dcf: 0.35, pbv: 0.25, ddm: 0.20, roe: 0.20 },
-    },
-
-    // Sector-specific WACC / growth defaults for Valuation Synthesis
-    // WACC reflects: Indonesian BI rate (~5.75%) + equity risk premium (5–8%) + sector beta adjustment
-    SYNTHESIS_PARAMS: {
-        perbankan:             { wacc: 0.12, growth_rate: 0.08, terminal_growth: 0.04 },
-        telekomunikasi:        { wacc: 0.11, growth_rate: 0.06, terminal_growth: 0.03 },
-        energi_pertambangan:   { wacc: 0.14, growth_rate: 0.05, terminal_growth: 0.02 },
-        consumer_goods:        { wacc: 0.11, growth_rate: 0.09, terminal_growth: 0.04 },
-        manufaktur:            { wacc: 0.12, growth_rate: 0.07, terminal_growth: 0.03 },
-        properti_konstruksi:   { wacc: 0.12, growth_rate: 0.08, terminal_growth: 0.03 },
-        logistik_transportasi: { wacc: 0.12, growth_rate: 0.07, terminal_growth: 0.03 },
-        healthcare:            { wacc: 0.12, growth_rate: 0.10, terminal_growth: 0.04 },
-        teknologi:             { wacc: 0.14, growth_rate: 0.20, terminal_growth: 0.05 },
-        _default:              { wacc: 0.11, growth_rate: 0.10, terminal_growth: 0.03 },
-    },
+    // Q5: Valuation synthesis — models, sector weights and assumptions are
+    // computed server-side by /api/model/valuation-batch
+    SYNTHESIS_MODELS: [
+        { key: 'dcf', label: 'DCF' },
+        { key: 'pbv', label: 'PBV' },
+        { key: 'ddm', label: 'DDM' },
+        { key: 'roe', label: 'ROE Growth' },
+    ],
 
     async _loadValuationSynthesis(ticker) {
         const el = document.getElementById('valuation-synthesis');
         if (!el) return;
         try {
-            // Phase 1: get sector to determine WACC / growth / model weight defaults
-            const ind = await this.api('/api/industry', { method: 'POST', body: { ticker } }).catch(() => null);
-            const industryKey = ind?.industry_key || '_default';
-            const sectorLabel = ind?.label || 'General';
-            const p = this.SYNTHESIS_PARAMS[industryKey] || this.SYNTHESIS_PARAMS._default;
-            const rawWeights = this.SECTOR_WEIGHTS[industryKey] || this.SECTOR_WEIGHTS['_default'];
-
-            // Phase 2: run all models in parallel with sector-appropriate assumptions
-            const [dcfRes, pbvRes, ddmRes, roeRes] = await Promise.all([
-                this.api('/api/model/dcf', { method: 'POST', body: { ticker, growth_rate: p.growth_rate, terminal_growth: p.terminal_growth, wacc: p.wacc, projection_years: 5 } }).catch(() => null),
-                this.api('/api/model/pbv', { method: 'POST', body: { ticker, cost_of_equity: p.wacc, terminal_growth: p.terminal_growth } }).catch(() => null),
-                this.api('/api/model/ddm', { method: 'POST', body: { ticker, growth_rate: p.terminal_growth, cost_of_equity: p.wacc } }).catch(() => null),
-                this.api('/api/model/roe', { method: 'POST', body: { ticker, cost_of_equity: p.wacc } }).catch(() => null),
+            const [ind, batch] = await Promise.all([
+                this.api('/api/industry', { method: 'POST', body: { ticker } }).catch(() => null),
+                this.api('/api/model/valuation-batch', { method: 'POST', body: { tickers: [ticker] } }),
             ]);
+            const res = batch?.results?.[0];
+            if (!res || res.error) { el.innerHTML = ''; return; }
+            const sectorLabel = ind?.label || 'General';
 
-            // Get current price from DCF result or stored value
-            const cp = (dcfRes?.error ? null : dcfRes?.current_price) ?? this._lastCurrentPrice;
+            const cp = res.current_price ?? this._lastCurrentPrice;
             if (cp != null) this._lastCurrentPrice = cp;
 
-            // Filter out errors AND negative intrinsic values (negative FCF / unprofitable stocks)
-            const safeIntrinsic = (res) => {
-                if (!res || res.error) return null;
-                const v = res.intrinsic_per_share;
-                return (v != null && v > 0) ? v : null;
-            };
-
-            const models = [
-                { key: 'dcf', label: 'DCF', intrinsic: safeIntrinsic(dcfRes), weight: rawWeights.dcf },
-                { key: 'pbv', label: 'PBV', intrinsic: safeIntrinsic(pbvRes), weight: rawWeights.pbv },
-                { key: 'ddm', label: 'DDM', intrinsic: safeIntrinsic(ddmRes), weight: rawWeights.ddm },
-                { key: 'roe', label: 'ROE Growth', intrinsic: safeIntrinsic(roeRes), weight: rawWeights.roe },
-            ];
-
-            // Re-normalize weights for available models only
-            const available = models.filter(m => m.intrinsic != null);
-            const totalW = available.reduce((s, m) => s + m.weight, 0);
-            if (totalW > 0) available.forEach(m => m.normWeight = m.weight / totalW);
-            else available.forEach(m => m.normWeight = 1 / available.length);
+            // Weights come back normalized over the models with a positive value
+            const models = this.SYNTHESIS_MODELS.map(m => {
+                const r = res.models[m.key] || {};
+                return { ...m, intrinsic: r.weight != null ? r.intrinsic_per_share : null, normWeight: r.weight };
+            });
 
-            el.innerHTML = this._renderValuationSynthesis(models, cp, sectorLabel, p);
+            el.innerHTML = this._renderValuationSynthesis(models, cp, sectorLabel, res.assumptions);
         } catch (e) {
             el.innerHTML = '';
         }
@@ -1535,6 +1493,16 @@ const App = {
             <div style="margin-top:8px;font-size:0.82em">
                 Zona: <span style="font-weight:700;color:${zoneColor}">${zoneLabel}</span>
                 ${cur != null ? `<span style="color:var(--text-muted)"> (${Tables.addSeparator(cur.toFixed(2))}x)</span>` : ''}
+            </div>
+            ${this._renderSectorRelative(val.sector_relative)}`;
+    },
+
+    _renderSectorRelative(rel) {
+        if (!rel || rel.percentile == null) return '';
+        const basis = rel.basis === 'sector' ? 'sektor' : 'universe';
+        return `<div style="margin-top:4px;font-size:0.75em;color:var(--text-muted)">
+                Persentil ${basis}: <span style="font-weight:700;color:var(--text-secondary)">P${Math.round(rel.percentile)}</span>
+                · median ${Tables.addSeparator(rel.median.toFixed(2))}x (Q1 ${rel.q1}x – Q3 ${rel.q3}x, n=${rel.peer_count})
             </div>`;
     },
 
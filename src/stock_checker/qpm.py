@@ -1,8 +1,11 @@
 """Quantitative Portfolio Management (QPM) engine.
 
 Builds optimized portfolios from a watchlist using:
-- Ledoit-Wolf shrinkage covariance estimation (sklearn)
-- Min-Variance, Max-Sharpe, Risk-Parity, Factor-Weighted optimization (scipy)
+- Ledoit-Wolf shrinkage covariance estimation (sklearn; incremental
+  rolling estimate in qpm_covariance for backtests), or a PCA factor-model
+  covariance for large universes
+- Min-Variance, Max-Sharpe, Risk-Parity, Factor-Weighted optimization
+  (dedicated solvers in qpm_solvers, scipy SLSQP as fallback)
 - 12-1 Momentum, Low-Volatility, Value, and Quality factor signals
 - Rolling monthly-rebalanced backtest vs IHSG benchmark
 """
@@ -10,6 +13,7 @@ from __future__ import annotations
 
 import math
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Optional
 
 import numpy as np
@@ -17,11 +21,27 @@ import pandas as pd
 import yfinance as yf
 from scipy.optimize import minimize as sp_minimize
 
+from stock_checker.qpm_covariance import FactorCovariance, RollingCovariance
+from stock_checker.qpm_solvers import (
+    box_budget_qp,
+    box_feasible,
+    greedy_linear,
+    max_sharpe_frontier,
+    project_to_box_budget,
+    risk_parity_newton,
+)
+
 RISK_FREE_RATE_DEFAULT = 0.065  # 6.5% BI Rate (IDX context)
 MIN_TICKERS = 3
 MAX_WEIGHT = 0.20
 MIN_WEIGHT = 0.02
 
+OPTIMIZATION_METHODS = ("min_variance", "max_sharpe", "risk_parity", "factor_weighted")
+# Rebalance frequency -> pandas resample rule (period end) and plural label
+REBALANCE_FREQUENCIES = {"weekly": "W-FRI", "monthly": "ME", "quarterly": "QE"}
+REBALANCE_PERIODS = {"weekly": "weeks", "monthly": "months", "quarterly": "quarters"}
+MAX_SWEEP_RUNS = 64
+
 
 def _normalize_ticker(ticker: str) -> str:
     ticker = ticker.strip().upper()
@@ -33,8 +53,15 @@ def _normalize_ticker(ticker: str) -> str:
 class QPMAnalyzer:
     """Quantitative Portfolio Management analyzer."""
 
-    def __init__(self, risk_free_rate: float = RISK_FREE_RATE_DEFAULT):
+    def __init__(
+        self,
+        risk_free_rate: float = RISK_FREE_RATE_DEFAULT,
+        min_weight: float = MIN_WEIGHT,
+        max_weight: float = MAX_WEIGHT,
+    ):
         self.rf = risk_free_rate
+        self.min_weight = min_weight
+        self.max_weight = max_weight
 
     # ── Data Layer ──────────────────────────────────────────────────────────
 
@@ -75,9 +102,17 @@ class QPMAnalyzer:
         return np.log(prices / prices.shift(1)).dropna()
 
     def compute_covariance(
-        self, returns: pd.DataFrame, shrinkage: bool = True
-    ) -> np.ndarray:
-        """Annualized covariance matrix with optional Ledoit-Wolf shrinkage."""
+        self, returns: pd.DataFrame, shrinkage: bool = True,
+        n_factors: Optional[int] = None,
+    ):
+        """Annualized covariance matrix with optional Ledoit-Wolf shrinkage.
+
+        With ``n_factors``, a statistical factor model (FactorCovariance) of
+        that many principal components instead: O(N·K) memory, usable
+        anywhere the optimizers take the dense matrix.
+        """
+        if n_factors:
+            return FactorCovariance.from_returns(returns.values, n_factors)
         if shrinkage:
             try:
                 from sklearn.covariance import LedoitWolf
@@ -91,7 +126,24 @@ class QPMAnalyzer:
 
     # ── Factor Signals ──────────────────────────────────────────────────────
 
-    def compute_factors(self, prices: pd.DataFrame) -> pd.DataFrame:
+    def load_fundamentals(self, tickers: list[str]):
+        """Point-in-time fundamentals for backtests, read from the local warehouse.
+
+        Never touches the network; returns an empty store when the warehouse
+        is unavailable (value/quality then stay neutral).
+        """
+        from stock_checker.alpha.calculations.point_in_time import PointInTimeStore
+
+        try:
+            from stock_checker.alpha.services.fundamentals import load_point_in_time
+
+            return load_point_in_time(tickers)
+        except Exception:
+            return PointInTimeStore.empty()
+
+    def compute_factors(
+        self, prices: pd.DataFrame, fundamentals=None
+    ) -> pd.DataFrame:
         """
         Compute per-ticker factor signals.
 
@@ -101,6 +153,11 @@ class QPMAnalyzer:
         - value    : derived from P/E and P/BV (lower ratios → higher score)
         - quality  : ROE proxy (higher is better)
 
+        With ``fundamentals`` (a PointInTimeStore), value and quality use only
+        what was known on the last price date and prices from that date — no
+        network calls and no lookahead. Without it, today's yfinance info is
+        used (live optimization).
+
         Returns a DataFrame indexed by ticker, normalized to [0, 1].
         """
         tickers = prices.columns.tolist()
@@ -129,6 +186,10 @@ class QPMAnalyzer:
                 "quality": 0.0,
             }
 
+        if fundamentals is not None:
+            self._point_in_time_value_quality(records, prices, fundamentals)
+            return self._normalize_factors(records)
+
         # Enrich value/quality from yfinance fundamentals
         for ticker in list(records.keys()):
             try:
@@ -151,6 +212,25 @@ class QPMAnalyzer:
             except Exception:
                 pass
 
+        return self._normalize_factors(records)
+
+    def _point_in_time_value_quality(
+        self, records: dict[str, dict], prices: pd.DataFrame, fundamentals
+    ) -> None:
+        """Fill value/quality from fundamentals known on the last price date."""
+        from stock_checker.alpha.calculations.point_in_time import calc_value_quality
+
+        if not fundamentals:
+            return
+        tickers = list(records)
+        panel = fundamentals.as_of(prices.index[-1], tickers)
+        last_px = prices[tickers].ffill().iloc[-1].to_numpy(dtype=float)
+        vq = calc_value_quality(panel, last_px)
+        for ticker in tickers:
+            records[ticker]["value"] = float(vq.at[ticker, "value"])
+            records[ticker]["quality"] = float(vq.at[ticker, "quality"])
+
+    def _normalize_factors(self, records: dict[str, dict]) -> pd.DataFrame:
         df = pd.DataFrame(records).T.astype(float)
 
         # Cross-sectional normalization to [0, 1]
@@ -185,55 +265,89 @@ class QPMAnalyzer:
     # ── Optimization ────────────────────────────────────────────────────────
 
     def _bounds_and_constraints(self, n: int):
-        bounds = [(MIN_WEIGHT, MAX_WEIGHT)] * n
+        bounds = [(self.min_weight, self.max_weight)] * n
         constraints = [{"type": "eq", "fun": lambda w: float(np.sum(w)) - 1.0}]
         return bounds, constraints
 
-    def _minimize(self, obj_fn, n: int) -> np.ndarray:
+    def _minimize(self, obj_fn, n: int, jac=None, w0: Optional[np.ndarray] = None) -> np.ndarray:
         """Run SLSQP minimization with equal-weight fallback on failure."""
+        equal = np.ones(n) / n
+        if not box_feasible(n, self.min_weight, self.max_weight):
+            return equal
         bounds, constraints = self._bounds_and_constraints(n)
-        w0 = np.ones(n) / n
         try:
             res = sp_minimize(
                 obj_fn,
-                w0,
+                equal if w0 is None else w0,
                 method="SLSQP",
+                jac=jac,
                 bounds=bounds,
                 constraints=constraints,
                 options={"maxiter": 1000, "ftol": 1e-9},
             )
             if res.success:
-                w = np.clip(res.x, MIN_WEIGHT, MAX_WEIGHT)
+                w = np.clip(res.x, self.min_weight, self.max_weight)
                 return w / w.sum()
         except Exception:
             pass
-        return w0
+        return equal
 
     def optimize_min_variance(
         self, returns: pd.DataFrame, cov: np.ndarray
     ) -> np.ndarray:
-        """Minimum variance portfolio."""
+        """Minimum variance portfolio (active-set QP, SLSQP fallback)."""
+        w = box_budget_qp(cov, lo=self.min_weight, hi=self.max_weight)
+        if w is not None:
+            return w / w.sum()
+
         def portfolio_var(w):
             return float(w @ cov @ w)
 
-        return self._minimize(portfolio_var, len(returns.columns))
+        return self._minimize(portfolio_var, len(returns.columns), jac=lambda w: 2 * cov @ w)
 
     def optimize_max_sharpe(
         self, returns: pd.DataFrame, cov: np.ndarray
     ) -> np.ndarray:
-        """Maximum Sharpe Ratio portfolio (negative Sharpe minimization)."""
+        """Maximum Sharpe Ratio portfolio.
+
+        Searched along the efficient frontier with the active-set QP; SLSQP
+        (negative Sharpe minimization) covers universes where no attainable
+        return beats the risk-free rate, or a frontier QP fails.
+        """
         ann_ret = returns.mean().values * 252
+        n = len(ann_ret)
+        if box_feasible(n, self.min_weight, self.max_weight):
+            w = max_sharpe_frontier(cov, ann_ret, self.rf, self.min_weight, self.max_weight)
+            if w is not None:
+                return w
 
         def neg_sharpe(w):
             port_ret = float(w @ ann_ret)
             port_vol = math.sqrt(max(float(w @ cov @ w), 1e-12))
             return -(port_ret - self.rf) / port_vol
 
-        return self._minimize(neg_sharpe, len(returns.columns))
+        def neg_sharpe_grad(w):
+            cw = cov @ w
+            port_vol = math.sqrt(max(float(w @ cw), 1e-12))
+            excess = float(w @ ann_ret) - self.rf
+            return -(ann_ret / port_vol - excess * cw / port_vol ** 3)
+
+        return self._minimize(neg_sharpe, len(returns.columns), jac=neg_sharpe_grad)
 
     def optimize_risk_parity(self, cov: np.ndarray) -> np.ndarray:
-        """Equal Risk Contribution (Risk Parity) portfolio."""
+        """Equal Risk Contribution (Risk Parity) portfolio.
+
+        Solved exactly by Newton's method; only when the equal-contribution
+        weights break the weight bounds does SLSQP minimize the contribution
+        spread within the bounds, starting from their projection.
+        """
         n = cov.shape[0]
+        if not box_feasible(n, self.min_weight, self.max_weight):
+            return np.ones(n) / n
+        erc = risk_parity_newton(cov)
+        if (erc is not None and np.all(erc >= self.min_weight)
+                and np.all(erc <= self.max_weight)):
+            return erc
 
         def risk_parity_obj(w):
             sigma = math.sqrt(max(float(w @ cov @ w), 1e-12))
@@ -241,21 +355,30 @@ class QPMAnalyzer:
             target_rc = sigma / n
             return float(np.sum((rc - target_rc) ** 2))
 
-        return self._minimize(risk_parity_obj, n)
+        def risk_parity_grad(w):
+            cw = cov @ w
+            sigma = math.sqrt(max(float(w @ cw), 1e-12))
+            d = w * cw / sigma - sigma / n
+            rc_grad = (cw * d + cov @ (w * d)) / sigma - cw * float((w * cw) @ d) / sigma ** 3
+            return 2 * (rc_grad - d.sum() * cw / (n * sigma))
+
+        w0 = (project_to_box_budget(erc, self.min_weight, self.max_weight)
+              if erc is not None else None)
+        return self._minimize(risk_parity_obj, n, jac=risk_parity_grad, w0=w0)
 
     def optimize_factor_weighted(
         self, tickers: list[str], factor_scores: pd.Series
     ) -> np.ndarray:
-        """Factor-score weighted portfolio via score-maximizing SLSQP (satisfies all bounds)."""
+        """Score-maximizing portfolio within the weight bounds.
+
+        The objective is linear, so the optimum is greedy: every ticker gets
+        the minimum weight and the rest of the budget fills the best scores
+        up to the maximum weight.
+        """
         n = len(tickers)
         scores = np.array([float(factor_scores.get(t, 0.0)) for t in tickers])
-        total = scores.sum()
-        norm_scores = scores / total if total > 1e-10 else np.ones(n) / n
-
-        def neg_factor(w: np.ndarray) -> float:
-            return -float(w @ norm_scores)
-
-        return self._minimize(neg_factor, n)
+        w = greedy_linear(scores, self.min_weight, self.max_weight)
+        return np.ones(n) / n if w is None else w
 
     def optimize(
         self,
@@ -291,7 +414,7 @@ class QPMAnalyzer:
         sharpe = (port_ret - self.rf) / port_vol if port_vol > 0 else 0.0
 
         # Diversification ratio: weighted-avg individual vol / portfolio vol
-        individual_vols = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        individual_vols = np.sqrt(np.maximum(cov.diagonal(), 0.0))
         weighted_vol = float(weights @ individual_vols)
         div_ratio = weighted_vol / port_vol if port_vol > 0 else 1.0
 
@@ -304,50 +427,86 @@ class QPMAnalyzer:
 
     # ── Efficient Frontier ──────────────────────────────────────────────────
 
+    def _frontier_slsqp(
+        self, cov: np.ndarray, ann_ret: np.ndarray, target: float,
+        w0: Optional[np.ndarray] = None,
+    ) -> Optional[np.ndarray]:
+        """One frontier point by SLSQP (fallback when the QP cannot certify one)."""
+        n = len(ann_ret)
+        bounds, constraints = self._bounds_and_constraints(n)
+        constraints = constraints + [
+            {"type": "eq", "fun": lambda w: float(w @ ann_ret) - target,
+             "jac": lambda w: ann_ret}
+        ]
+        try:
+            res = sp_minimize(
+                lambda w: float(w @ cov @ w),
+                np.ones(n) / n if w0 is None else w0,
+                method="SLSQP",
+                jac=lambda w: 2 * cov @ w,
+                bounds=bounds,
+                constraints=constraints,
+                options={"maxiter": 500, "ftol": 1e-8},
+            )
+        except Exception:
+            return None
+        return res.x if res.success else None
+
     def efficient_frontier(
-        self, returns: pd.DataFrame, cov: np.ndarray, n_points: int = 40
+        self, returns: pd.DataFrame, cov: np.ndarray, n_points: int = 40,
+        workers: int = 1,
     ) -> list[dict]:
-        """Generate efficient frontier points (min-variance at each target return)."""
-        ann_ret = returns.mean() * 252
-        n = len(returns.columns)
-        bounds = [(MIN_WEIGHT, MAX_WEIGHT)] * n
-        base_constraints = [{"type": "eq", "fun": lambda w: float(np.sum(w)) - 1.0}]
+        """Generate efficient frontier points (min-variance at each target return).
+
+        Targets are traced in order with the active-set QP, each warm-started
+        from the previous point's solution. Targets outside the returns the
+        weight bounds can reach are skipped. With ``workers`` > 1 the targets
+        are split into contiguous runs traced in parallel threads.
+        """
+        ann_ret = returns.mean().values * 252
+        n = len(ann_ret)
+        if not box_feasible(n, self.min_weight, self.max_weight):
+            return []
 
         r_min = float(ann_ret.min()) * 0.8
         r_max = float(ann_ret.max()) * 0.9
-        frontier: list[dict] = []
-
-        for target in np.linspace(r_min, r_max, n_points):
-            constraints = base_constraints + [
-                {
-                    "type": "eq",
-                    "fun": lambda w, t=target: float(w @ ann_ret.values) - t,
+        targets = np.linspace(r_min, r_max, n_points)
+        # Attainable return range within the weight bounds
+        lowest = float(greedy_linear(-ann_ret, self.min_weight, self.max_weight) @ ann_ret)
+        highest = float(greedy_linear(ann_ret, self.min_weight, self.max_weight) @ ann_ret)
+
+        def trace(indices: np.ndarray) -> dict[int, dict]:
+            points: dict[int, dict] = {}
+            w_prev = None
+            for i in indices:
+                target = float(targets[i])
+                if not lowest - 1e-12 <= target <= highest + 1e-12:
+                    continue
+                w = box_budget_qp(cov, lo=self.min_weight, hi=self.max_weight,
+                                  A=ann_ret, b=target, w0=w_prev)
+                if w is None:
+                    w = self._frontier_slsqp(cov, ann_ret, target, w_prev)
+                if w is None:
+                    continue
+                w_prev = w
+                w = np.clip(w, 0, 1)
+                w /= w.sum()
+                vol = math.sqrt(max(float(w @ cov @ w), 0.0))
+                points[i] = {
+                    "volatility": round(vol * 100, 2),
+                    "return": round(target * 100, 2),
                 }
-            ]
-            w0 = np.ones(n) / n
-            try:
-                res = sp_minimize(
-                    lambda w: float(w @ cov @ w),
-                    w0,
-                    method="SLSQP",
-                    bounds=bounds,
-                    constraints=constraints,
-                    options={"maxiter": 500, "ftol": 1e-8},
-                )
-                if res.success:
-                    w = np.clip(res.x, 0, 1)
-                    w /= w.sum()
-                    vol = math.sqrt(max(float(w @ cov @ w), 0.0))
-                    frontier.append(
-                        {
-                            "volatility": round(vol * 100, 2),
-                            "return": round(float(target) * 100, 2),
-                        }
-                    )
-            except Exception:
-                pass
+            return points
 
-        return frontier
+        runs = [r for r in np.array_split(np.arange(n_points), max(1, workers)) if len(r)]
+        if len(runs) > 1:
+            with ThreadPoolExecutor(max_workers=len(runs)) as pool:
+                traced = list(pool.map(trace, runs))
+        else:
+            traced = [trace(r) for r in runs]
+
+        points = {i: p for run in traced for i, p in run.items()}
+        return [points[i] for i in sorted(points)]
 
     # ── Backtest ────────────────────────────────────────────────────────────
 
@@ -367,15 +526,116 @@ class QPMAnalyzer:
         except Exception:
             return pd.Series(0.0, index=index)
 
+    def _period_ends(self, returns: pd.DataFrame, rebalance: str) -> pd.DatetimeIndex:
+        if rebalance not in REBALANCE_FREQUENCIES:
+            raise ValueError(
+                f"Unknown rebalance frequency: {rebalance!r} "
+                f"(choose from {', '.join(REBALANCE_FREQUENCIES)})"
+            )
+        return returns.resample(REBALANCE_FREQUENCIES[rebalance]).last().index
+
+    def _weight_schedules(
+        self,
+        prices: pd.DataFrame,
+        returns: pd.DataFrame,
+        runs: list[tuple[str, float, float]],
+        period_ends: pd.DatetimeIndex,
+        lookback: int = 252,
+        fundamentals=None,
+        n_factors: Optional[int] = None,
+    ) -> list[tuple[np.ndarray, list[str]]]:
+        """Weight schedule and rebalance dates for each (method, min, max weight) run.
+
+        Row i of a schedule holds the weights held after period_ends[i]. The
+        trailing covariance (and factor scores, when a run needs them) for
+        each rebalance date is computed once and shared by every run; with
+        ``n_factors`` it is a factor model fitted to the trailing window.
+        """
+        n = len(prices.columns)
+        ends = returns.index.searchsorted(period_ends, side="right")
+        # Shrunk covariance of the trailing window, updated as it slides
+        rolling = RollingCovariance(returns.to_numpy(dtype=float))
+        optimizers = {
+            (lo, hi): self if (lo, hi) == (self.min_weight, self.max_weight)
+            else QPMAnalyzer(self.rf, min_weight=lo, max_weight=hi)
+            for _, lo, hi in runs
+        }
+        needs_factors = any(method == "factor_weighted" for method, _, _ in runs)
+
+        current = [np.ones(n) / n for _ in runs]
+        schedules = [np.empty((len(period_ends) - 1, n)) for _ in runs]
+        rebalance_dates: list[list[str]] = [[] for _ in runs]
+
+        for i, rebal_date in enumerate(period_ends[:-1]):
+            # Rebalance using the trailing lookback window (at least 60 days)
+            if ends[i] >= 60:
+                trail = returns.iloc[max(ends[i] - lookback, 0):ends[i]]
+                try:
+                    if n_factors:
+                        cov = FactorCovariance.from_returns(trail.to_numpy(dtype=float), n_factors)
+                    else:
+                        rolling.move_to(max(ends[i] - lookback, 0), ends[i])
+                        cov = rolling.covariance(shrinkage=True)
+                except Exception:
+                    cov = None
+                fs = None
+                if cov is not None and needs_factors:
+                    try:
+                        trail_prices = prices.loc[trail.index]
+                        factors = self.compute_factors(
+                            trail_prices, fundamentals=fundamentals
+                        )
+                        fs = self.compute_factor_scores(factors)
+                    except Exception:
+                        pass
+                for r, (method, lo, hi) in enumerate(runs):
+                    if cov is None or (method == "factor_weighted" and fs is None):
+                        continue
+                    try:
+                        current[r] = optimizers[(lo, hi)].optimize(
+                            method, trail, cov, factor_scores=fs
+                        )
+                        rebalance_dates[r].append(rebal_date.strftime("%Y-%m-%d"))
+                    except Exception:
+                        pass
+            for r in range(len(runs)):
+                schedules[r][i] = current[r]
+
+        return list(zip(schedules, rebalance_dates))
+
+    def _portfolio_returns(
+        self, returns: pd.DataFrame, period_ends: pd.DatetimeIndex, schedule: np.ndarray
+    ) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Days after the first period end and their portfolio log returns."""
+        start = returns.index.searchsorted(period_ends[0], side="right")
+        days = returns.index[start:]
+        # Each day is held at the previous period end's weights
+        period = period_ends.searchsorted(days, side="left") - 1
+        daily = np.nan_to_num(returns.to_numpy(dtype=float)[start:])
+        return days, np.einsum("ij,ij->i", schedule[period], daily)
+
     def backtest(
-        self, prices: pd.DataFrame, method: str, benchmark: str = "^JKSE"
+        self,
+        prices: pd.DataFrame,
+        method: str,
+        benchmark: str = "^JKSE",
+        fundamentals=None,
+        lookback: int = 252,
+        rebalance: str = "monthly",
+        n_factors: Optional[int] = None,
     ) -> dict:
         """
-        Rolling backtest with monthly rebalancing.
+        Rolling backtest with periodic (monthly by default) rebalancing.
+
+        For each period:
+          1. Recompute weights using trailing ``lookback``-day history
+             (Ledoit-Wolf covariance maintained incrementally as the window
+             slides, or an ``n_factors`` PCA factor model).
+          2. Apply weights to next period's daily returns.
 
-        For each month:
-          1. Recompute weights using trailing 252-day history.
-          2. Apply weights to next month's daily returns.
+        Factor-weighted rebalances take value/quality from a point-in-time
+        store (``fundamentals``, loaded from the local warehouse by default),
+        so each month only sees fundamentals published by then.
 
         Returns cumulative returns (portfolio + benchmark), max drawdown,
         rebalance dates, and rolling 63-day Sharpe.
@@ -383,100 +643,173 @@ class QPMAnalyzer:
         returns = self.compute_returns(prices)
         bench_ret = self._fetch_benchmark(benchmark, returns.index)
 
-        month_ends = returns.resample("ME").last().index.tolist()
-        if len(month_ends) < 2:
-            return {"error": "Insufficient data for backtest (need at least 2 months)"}
-
-        current_weights = np.ones(len(prices.columns)) / len(prices.columns)
-        cum_port = 1.0
-        cum_bench = 1.0
-        port_daily: list[dict] = []
-        bench_series: list[dict] = []
-        rebalance_dates: list[str] = []
-
-        for i in range(len(month_ends) - 1):
-            rebal_date = month_ends[i]
-            next_rebal = month_ends[i + 1]
-
-            # Rebalance at month-end using trailing 252-day data
-            hist = returns.loc[:rebal_date]
-            if len(hist) >= 60:
-                trail = hist.tail(252)
-                try:
-                    cov = self.compute_covariance(trail, shrinkage=True)
-                    if method == "factor_weighted":
-                        trail_prices = prices.loc[trail.index]
-                        factors = self.compute_factors(trail_prices)
-                        fs = self.compute_factor_scores(factors)
-                        current_weights = self.optimize(
-                            method, trail, cov, factor_scores=fs
-                        )
-                    else:
-                        current_weights = self.optimize(method, trail, cov)
-                    rebalance_dates.append(rebal_date.strftime("%Y-%m-%d"))
-                except Exception:
-                    pass
-
-            # Apply weights to next month's daily returns
-            mask = (returns.index > rebal_date) & (returns.index <= next_rebal)
-            for dt, row in returns.loc[mask].iterrows():
-                port_r = float(current_weights @ row.fillna(0.0).values)
-                bench_r = float(bench_ret.get(dt, 0.0))
-                cum_port *= math.exp(port_r)
-                cum_bench *= math.exp(bench_r)
-                date_str = dt.strftime("%Y-%m-%d")
-                port_daily.append(
-                    {
-                        "date": date_str,
-                        "cumulative": round((cum_port - 1) * 100, 4),
-                        "_ret": port_r,  # internal — stripped below
-                    }
-                )
-                bench_series.append(
-                    {"date": date_str, "cumulative": round((cum_bench - 1) * 100, 4)}
-                )
+        period_ends = self._period_ends(returns, rebalance)
+        if len(period_ends) < 2:
+            return {"error": "Insufficient data for backtest "
+                             f"(need at least 2 {REBALANCE_PERIODS[rebalance]})"}
+
+        if method == "factor_weighted" and fundamentals is None:
+            fundamentals = self.load_fundamentals(prices.columns.tolist())
 
-        if not port_daily:
+        [(schedule, rebalance_dates)] = self._weight_schedules(
+            prices, returns, [(method, self.min_weight, self.max_weight)],
+            period_ends, lookback, fundamentals, n_factors,
+        )
+        days, port_ret = self._portfolio_returns(returns, period_ends, schedule)
+        if not len(days):
             return {"error": "No backtest data produced — watchlist may be too small"}
+        bench = bench_ret.reindex(days).fillna(0.0).to_numpy(dtype=float)
 
-        # Strip internal field
-        port_series = [{"date": d["date"], "cumulative": d["cumulative"]} for d in port_daily]
-        daily_rets = [d["_ret"] for d in port_daily]
-        dates = [d["date"] for d in port_daily]
+        dates = days.strftime("%Y-%m-%d").tolist()
+        port_cum = _cumulative_pct(port_ret)
+        bench_cum = _cumulative_pct(bench)
 
-        max_dd = self._max_drawdown([x["cumulative"] for x in port_series])
-        rolling_sharpe = self._rolling_sharpe(dates, daily_rets, window=63)
+        max_dd = self._max_drawdown(port_cum)
+        rolling_sharpe = self._rolling_sharpe(dates, port_ret, window=63)
 
         return {
-            "portfolio": port_series,
-            "benchmark": bench_series,
+            "portfolio": [{"date": d, "cumulative": c} for d, c in zip(dates, port_cum)],
+            "benchmark": [{"date": d, "cumulative": c} for d, c in zip(dates, bench_cum)],
             "max_drawdown": round(max_dd * 100, 2),
             "rebalance_dates": rebalance_dates,
             "rolling_sharpe": rolling_sharpe,
         }
 
-    def _max_drawdown(self, cum_pct_series: list[float]) -> float:
+    def backtest_sweep(
+        self,
+        prices: pd.DataFrame,
+        methods: list[str],
+        lookbacks: list[int] = (252,),
+        rebalances: list[str] = ("monthly",),
+        bounds: list[tuple[float, float]] = ((MIN_WEIGHT, MAX_WEIGHT),),
+        benchmark: str = "^JKSE",
+        fundamentals=None,
+        workers: int = 1,
+    ) -> dict:
+        """
+        Backtest every combination of methods × lookbacks × rebalance
+        frequencies × weight bounds on one price set.
+
+        Returns, the benchmark and point-in-time fundamentals are loaded once.
+        Runs sharing a lookback and rebalance calendar share their trailing
+        covariances and factor scores; those groups are spread over a process
+        pool when ``workers`` > 1.
+
+        Returns:
+            dict with ``dates``, ``benchmark`` (cumulative %, aligned to
+            dates) and ``runs``: one row per combination with its parameters,
+            summary metrics and ``equity`` curve (cumulative %, None before
+            the run's first period end)
+        """
+        for method in methods:
+            if method not in OPTIMIZATION_METHODS:
+                raise ValueError(f"Unknown optimization method: {method!r}")
+        for rebalance in rebalances:
+            if rebalance not in REBALANCE_FREQUENCIES:
+                raise ValueError(f"Unknown rebalance frequency: {rebalance!r}")
+        n_runs = len(methods) * len(lookbacks) * len(rebalances) * len(bounds)
+        if not 1 <= n_runs <= MAX_SWEEP_RUNS:
+            raise ValueError(f"A sweep must have between 1 and {MAX_SWEEP_RUNS} runs")
+
+        returns = self.compute_returns(prices)
+        bench_ret = self._fetch_benchmark(benchmark, returns.index)
+        if "factor_weighted" in methods and fundamentals is None:
+            fundamentals = self.load_fundamentals(prices.columns.tolist())
+
+        runs = [(method, float(lo), float(hi)) for method in methods for lo, hi in bounds]
+        tasks = [
+            (self.rf, prices, returns, runs, int(lookback), rebalance, fundamentals)
+            for lookback in lookbacks
+            for rebalance in rebalances
+        ]
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                groups = list(pool.map(_sweep_group, tasks))
+        else:
+            groups = [_sweep_group(task) for task in tasks]
+
+        rows = [row for group in groups for row in group]
+        starts = [row.pop("_start") for row in rows if "_start" in row]
+        first = min(starts, default=len(returns))
+        dates = returns.index[first:].strftime("%Y-%m-%d").tolist()
+        bench = bench_ret.reindex(returns.index[first:]).fillna(0.0).to_numpy(dtype=float)
+        for row in rows:
+            if "equity" in row:
+                row["equity"] = [None] * (len(dates) - len(row["equity"])) + row["equity"]
+        for i, row in enumerate(rows):
+            row["id"] = i
+
+        return {"dates": dates, "benchmark": _cumulative_pct(bench), "runs": rows}
+
+    def _max_drawdown(self, cum_pct_series) -> float:
         """Maximum drawdown from a cumulative % return series."""
-        if not cum_pct_series:
+        wealth = 1.0 + np.asarray(cum_pct_series, dtype=float) / 100
+        if not wealth.size:
             return 0.0
-        wealth = [1.0 + v / 100 for v in cum_pct_series]
-        peak = wealth[0]
-        max_dd = 0.0
-        for w in wealth:
-            peak = max(peak, w)
-            dd = (peak - w) / peak if peak > 0 else 0.0
-            max_dd = max(max_dd, dd)
-        return max_dd
+        peak = np.maximum.accumulate(wealth)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dd = np.where(peak > 0, (peak - wealth) / peak, 0.0)
+        return max(float(dd.max()), 0.0)
 
     def _rolling_sharpe(
-        self, dates: list[str], daily_rets: list[float], window: int = 63
+        self, dates: list[str], daily_rets, window: int = 63
     ) -> list[dict]:
-        """Rolling annualized Sharpe Ratio over a given window."""
-        result = []
-        for i in range(window, len(daily_rets)):
-            chunk = daily_rets[i - window: i]
-            avg = float(np.mean(chunk)) * 252
-            std = float(np.std(chunk)) * math.sqrt(252)
-            sharpe = (avg - self.rf) / std if std > 1e-10 else 0.0
-            result.append({"date": dates[i], "sharpe": round(sharpe, 3)})
-        return result
+        """Rolling annualized Sharpe Ratio over the ``window`` days before each date."""
+        rets = np.asarray(daily_rets, dtype=float)
+        if len(rets) <= window:
+            return []
+        # Windows rets[i - window:i] for i = window .. len - 1
+        windows = np.lib.stride_tricks.sliding_window_view(rets[:-1], window)
+        avg = windows.mean(axis=1) * 252
+        std = windows.std(axis=1) * math.sqrt(252)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(std > 1e-10, (avg - self.rf) / std, 0.0)
+        return [
+            {"date": d, "sharpe": round(v, 3)}
+            for d, v in zip(dates[window:], sharpe.tolist())
+        ]
+
+
+def _cumulative_pct(log_returns: np.ndarray) -> list[float]:
+    """Cumulative % return series of daily log returns (rounded to 4 places)."""
+    return [round(v, 4) for v in ((np.cumprod(np.exp(log_returns)) - 1) * 100).tolist()]
+
+
+def _sweep_group(task) -> list[dict]:
+    """All runs of one (lookback, rebalance) pair; executed in a worker process."""
+    rf, prices, returns, runs, lookback, rebalance, fundamentals = task
+    analyzer = QPMAnalyzer(risk_free_rate=rf)
+    params = [
+        {"method": method, "lookback": lookback, "rebalance": rebalance,
+         "min_weight": lo, "max_weight": hi}
+        for method, lo, hi in runs
+    ]
+    period_ends = analyzer._period_ends(returns, rebalance)
+    if len(period_ends) < 2:
+        error = f"Insufficient data for backtest (need at least 2 {REBALANCE_PERIODS[rebalance]})"
+        return [{**p, "error": error} for p in params]
+
+    schedules = analyzer._weight_schedules(
+        prices, returns, runs, period_ends, lookback, fundamentals
+    )
+    start = int(returns.index.searchsorted(period_ends[0], side="right"))
+    rows = []
+    for p, (schedule, rebalance_dates) in zip(params, schedules):
+        days, port_ret = analyzer._portfolio_returns(returns, period_ends, schedule)
+        if not len(days):
+            rows.append({**p, "error": "No backtest data produced — watchlist may be too small"})
+            continue
+        equity = _cumulative_pct(port_ret)
+        mean, std = float(port_ret.mean()) * 252, float(port_ret.std()) * math.sqrt(252)
+        rows.append({
+            **p,
+            "total_return": round(equity[-1], 2),
+            "annual_return": round(mean * 100, 2),
+            "volatility": round(std * 100, 2),
+            "sharpe_ratio": round((mean - rf) / std, 3) if std > 1e-10 else 0.0,
+            "max_drawdown": round(analyzer._max_drawdown(equity) * 100, 2),
+            "rebalances": len(rebalance_dates),
+            "equity": equity,
+            "_start": start,
+        })
+    return rows
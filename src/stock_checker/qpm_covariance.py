@@ -0,0 +1,208 @@
+"""Covariance estimators for QPM: rolling Ledoit-Wolf and statistical factor models.
+
+RollingCovariance keeps the raw moments of a sliding window of daily return
+rows — count, Σx, Σxx', and the two fourth-order sums Ledoit-Wolf needs,
+Σ|x|⁴ and Σ|x|²x — so moving the window costs O(k·N²) for the k days added
+or dropped instead of refitting the whole window.
+
+The shrinkage intensity follows sklearn.covariance.ledoit_wolf exactly:
+with centered rows y = x − m, sample covariance S = Σyy'/n and target μI
+(μ = tr S / N),
+
+    δ = ‖S − μI‖²_F / N
+    β = (Σ_t |y_t|⁴ / n − ‖S‖²_F) / (N·n)
+    shrinkage = min(β, δ) / δ
+
+where Σ|y|⁴ expands into the maintained raw moments.
+
+FactorCovariance is a statistical (PCA) factor model Σ = B F Bᵀ + diag(d)
+holding only the N×K loadings, K factor variances and N specific variances.
+It stands in for the dense matrix in the optimizers: ``cov @ w``,
+``w @ cov @ w`` and ``cov.diagonal()`` cost O(N·K), and solves against any
+principal sub-block go through the Woodbury identity in O(k·K²).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+TRADING_DAYS = 252
+DEFAULT_FACTORS = 10
+
+
+class RollingCovariance:
+    """Covariance of rows [start, stop) of a returns matrix, updated in place."""
+
+    def __init__(self, returns: np.ndarray):
+        self._x = np.asarray(returns, dtype=float)
+        n_assets = self._x.shape[1]
+        self.start = self.stop = 0
+        self._sum = np.zeros(n_assets)          # Σ x
+        self._cross = np.zeros((n_assets, n_assets))  # Σ x x'
+        self._sq_x = np.zeros(n_assets)         # Σ |x|² x
+        self._sq_sq = 0.0                       # Σ |x|⁴
+
+    @property
+    def n_obs(self) -> int:
+        return self.stop - self.start
+
+    def _accumulate(self, lo: int, hi: int, sign: float) -> None:
+        if hi <= lo:
+            return
+        rows = self._x[lo:hi]
+        sq = np.einsum("ij,ij->i", rows, rows)
+        self._sum += sign * rows.sum(axis=0)
+        self._cross += sign * (rows.T @ rows)
+        self._sq_x += sign * (sq @ rows)
+        self._sq_sq += sign * float(sq @ sq)
+
+    def move_to(self, start: int, stop: int) -> None:
+        """Slide the window to rows [start, stop), touching only changed rows."""
+        if not 0 <= start <= stop <= len(self._x):
+            raise ValueError(f"Invalid window [{start}, {stop})")
+        if start >= self.stop or stop <= self.start:
+            # No overlap: rebuild from scratch
+            self._sum[:] = 0.0
+            self._cross[:] = 0.0
+            self._sq_x[:] = 0.0
+            self._sq_sq = 0.0
+            self._accumulate(start, stop, 1.0)
+        else:
+            self._accumulate(self.start, start, -1.0)
+            self._accumulate(start, self.start, 1.0)
+            self._accumulate(self.stop, stop, 1.0)
+            self._accumulate(stop, self.stop, -1.0)
+        self.start, self.stop = start, stop
+
+    def _centered(self) -> tuple[np.ndarray, np.ndarray]:
+        """(mean, Σ (x − m)(x − m)') of the current window."""
+        n = self.n_obs
+        mean = self._sum / n
+        return mean, self._cross - n * np.outer(mean, mean)
+
+    def shrinkage(self) -> float:
+        """Ledoit-Wolf shrinkage intensity of the current window."""
+        n = self.n_obs
+        mean, centered = self._centered()
+        p = len(mean)
+        cov = centered / n
+        mu = float(np.trace(cov)) / p
+
+        # Σ_t |x_t − m|⁴ from raw moments
+        m2 = float(mean @ mean)
+        q = float(np.trace(self._cross))
+        proj = float(self._sum @ mean)
+        fourth = (self._sq_sq - 4 * float(self._sq_x @ mean) + 2 * m2 * q
+                  + 4 * float(mean @ self._cross @ mean) - 4 * m2 * proj + n * m2 * m2)
+
+        cov_sq = float(np.sum(cov ** 2))
+        beta = (fourth / n - cov_sq) / (p * n)
+        delta = (cov_sq - 2 * mu * float(np.trace(cov)) + p * mu * mu) / p
+        beta = min(beta, delta)
+        return 0.0 if beta == 0 else beta / delta
+
+    def covariance(self, shrinkage: bool = True, annualize: int = TRADING_DAYS) -> np.ndarray:
+        """Annualized covariance of the window.
+
+        With shrinkage, the Ledoit-Wolf estimate (same as
+        QPMAnalyzer.compute_covariance); without, the sample covariance
+        (ddof = 1) like DataFrame.cov().
+        """
+        n = self.n_obs
+        if n < 2:
+            raise ValueError("Need at least 2 observations")
+        mean, centered = self._centered()
+        if not shrinkage:
+            return centered / (n - 1) * annualize
+        cov = centered / n
+        s = self.shrinkage()
+        mu = float(np.trace(cov)) / len(mean)
+        shrunk = (1 - s) * cov
+        shrunk.flat[:: len(mean) + 1] += s * mu
+        return shrunk * annualize
+
+
+class FactorCovariance:
+    """Low-rank plus diagonal covariance B F Bᵀ + diag(d), never formed densely."""
+
+    # Make numpy defer ``w @ cov`` to __rmatmul__ instead of coercing to an array
+    __array_ufunc__ = None
+
+    def __init__(self, loadings: np.ndarray, factor_var: np.ndarray, specific_var: np.ndarray):
+        """
+        Args:
+            loadings: (N × K) factor loadings B
+            factor_var: (K,) factor variances (F = diag(factor_var))
+            specific_var: (N,) strictly positive specific variances d
+        """
+        self.loadings = np.asarray(loadings, dtype=float)
+        self.factor_var = np.asarray(factor_var, dtype=float)
+        self.specific_var = np.asarray(specific_var, dtype=float)
+
+    @classmethod
+    def from_returns(
+        cls, returns, n_factors: int = DEFAULT_FACTORS, annualize: int = TRADING_DAYS
+    ) -> "FactorCovariance":
+        """Fit K principal components of the (T × N) daily returns.
+
+        The loadings are the leading right singular vectors of the centered
+        returns, factor variances their explained variances, and each asset
+        keeps the rest of its sample variance as specific risk (floored so
+        the model stays positive definite).
+        """
+        x = np.asarray(returns, dtype=float)
+        t, n = x.shape
+        if t < 2:
+            raise ValueError("Need at least 2 observations")
+        k = max(1, min(int(n_factors), t - 1, n - 1))
+        x = x - x.mean(axis=0)
+        _, sv, vt = np.linalg.svd(x, full_matrices=False)
+        loadings = vt[:k].T
+        factor_var = sv[:k] ** 2 / (t - 1)
+        total_var = np.einsum("ij,ij->j", x, x) / (t - 1)
+        specific = total_var - (loadings ** 2) @ factor_var
+        floor = 1e-6 * max(float(total_var.mean()), 1e-12)
+        return cls(loadings, factor_var * annualize, np.maximum(specific, floor) * annualize)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        n = len(self.specific_var)
+        return (n, n)
+
+    def diagonal(self) -> np.ndarray:
+        return (self.loadings ** 2) @ self.factor_var + self.specific_var
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        d = self.specific_var if x.ndim == 1 else self.specific_var[:, None]
+        common = self.factor_var[:, None] if x.ndim > 1 else self.factor_var
+        return self.loadings @ (common * (self.loadings.T @ x)) + d * x
+
+    def __rmatmul__(self, x):
+        # Symmetric: x @ Σ = (Σ @ xᵀ)ᵀ
+        x = np.asarray(x, dtype=float)
+        return self @ x if x.ndim == 1 else (self @ x.T).T
+
+    def to_dense(self) -> np.ndarray:
+        dense = (self.loadings * self.factor_var) @ self.loadings.T
+        dense.flat[:: len(self.specific_var) + 1] += self.specific_var
+        return dense
+
+    def solve(self, rhs: np.ndarray, mask: np.ndarray = None, shift: np.ndarray = None):
+        """Solve (Σ + diag(shift))[mask, mask] x = rhs by the Woodbury identity.
+
+        Args:
+            rhs: (k,) or (k × m) right-hand side for the selected assets
+            mask: boolean selection of assets (default: all)
+            shift: extra diagonal added to the selected block
+        """
+        b = self.loadings if mask is None else self.loadings[mask]
+        d = self.specific_var if mask is None else self.specific_var[mask]
+        if shift is not None:
+            d = d + shift
+        rhs = np.asarray(rhs, dtype=float)
+        d_col = d if rhs.ndim == 1 else d[:, None]
+        scaled = b / d[:, None]                         # D⁻¹B
+        # (D + B F Bᵀ)⁻¹ = D⁻¹ − D⁻¹B (I + F BᵀD⁻¹B)⁻¹ F BᵀD⁻¹
+        inner = np.eye(b.shape[1]) + self.factor_var[:, None] * (b.T @ scaled)
+        f_col = self.factor_var if rhs.ndim == 1 else self.factor_var[:, None]
+        return rhs / d_col - scaled @ np.linalg.solve(inner, f_col * (scaled.T @ rhs))
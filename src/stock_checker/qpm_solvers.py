@@ -0,0 +1,398 @@
+"""Dedicated solvers for the QPM long-only, box-bounded portfolio problems.
+
+Every QPM portfolio lives in the same feasible set: weights between a lower
+and an upper bound that sum to one. Within it:
+
+- box_budget_qp      : convex QP  min ½ w'Qw − q'w  (min-variance with q = 0,
+                       frontier points with a target-return row), by a
+                       primal-dual active-set method — each iteration is one
+                       linear solve on the free weights; it typically settles
+                       in a handful of iterations, one or two when warm-started.
+                       When it does not settle, a primal active-set method
+                       from a feasible vertex (one bound change per step,
+                       always feasible) finishes the job
+- max_sharpe_frontier : maximum Sharpe ratio by golden-section search over
+                       the target return, one warm-started box_budget_qp
+                       per step
+- greedy_linear      : linear objective  max s'w  — exact by filling the
+                       highest scores up to the upper bound (ties share)
+- risk_parity_newton : unconstrained equal-risk-contribution weights by
+                       damped Newton on Spinu's convex formulation
+                       ½ y'Σy − Σ b·ln y
+- project_to_box_budget : Euclidean projection onto the feasible set, used to
+                       turn an approximate answer into a feasible start
+
+Each solver returns None when it cannot certify a solution, so callers can
+fall back to SLSQP. The QP and risk-parity solvers also accept a
+FactorCovariance, solving against it in O(N·K²) per step instead of O(N³).
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from stock_checker.qpm_covariance import FactorCovariance
+
+QP_MAX_ITER = 100
+NEWTON_MAX_ITER = 100
+# Primal active-set steps allowed per weight (each adds or frees one bound)
+PRIMAL_STEPS_PER_WEIGHT = 4
+SHARPE_MAX_ITER = 100
+_GOLDEN = (np.sqrt(5.0) - 1.0) / 2.0
+
+
+def _bounds(n: int, lo, hi) -> tuple[np.ndarray, np.ndarray]:
+    return (np.broadcast_to(np.asarray(lo, dtype=float), (n,)).copy(),
+            np.broadcast_to(np.asarray(hi, dtype=float), (n,)).copy())
+
+
+def box_feasible(n: int, lo, hi) -> bool:
+    """Whether n weights within [lo, hi] can sum to one."""
+    lo, hi = _bounds(n, lo, hi)
+    return bool(np.all(lo <= hi) and lo.sum() <= 1 + 1e-12 and hi.sum() >= 1 - 1e-12)
+
+
+def project_to_box_budget(v: np.ndarray, lo, hi) -> Optional[np.ndarray]:
+    """Closest point to v with lo ≤ w ≤ hi and sum(w) = 1 (None if infeasible).
+
+    The projection is clip(v − τ, lo, hi) for the τ that meets the budget;
+    the sum is monotone in τ, so τ is found by bisection.
+    """
+    v = np.asarray(v, dtype=float)
+    n = len(v)
+    if not box_feasible(n, lo, hi):
+        return None
+    lo, hi = _bounds(n, lo, hi)
+    t_lo, t_hi = float(np.min(v - hi)), float(np.max(v - lo))
+    for _ in range(100):
+        tau = 0.5 * (t_lo + t_hi)
+        if np.clip(v - tau, lo, hi).sum() > 1:
+            t_lo = tau
+        else:
+            t_hi = tau
+    return np.clip(v - 0.5 * (t_lo + t_hi), lo, hi)
+
+
+def box_budget_qp(Q: np.ndarray, q: Optional[np.ndarray] = None, lo=0.0, hi=1.0,
+                  A: Optional[np.ndarray] = None, b: Optional[np.ndarray] = None,
+                  w0: Optional[np.ndarray] = None,
+                  max_iter: int = QP_MAX_ITER) -> Optional[np.ndarray]:
+    """Solve min ½ w'Qw − q'w  s.t.  sum(w) = 1, A w = b, lo ≤ w ≤ hi.
+
+    Primal-dual active set: guess which weights sit on a bound, solve the
+    equality-constrained QP on the rest, and move weights on/off the bounds
+    from the primal values and bound multipliers until the guess repeats.
+    That converges fast but is not guaranteed to for a general Q; when it
+    fails, the primal active-set method takes over.
+
+    Args:
+        Q: (n × n) positive semi-definite matrix (e.g. covariance)
+        q: linear term (default zero)
+        lo, hi: scalar or per-weight bounds
+        A, b: optional extra equality rows (e.g. a target return)
+        w0: a nearby solution (e.g. the previous frontier point); its
+            weights on a bound seed the active set, so a small change in
+            the problem usually settles in one or two iterations
+
+    Returns:
+        optimal weights, or None when the bounds are infeasible, the
+        equality rows cannot be met, or neither method converges
+    """
+    structured = isinstance(Q, FactorCovariance)
+    if not structured:
+        Q = np.asarray(Q, dtype=float)
+    n = Q.shape[0]
+    q = np.zeros(n) if q is None else np.asarray(q, dtype=float)
+    if not box_feasible(n, lo, hi):
+        return None
+    lo, hi = _bounds(n, lo, hi)
+    rows, targets = np.ones((1, n)), np.ones(1)
+    if A is not None:
+        rows = np.vstack([rows, np.atleast_2d(np.asarray(A, dtype=float))])
+        targets = np.append(targets, np.asarray(b, dtype=float))
+    diag = Q.diagonal()
+    scale = float(diag.mean()) if diag.size and diag.mean() > 0 else 1.0
+    problem = (Q, q, lo, hi, rows, targets, structured, scale)
+
+    w = _primal_dual_qp(*problem, w0, max_iter)
+    if w is None and w0 is not None:
+        # A start far from the solution can shrink the free set to a
+        # (near-)singular block; the cold start from all-free is sturdier
+        w = _primal_dual_qp(*problem, None, max_iter)
+    if w is None:
+        start = _feasible_vertex(q, lo, hi, rows, targets)
+        if start is not None:
+            w = _primal_qp(*problem, start, PRIMAL_STEPS_PER_WEIGHT * n + max_iter)
+    return w
+
+
+def _reduced_kkt(Q, free, rows_f, r, e, structured):
+    """Solve Q_FF x + R_F'ν = r, R_F x = e on the free weights F.
+
+    Raises LinAlgError when the reduced system is singular.
+    """
+    if structured:
+        # Schur complement on the equality rows, Woodbury solves on Q_FF
+        qi_r = Q.solve(r, free)
+        qi_a = Q.solve(rows_f.T, free)
+        nu = np.linalg.solve(rows_f @ qi_a, rows_f @ qi_r - e)
+        x = qi_r - qi_a @ nu
+    else:
+        k, m = len(r), len(e)
+        kkt = np.zeros((k + m, k + m))
+        kkt[:k, :k] = Q[np.ix_(free, free)]
+        kkt[:k, k:] = rows_f.T
+        kkt[k:, :k] = rows_f
+        sol = np.linalg.solve(kkt, np.concatenate([r, e]))
+        x, nu = sol[:k], sol[k:]
+    if not (np.all(np.isfinite(x)) and np.all(np.isfinite(nu))):
+        raise np.linalg.LinAlgError("Non-finite reduced solution")
+    return x, nu
+
+
+def _primal_dual_qp(Q, q, lo, hi, rows, targets, structured, scale, w0, max_iter
+                    ) -> Optional[np.ndarray]:
+    n = len(q)
+    if w0 is None:
+        w = np.full(n, 1.0 / n)
+        if np.any(w < lo) or np.any(w > hi):
+            w = project_to_box_budget(w, lo, hi)
+        at_lo = at_hi = np.zeros(n, dtype=bool)
+    else:
+        w = np.asarray(w0, dtype=float).copy()
+        at_lo, at_hi = w <= lo + 1e-12, w >= hi - 1e-12
+    seen = set()
+
+    for _ in range(max_iter):
+        state = (at_lo.tobytes(), at_hi.tobytes())
+        if state in seen:
+            break
+        seen.add(state)
+
+        fixed_lo, fixed_hi = at_lo, at_hi
+        free = ~(at_lo | at_hi)
+        w = np.where(at_lo, lo, np.where(at_hi, hi, w))
+        if free.any():
+            resid = q[free] - (Q @ np.where(free, 0.0, w))[free]
+            try:
+                w[free], nu = _reduced_kkt(Q, free, rows[:, free], resid,
+                                           targets - rows[:, ~free] @ w[~free], structured)
+            except np.linalg.LinAlgError:
+                return None
+        else:
+            nu = np.linalg.lstsq(rows.T, q - Q @ w, rcond=None)[0]
+        if not np.allclose(rows @ w, targets, rtol=0, atol=1e-8):
+            return None
+        # Multipliers are λ = ∂L/∂w: ≥ 0 on the lower bound, ≤ 0 on the upper
+        lam = np.where(free, 0.0, Q @ w - q + rows.T @ nu)
+        at_lo = lo - w + lam / scale > 0
+        at_hi = hi - w + lam / scale < 0
+
+    tol = 1e-9
+    grad_tol = 1e-9 * max(scale, 1.0)
+    if (np.all(w >= lo - tol) and np.all(w <= hi + tol)
+            and np.all(lam[fixed_lo] >= -grad_tol) and np.all(lam[fixed_hi] <= grad_tol)):
+        return np.clip(w, lo, hi)
+    return None
+
+
+def _feasible_vertex(q, lo, hi, rows, targets) -> Optional[np.ndarray]:
+    """A feasible point with nearly every weight on a bound.
+
+    With the budget row only, the best vertex for the linear term; with one
+    extra row a, the mix of the lowest- and highest-a vertices meeting its
+    target. None when that target is out of reach (or more rows are given).
+    """
+    if len(targets) == 1:
+        return greedy_linear(q, lo, hi)
+    if len(targets) > 2:
+        return None
+    a, target = rows[1], float(targets[1])
+    low, high = greedy_linear(-a, lo, hi), greedy_linear(a, lo, hi)
+    r_low, r_high = float(a @ low), float(a @ high)
+    tol = 1e-12 * max(abs(r_low), abs(r_high), 1.0)
+    if not r_low - tol <= target <= r_high + tol:
+        return None
+    theta = 0.0 if r_high - r_low <= tol else min(max((target - r_low) / (r_high - r_low), 0.0), 1.0)
+    return (1 - theta) * low + theta * high
+
+
+def _primal_qp(Q, q, lo, hi, rows, targets, structured, scale, w, max_iter
+               ) -> Optional[np.ndarray]:
+    """Primal active-set method from a feasible w (Nocedal & Wright, Alg. 16.3).
+
+    Each step solves the equality-constrained QP on the free weights and
+    moves towards its solution until a weight hits a bound (which is then
+    fixed); at a stationary point the bound with the most negative
+    multiplier is released. Every iterate stays feasible.
+    """
+    n, m = len(w), len(targets)
+    w = w.copy()
+    eps = 1e-12
+    grad_tol = 1e-9 * max(scale, 1.0)
+    fixed = (w <= lo + eps) | (w >= hi - eps)
+    # The free block needs full row rank in the equality rows
+    for i in np.flatnonzero(fixed):
+        if np.linalg.matrix_rank(rows[:, ~fixed]) >= m:
+            break
+        fixed[i] = False
+
+    for _ in range(max_iter):
+        free = ~fixed
+        grad = Q @ w - q
+        if free.any():
+            try:
+                step, nu = _reduced_kkt(Q, free, rows[:, free], -grad[free], np.zeros(m), structured)
+            except np.linalg.LinAlgError:
+                return None
+        else:
+            step, nu = np.zeros(0), np.linalg.lstsq(rows.T, -grad, rcond=None)[0]
+
+        if not free.any() or np.max(np.abs(step)) <= eps:
+            lam = grad + rows.T @ nu
+            on_lo = fixed & (w <= lo + eps)
+            # λ ≥ 0 on a lower bound and ≤ 0 on an upper one at the optimum
+            violation = np.where(on_lo, -lam, np.where(fixed, lam, 0.0))
+            j = int(np.argmax(violation))
+            if violation[j] <= grad_tol:
+                return np.clip(w, lo, hi)
+            fixed[j] = False
+            continue
+
+        p = np.zeros(n)
+        p[free] = step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            room = np.where(p < -eps, (lo - w) / p, np.where(p > eps, (hi - w) / p, np.inf))
+        room[fixed] = np.inf
+        j = int(np.argmin(room))
+        alpha = min(1.0, max(float(room[j]), 0.0))
+        w += alpha * p
+        if alpha < 1.0:
+            w[j] = lo[j] if p[j] < 0 else hi[j]
+            fixed[j] = True
+    return None
+
+
+def max_sharpe_frontier(cov, mu: np.ndarray, rf: float = 0.0, lo=0.0, hi=1.0,
+                        tol: float = 1e-9, max_iter: int = SHARPE_MAX_ITER
+                        ) -> Optional[np.ndarray]:
+    """Solve max (mu'w − rf) / sqrt(w'Σw)  s.t.  sum(w) = 1, lo ≤ w ≤ hi.
+
+    The optimum lies on the efficient frontier between the minimum-variance
+    return and the highest attainable return. Frontier volatility is convex
+    in the target return, so the Sharpe ratio is unimodal there and a
+    golden-section search over the target finds it; each step is one
+    min-variance QP warm-started from the previous step.
+
+    Returns:
+        optimal weights, or None when no attainable return beats rf or a
+        frontier QP fails
+    """
+    mu = np.asarray(mu, dtype=float)
+    w_min = box_budget_qp(cov, lo=lo, hi=hi)
+    top = greedy_linear(mu, lo, hi)
+    if w_min is None or top is None:
+        return None
+    a, d = float(w_min @ mu), float(top @ mu)
+    if d <= rf:
+        return None
+    if d - a <= tol * max(abs(d), 1.0):
+        return w_min
+
+    last = {"w": w_min}
+    evaluated: dict[float, tuple[float, np.ndarray]] = {}
+
+    def sharpe(target: float) -> float:
+        if target not in evaluated:
+            w = box_budget_qp(cov, lo=lo, hi=hi, A=mu, b=target, w0=last["w"])
+            if w is None:
+                raise np.linalg.LinAlgError("frontier QP failed")
+            last["w"] = w
+            vol = np.sqrt(max(float(w @ cov @ w), 1e-24))
+            evaluated[target] = ((target - rf) / vol, w)
+        return evaluated[target][0]
+
+    # The ends need no QP: the min-variance point, and the top-return
+    # portfolio (the only one attaining that return, up to ties)
+    for target, w in ((a, w_min), (d, top)):
+        evaluated[target] = ((target - rf) / np.sqrt(max(float(w @ cov @ w), 1e-24)), w)
+    try:
+        b, c = d - _GOLDEN * (d - a), a + _GOLDEN * (d - a)
+        for _ in range(max_iter):
+            if d - a <= tol * max(abs(d), 1.0):
+                break
+            if sharpe(b) >= sharpe(c):
+                d, c = c, b
+                b = d - _GOLDEN * (d - a)
+            else:
+                a, b = b, c
+                c = a + _GOLDEN * (d - a)
+    except np.linalg.LinAlgError:
+        return None
+    return max(evaluated.values(), key=lambda item: item[0])[1]
+
+
+def greedy_linear(scores: np.ndarray, lo=0.0, hi=1.0) -> Optional[np.ndarray]:
+    """Solve max s'w  s.t.  sum(w) = 1, lo ≤ w ≤ hi.
+
+    Every weight starts at its lower bound; the remaining budget goes to the
+    highest scores first, each up to its upper bound. Equal scores split
+    their share evenly.
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if not box_feasible(n, lo, hi):
+        return None
+    lo, hi = _bounds(n, lo, hi)
+    w = lo.copy()
+    remaining = 1.0 - lo.sum()
+    for value in np.unique(scores)[::-1]:
+        if remaining <= 0:
+            break
+        group = np.flatnonzero(scores == value)
+        room = hi[group] - lo[group]
+        take = min(remaining, float(room.sum()))
+        if room.sum() > 0:
+            w[group] += take * room / room.sum()
+        remaining -= take
+    return w
+
+
+def risk_parity_newton(cov: np.ndarray, budgets: Optional[np.ndarray] = None,
+                       tol: float = 1e-12, max_iter: int = NEWTON_MAX_ITER
+                       ) -> Optional[np.ndarray]:
+    """Long-only weights whose risk contributions match budgets (equal by default).
+
+    Minimizes the strictly convex ½ y'Σy − Σ bᵢ ln yᵢ with damped Newton
+    steps (Spinu, 2013); at the optimum yᵢ(Σy)ᵢ = bᵢ, so w = y / sum(y) has
+    risk contributions proportional to b. Box bounds are not imposed.
+    """
+    structured = isinstance(cov, FactorCovariance)
+    if not structured:
+        cov = np.asarray(cov, dtype=float)
+    n = cov.shape[0]
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float)
+    diag = cov.diagonal()
+    if n == 0 or np.any(diag <= 0) or np.any(b <= 0):
+        return None
+
+    y = 1.0 / np.sqrt(diag)
+    y /= np.sqrt(y @ cov @ y)
+    for _ in range(max_iter):
+        grad = cov @ y - b / y
+        try:
+            if structured:
+                step = cov.solve(grad, shift=b / y ** 2)
+            else:
+                step = np.linalg.solve(cov + np.diag(b / y ** 2), grad)
+        except np.linalg.LinAlgError:
+            return None
+        decrement = float(np.sqrt(max(step @ grad, 0.0)))
+        # Damped while far from the optimum keeps y strictly positive
+        y = y - (step / (1 + decrement) if decrement > 0.25 else step)
+        if not np.all(np.isfinite(y)) or np.any(y <= 0):
+            return None
+        if decrement ** 2 < tol:
+            return y / y.sum()
+    return None
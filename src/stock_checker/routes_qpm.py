@@ -4,6 +4,7 @@ from __future__ import annotations
 import csv
 import io
 import logging
+import os
 import re
 from pathlib import Path
 
@@ -19,6 +20,10 @@ bp = Blueprint(
 )
 
 _DEFAULT_RF = 0.065  # 6.5% BI Rate
+_MAX_FRONTIER_POINTS = 200
+_SWEEP_WORKERS = 4
+_MAX_FACTORS = 50
+_MIN_LOOKBACK, _MAX_LOOKBACK = 60, 1260
 _TICKER_RE = re.compile(r'^[A-Z0-9]{1,10}(\.[A-Z]{1,4})?$')
 
 
@@ -51,15 +56,42 @@ def dashboard():
 def optimize():
     """
     POST /qpm/optimize
-    Body: { tickers, period, method, risk_free_rate }
+    Body: { tickers, period, method, risk_free_rate, frontier_points, n_factors,
+            min_weight, max_weight }
+    n_factors switches to a PCA factor-model covariance (large watchlists).
+    min_weight / max_weight default to 2% / 20%; without an explicit
+    min_weight, universes too large for the 2% floor drop it to 0.
+    Explicit bounds that no portfolio can meet are a 422.
     Returns optimization results: weights, metrics, factor exposures, efficient frontier.
     """
+    from stock_checker.qpm import MAX_WEIGHT, MIN_TICKERS, MIN_WEIGHT, QPMAnalyzer
+    from stock_checker.qpm_solvers import box_feasible
+
     body = request.get_json(force=True, silent=True) or {}
     raw_tickers = [str(t).strip().upper() for t in body.get("tickers", []) if str(t).strip()]
     tickers: list[str] = [t for t in raw_tickers if _TICKER_RE.match(t)]
     period: str = body.get("period", "3y")
     method: str = body.get("method", "max_sharpe")
     rf: float = float(body.get("risk_free_rate", _get_rf()))
+    try:
+        frontier_points = int(body.get("frontier_points", 40))
+    except (TypeError, ValueError):
+        frontier_points = 40
+    frontier_points = min(max(frontier_points, 2), _MAX_FRONTIER_POINTS)
+    try:
+        n_factors = int(body["n_factors"]) if body.get("n_factors") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "n_factors must be an integer"}), 400
+    if n_factors is not None and not 1 <= n_factors <= _MAX_FACTORS:
+        return jsonify({"error": f"n_factors must be between 1 and {_MAX_FACTORS}"}), 400
+    explicit_bounds = body.get("min_weight") is not None or body.get("max_weight") is not None
+    try:
+        min_weight = None if body.get("min_weight") is None else float(body["min_weight"])
+        max_weight = MAX_WEIGHT if body.get("max_weight") is None else float(body["max_weight"])
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_weight and max_weight must be numbers"}), 400
+    if not 0 <= (min_weight or 0.0) <= max_weight <= 1:
+        return jsonify({"error": "Bounds must satisfy 0 <= min_weight <= max_weight <= 1"}), 400
 
     if len(tickers) < 3:
         return jsonify({"error": "QPM requires minimum 3 tickers"}), 400
@@ -75,9 +107,7 @@ def optimize():
         period = "3y"
 
     try:
-        from stock_checker.qpm import MIN_TICKERS, QPMAnalyzer
-
-        analyzer = QPMAnalyzer(risk_free_rate=rf)
+        analyzer = QPMAnalyzer(risk_free_rate=rf, max_weight=max_weight)
         prices = analyzer.fetch_prices(tickers, period=period)
         available = prices.columns.tolist()
 
@@ -95,8 +125,16 @@ def optimize():
                 422,
             )
 
+        n = len(available)
+        if min_weight is None:
+            min_weight = MIN_WEIGHT if n * MIN_WEIGHT <= 1 and MIN_WEIGHT <= max_weight else 0.0
+        if explicit_bounds and not box_feasible(n, min_weight, max_weight):
+            return jsonify({"error": f"Weights between {min_weight:.2%} and {max_weight:.2%} "
+                                     f"cannot sum to 100% across {n} tickers"}), 422
+        analyzer.min_weight = min_weight
+
         returns = analyzer.compute_returns(prices)
-        cov = analyzer.compute_covariance(returns, shrinkage=True)
+        cov = analyzer.compute_covariance(returns, shrinkage=True, n_factors=n_factors)
 
         # Factor signals
         factors_df = analyzer.compute_factors(prices)
@@ -116,13 +154,13 @@ def optimize():
 
         # Efficient frontier
         try:
-            frontier = analyzer.efficient_frontier(returns, cov)
+            frontier = analyzer.efficient_frontier(returns, cov, n_points=frontier_points)
         except Exception:
             frontier = []
 
         # Per-ticker statistics
         ann_returns = returns.mean() * 252
-        vols = pd.Series(np.sqrt(np.maximum(np.diag(cov), 0.0)), index=tickers_avail)
+        vols = pd.Series(np.sqrt(np.maximum(cov.diagonal(), 0.0)), index=tickers_avail)
 
         ticker_stats = []
         for t, w in zip(tickers_avail, weights_arr):
@@ -161,6 +199,8 @@ def optimize():
                 "method": method,
                 "period": period,
                 "risk_free_rate": rf,
+                "min_weight": min_weight,
+                "max_weight": max_weight,
                 "weights": weights,
                 "metrics": metrics,
                 "ticker_stats": ticker_stats,
@@ -208,6 +248,84 @@ def backtest(method: str):
         return jsonify({"error": "Backtest failed. Please try again."}), 500
 
 
+@bp.route("/sweep", methods=["POST"])
+def sweep():
+    """
+    POST /qpm/sweep
+    Body: { tickers, period, risk_free_rate, methods, lookbacks, rebalance, bounds }
+      methods   : subset of the optimization methods (default: all four)
+      lookbacks : trailing windows in trading days (default: [252])
+      rebalance : subset of weekly / monthly / quarterly (default: ["monthly"])
+      bounds    : [[min_weight, max_weight], ...] (default: [[0.02, 0.20]])
+    Returns one comparison row (parameters, metrics, equity curve) per
+    combination, sharing prices, returns and covariances across runs.
+    """
+    from stock_checker.qpm import (
+        MAX_SWEEP_RUNS, MAX_WEIGHT, MIN_TICKERS, MIN_WEIGHT, OPTIMIZATION_METHODS,
+        REBALANCE_FREQUENCIES, QPMAnalyzer,
+    )
+
+    body = request.get_json(force=True, silent=True) or {}
+    raw_tickers = [str(t).strip().upper() for t in body.get("tickers", []) if str(t).strip()]
+    tickers: list[str] = [t for t in raw_tickers if _TICKER_RE.match(t)]
+    period: str = body.get("period", "5y")
+    if period not in {"1y", "3y", "5y"}:
+        period = "5y"
+
+    if len(tickers) < 3:
+        return jsonify({"error": "QPM requires minimum 3 tickers"}), 400
+    try:
+        rf = float(body.get("risk_free_rate", _get_rf()))
+        methods = list(dict.fromkeys(body.get("methods") or OPTIMIZATION_METHODS))
+        lookbacks = sorted({int(v) for v in body.get("lookbacks") or [252]})
+        rebalances = list(dict.fromkeys(body.get("rebalance") or ["monthly"]))
+        bounds = [(float(lo), float(hi))
+                  for lo, hi in body.get("bounds") or [[MIN_WEIGHT, MAX_WEIGHT]]]
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid sweep parameters"}), 400
+
+    invalid = [m for m in methods if m not in OPTIMIZATION_METHODS]
+    if invalid:
+        return jsonify({"error": f"Invalid methods: {invalid}. "
+                                 f"Choose from: {list(OPTIMIZATION_METHODS)}"}), 400
+    invalid = [r for r in rebalances if r not in REBALANCE_FREQUENCIES]
+    if invalid:
+        return jsonify({"error": f"Invalid rebalance: {invalid}. "
+                                 f"Choose from: {list(REBALANCE_FREQUENCIES)}"}), 400
+    if any(not _MIN_LOOKBACK <= v <= _MAX_LOOKBACK for v in lookbacks):
+        return jsonify({"error": f"Lookbacks must be between {_MIN_LOOKBACK} "
+                                 f"and {_MAX_LOOKBACK} days"}), 400
+    if any(not 0 <= lo <= hi <= 1 for lo, hi in bounds):
+        return jsonify({"error": "Bounds must satisfy 0 <= min_weight <= max_weight <= 1"}), 400
+    n_runs = len(methods) * len(lookbacks) * len(rebalances) * len(bounds)
+    if n_runs > MAX_SWEEP_RUNS:
+        return jsonify({"error": f"At most {MAX_SWEEP_RUNS} runs per sweep "
+                                 f"(requested {n_runs})"}), 400
+
+    try:
+        analyzer = QPMAnalyzer(risk_free_rate=rf)
+        prices = analyzer.fetch_prices(tickers, period=period)
+        if len(prices.columns) < MIN_TICKERS:
+            return jsonify({
+                "error": (f"Only {len(prices.columns)} tickers returned data. "
+                          f"Minimum {MIN_TICKERS} required."),
+                "available": prices.columns.tolist(),
+            }), 422
+        workers = min(os.cpu_count() or 1, _SWEEP_WORKERS, len(lookbacks) * len(rebalances))
+        result = analyzer.backtest_sweep(
+            prices, methods, lookbacks=lookbacks, rebalances=rebalances,
+            bounds=bounds, workers=workers,
+        )
+        result.update({"period": period, "risk_free_rate": rf,
+                       "tickers": prices.columns.tolist()})
+        return jsonify(result)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 422
+    except Exception:
+        logging.exception("Sweep failed (tickers=%s)", tickers)
+        return jsonify({"error": "Sweep failed. Please try again."}), 500
+
+
 @bp.route("/export", methods=["POST"])
 def export_csv():
     """
@@ -0,0 +1,32 @@
+"""Shared fixtures for the Alpha module tests."""
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def app():
+    """Alpha app on an in-memory SQLite database, inside an app context."""
+    flask = pytest.importorskip("flask")
+    from stock_checker.alpha import init_alpha
+    from stock_checker.alpha.services import (
+        fundamentals, peers, rollups, sector_stats, universe, valuation_cache,
+    )
+
+    app = flask.Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    init_alpha(app)
+    with app.app_context():
+        universe.invalidate_universe()
+        fundamentals.clear_cache()
+        sector_stats.clear_cache()
+        peers.invalidate_peer_index()
+        rollups.clear_cache()
+        valuation_cache.clear_cache()
+        yield app
+    universe.invalidate_universe()
+    fundamentals.clear_cache()
+    sector_stats.clear_cache()
+    peers.invalidate_peer_index()
+    rollups.clear_cache()
+    valuation_cache.clear_cache()
@@ -0,0 +1,152 @@
+"""Tests for cross-sectional batch ratio calculation."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.batch_ratios import (
+    RATIO_COLUMNS,
+    STATEMENT_ITEMS,
+    calc_implied_growth_batch,
+    calc_ratios_batch,
+    item_history,
+    statements_to_long,
+)
+from stock_checker.alpha.calculations.ratios import calc_all_ratios
+from stock_checker.alpha.calculations.valuation import calc_dcf
+
+_INFO_KEYS = ["currentPrice", "regularMarketPrice", "marketCap", "sharesOutstanding", "beta",
+              "dividendYield", "priceToSalesTrailing12Months", "trailingPE", "priceToBook",
+              "returnOnEquity", "returnOnAssets", "debtToEquity", "currentRatio",
+              "enterpriseToEbitda", "pegRatio"]
+
+
+def _statement(rng, items, n_periods):
+    if rng.random() < 0.05:
+        return None
+    items = [i for i in items if rng.random() < 0.85] + ["Other"]
+    cols = pd.date_range("2020-12-31", periods=n_periods, freq="YE")[::-1]
+    values = rng.normal(50, 60, (len(items), n_periods))
+    values[rng.random(values.shape) < 0.15] = np.nan
+    values[rng.random(values.shape) < 0.10] = 0.0
+    return pd.DataFrame(values, index=items, columns=cols)
+
+
+def _info(rng):
+    info = {}
+    for key in _INFO_KEYS:
+        r = rng.random()
+        if r < 0.3:
+            continue
+        info[key] = 0.0 if r < 0.4 else (None if r < 0.45 else float(rng.normal(1, 2)))
+    return info
+
+
+@pytest.fixture(scope="module")
+def universe():
+    rng = np.random.default_rng(21)
+    frames, infos = {}, {}
+    for i in range(300):
+        ticker = f"T{i:03d}.JK"
+        frames[ticker] = {
+            "income": _statement(rng, STATEMENT_ITEMS["income"], int(rng.integers(1, 5))),
+            "balance": _statement(rng, STATEMENT_ITEMS["balance"], 4),
+            "cashflow": _statement(rng, STATEMENT_ITEMS["cashflow"], 4),
+        }
+        infos[ticker] = _info(rng)
+    return frames, infos
+
+
+def _assert_matches_reference(out, frames, infos):
+    for ticker, st in frames.items():
+        ref = calc_all_ratios(infos[ticker], st["income"], st["balance"], st["cashflow"])
+        for col in RATIO_COLUMNS:
+            got = out.at[ticker, col]
+            if ref[col] is None:
+                assert np.isnan(got), (ticker, col, got)
+            else:
+                assert got == pytest.approx(ref[col], rel=1e-12), (ticker, col)
+
+
+def test_batch_matches_calc_all_ratios(universe):
+    frames, infos = universe
+    out = calc_ratios_batch(statements_to_long(frames), infos)
+    assert list(out.columns) == RATIO_COLUMNS
+    _assert_matches_reference(out, frames, infos)
+
+
+def test_offsets_derived_from_periods(universe):
+    frames, infos = universe
+    long = statements_to_long(frames, STATEMENT_ITEMS)
+    with_offset = calc_ratios_batch(long, infos)
+    derived = calc_ratios_batch(long.drop(columns="offset"), infos)
+    np.testing.assert_array_equal(with_offset.to_numpy(), derived.loc[with_offset.index].to_numpy())
+
+
+def test_info_only_tickers_use_fallbacks():
+    out = calc_ratios_batch(statements_to_long({}), {"A.JK": {"trailingPE": 12.0, "returnOnEquity": 0.15,
+                                                              "dividendYield": 0.03}})
+    assert out.at["A.JK", "PER"] == 12.0
+    assert out.at["A.JK", "ROE"] == pytest.approx(15.0)
+    assert out.at["A.JK", "Dividend Yield"] == pytest.approx(3.0)
+    assert np.isnan(out.at["A.JK", "DER"])
+
+
+def test_item_history_is_oldest_first(universe):
+    frames, _ = universe
+    long = statements_to_long(frames)
+    ticker = next(t for t, st in frames.items()
+                  if st["income"] is not None and "Net Income" in st["income"].index
+                  and st["income"].shape[1] >= 3)
+    hist = item_history(long, "income", "Net Income", [ticker])[0]
+    expected = frames[ticker]["income"].loc["Net Income"].to_numpy()[::-1]
+    np.testing.assert_array_equal(hist[-len(expected):], expected)
+
+
+# ── Reverse DCF column ──
+
+def test_implied_growth_batch_reprices_market_value():
+    cols = pd.to_datetime(["2024-12-31"])
+    frames = {
+        "AAA.JK": {"balance": pd.DataFrame({cols[0]: [3e11, 1e11]},
+                                           index=["Total Debt", "Cash And Cash Equivalents"]),
+                   "cashflow": pd.DataFrame({cols[0]: [1.2e11]}, index=["Free Cash Flow"])},
+        "BBB.JK": {"cashflow": pd.DataFrame({cols[0]: [-5e10]}, index=["Free Cash Flow"])},
+        "CCC.JK": {"cashflow": pd.DataFrame({cols[0]: [8e10]}, index=["Free Cash Flow"])},
+    }
+    infos = {"AAA.JK": {"marketCap": 2.5e12}, "BBB.JK": {"marketCap": 9e11},
+             "CCC.JK": {"currentPrice": 10.0, "sharesOutstanding": 1.5e11}}
+    implied = calc_implied_growth_batch(statements_to_long(frames), infos)
+
+    assert implied.name == "Implied Growth"
+    ev = calc_dcf(1.2e11, implied["AAA.JK"] / 100, 0.03, 0.10)["enterprise_value"]
+    assert ev == pytest.approx(2.5e12 + 3e11 - 1e11, rel=1e-6)
+    assert np.isnan(implied["BBB.JK"])                      # negative FCF
+    ev = calc_dcf(8e10, implied["CCC.JK"] / 100, 0.03, 0.10)["enterprise_value"]
+    assert ev == pytest.approx(1.5e12, rel=1e-6)            # price × shares
+
+
+# ── Comparison service ──
+
+def test_compare_isolates_a_bad_statement(monkeypatch):
+    from stock_checker.alpha.services import comparison as svc
+
+    cols = pd.date_range("2020-12-31", periods=3, freq="YE")[::-1]
+    income = pd.DataFrame([[120.0, 100.0, 90.0], [12.0, 10.0, 9.0]],
+                          index=["Total Revenue", "Net Income"], columns=cols)
+    bad = income.astype(object)
+    bad.iloc[0, 0] = "n/a"
+    statements = {"AAAA.JK": income, "BAD.JK": bad, "CCCC.JK": income * 2}
+    monkeypatch.setattr(svc, "get_info", lambda symbol: {"currentPrice": 1000.0})
+    monkeypatch.setattr(svc, "get_financials", statements.get)
+    monkeypatch.setattr(svc, "get_balance_sheet", lambda symbol: None)
+    monkeypatch.setattr(svc, "get_cashflow", lambda symbol: None)
+
+    data = svc.compare_tickers(["AAAA.JK", "BAD.JK", "CCCC.JK"])["data"]
+    assert list(data) == ["AAAA.JK", "BAD.JK", "CCCC.JK"]
+    assert set(data["BAD.JK"]) == {"error"}
+    assert data["AAAA.JK"]["metrics"]["NPM"] == pytest.approx(10.0)
+    assert data["CCCC.JK"]["metrics"]["NPM"] == pytest.approx(10.0)
+    clean = svc.compare_tickers(["AAAA.JK", "CCCC.JK"])["data"]
+    assert clean == {t: data[t] for t in clean}
@@ -0,0 +1,180 @@
+"""Vectorized scoring engine must match the scalar scoring functions row for row."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.batch_scores import (
+    PANEL_COLUMNS,
+    SECTOR_KEYS,
+    breakdown_row,
+    calc_scores_batch,
+    calc_scores_sweep,
+    compile_scoring_matrices,
+    pillar_grid,
+)
+from stock_checker.alpha.calculations.scores import (
+    calc_composite_score,
+    calc_quality_score,
+    calc_risk_score,
+    calc_valuation_score,
+)
+
+_CAGR_KEYS = {"Revenue CAGR": "Total Revenue", "NI CAGR": "Net Income", "FCF CAGR": "Free Cash Flow"}
+
+
+def _random_panel(n: int = 400, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {col: rng.normal(10, 15, n) for col in PANEL_COLUMNS}
+    panel = pd.DataFrame(data, index=[f"T{i}.JK" for i in range(n)])
+    # Sprinkle missing values and unknown sectors
+    panel = panel.mask(rng.random(panel.shape) < 0.15)
+    panel["sector"] = rng.choice(SECTOR_KEYS + ["unknown"], n)
+    return panel
+
+
+def _scalar(row: pd.Series) -> dict:
+    ratios = {k: (None if pd.isna(row[k]) else float(row[k])) for k in PANEL_COLUMNS}
+    trends = {"annual": {metric: {"cagr": ratios[col]} for col, metric in _CAGR_KEYS.items()}}
+    sector = row["sector"]
+    q = calc_quality_score(ratios, trends, sector=sector)
+    v = calc_valuation_score(ratios, sector=sector)
+    r = calc_risk_score(ratios, sector=sector)
+    c = calc_composite_score(q["score"], v["score"], r["score"])
+    return {"quality": q, "valuation": v, "risk": r, "composite": c}
+
+
+def _opt(v):
+    return None if pd.isna(v) else float(v)
+
+
+@pytest.fixture(scope="module")
+def panel() -> pd.DataFrame:
+    return _random_panel()
+
+
+@pytest.fixture(scope="module")
+def batch(panel: pd.DataFrame) -> dict:
+    return calc_scores_batch(panel)
+
+
+def test_scores_match_scalar(panel, batch):
+    scores = batch["scores"]
+    for i, (_, row) in enumerate(panel.iterrows()):
+        ref = _scalar(row)
+        got = scores.iloc[i]
+        assert _opt(got["quality_score"]) == ref["quality"]["score"]
+        assert _opt(got["valuation_score"]) == ref["valuation"]["score"]
+        assert _opt(got["risk_score"]) == ref["risk"]["score"]
+        assert _opt(got["composite_score"]) == ref["composite"]["composite_score"]
+        assert got["recommendation"] == ref["composite"]["recommendation"]
+
+
+def test_breakdown_matches_scalar(panel, batch):
+    for i, (_, row) in enumerate(panel.iterrows()):
+        ref = _scalar(row)
+        got = breakdown_row(batch["breakdown"], i, row["sector"])
+        for pillar in ("quality", "valuation", "risk"):
+            assert got[pillar].keys() == ref[pillar]["breakdown"].keys()
+            for key, expected in ref[pillar]["breakdown"].items():
+                if expected is None:
+                    assert got[pillar][key] is None
+                else:
+                    assert got[pillar][key] == pytest.approx(expected)
+
+
+def test_missing_columns_and_sector_use_defaults():
+    panel = pd.DataFrame({"ROE": [20.0], "PER": [12.0]}, index=["AAAA.JK"])
+    scores = calc_scores_batch(panel)["scores"].iloc[0]
+    assert scores["quality_score"] == calc_quality_score({"ROE": 20.0}, None)["score"]
+    assert scores["valuation_score"] == calc_valuation_score({"PER": 12.0})["score"]
+    assert np.isnan(scores["risk_score"])
+
+
+def test_empty_row_has_no_recommendation():
+    panel = pd.DataFrame({"ROE": [np.nan]}, index=["AAAA.JK"])
+    scores = calc_scores_batch(panel)["scores"].iloc[0]
+    assert np.isnan(scores["composite_score"])
+    assert scores["recommendation"] is None
+
+
+# ── Weight profiles & sweeps ──────────────────────────────────────────────────
+
+
+def test_empty_profile_compiles_to_defaults():
+    base = compile_scoring_matrices()
+    same = compile_scoring_matrices({})
+    for key in base:
+        np.testing.assert_array_equal(base[key], same[key])
+
+
+def test_profile_overrides_pillars_and_sector_valuation(panel):
+    profile = {
+        "pillars": {"quality": 0, "valuation": 1, "risk": 0},
+        "sectors": {"perbankan": {"valuation": {"P/S": {"lo": 0.5, "hi": 5, "weight": 0.2}}}},
+    }
+    scores = calc_scores_batch(panel, compile_scoring_matrices(profile))["scores"]
+    val = scores["valuation_score"].dropna()
+    np.testing.assert_array_equal(scores.loc[val.index, "composite_score"], val)
+
+
+@pytest.mark.parametrize("profile", [
+    {"unknown": {}},
+    {"pillars": {"quality": -1}},
+    {"pillars": {"quality": 0, "valuation": 0, "risk": 0}},
+    {"quality_ranges": {"ROE": [30, 0]}},
+    {"sectors": {"not_a_sector": {}}},
+    {"sectors": {"perbankan": {"valuation": {"P/S": {"weight": 1}}}}},
+])
+def test_invalid_profiles_raise(profile):
+    with pytest.raises(ValueError):
+        compile_scoring_matrices(profile)
+
+
+def test_sweep_matches_individual_batches(panel):
+    profiles = [{"pillars": dict(zip(("quality", "valuation", "risk"), w))} for w in pillar_grid(0.25)]
+    profiles.append({"quality": {"ROE": 1}, "risk": {"DER": 0}})
+    matrices = [compile_scoring_matrices(p) for p in profiles]
+    sweep = calc_scores_sweep(panel, matrices)
+    for k, m in enumerate(matrices):
+        single = calc_scores_batch(panel, m)["scores"]
+        for col in ("quality_score", "valuation_score", "risk_score", "composite_score"):
+            np.testing.assert_array_equal(sweep[col][k].to_numpy(), single[col].to_numpy())
+        assert sweep["recommendation"][k].tolist() == single["recommendation"].tolist()
+
+
+def test_pillar_grid_on_simplex():
+    grid = pillar_grid(0.1)
+    assert len(grid) == 66
+    np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+    assert (grid >= 0).all()
+
+
+# ── Service ───────────────────────────────────────────────────────────────────
+
+
+def test_scores_batch_isolates_a_poisoned_ticker(monkeypatch):
+    from stock_checker.alpha.services import scores as svc
+
+    cols = pd.date_range("2020-12-31", periods=3, freq="YE")[::-1]
+    income = pd.DataFrame([[120.0, 100.0, 90.0], [12.0, 10.0, 9.0]],
+                          index=["Total Revenue", "Net Income"], columns=cols)
+    poisoned = income.astype(object)
+    poisoned.iloc[0, 0] = "n/a"
+    statements = {"AAAA.JK": income, "BAD.JK": poisoned, "CCCC.JK": income * 2}
+    monkeypatch.setattr(svc, "get_info", lambda symbol: {"currentPrice": 1000.0})
+    monkeypatch.setattr(svc, "get_financials", statements.get)
+    monkeypatch.setattr(svc, "get_balance_sheet", lambda symbol: None)
+    monkeypatch.setattr(svc, "get_cashflow", lambda symbol: None)
+    monkeypatch.setattr(svc, "_detect_sector", lambda symbol: "unknown")
+    monkeypatch.setattr(svc, "_sector_stats", lambda: None)
+
+    results = svc.get_scores_batch(["AAAA.JK", "BAD.JK", "CCCC.JK"])
+    assert [r["ticker"] for r in results] == ["AAAA.JK", "BAD.JK", "CCCC.JK"]
+    assert results[1] == {"ticker": "BAD.JK", "error": "Failed to compute scores"}
+    for r in (results[0], results[2]):
+        assert "error" not in r
+        assert r["score_details"]["quality"]
+    clean = svc.get_scores_batch(["AAAA.JK", "CCCC.JK"])
+    assert [results[0], results[2]] == clean
@@ -0,0 +1,115 @@
+"""Tests for line-item normalization and the fundamentals warehouse."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.line_items import canonical_item, normalize_statement
+from stock_checker.alpha.services import fundamentals as fu
+
+
+def _statement(items, periods, seed=0):
+    rng = np.random.default_rng(seed)
+    cols = pd.DatetimeIndex(pd.to_datetime(periods))
+    return pd.DataFrame(rng.normal(100, 10, (len(items), len(cols))), index=items, columns=cols)
+
+
+# ── Normalization ───────────────────────────────────────────────────────────
+
+def test_canonical_item_labels():
+    assert canonical_item("TotalRevenue") == "Total Revenue"
+    assert canonical_item("  Net   Income ") == "Net Income"
+    assert canonical_item("EBITDA") == "EBITDA"
+    assert canonical_item("Cash Flowsfromusedin Operating Activities Direct") == "Operating Cash Flow"
+
+
+def test_normalize_statement_prefers_canonical_row():
+    df = _statement(["Operating Activities", "Free Cash Flow", "Operating Cash Flow"],
+                    ["2024-12-31", "2023-12-31"])
+    out = normalize_statement(df)
+    assert list(out.index) == ["Free Cash Flow", "Operating Cash Flow"]
+    np.testing.assert_array_equal(out.loc["Operating Cash Flow"], df.loc["Operating Cash Flow"])
+
+    only_alias = normalize_statement(df.drop(index="Operating Cash Flow"))
+    assert list(only_alias.index) == ["Operating Cash Flow", "Free Cash Flow"]
+
+
+
+def test_normalize_statement_fills_canonical_gaps_from_alias():
+    from stock_checker.alpha.calculations.ratios import calc_all_ratios
+
+    periods = ["2024-12-31", "2023-12-31", "2022-12-31"]
+    df = _statement(["Stockholders Equity", "Total Assets", "Total Stockholders Equity"], periods)
+    df.loc["Stockholders Equity"] = [np.nan, 0.0, 90.0]
+    df.loc["Total Stockholders Equity"] = [200.0, 150.0, 95.0]
+    out = normalize_statement(df)
+    assert list(out.index) == ["Stockholders Equity", "Total Assets"]
+    np.testing.assert_array_equal(out.loc["Stockholders Equity"], [200.0, 150.0, 90.0])
+
+    income = _statement(["Net Income"], periods)
+    ratios = calc_all_ratios({}, income, out)
+    assert ratios["ROE"] == pytest.approx(income.iloc[0, 0] / 200.0 * 100)
+
+
+# ── Warehouse ───────────────────────────────────────────────────────────────
+
+def test_ingest_round_trip_keeps_shape(app):
+    df = _statement(["Total Revenue", "Ghost", "Net Income"], ["2024-12-31", "2023-12-31"])
+    df.loc["Ghost"] = np.nan
+    assert fu.ingest_statement("aaa.jk", "income", "annual", df) == 6
+
+    out = fu.load_statement("AAA.JK", "income")
+    assert list(out.index) == ["Total Revenue", "Ghost", "Net Income"]
+    assert list(out.columns) == list(df.columns)
+    np.testing.assert_array_equal(out.to_numpy(), df.to_numpy())
+
+
+def test_restatement_replaces_period_and_keeps_history(app):
+    fu.ingest_statement("AAA.JK", "income", "annual",
+                        _statement(["Total Revenue"], ["2023-12-31", "2022-12-31"], seed=1))
+    newer = _statement(["Total Revenue"], ["2024-12-31", "2023-12-31"], seed=2)
+    fu.ingest_statement("AAA.JK", "income", "annual", newer)
+
+    out = fu.load_statement("AAA.JK", "income")
+    assert [c.year for c in out.columns] == [2024, 2023, 2022]
+    assert out.iloc[0, 1] == newer.iloc[0, 1]
+
+
+def test_load_long_offsets_and_item_panel(app):
+    for i, ticker in enumerate(["AAA.JK", "BBB.JK"]):
+        fu.ingest_statement(ticker, "income", "annual",
+                            _statement(["TotalRevenue", "Net Income"],
+                                       ["2024-12-31", "2023-12-31", "2022-12-31"], seed=i))
+    long = fu.load_long(items=["Total Revenue"])
+    assert set(long["item"]) == {"Total Revenue"}
+    latest = long[long["offset"] == 0]
+    assert set(latest["period"].dt.year) == {2024}
+    panel = fu.item_panel("Total Revenue")
+    assert list(panel.columns) == ["AAA.JK", "BBB.JK"]
+    assert list(panel.index.year) == [2022, 2023, 2024]
+
+
+def test_get_statement_served_from_warehouse_when_fresh(app, monkeypatch):
+    df = _statement(["Total Revenue"], ["2024-12-31", "2023-12-31"])
+    calls = []
+
+    def fake_raw(symbol, statement, freq):
+        calls.append((symbol, statement, freq))
+        return df
+
+    monkeypatch.setattr(fu, "get_raw_statement", fake_raw)
+    first = fu.get_financials("AAA.JK")
+    fu.clear_cache()
+    second = fu.get_financials("AAA.JK")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_load_point_in_time_from_warehouse(app):
+    fu.ingest_statement("AAA.JK", "income", "annual",
+                        _statement(["Net Income"], ["2023-12-31", "2022-12-31"], seed=3))
+    store = fu.load_point_in_time(["AAA.JK"])
+    stored = fu.load_statement("AAA.JK", "income")
+    assert store.as_of("2023-06-30").loc["AAA.JK", "Net Income"] == stored.iloc[0, 1]
+    assert store.as_of("2024-06-30").loc["AAA.JK", "Net Income"] == stored.iloc[0, 0]
@@ -0,0 +1,61 @@
+"""Tests for the vectorized statement growth helpers."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.growth import (
+    calc_cagr,
+    calc_cagr_matrix,
+    calc_growth_matrix,
+    calc_growth_series,
+    growth_records,
+    period_labels,
+    statement_values,
+)
+from stock_checker.alpha.services.financials import _df_to_dict
+
+
+@pytest.fixture(scope="module")
+def statement() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    values = rng.normal(100, 80, (30, 5)).round(1)
+    values[rng.random(values.shape) < 0.15] = np.nan
+    values[rng.random(values.shape) < 0.05] = 0.0
+    values[0, 2] = np.inf
+    cols = pd.DatetimeIndex(pd.date_range("2020-12-31", periods=5, freq="YE")[::-1])
+    return pd.DataFrame(values, index=[f"row{i}" for i in range(30)], columns=cols)
+
+
+def test_df_to_dict_matches_cellwise(statement):
+    out = _df_to_dict(statement)
+    assert list(out) == list(statement.index)
+    for label, row in statement.iterrows():
+        for col, v in row.items():
+            expected = None if not np.isfinite(v) else float(v)
+            assert out[label][col.strftime("%Y-%m-%d")] == expected
+
+
+def test_growth_rows_match_series_path(statement):
+    oldest_first = statement.iloc[:, ::-1]
+    values = statement_values(oldest_first)
+    labels = period_labels(oldest_first.columns)
+    growth = calc_growth_matrix(values)
+    cagr = calc_cagr_matrix(values)
+    for i, (_, series) in enumerate(oldest_first.iterrows()):
+        clean = series.where(np.isfinite(series))
+        expected = calc_growth_series(clean)
+        assert growth_records(labels, values[i], growth[i]) == expected
+        finite = [v for v in clean if v == v]
+        ref = calc_cagr(finite[0], finite[-1], len(finite) - 1) if len(finite) >= 2 else None
+        if ref is None:
+            assert np.isnan(cagr[i])
+        else:
+            assert cagr[i] == pytest.approx(ref)
+
+
+def test_growth_matrix_zero_and_missing_previous():
+    g = calc_growth_matrix([[0.0, 10.0, np.nan, 5.0, -5.0]])
+    assert np.isnan(g[0, :4]).all()
+    assert g[0, 4] == pytest.approx(-200.0)
@@ -0,0 +1,128 @@
+"""Tests for the Monte Carlo DCF engine."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from stock_checker.alpha.calculations.monte_carlo import (
+    calc_monte_carlo_dcf, parse_distribution, sample_inputs,
+)
+from stock_checker.alpha.calculations.valuation import calc_dcf
+
+FCF = 2.5e9
+SHARES = 1.2e9
+NET_DEBT = 4e8
+
+INPUTS = {
+    "growth": {"dist": "normal", "mean": 0.08, "std": 0.03},
+    "wacc": {"dist": "uniform", "low": 0.09, "high": 0.13},
+    "terminal_growth": {"dist": "triangular", "low": 0.02, "mode": 0.03, "high": 0.04},
+}
+
+
+# ── Sampling ──
+
+def test_marginals_match_their_distributions():
+    specs = {n: parse_distribution(n, s) for n, s in INPUTS.items()}
+    draws = sample_inputs(specs, 200_000, seed=3)
+    assert draws["growth"].mean() == pytest.approx(0.08, abs=1e-3)
+    assert draws["growth"].std() == pytest.approx(0.03, abs=1e-3)
+    assert draws["wacc"].min() >= 0.09 and draws["wacc"].max() <= 0.13
+    assert draws["wacc"].mean() == pytest.approx(0.11, abs=1e-3)
+    tg = draws["terminal_growth"]
+    assert tg.min() >= 0.02 and tg.max() <= 0.04
+    assert tg.mean() == pytest.approx(0.03, abs=1e-4)
+
+
+def test_correlation_is_applied():
+    specs = {n: parse_distribution(n, s) for n, s in INPUTS.items()}
+    draws = sample_inputs(specs, 100_000, correlation={"growth": {"wacc": 0.6}}, seed=5)
+    rho = np.corrcoef(draws["growth"], draws["wacc"])[0, 1]
+    assert rho == pytest.approx(0.6 * 0.977, abs=0.02)   # Pearson after the uniform map
+    assert abs(np.corrcoef(draws["growth"], draws["terminal_growth"])[0, 1]) < 0.02
+
+
+@pytest.mark.parametrize("spec", [
+    {"dist": "gamma", "mean": 1},
+    {"dist": "normal", "mean": 0.1},
+    {"dist": "normal", "mean": 0.1, "std": -1},
+    {"dist": "uniform", "low": 0.2, "high": 0.1},
+    {"dist": "triangular", "low": 0.0, "mode": 0.5, "high": 0.4},
+    "0.1",
+])
+def test_invalid_distributions(spec):
+    with pytest.raises(ValueError):
+        parse_distribution("growth", spec)
+
+
+def test_invalid_correlation():
+    specs = {n: parse_distribution(n, s) for n, s in INPUTS.items()}
+    bad = {"growth": {"wacc": 0.99, "terminal_growth": 0.99}, "wacc": {"terminal_growth": -0.99}}
+    with pytest.raises(ValueError, match="positive definite"):
+        sample_inputs(specs, 10, correlation=bad)
+    with pytest.raises(ValueError):
+        sample_inputs(specs, 10, correlation={"growth": {"fcf_margin": 0.5}})
+
+
+# ── Valuation ──
+
+def test_fixed_inputs_reduce_to_calc_dcf():
+    result = calc_monte_carlo_dcf(FCF, {"growth": 0.08, "wacc": 0.11, "terminal_growth": 0.03},
+                                  n_paths=10, shares_outstanding=SHARES, net_debt=NET_DEBT)
+    ref = calc_dcf(FCF, 0.08, 0.03, 0.11, 5, SHARES, NET_DEBT)["intrinsic_per_share"]
+    assert result["percentiles"]["p50"] == ref
+    assert result["std"] == 0
+
+
+def test_distribution_summary_and_upside():
+    result = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=50_000, shares_outstanding=SHARES,
+                                  net_debt=NET_DEBT, seed=7)
+    assert result["valid_paths"] == 50_000
+    assert "prob_upside" not in result
+    p = result["percentiles"]
+    assert p["p5"] < p["p25"] < p["p50"] < p["p75"] < p["p95"]
+    priced = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=50_000, shares_outstanding=SHARES,
+                                  net_debt=NET_DEBT, current_price=p["p25"], seed=7)
+    assert priced["prob_upside"] == pytest.approx(0.75, abs=1e-3)
+    hist = result["histogram"]
+    assert len(hist["counts"]) == 50 and len(hist["edges"]) == 51
+    assert sum(hist["counts"]) + hist["below"] + hist["above"] == 50_000
+
+
+def test_seed_is_reproducible():
+    a = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=5_000, shares_outstanding=SHARES, seed=11)
+    b = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=5_000, shares_outstanding=SHARES, seed=11)
+    c = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=5_000, shares_outstanding=SHARES, seed=12)
+    assert a == b
+    assert a["percentiles"] != c["percentiles"]
+
+
+def test_fcf_margin_uses_revenue_base():
+    inputs = {**INPUTS, "fcf_margin": {"dist": "uniform", "low": 0.05, "high": 0.15}}
+    assert "error" in calc_monte_carlo_dcf(FCF, inputs, n_paths=100)
+    result = calc_monte_carlo_dcf(None, {**inputs, "fcf_margin": 0.1}, n_paths=100,
+                                  shares_outstanding=SHARES, revenue_base=FCF * 10, seed=1)
+    same = calc_monte_carlo_dcf(FCF, INPUTS, n_paths=100, shares_outstanding=SHARES, seed=1)
+    assert result["percentiles"] == same["percentiles"]
+
+
+def test_invalid_paths_are_dropped():
+    inputs = {**INPUTS, "wacc": {"dist": "uniform", "low": 0.01, "high": 0.05}}
+    result = calc_monte_carlo_dcf(FCF, inputs, n_paths=10_000, shares_outstanding=SHARES, seed=2)
+    assert 0 < result["valid_paths"] < 10_000
+    assert calc_monte_carlo_dcf(FCF, {**INPUTS, "wacc": 0.01}, n_paths=10)["valid_paths"] == 0
+
+
+def test_sampled_fcf_margin_with_fixed_rates():
+    inputs = {"growth": 0.08, "wacc": 0.11, "terminal_growth": 0.03,
+              "fcf_margin": {"dist": "normal", "mean": 0.1, "std": 0.02}}
+    result = calc_monte_carlo_dcf(None, inputs, n_paths=1000, shares_outstanding=SHARES,
+                                  revenue_base=FCF * 10, seed=1)
+    assert "error" not in result
+    assert result["valid_paths"] == 1000
+    assert result["std"] > 0
+    # Value is linear in FCF, so the mean path sits at the mean sampled margin
+    specs = {name: parse_distribution(name, spec) for name, spec in inputs.items()}
+    margins = sample_inputs(specs, 1000, seed=1)["fcf_margin"]
+    expected = calc_dcf(FCF * 10 * margins.mean(), 0.08, 0.03, 0.11, 5, SHARES)
+    assert result["mean"] == pytest.approx(expected["intrinsic_per_share"], rel=1e-6)
@@ -0,0 +1,140 @@
+"""Tests for the nearest-neighbor peer index."""
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.peers import PEER_FEATURES, PeerIndex, standardize
+
+
+@pytest.fixture(scope="module")
+def features() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    n = 40
+    data = rng.normal(0, 1, (n, len(PEER_FEATURES)))
+    data[:20] += 5           # two well separated clusters
+    frame = pd.DataFrame(data, columns=PEER_FEATURES, index=[f"T{i:02d}.JK" for i in range(n)])
+    return frame
+
+
+@pytest.fixture(scope="module")
+def sectors(features) -> pd.Series:
+    return pd.Series(["banking", "mining"] * 20, index=features.index)
+
+
+def _brute_force(features, ticker, k, allowed=None):
+    z, _, _ = standardize(features.to_numpy())
+    pos = features.index.get_loc(ticker)
+    d = np.sqrt(((z - z[pos]) ** 2).sum(axis=1))
+    d[pos] = np.inf
+    if allowed is not None:
+        d[~allowed] = np.inf
+    return features.index[np.argsort(d, kind="stable")[:k]].tolist()
+
+
+# ── Calculations ──────────────────────────────────────────────────────────
+
+def test_standardize_is_robust_and_fills_missing():
+    raw = np.array([[1.0, np.nan], [2.0, 5.0], [3.0, 5.0], [1000.0, 7.0]])
+    z, centre, scale = standardize(raw)
+    assert centre[0] == pytest.approx(2.5)
+    assert z[3, 0] == 4.0                  # outlier clipped
+    assert z[0, 1] == 0.0                  # missing sits at the median
+    assert np.isfinite(z).all()
+
+
+def test_query_matches_brute_force(features):
+    index = PeerIndex(features)
+    for ticker in features.index[::9]:
+        got = [p["ticker"] for p in index.query(ticker, k=4, same_sector=False)]
+        assert got == _brute_force(features, ticker, 4)
+        assert ticker not in got
+
+
+def test_same_sector_restricts_candidates(features, sectors):
+    index = PeerIndex(features, sectors)
+    peers = index.query("T00.JK", k=5)
+    assert {p["sector"] for p in peers} == {"banking"}
+    assert [p["ticker"] for p in peers] == _brute_force(
+        features, "T00.JK", 5, allowed=(sectors == "banking").to_numpy())
+    assert [p["distance"] for p in peers] == sorted(p["distance"] for p in peers)
+
+
+def test_update_replaces_rows(features, sectors):
+    index = PeerIndex(features, sectors)
+    before = index.query("T00.JK", k=3, same_sector=False)
+    moved = features.loc[["T01.JK"]].copy()
+    moved.loc[:, :] = features.loc["T00.JK"].to_numpy() + 1e-3
+    index.update(moved, sectors.loc[["T01.JK"]])
+    after = index.query("T00.JK", k=3, same_sector=False)
+    assert len(index) == len(features)
+    assert after[0]["ticker"] == "T01.JK"
+    assert after != before
+
+    index.remove(["T01.JK"])
+    assert "T01.JK" not in index
+    assert index.query("missing", k=3) == []
+
+
+# ── Service ───────────────────────────────────────────────────────────────
+
+def test_peer_index_picks_up_new_snapshots(app):
+    from stock_checker.alpha.calculations.batch_scores import calc_scores_batch
+    from stock_checker.alpha.services import peers as svc
+    from stock_checker.alpha.services.score_history import record_scores
+
+    panel = pd.DataFrame({
+        "ROE": [20.0, 21.0, 5.0, 4.0], "PER": [10.0, 11.0, 30.0, 32.0],
+        "sector": ["banking"] * 4,
+    }, index=["AAA.JK", "BBB.JK", "CCC.JK", "DDD.JK"])
+    record_scores(panel, calc_scores_batch(panel)["scores"], as_of=date(2024, 1, 31))
+
+    assert [p["ticker"] for p in svc.find_peers("aaa.jk", k=1)] == ["BBB.JK"]
+
+    before = svc.get_peer_index()
+    new = pd.DataFrame({"ROE": [20.5], "PER": [10.5], "sector": ["banking"]}, index=["EEE.JK"])
+    record_scores(new, calc_scores_batch(new)["scores"], as_of=date(2024, 2, 1))
+    index = svc.update_peer_index()
+    # Updates land in a fresh index; the one in use is left untouched
+    assert index is not before and svc.get_peer_index() is index
+    assert "EEE.JK" not in before and len(before) == 4
+    assert "EEE.JK" in index
+    assert len(index) == 5
+    assert svc.find_peers("EEE.JK", k=2)[0]["ticker"] in {"AAA.JK", "BBB.JK"}
+
+
+def test_copy_is_independent(features, sectors):
+    index = PeerIndex(features, sectors)
+    expected = index.query("T00.JK", k=3)
+    copy = index.copy()
+    copy.update(features.loc[["T01.JK"]] + 5.0, sectors.loc[["T01.JK"]])
+    copy.remove(["T02.JK"])
+    assert index.query("T00.JK", k=3) == expected
+    assert len(index) == len(features) and "T02.JK" in index
+
+
+# ── Route ─────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, True), (True, True), (False, False), ("false", False), ("True", True), (" FALSE ", False),
+])
+def test_industry_route_parses_same_sector(app, monkeypatch, value, expected):
+    from stock_checker.alpha.routes import industry as route
+
+    calls = []
+    monkeypatch.setattr(route, "get_industry_context",
+                        lambda ticker, k, same_sector: calls.append(same_sector) or {"ticker": ticker})
+    body = {"ticker": "bbca.jk"} if value is None else {"ticker": "bbca.jk", "same_sector": value}
+    resp = app.test_client().post("/alpha/api/industry", json=body)
+    assert resp.status_code == 200
+    assert calls == [expected]
+
+
+@pytest.mark.parametrize("value", ["no", 1, "", [True]])
+def test_industry_route_rejects_bad_same_sector(app, value):
+    resp = app.test_client().post("/alpha/api/industry", json={"ticker": "BBCA.JK", "same_sector": value})
+    assert resp.status_code == 400
@@ -0,0 +1,62 @@
+"""Tests for the point-in-time fundamentals store."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.point_in_time import PointInTimeStore, calc_value_quality
+
+
+@pytest.fixture(scope="module")
+def facts() -> pd.DataFrame:
+    rows = []
+    for t, base in (("AAA.JK", 100.0), ("BBB.JK", 200.0), ("CCC.JK", 300.0)):
+        for year in (2021, 2022, 2023):
+            rows.append({"ticker": t, "item": "Net Income", "period": f"{year}-12-31",
+                         "value": base + year})
+    rows.append({"ticker": "BBB.JK", "item": "Basic EPS", "period": "2022-12-31", "value": 5.0})
+    rows.append({"ticker": "BBB.JK", "item": "Basic EPS", "period": "2023-12-31", "value": np.nan})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def store(facts) -> PointInTimeStore:
+    return PointInTimeStore(facts, lag_days=90)
+
+
+def test_values_only_known_after_lag(store):
+    before = store.as_of("2023-03-30", items=["Net Income"])
+    after = store.as_of("2023-04-01", items=["Net Income"])
+    assert before.loc["AAA.JK", "Net Income"] == 100.0 + 2021
+    assert after.loc["AAA.JK", "Net Income"] == 100.0 + 2022
+    assert np.isnan(store.as_of("2022-01-01").loc["CCC.JK", "Net Income"])
+
+
+def test_lookup_never_crosses_tickers(store):
+    panel = store.as_of("2030-01-01", tickers=["AAA.JK", "BBB.JK", "ZZZ.JK"], items=["Basic EPS"])
+    assert np.isnan(panel.loc["AAA.JK", "Basic EPS"])
+    assert panel.loc["BBB.JK", "Basic EPS"] == 5.0     # NaN restatement skipped
+    assert np.isnan(panel.loc["ZZZ.JK", "Basic EPS"])
+
+
+def test_as_of_many_matches_single_queries(store):
+    dates = pd.date_range("2021-06-30", "2024-12-31", freq="ME")
+    many = store.as_of_many(dates, "Net Income")
+    for d in dates[::5]:
+        single = store.as_of(d, items=["Net Income"])["Net Income"]
+        np.testing.assert_array_equal(many.loc[d].to_numpy(), single.loc[many.columns].to_numpy())
+
+
+def test_value_quality_from_panel():
+    panel = pd.DataFrame({"Basic EPS": [10.0, -1.0, np.nan], "Net Income": [20.0, 5.0, np.nan],
+                          "Stockholders Equity": [100.0, 50.0, np.nan],
+                          "Ordinary Shares Number": [10.0, 10.0, np.nan]},
+                         index=["A", "B", "C"])
+    vq = calc_value_quality(panel, [100.0, 10.0, 50.0])
+    # A: PE 10 -> 1.0, PBV 10 -> 0.1
+    assert vq.loc["A", "value"] == pytest.approx(0.55)
+    assert vq.loc["A", "quality"] == pytest.approx(0.2)
+    # B: negative EPS ignored, PBV 2 -> 0.5
+    assert vq.loc["B", "value"] == pytest.approx(0.5)
+    assert vq.loc["C", "value"] == 0.0 and vq.loc["C", "quality"] == 0.0
@@ -0,0 +1,123 @@
+"""Tests for the batched trend projection engine."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.projections import calc_projections, projection_row
+from stock_checker.alpha.calculations.valuation import calc_linear_projection
+
+
+@pytest.fixture(scope="module")
+def series() -> list:
+    """Ragged metric histories with gaps, oldest first."""
+    rng = np.random.default_rng(11)
+    out = []
+    for _ in range(300):
+        values = list(rng.normal(1_000, 400, int(rng.integers(1, 7))))
+        for j in range(len(values)):
+            if rng.random() < 0.15:
+                values[j] = None
+        out.append(values)
+    return out
+
+
+def _stack(rows):
+    width = max(len(r) for r in rows)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        matrix[i, width - len(r):] = [np.nan if v is None else v for v in r]
+    return matrix, width
+
+
+# ── Linear ──
+
+def test_linear_matches_scalar_projection(series):
+    matrix, width = _stack(series)
+    fit = calc_projections(matrix, periods_ahead=3)
+    for i, values in enumerate(series):
+        expected = calc_linear_projection(values, 3)
+        got = projection_row(fit, i, width - len(values))
+        if "error" in expected:
+            assert "error" in got
+            continue
+        assert got.pop("method") == "linear"
+        assert got == expected
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        calc_projections([[1.0, 2.0]], method="cubic")
+
+
+# ── Log and robust ──
+
+def test_log_fit_recovers_constant_growth():
+    values = 100 * 1.1 ** np.arange(6)
+    fit = calc_projections([values], periods_ahead=2, method="log")
+    assert np.exp(fit["slope"][0]) == pytest.approx(1.1)
+    assert fit["projected"][0] == pytest.approx(100 * 1.1 ** np.arange(6, 8))
+    assert fit["r_squared"][0] == pytest.approx(1.0)
+
+
+def test_log_fit_ignores_non_positive_values():
+    fit = calc_projections([[-5.0, 100.0, 110.0, 121.0]], method="log")
+    assert fit["n_points"][0] == 3
+    assert np.exp(fit["slope"][0]) == pytest.approx(1.1)
+
+
+def test_robust_fit_resists_an_outlier():
+    values = np.array([10.0, 12.0, 14.0, 80.0, 18.0, 20.0])
+    linear = calc_projections([values], method="linear")
+    robust = calc_projections([values], method="robust")
+    assert abs(robust["slope"][0] - 2.0) < 0.2
+    assert abs(robust["slope"][0] - 2.0) < abs(linear["slope"][0] - 2.0)
+
+
+# ── Service ──
+
+def test_run_projections_matches_run_projection(app, monkeypatch):
+    from stock_checker.alpha.services import modelling
+
+    dates = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31", "2021-12-31"])
+    frames = {
+        "AAA.JK": pd.DataFrame({d: [100.0 + 10 * k, 40.0 + k] for k, d in enumerate(reversed(dates))},
+                               index=["Total Revenue", "Net Income"])[dates],
+        "BBB.JK": pd.DataFrame({d: [50.0 * (k + 1)] for k, d in enumerate(reversed(dates[:2]))},
+                               index=["Total Revenue"])[dates[:2]],
+    }
+    monkeypatch.setattr(modelling, "_STATEMENT_FETCHERS", {
+        "income": frames.get,
+        "balance": lambda symbol: None,
+        "cashflow": lambda symbol: None,
+    })
+
+    results = modelling.run_projections(["BBB.JK", "AAA.JK", "CCC.JK"],
+                                        metrics=["Total Revenue", "Net Income"])
+    assert [r["ticker"] for r in results] == ["BBB.JK", "AAA.JK", "CCC.JK"]
+    assert results[0]["missing"] == ["Net Income"]
+    assert results[2]["missing"] == ["Total Revenue", "Net Income"]
+    for r in results:
+        for metric, got in r["projections"].items():
+            assert got == modelling.run_projection(r["ticker"], metric)
+    assert results[1]["projections"]["Total Revenue"]["projections"][0]["value"] == 140.0
+
+
+def test_single_and_batch_linear_projections_agree_to_the_cent(app, monkeypatch):
+    from stock_checker.alpha.services import modelling
+
+    # The textbook sums and lstsq round this series a cent apart
+    dates = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31", "2021-12-31"])
+    revenue = pd.DataFrame([[1349459.19, 1253119.8, 1217828.14, 1426294.61]],
+                           index=["Total Revenue"], columns=dates)
+    monkeypatch.setattr(modelling, "_STATEMENT_FETCHERS", {
+        "income": lambda symbol: revenue,
+        "balance": lambda symbol: None,
+        "cashflow": lambda symbol: None,
+    })
+
+    batch = modelling.run_projections(["AAA.JK"], metrics=["Total Revenue"])
+    single = modelling.run_projection("AAA.JK", "Total Revenue")
+    assert batch[0]["projections"]["Total Revenue"] == single
+    assert single["projections"][0]["value"] == 1262871.79
@@ -0,0 +1,133 @@
+"""Tests for the vectorized red-flag scan and the FCF check fix."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.anomaly import check_fcf_vs_net_income, detect_anomalies
+from stock_checker.alpha.calculations.batch_ratios import statements_to_long
+from stock_checker.alpha.calculations.growth import calc_yoy_growth
+from stock_checker.alpha.calculations.red_flags import calc_red_flags
+
+PERIODS = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31", "2021-12-31", "2020-12-31"])
+
+
+def _frames(seed):
+    rng = np.random.default_rng(seed)
+
+    def stmt(rows):
+        return pd.DataFrame({k: v for k, v in rows.items()}, index=PERIODS).T
+
+    revenue = rng.uniform(50, 150, 5)
+    return {
+        "income": stmt({"Total Revenue": revenue,
+                        "Net Income": revenue * rng.uniform(-0.1, 0.3, 5)}),
+        "balance": stmt({"Net Receivables": rng.uniform(5, 40, 5),
+                         "Total Debt": rng.uniform(10, 300, 5),
+                         "Stockholders Equity": rng.uniform(50, 150, 5)}),
+        "cashflow": stmt({"Free Cash Flow": rng.uniform(-30, 40, 5)}),
+    }
+
+
+def _page_anomalies(frames):
+    """detect_anomalies inputs built as financials.get_financial_analysis does."""
+    inc, bs, cf = frames["income"], frames["balance"], frames["cashflow"]
+    rev, ni = inc.loc["Total Revenue"], inc.loc["Net Income"]
+    rec = bs.loc["Net Receivables"]
+    data = {
+        "revenue_growth": calc_yoy_growth(rev.iloc[0], rev.iloc[1]),
+        "net_income": ni.iloc[0],
+        "current_npm": ni.iloc[0] / rev.iloc[0] * 100,
+        "previous_npm": ni.iloc[1] / rev.iloc[1] * 100,
+        "fcf": cf.loc["Free Cash Flow"].iloc[0],
+        "receivables_growth": calc_yoy_growth(rec.iloc[0], rec.iloc[1]),
+        "der": bs.loc["Total Debt"].iloc[0] / bs.loc["Stockholders Equity"].iloc[0],
+    }
+    return detect_anomalies(data)
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {f"T{i:02d}.JK": _frames(i) for i in range(40)}
+
+
+@pytest.fixture(scope="module")
+def flags(frames):
+    return calc_red_flags(statements_to_long(frames))
+
+
+# ── FCF check ─────────────────────────────────────────────────────────────
+
+def test_negative_fcf_with_positive_income_is_critical():
+    flag = check_fcf_vs_net_income(-10.0, 100.0)
+    assert flag["type"] == "fcf_negative"
+    assert flag["severity"] == "critical"
+    assert check_fcf_vs_net_income(20.0, 100.0)["type"] == "fcf_divergence"
+    assert check_fcf_vs_net_income(80.0, 100.0) is None
+
+
+# ── Batch scan ────────────────────────────────────────────────────────────
+
+def test_latest_period_matches_page_checks(frames, flags):
+    latest = flags[(flags["offset"] == 0) & (flags["type"] != "z_score")]
+    for ticker, f in frames.items():
+        expected = sorted((a["type"], a["severity"], a["message"]) for a in _page_anomalies(f))
+        got = latest[latest["ticker"] == ticker]
+        assert sorted(zip(got["type"], got["severity"], got["message"])) == expected
+
+
+def test_every_period_is_scanned(frames, flags):
+    assert set(flags["offset"]) >= {0, 1, 2}
+    # The oldest period has no predecessor, so no growth-based flags
+    oldest = flags[flags["offset"] == 4]
+    assert not oldest["type"].isin(["revenue_decline", "receivables_growth",
+                                    "margin_decline"]).any()
+    row = flags[flags["offset"] == 1].iloc[0]
+    assert row["period"] == PERIODS[1]
+
+
+def test_zscore_flags_outlier_year():
+    periods = pd.date_range("2015-12-31", periods=8, freq="YE")[::-1]
+    income = pd.DataFrame([[100.0] * 8, [10.0, 10.5, 9.5, 10.2, 9.8, 10.1, 10.3, -40.0]],
+                          index=["Total Revenue", "Net Income"], columns=periods)
+    flags = calc_red_flags(statements_to_long({"AAA.JK": {"income": income}}))
+    z = flags[(flags["type"] == "z_score") & (flags["metric"] == "NPM")]
+    assert z["period"].tolist() == [periods[-1]]
+    assert z["value"].iloc[0] < -1.9
+    assert (z["severity"] == "info").all()
+
+
+def test_empty_input():
+    assert calc_red_flags(pd.DataFrame()).empty
+
+
+# ── Service ───────────────────────────────────────────────────────────────
+
+def test_scan_stores_and_lists(app, frames):
+    from stock_checker.alpha.services import fundamentals as fu
+    from stock_checker.alpha.services.red_flags import list_red_flags, scan_red_flags
+
+    subset = dict(list(frames.items())[:10])
+    for ticker, f in subset.items():
+        for statement, df in f.items():
+            fu.ingest_statement(ticker, statement, "annual", df)
+
+    result = scan_red_flags()
+    assert result["tickers"] == 10
+    listed = list_red_flags()
+    assert {g["ticker"] for g in listed} <= set(subset)
+    assert all(f["is_latest"] for g in listed for f in g["flags"])
+    worst = [g["worst"] for g in listed]
+    order = {"critical": 0, "warning": 1, "info": 2}
+    assert worst == sorted(worst, key=order.get)
+
+    critical = list_red_flags(severity="critical")
+    assert all(g["worst"] == "critical" for g in critical)
+    assert len(list_red_flags(latest_only=False)) >= len(listed)
+
+    # Re-scanning replaces rather than duplicates
+    again = scan_red_flags(list(subset))
+    assert again["by_severity"] == result["by_severity"]
+    with pytest.raises(ValueError):
+        list_red_flags(severity="bogus")
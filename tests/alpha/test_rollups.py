@@ -0,0 +1,117 @@
+"""Tests for quarterly TTM / QoQ / YoY rollups."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.growth import calc_yoy_growth
+from stock_checker.alpha.calculations.rollups import calc_rollups, latest_rollups, ttm_panel
+
+QUARTERS = pd.date_range("2022-03-31", periods=12, freq="QE")
+
+
+def _long(ticker, statement, item, periods, values):
+    return pd.DataFrame({"ticker": ticker, "statement": statement, "item": item,
+                         "period": periods, "value": values})
+
+
+@pytest.fixture(scope="module")
+def long() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    return pd.concat([
+        _long("AAA.JK", "income", "Total Revenue", QUARTERS, rng.uniform(80, 120, 12)),
+        _long("BBB.JK", "income", "Total Revenue", QUARTERS, rng.uniform(80, 120, 12)),
+        _long("AAA.JK", "balance", "Total Debt", QUARTERS, rng.uniform(10, 20, 12)),
+        # Q3 2023 missing: the TTM windows and growth across the hole are undefined
+        _long("CCC.JK", "cashflow", "Free Cash Flow", QUARTERS.delete(6),
+              rng.uniform(-5, 20, 11)),
+    ], ignore_index=True).sample(frac=1.0, random_state=0)
+
+
+@pytest.fixture(scope="module")
+def rolled(long) -> pd.DataFrame:
+    return calc_rollups(long)
+
+
+def _series(rolled, ticker, item):
+    return rolled[(rolled["ticker"] == ticker) & (rolled["item"] == item)].reset_index(drop=True)
+
+
+def test_flow_ttm_and_growth_match_loop(long, rolled):
+    src = long[long["ticker"] == "BBB.JK"].sort_values("period")["value"].to_numpy()
+    out = _series(rolled, "BBB.JK", "Total Revenue")
+    for i in range(len(src)):
+        ttm = src[i - 3:i + 1].sum() if i >= 3 else np.nan
+        assert out.loc[i, "ttm"] == pytest.approx(ttm, nan_ok=True)
+        qoq = calc_yoy_growth(src[i], src[i - 1]) if i >= 1 else None
+        yoy = calc_yoy_growth(src[i], src[i - 4]) if i >= 4 else None
+        assert out.loc[i, "qoq"] == pytest.approx(np.nan if qoq is None else qoq, nan_ok=True)
+        assert out.loc[i, "yoy"] == pytest.approx(np.nan if yoy is None else yoy, nan_ok=True)
+
+
+def test_balance_items_are_stocks(rolled):
+    out = _series(rolled, "AAA.JK", "Total Debt")
+    np.testing.assert_array_equal(out["ttm"], out["value"])
+
+
+def test_gaps_break_lookbacks(rolled):
+    out = _series(rolled, "CCC.JK", "Free Cash Flow").set_index("period")
+    after_gap = pd.Timestamp("2023-12-31")
+    assert np.isnan(out.loc[after_gap, "qoq"])
+    assert np.isnan(out.loc[after_gap, "ttm"])
+    assert np.isnan(out.loc[pd.Timestamp("2024-09-30"), "yoy"])   # year-ago quarter missing
+    # Four quarters after the hole the window is whole again
+    assert np.isfinite(out.loc[pd.Timestamp("2024-09-30"), "ttm"])
+    # YoY compares against the same quarter a year earlier despite the hole
+    expected = calc_yoy_growth(out.loc[after_gap, "value"],
+                               out.loc[pd.Timestamp("2022-12-31"), "value"])
+    assert out.loc[after_gap, "yoy"] == pytest.approx(expected)
+
+
+def test_series_never_mix(rolled):
+    first = _series(rolled, "BBB.JK", "Total Revenue").iloc[0]
+    assert np.isnan(first["qoq"]) and np.isnan(first["ttm"])
+
+
+def test_latest_and_panel(rolled):
+    latest = latest_rollups(rolled)
+    assert len(latest) == 4
+    assert (latest["period"] == QUARTERS[-1]).all()
+    panel = ttm_panel(rolled, ["Total Revenue", "Free Cash Flow"])
+    assert panel.loc["AAA.JK", "Total Revenue"] == pytest.approx(
+        _series(rolled, "AAA.JK", "Total Revenue")["value"].iloc[-4:].sum())
+    assert np.isnan(panel.loc["AAA.JK", "Free Cash Flow"])
+
+
+# ── Service ───────────────────────────────────────────────────────────────
+
+def _statement(item, periods, values):
+    return pd.DataFrame([values], index=[item], columns=pd.DatetimeIndex(periods)[::-1])
+
+
+def test_service_recomputes_only_changed_tickers(app, monkeypatch):
+    from stock_checker.alpha.services import fundamentals as fu
+    from stock_checker.alpha.services import rollups as svc
+
+    for t in ("AAA.JK", "BBB.JK"):
+        fu.ingest_statement(t, "cashflow", "quarterly",
+                            _statement("Free Cash Flow", QUARTERS[:8], list(range(1, 9))[::-1]))
+
+    ttm = svc.get_ttm("aaa.jk")["Free Cash Flow"]
+    assert ttm["period"] == "2023-12-31"
+    assert ttm["ttm"] == 5 + 6 + 7 + 8
+
+    seen = []
+    real = svc.calc_rollups
+    monkeypatch.setattr(svc, "calc_rollups",
+                        lambda long: seen.append(sorted(set(long["ticker"]))) or real(long))
+    fu.ingest_statement("BBB.JK", "cashflow", "quarterly",
+                        _statement("Free Cash Flow", QUARTERS[8:9], [20.0]))
+    rolled = svc.get_rollups()
+    assert seen == [["BBB.JK"]]
+    assert svc.get_ttm("BBB.JK")["Free Cash Flow"]["ttm"] == 6 + 7 + 8 + 20
+    assert len(rolled[rolled["ticker"] == "AAA.JK"]) == 8
+
+    svc.get_rollups()
+    assert seen == [["BBB.JK"]]          # nothing stale, nothing recomputed
@@ -0,0 +1,61 @@
+"""Tests for the vectorized composite-score backtest."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.score_backtest import (
+    calc_forward_returns,
+    calc_quantile_backtest,
+)
+
+
+def _synthetic(n_tickers: int = 50, n_days: int = 750, seed: int = 3):
+    """Prices whose drift is proportional to a persistent score."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    tickers = [f"T{i}.JK" for i in range(n_tickers)]
+    signal = rng.uniform(0, 100, n_tickers)
+    drift = (signal - 50) * 2e-5
+    rets = drift + rng.normal(0, 0.01, (n_days, n_tickers))
+    prices = pd.DataFrame(1000 * np.exp(np.cumsum(rets, axis=0)), index=dates, columns=tickers)
+    score_dates = pd.date_range(dates[0], dates[-1], freq="W-FRI")
+    scores = pd.DataFrame(
+        signal + rng.normal(0, 5, (len(score_dates), n_tickers)),
+        index=score_dates, columns=tickers,
+    )
+    return scores, prices
+
+
+def test_forward_returns_no_lookahead():
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    prices = pd.DataFrame({"A": np.arange(1.0, 11.0)}, index=dates)
+    # Saturday signal aligns to Friday's close
+    sat = pd.DatetimeIndex([pd.Timestamp("2024-01-06")])
+    fwd = calc_forward_returns(prices, sat, horizon=2)
+    assert fwd.iloc[0, 0] == pytest.approx(7.0 / 5.0 - 1)
+
+
+def test_forward_returns_nan_past_end():
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    prices = pd.DataFrame({"A": np.arange(1.0, 6.0)}, index=dates)
+    fwd = calc_forward_returns(prices, dates[-2:], horizon=3)
+    assert fwd["A"].isna().all()
+
+
+def test_quantile_backtest_detects_signal():
+    scores, prices = _synthetic()
+    result = calc_quantile_backtest(scores, prices, n_quantiles=5, horizon=21)
+    assert "error" not in result
+    assert set(result["quantile_returns"]) == {"Q1", "Q2", "Q3", "Q4", "Q5"}
+    assert result["mean_quantile_return"]["Q5"] > result["mean_quantile_return"]["Q1"]
+    assert result["ic_mean"] > 0
+    assert 0 <= result["hit_rate"] <= 1
+    assert len(result["dates"]) == result["n_periods"] == len(result["ic"])
+
+
+def test_quantile_backtest_no_overlap():
+    scores, prices = _synthetic(n_tickers=5)
+    prices.columns = [c + "X" for c in prices.columns]
+    assert "error" in calc_quantile_backtest(scores, prices)
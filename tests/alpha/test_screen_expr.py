@@ -0,0 +1,118 @@
+"""Tests for the screener expression language."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.screen_expr import ExpressionError, compile_expression
+from stock_checker.alpha.calculations.screener import ScreenerTable, calc_indicator_columns
+from stock_checker.indicators import calc_rsi, calc_sma
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    n = 300
+    df = pd.DataFrame({c: rng.normal(15, 10, n) for c in ["PER", "ROE", "EV/EBITDA"]},
+                      index=[f"T{i:03d}.JK" for i in range(n)])
+    df["sector"] = rng.choice(["perbankan", "teknologi", "unknown"], n)
+    df["close"] = rng.uniform(50, 150, n)
+    df["sma200"] = rng.uniform(50, 150, n)
+    return df
+
+
+@pytest.fixture(scope="module")
+def table(frame) -> ScreenerTable:
+    return ScreenerTable(frame)
+
+
+def test_mask_with_sector_median_and_indicators(frame, table):
+    expr = compile_expression("ROE > 15 and PER < sector_median(PER) and close > sma200")
+    assert expr.kind == "mask"
+    median = frame.groupby("sector")["PER"].transform("median")
+    expected = (frame["ROE"] > 15) & (frame["PER"] < median) & (frame["close"] > frame["sma200"])
+    np.testing.assert_array_equal(expr.evaluate(table), expected.to_numpy())
+
+
+def test_sector_membership_and_not(frame, table):
+    expr = compile_expression("sector in ('perbankan', 'teknologi') and not PER > 20")
+    expected = frame["sector"].isin(["perbankan", "teknologi"]) & ~(frame["PER"] > 20)
+    np.testing.assert_array_equal(expr.evaluate(table), expected.to_numpy())
+
+
+def test_score_expression_and_field_aliases(frame, table):
+    expr = compile_expression("2 * ev_ebitda - abs(per)")
+    assert expr.kind == "score"
+    expected = 2 * frame["EV/EBITDA"] - frame["PER"].abs()
+    np.testing.assert_allclose(expr.evaluate(table), expected.to_numpy())
+
+
+def test_chained_comparison(frame, table):
+    expr = compile_expression("10 <= ROE < 20")
+    expected = (frame["ROE"] >= 10) & (frame["ROE"] < 20)
+    np.testing.assert_array_equal(expr.evaluate(table), expected.to_numpy())
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("not DER > 2", [True, False, False]),
+    ("DER <= 2", [True, False, False]),
+    ("DER != 2", [True, True, False]),
+    ("DER > 2 or ROE > 10", [False, True, True]),
+    ("not (DER > 2 or ROE > 10)", [True, False, False]),
+    ("not (DER > 2 and ROE > 10)", [True, True, False]),
+    ("not exists(DER) and ROE > 10", [False, False, True]),
+])
+def test_missing_values_stay_unknown_under_not(text, expected):
+    small = ScreenerTable(pd.DataFrame(
+        {"DER": [1.0, 3.0, np.nan], "ROE": [5.0, 5.0, 20.0], "sector": ["perbankan"] * 3},
+        index=["A.JK", "B.JK", "C.JK"],
+    ))
+    np.testing.assert_array_equal(compile_expression(text).evaluate(small), expected)
+
+
+def test_compiled_expressions_are_cached_by_text():
+    assert compile_expression("ROE > 1") is compile_expression("ROE > 1")
+
+
+def test_where_and_rank_in_query(frame, table):
+    where = compile_expression("ROE > 15").evaluate(table)
+    score = compile_expression("rank(ROE)").evaluate(table)
+    result = table.query(where=where, sort_values=score, limit=5, columns=["ROE"])
+    expected = frame[frame["ROE"] > 15].sort_values("ROE", ascending=False)
+    assert [r["ticker"] for r in result["rows"]] == list(expected.index[:5])
+    assert result["count"] == len(expected)
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('ls')",
+    "ROE.real > 1",
+    "ROE[0] > 1",
+    "(lambda: 1)()",
+    "ROE >",
+    "sector > 1",
+    "ROE and PER",
+    "unknown_fn(ROE) > 1",
+    "'text'",
+    "ROE in (1, 2)",
+])
+def test_rejects_unsafe_or_invalid(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_unknown_field_raises_on_evaluate(table):
+    with pytest.raises(ExpressionError):
+        compile_expression("missing_metric > 1").evaluate(table)
+
+
+def test_indicator_columns_match_scalar_indicators():
+    rng = np.random.default_rng(2)
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (260, 4)), axis=0)),
+                          columns=list("ABCD"))
+    got = calc_indicator_columns(closes)
+    for t in closes.columns:
+        ref = calc_rsi(calc_sma(pd.DataFrame({"Close": closes[t]}))).iloc[-1]
+        assert got.at[t, "sma200"] == pytest.approx(ref["SMA_200"])
+        assert got.at[t, "sma50"] == pytest.approx(ref["SMA_50"])
+        assert got.at[t, "rsi14"] == pytest.approx(ref["RSI"])
@@ -0,0 +1,79 @@
+"""Tests for the columnar in-memory screener."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.screener import ScreenerTable
+
+_METRICS = ["PER", "ROE", "PBV", "composite_score"]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 500
+    df = pd.DataFrame({c: rng.normal(15, 10, n) for c in _METRICS},
+                      index=[f"T{i:03d}.JK" for i in range(n)])
+    df = df.mask(rng.random(df.shape) < 0.1)
+    df.iloc[0, 0] = np.inf
+    df["sector"] = rng.choice(["perbankan", "teknologi", "unknown"], n)
+    df["recommendation"] = "Hold"
+    return df
+
+
+@pytest.fixture(scope="module")
+def table(frame) -> ScreenerTable:
+    return ScreenerTable(frame)
+
+
+@pytest.mark.parametrize("op, value, expected", [
+    ("<", 15, lambda s: s < 15),
+    ("<=", 15, lambda s: s <= 15),
+    (">", 20, lambda s: s > 20),
+    (">=", 20, lambda s: s >= 20),
+    ("between", [10, 20], lambda s: (s >= 10) & (s <= 20)),
+])
+def test_range_filters_match_pandas(frame, table, op, value, expected):
+    per = frame["PER"].replace(np.inf, np.nan)
+    got = table.mask([{"field": "PER", "op": op, "value": value}])
+    np.testing.assert_array_equal(got, expected(per).fillna(False).to_numpy())
+
+
+def test_not_equal_excludes_missing(frame, table):
+    got = table.mask([{"field": "ROE", "op": "!=", "value": 1e9}])
+    np.testing.assert_array_equal(got, frame["ROE"].notna().to_numpy())
+
+
+def test_sector_bitmaps(frame, table):
+    got = table.mask([{"field": "sector", "op": "in", "value": ["perbankan", "teknologi"]}])
+    np.testing.assert_array_equal(got, frame["sector"].isin(["perbankan", "teknologi"]).to_numpy())
+    got = table.mask([{"field": "sector", "op": "!=", "value": "perbankan"}])
+    np.testing.assert_array_equal(got, (frame["sector"] != "perbankan").to_numpy())
+
+
+def test_query_sort_and_limit(frame, table):
+    filters = [{"field": "PER", "op": "<", "value": 20}, {"field": "sector", "op": "==", "value": "teknologi"}]
+    result = table.query(filters, sort="ROE", descending=True, limit=400)
+    per = frame["PER"].replace(np.inf, np.nan)
+    expected = frame[(per < 20) & (frame["sector"] == "teknologi")]
+    expected = expected.sort_values("ROE", ascending=False, na_position="last", kind="stable")
+    assert result["count"] == len(expected)
+    tickers = [r["ticker"] for r in result["rows"]]
+    n_finite = expected["ROE"].notna().sum()
+    assert tickers[:n_finite] == list(expected.index[:n_finite])
+    assert all(r["ROE"] is None for r in result["rows"][n_finite:])
+
+    top = table.query(filters, sort="ROE", descending=False, limit=5, columns=["ROE"])
+    assert [r["ticker"] for r in top["rows"]] == list(expected.index[:n_finite][::-1][:5])
+    assert set(top["rows"][0]) == {"ticker", "sector", "recommendation", "ROE"}
+
+
+def test_unknown_field_and_operator(table):
+    with pytest.raises(ValueError):
+        table.query([{"field": "NOPE", "op": "<", "value": 1}])
+    with pytest.raises(ValueError):
+        table.query([{"field": "PER", "op": "~", "value": 1}])
+    with pytest.raises(ValueError):
+        table.query(sort="NOPE")
@@ -0,0 +1,126 @@
+"""Tests for sector distributions and percentile lookups."""
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.industry import detect_valuation_zone, get_industry_config
+from stock_checker.alpha.calculations.sector_stats import (
+    ALL_SECTORS, SectorStats, calc_sector_distributions, relative_valuation_scores,
+)
+
+
+@pytest.fixture(scope="module")
+def panel() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    n = 60
+    return pd.DataFrame({
+        "PER": np.r_[rng.uniform(5, 25, 40), rng.uniform(10, 40, 20)],
+        "PBV": np.r_[np.full(40, 1.5), rng.uniform(0.5, 4, 20)],
+        "ROE": rng.normal(12, 4, n),
+        "sector": ["banking"] * 40 + ["mining"] * 18 + ["retail"] * 2,
+    }, index=[f"T{i:02d}.JK" for i in range(n)])
+
+
+@pytest.fixture(scope="module")
+def stats(panel) -> SectorStats:
+    return SectorStats(calc_sector_distributions(panel))
+
+
+# ── Distributions ─────────────────────────────────────────────────────────
+
+def test_distribution_summaries(panel, stats):
+    per = panel.loc[panel["sector"] == "banking", "PER"]
+    summary = stats.summary("banking", "PER")
+    assert summary["count"] == 40
+    assert summary["median"] == pytest.approx(per.median())
+    assert summary["q1"] == pytest.approx(per.quantile(0.25))
+    assert summary["q3"] == pytest.approx(per.quantile(0.75))
+
+
+def test_small_sector_falls_back_to_universe(stats):
+    assert "retail" not in stats.sectors
+    assert stats.summary("retail", "PER")["sector"] == ALL_SECTORS
+    assert stats.summary("unknown-sector", "PBV")["count"] == 60
+
+
+def test_non_positive_multiples_excluded():
+    panel = pd.DataFrame({"PER": [-5.0, 0.0, 8.0, 10.0, 12.0, 14.0, 16.0],
+                          "sector": ["x"] * 7})
+    stats = SectorStats(calc_sector_distributions(panel))
+    assert stats.summary("x", "PER")["count"] == 5
+    assert stats.percentile("x", "PER", -5.0) is None
+
+
+# ── Percentiles ───────────────────────────────────────────────────────────
+
+def test_percentile_close_to_empirical_rank(panel, stats):
+    per = panel.loc[panel["sector"] == "banking", "PER"].to_numpy()
+    for value in (8.0, 12.0, 20.0):
+        empirical = (per < value).mean() * 100
+        assert stats.percentile("banking", "PER", value) == pytest.approx(empirical, abs=3)
+    assert stats.percentile("banking", "PER", 1.0) == 0.0
+    assert stats.percentile("banking", "PER", 99.0) == 100.0
+    assert stats.percentile("banking", "PER", None) is None
+
+
+def test_ties_get_mid_rank(stats):
+    assert stats.percentile("banking", "PBV", 1.5) == pytest.approx(50.0)
+
+
+def test_percentile_frame_matches_scalar(panel, stats):
+    frame = stats.percentile_frame(panel)
+    for ticker in panel.index[::7]:
+        row = panel.loc[ticker]
+        for metric in ("PER", "PBV", "ROE"):
+            assert frame.loc[ticker, metric] == pytest.approx(
+                stats.percentile(row["sector"], metric, row[metric]))
+
+
+def test_relative_valuation_score_prefers_cheap(panel, stats):
+    scores = relative_valuation_scores(stats.percentile_frame(panel))
+    mining = panel[panel["sector"] == "mining"]
+    cheapest, dearest = mining["PER"].idxmin(), mining["PER"].idxmax()
+    assert scores[cheapest] > scores[dearest]
+
+
+def test_valuation_zone_sector_relative(stats):
+    config = get_industry_config("mining")
+    plain = detect_valuation_zone({"PER (x)": 12.0}, config)
+    assert "sector_relative" not in plain
+
+    config = {**config, "valuation_metric": "PER"}
+    zone = detect_valuation_zone({"PER (x)": 12.0}, config, stats, "mining")
+    rel = zone["sector_relative"]
+    assert rel["basis"] == "sector"
+    assert rel["percentile"] == pytest.approx(stats.percentile("mining", "PER", 12.0), abs=0.05)
+    assert rel["zone"] == ("cheap" if 12.0 <= rel["q1"] else "fair")
+
+
+# ── Storage ───────────────────────────────────────────────────────────────
+
+def test_refresh_and_cached_lookup(app, panel):
+    from stock_checker.alpha.calculations.batch_scores import calc_scores_batch
+    from stock_checker.alpha.services.score_history import record_scores
+    from stock_checker.alpha.services.sector_stats import (
+        get_sector_stats, refresh_sector_stats, sector_summary,
+    )
+
+    assert not get_sector_stats()
+    record_scores(panel, calc_scores_batch(panel)["scores"], as_of=date(2024, 1, 31))
+    result = refresh_sector_stats(as_of=date(2024, 2, 1))
+    assert result["tickers"] == 60
+    assert "banking" in result["sectors"]
+
+    stats = get_sector_stats()
+    expected = SectorStats(calc_sector_distributions(panel))
+    assert stats.as_of == date(2024, 2, 1)
+    assert stats.percentile("banking", "PER", 15.0) == pytest.approx(
+        expected.percentile("banking", "PER", 15.0))
+    assert sector_summary("banking")["metrics"]["PBV"]["median"] == pytest.approx(1.5)
+
+    # Re-running for the same date replaces the set
+    assert refresh_sector_stats(as_of=date(2024, 2, 1))["rows"] == result["rows"]
@@ -0,0 +1,191 @@
+"""Tests for the batch valuation synthesis."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.calculations.synthesis import (
+    MODELS, SECTOR_MODEL_WEIGHTS, SYNTHESIS_PARAMS, calc_model_values, calc_valuation_synthesis,
+)
+from stock_checker.alpha.calculations.valuation import (
+    calc_dcf, calc_ddm, calc_pbv, calc_roe_sustainable_growth,
+)
+
+SECTORS = ["perbankan", "teknologi", "consumer_goods", "unknown"]
+
+
+@pytest.fixture(scope="module")
+def inputs() -> pd.DataFrame:
+    rng = np.random.default_rng(17)
+    n = 200
+
+    def maybe(values, p=0.15):
+        values = values.astype(object)
+        values[rng.random(n) < p] = None
+        return values
+
+    return pd.DataFrame({
+        "sector": rng.choice(SECTORS, n),
+        "price": rng.uniform(100, 10_000, n),
+        "fcf": maybe(rng.normal(2e11, 3e11, n)),
+        "shares": maybe(rng.uniform(1e9, 5e10, n)),
+        "net_debt": rng.normal(0, 1e12, n),
+        "roe": maybe(rng.normal(0.12, 0.1, n)),
+        "bvps": maybe(rng.normal(2_000, 1_500, n)),
+        "dividend": maybe(rng.normal(50, 60, n)),
+        "eps": maybe(rng.normal(200, 150, n)),
+        "payout": maybe(rng.uniform(-0.2, 1.3, n)),
+    }, index=[f"T{i:03d}.JK" for i in range(n)])
+
+
+def _param(sector, key):
+    return SYNTHESIS_PARAMS.get(sector, SYNTHESIS_PARAMS["_default"])[key]
+
+
+def _scalar(row):
+    """The per-ticker models with the synthesis assumptions."""
+    wacc, g, tg = (_param(row.sector, k) for k in ("wacc", "growth_rate", "terminal_growth"))
+    opt = lambda v: None if v is None or v != v else v
+    out = {}
+    if opt(row.fcf) is not None:
+        out["dcf"] = calc_dcf(row.fcf, g, tg, wacc, 5, opt(row.shares), row.net_debt)
+    out["pbv"] = calc_pbv(opt(row.roe), opt(row.bvps), wacc, tg)
+    out["ddm"] = calc_ddm(opt(row.dividend), tg, wacc)
+    out["roe"] = calc_roe_sustainable_growth(opt(row.roe), opt(row.payout), opt(row.eps), wacc)
+    return {m: (r or {}).get("intrinsic_per_share") for m, r in out.items()}
+
+
+# ── Models ──
+
+def test_model_values_match_scalar_models(inputs):
+    values = calc_model_values(inputs)
+    for row in inputs.itertuples():
+        expected = _scalar(row)
+        for m in MODELS:
+            got = values.at[row.Index, m]
+            want = expected.get(m)
+            if want is None:
+                assert np.isnan(got), (row.Index, m)
+            else:
+                assert got == pytest.approx(want, abs=0.011), (row.Index, m)
+
+
+# ── Synthesis ──
+
+def test_weights_renormalize_over_positive_models(inputs):
+    result = calc_valuation_synthesis(inputs)
+    values, weights, summary = result["values"], result["weights"], result["summary"]
+    for ticker in inputs.index[:50]:
+        v = values.loc[ticker]
+        available = [m for m in MODELS if v[m] == v[m] and v[m] > 0]
+        raw = SECTOR_MODEL_WEIGHTS.get(inputs.at[ticker, "sector"], SECTOR_MODEL_WEIGHTS["_default"])
+        if not available:
+            assert np.isnan(summary.at[ticker, "fair_value"])
+            continue
+        total = sum(raw[m] for m in available)
+        fair = sum(v[m] * raw[m] / total for m in available)
+        assert summary.at[ticker, "fair_value"] == pytest.approx(fair)
+        assert weights.loc[ticker, available].sum() == pytest.approx(1.0)
+        price = inputs.at[ticker, "price"]
+        assert summary.at[ticker, "upside_pct"] == pytest.approx((fair - price) / price * 100)
+
+
+def test_verdict_bands():
+    inputs = pd.DataFrame({"sector": ["_default"] * 3, "price": [100.0, 200.0, 300.0],
+                           "dividend": [20.0] * 3},
+                          index=["A.JK", "B.JK", "C.JK"])
+    # DDM only: 20 × 1.03 / (0.11 - 0.03) = 257.5
+    summary = calc_valuation_synthesis(inputs)["summary"]
+    assert summary["verdict"].tolist() == ["undervalued", "undervalued", "overvalued"]
+    assert summary["models_used"].tolist() == [1, 1, 1]
+
+
+# ── Service ──
+
+def test_run_valuation_batch_keeps_input_order(app, monkeypatch):
+    from stock_checker.alpha.services import modelling
+
+    def fake_inputs(symbol):
+        if symbol == "BAD.JK":
+            raise RuntimeError("no data")
+        return {"sector": "perbankan", "price": 1_000.0, "fcf": None, "shares": 1e9,
+                "net_debt": 0.0, "roe": 0.18, "bvps": 900.0, "dividend": None,
+                "eps": None, "payout": None, "fcf_basis": "annual"}
+
+    monkeypatch.setattr(modelling, "_valuation_inputs", fake_inputs)
+    monkeypatch.setattr(modelling, "_prefetch_valuation_data", lambda symbol, stale: {})
+    results = modelling.run_valuation_batch(["BBCA.JK", "BAD.JK", "BBRI.JK"])
+    assert [r["ticker"] for r in results] == ["BBCA.JK", "BAD.JK", "BBRI.JK"]
+    assert "error" in results[1]
+    pbv = calc_pbv(0.18, 900.0, 0.12, 0.04)["intrinsic_per_share"]
+    assert results[0]["fair_value"] == pbv
+    assert results[0]["models"]["pbv"]["weight"] == 1.0
+    assert results[0]["models"]["dcf"]["intrinsic_per_share"] is None
+
+    over = modelling.run_valuation_batch(["BBCA.JK"], overrides={"wacc": 0.10})
+    assert over[0]["fair_value"] == calc_pbv(0.18, 900.0, 0.10, 0.04)["intrinsic_per_share"]
+    with pytest.raises(ValueError):
+        modelling.run_valuation_batch(["BBCA.JK"], overrides={"beta": 1})
+
+
+def test_run_valuation_batch_fetches_concurrently_and_stores_serially(app, monkeypatch):
+    import threading
+    import time
+
+    from stock_checker.alpha.models.schemas import FundamentalFetch
+    from stock_checker.alpha.services import fundamentals, modelling, scores
+
+    main = threading.get_ident()
+    lock = threading.Lock()
+    fetch_threads, ingest_threads = {}, set()
+    active = {"now": 0, "peak": 0}
+    cols = pd.to_datetime(["2024-12-31", "2023-12-31"])
+
+    def network(symbol):
+        with lock:
+            fetch_threads.setdefault(symbol, set()).add(threading.get_ident())
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+
+    def fake_info(symbol):
+        if threading.get_ident() != main:
+            network(symbol)
+        return {"currentPrice": 1_000.0, "sharesOutstanding": 1e9, "returnOnEquity": 0.15,
+                "bookValue": 800.0}
+
+    def fake_raw(symbol, statement, freq="annual"):
+        network(symbol)
+        if symbol == "BAD.JK":
+            raise RuntimeError("no data")
+        items = {"cashflow": ["Free Cash Flow"],
+                 "balance": ["Total Debt", "Cash And Cash Equivalents", "Stockholders Equity"]}[statement]
+        return pd.DataFrame(1e11, index=items, columns=cols)
+
+    def recording_ingest(*args, **kwargs):
+        ingest_threads.add(threading.get_ident())
+        return ingest(*args, **kwargs)
+
+    ingest = modelling.ingest_statement
+    monkeypatch.setattr(modelling, "get_info", fake_info)
+    monkeypatch.setattr(modelling, "get_raw_statement", fake_raw)
+    monkeypatch.setattr(modelling, "ingest_statement", recording_ingest)
+    monkeypatch.setattr(scores, "_detect_sector", lambda symbol: "_default")
+    monkeypatch.setattr(modelling, "VALUATION_FETCH_WORKERS", 4)
+
+    # The calling thread only refetches tickers whose prefetch failed
+    monkeypatch.setattr(fundamentals, "get_raw_statement", fake_raw)
+
+    tickers = [f"T{i}.JK" for i in range(8)]
+    results = modelling.run_valuation_batch(tickers + ["BAD.JK"])
+
+    assert [r["ticker"] for r in results] == tickers + ["BAD.JK"]
+    assert all("error" not in r for r in results[:-1])
+    assert "error" in results[-1]
+    assert all(main not in fetch_threads[t] for t in tickers) and active["peak"] > 1
+    assert ingest_threads == {main}
+    stored = {(f.ticker, f.statement) for f in FundamentalFetch.query.all()}
+    assert stored == {(t, s) for t in tickers for s in ("balance", "cashflow")}
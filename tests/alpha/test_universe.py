@@ -0,0 +1,63 @@
+"""Tests for the IDX universe registry and index membership history."""
+from __future__ import annotations
+
+from stock_checker.alpha.services import universe as uni
+
+_LISTINGS = [
+    {"KodeEmiten": "BBCA", "NamaEmiten": "Bank Central Asia Tbk", "Sektor": "Financials",
+     "SubSektor": "Banks", "Industri": "Banks", "PapanPencatatan": "Utama",
+     "TanggalPencatatan": "2000-05-31T00:00:00"},
+    {"KodeEmiten": "BBRI", "Sektor": "Financials", "SubSektor": "Banks", "Industri": "Banks",
+     "PapanPencatatan": "Utama"},
+    {"KodeEmiten": "BJTM", "Sektor": "Financials", "SubSektor": "Banks", "Industri": "Banks",
+     "PapanPencatatan": "Utama"},
+    {"KodeEmiten": "GOTO", "Sektor": "Technology", "SubSektor": "Software & IT Services",
+     "Industri": "Online Applications & Services", "PapanPencatatan": "Pengembangan"},
+]
+
+
+# ── Listing normalization ───────────────────────────────────────────────────
+
+def test_normalize_listing_maps_idx_fields():
+    rec = uni._normalize_listing(_LISTINGS[0])
+    assert rec["ticker"] == "BBCA.JK"
+    assert rec["industry_key"] == "perbankan"
+    assert rec["board"] == "Utama"
+    assert rec["listing_date"].isoformat() == "2000-05-31"
+
+
+def test_normalize_listing_accepts_plain_keys():
+    rec = uni._normalize_listing({"ticker": "tlkm", "industry_key": "telekomunikasi"})
+    assert rec["ticker"] == "TLKM.JK"
+    assert rec["industry_key"] == "telekomunikasi"
+    assert rec["listing_date"] is None
+
+
+# ── Registry and membership ─────────────────────────────────────────────────
+
+def test_refresh_universe_deactivates_missing(app):
+    assert uni.refresh_universe(_LISTINGS)["added"] == 4
+    result = uni.refresh_universe(_LISTINGS[:3])
+    assert result == {"total": 3, "added": 0, "deactivated": 1}
+    assert uni.universe_tickers() == ["BBCA.JK", "BBRI.JK", "BJTM.JK"]
+    assert uni.lookup_industry_key("GOTO.JK") is None
+
+
+def test_index_membership_history_is_point_in_time(app):
+    uni.refresh_universe(_LISTINGS)
+    uni.record_index_constituents("lq45", ["BBCA", "BBRI"], as_of="2025-02-01")
+    diff = uni.record_index_constituents("LQ45", ["BBCA", "BJTM"], as_of="2025-08-01")
+    assert diff["added"] == ["BJTM.JK"] and diff["removed"] == ["BBRI.JK"]
+
+    assert uni.index_members("LQ45", "2025-03-01") == ["BBCA.JK", "BBRI.JK"]
+    assert uni.index_members("LQ45", "2025-08-01") == ["BBCA.JK", "BJTM.JK"]
+    assert uni.index_members("LQ45", "2025-01-01") == []
+    assert uni.universe_tickers(index_code="LQ45") == ["BBCA.JK", "BJTM.JK"]
+    assert uni.universe_tickers(index_code="LQ45", as_of="2025-03-01") == ["BBCA.JK", "BBRI.JK"]
+
+
+def test_universe_peers_prefer_index_members(app):
+    uni.refresh_universe(_LISTINGS)
+    uni.record_index_constituents("IDX30", ["BJTM"], as_of="2025-02-01")
+    assert uni.universe_peers("BBCA.JK", "perbankan", limit=2) == ["BJTM.JK", "BBRI.JK"]
+    assert uni.universe_peers("BBCA.JK", "consumer_goods") == []
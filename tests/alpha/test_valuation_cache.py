@@ -0,0 +1,110 @@
+"""Tests for the memoized valuation result cache."""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from stock_checker.alpha.services import valuation_cache as vc
+
+
+@pytest.fixture
+def counted(app, monkeypatch):
+    """A memoized model that counts how often it really runs."""
+    info = {"currentPrice": 1000.0, "sharesOutstanding": 1e9}
+    monkeypatch.setattr(vc, "get_info", lambda symbol: info)
+    calls = []
+
+    @vc.memoized("dcf", when=lambda a: a["seed"] is not None)
+    def run(symbol, wacc=0.10, ranges=None, seed=0):
+        calls.append((symbol, wacc))
+        if wacc <= 0:
+            return {"error": "bad wacc"}
+        return {"ticker": symbol, "value": wacc * 100, "ranges": ranges}
+
+    return run, calls, info
+
+
+def _cache_rows():
+    from stock_checker.alpha.models.schemas import ValuationResult
+    return ValuationResult.query.filter(ValuationResult.model_type.startswith(vc.CACHE_PREFIX)).all()
+
+
+# ── Keys ──
+
+def test_normalized_assumptions_ignore_formatting():
+    a = vc.normalize_assumptions({"wacc": 0.1, "years": 5, "r": [1, 2.0]})
+    b = vc.normalize_assumptions({"r": (1.0, 2), "years": 5.0, "wacc": 0.1000000000001})
+    assert a == b
+
+
+# ── Tiers ──
+
+def test_repeat_runs_hit_memory_then_database(counted):
+    run, calls, _ = counted
+    first = run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2])
+    assert run("BBCA.JK", 0.12, [0.1, 0.2]) == first
+    assert len(calls) == 1
+    assert vc.cache_stats()["hits"] >= 1
+
+    vc.clear_cache()                       # new process: memory tier empty
+    assert run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2]) == first
+    assert len(calls) == 1
+    assert len(_cache_rows()) == 1
+
+    run("BBCA.JK", wacc=0.13, ranges=[0.1, 0.2])
+    assert len(calls) == 2
+
+
+def test_callers_cannot_mutate_cached_results(counted):
+    run, calls, _ = counted
+    first = run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2])
+    first["value"] = -1.0
+    first["ranges"].append(9.9)
+    hit = run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2])
+    assert hit == {"ticker": "BBCA.JK", "value": 12.0, "ranges": [0.1, 0.2]}
+    hit["ranges"].clear()
+
+    vc.clear_cache()
+    from_db = run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2])
+    from_db["ranges"].clear()
+    assert run("BBCA.JK", wacc=0.12, ranges=[0.1, 0.2])["ranges"] == [0.1, 0.2]
+    assert len(calls) == 1
+
+
+def test_errors_and_opted_out_runs_are_not_cached(counted):
+    run, calls, _ = counted
+    run("BBCA.JK", wacc=0.0)
+    run("BBCA.JK", wacc=0.0)
+    run("BBCA.JK", seed=None)
+    run("BBCA.JK", seed=None)
+    assert len(calls) == 4
+    assert _cache_rows() == []
+
+
+# ── Invalidation ──
+
+def test_statement_refresh_changes_the_version(counted):
+    from stock_checker.alpha.services.fundamentals import ingest_statement
+
+    run, calls, info = counted
+    run("BBCA.JK")
+    frame = pd.DataFrame({pd.Timestamp("2024-12-31"): [1.0]}, index=["Free Cash Flow"])
+    ingest_statement("BBCA.JK", "cashflow", "annual", frame)
+    run("BBCA.JK")
+    assert len(calls) == 2
+    assert len(_cache_rows()) == 1          # the older version's row is pruned
+
+    info["currentPrice"] = 1100.0
+    run("BBCA.JK")
+    assert len(calls) == 3
+
+
+def test_saved_valuations_hide_cache_rows(counted):
+    from stock_checker.alpha.services.portfolio import list_valuations, save_valuation
+
+    run, _, _ = counted
+    run("BBCA.JK")
+    save_valuation("BBCA.JK", "dcf", {"wacc": 0.1}, {"value": 10})
+    assert [v["model_type"] for v in list_valuations("BBCA.JK")] == ["dcf"]
+    vc.clear_cache(persistent=True)
+    assert _cache_rows() == []
@@ -0,0 +1,128 @@
+"""Tests for the vectorized DCF kernel and sensitivity grids."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from stock_checker.alpha.calculations.valuation import (
+    calc_dcf, calc_dcf_grid, calc_implied_growth, calc_implied_wacc, calc_sensitivity,
+    calc_sensitivity_cube,
+)
+from stock_checker.alpha.services.modelling import _rate_axis
+
+FCF = 2.5e9
+SHARES = 1.2e9
+NET_DEBT = 4e8
+WACC = [0.08, 0.09, 0.10, 0.11, 0.12]
+GROWTH = [-0.02, 0.05, 0.08, 0.10, 0.15]
+
+
+# ── Kernel ──
+
+def test_grid_matches_calc_dcf_per_cell():
+    w = np.array(WACC)[:, None, None]
+    g = np.array(GROWTH)[None, :, None]
+    tg = np.array([0.02, 0.03, 0.095])[None, None, :]
+    grid = calc_dcf_grid(FCF, g, tg, w, 7, SHARES, NET_DEBT)
+    assert grid["equity_value"].shape == (5, 5, 3)
+    for i, wacc in enumerate(WACC):
+        for j, growth in enumerate(GROWTH):
+            for k, terminal in enumerate([0.02, 0.03, 0.095]):
+                ref = calc_dcf(FCF, growth, terminal, wacc, 7, SHARES, NET_DEBT)
+                if "error" in ref:
+                    assert not grid["valid"][i, j, k]
+                    assert np.isnan(grid["intrinsic_per_share"][i, j, k])
+                    continue
+                assert round(grid["enterprise_value"][i, j, k], 2) == ref["enterprise_value"]
+                assert round(grid["intrinsic_per_share"][i, j, k], 2) == ref["intrinsic_per_share"]
+
+
+def test_grid_without_shares_reports_equity_only():
+    grid = calc_dcf_grid(FCF, 0.05, 0.03, 0.10)
+    assert grid["intrinsic_per_share"] is None
+    assert round(float(grid["equity_value"]), 2) == calc_dcf(FCF, 0.05, 0.03, 0.10)["equity_value"]
+
+
+# ── Sensitivity ──
+
+def _reference_matrix(wacc_range, growth_range, terminal, shares):
+    matrix = []
+    for w in wacc_range:
+        row = []
+        for g in growth_range:
+            r = calc_dcf(FCF, g, terminal, w, 5, shares, NET_DEBT)
+            row.append(None if "error" in r else r.get("intrinsic_per_share", r["equity_value"]))
+        matrix.append(row)
+    return matrix
+
+
+@pytest.mark.parametrize("shares", [SHARES, None])
+def test_sensitivity_matrix_unchanged(shares):
+    wacc = WACC + [0.03]   # 0.03 <= terminal growth: invalid row
+    result = calc_sensitivity(FCF, wacc, GROWTH, 0.03, 5, shares, NET_DEBT)
+    assert result["matrix"] == _reference_matrix(wacc, GROWTH, 0.03, shares)
+    assert result["wacc_labels"][0] == "8.0%"
+    assert result["matrix"][-1] == [None] * len(GROWTH)
+
+
+def test_large_sensitivity_grid():
+    wacc = np.linspace(0.06, 0.16, 200)
+    growth = np.linspace(-0.05, 0.25, 200)
+    result = calc_sensitivity(FCF, wacc, growth, 0.03, 5, SHARES, NET_DEBT)
+    assert len(result["matrix"]) == 200 and len(result["matrix"][0]) == 200
+    ref = calc_dcf(FCF, growth[37], 0.03, wacc[123], 5, SHARES, NET_DEBT)
+    assert result["matrix"][123][37] == ref["intrinsic_per_share"]
+
+
+def test_sensitivity_cube_is_flat_row_major():
+    terminal = [0.02, 0.04, 0.12]
+    cube = calc_sensitivity_cube(FCF, WACC, GROWTH, terminal, 5, SHARES, NET_DEBT)
+    assert cube["shape"] == [5, 5, 3]
+    assert len(cube["values"]) == 75
+    values = np.array(cube["values"], dtype=object).reshape(cube["shape"])
+    ref = calc_dcf(FCF, GROWTH[3], terminal[1], WACC[2], 5, SHARES, NET_DEBT)
+    assert values[2, 3, 1] == ref["intrinsic_per_share"]
+    assert all(v is None for v in values[:, :, 2].ravel())   # terminal 12% >= every WACC
+    finite = [v for v in cube["values"] if v is not None]
+    assert cube["min"] == min(finite) and cube["max"] == max(finite)
+
+
+def test_sensitivity_cube_rejects_oversized_grid():
+    axis = np.linspace(0.0, 0.1, 101)
+    assert "error" in calc_sensitivity_cube(FCF, axis, axis, axis)
+
+
+# ── Reverse DCF ──
+
+def test_implied_growth_recovers_growth_for_many_tickers():
+    rng = np.random.default_rng(4)
+    fcf = 10 ** rng.uniform(8, 12, 500)
+    growth = rng.uniform(-0.3, 0.6, 500)
+    ev = np.array([calc_dcf(f, g, 0.03, 0.10, 7)["enterprise_value"] for f, g in zip(fcf, growth)])
+    implied = calc_implied_growth(fcf, ev, 0.10, 0.03, 7)
+    np.testing.assert_allclose(implied, growth, atol=1e-6)
+
+
+def test_implied_wacc_recovers_discount_rate():
+    fcf = np.array([1e9, 5e10, 2e11])
+    wacc = np.array([0.06, 0.11, 0.25])
+    ev = np.array([calc_dcf(f, 0.08, 0.03, w)["enterprise_value"] for f, w in zip(fcf, wacc)])
+    np.testing.assert_allclose(calc_implied_wacc(fcf, ev, 0.08, 0.03), wacc, atol=1e-6)
+
+
+def test_reverse_dcf_without_solution_is_nan():
+    implied = calc_implied_growth([-1e9, 1e9, 1e9, np.nan], [1e10, 1e30, 1e10, 1e10])
+    assert np.isnan(implied[[0, 1, 3]]).all()
+    assert np.isfinite(implied[2])
+    assert np.isnan(calc_implied_growth(1e9, 1e10, wacc=0.03, terminal_growth=0.03))
+
+
+# ── Axis parsing ──
+
+def test_rate_axis_accepts_lists_and_ranges():
+    assert _rate_axis([0.1, "0.12"], "wacc_range") == [0.1, 0.12]
+    assert _rate_axis({"start": 0.08, "stop": 0.12, "steps": 5}, "wacc_range") == pytest.approx(
+        [0.08, 0.09, 0.10, 0.11, 0.12])
+    for bad in ([], ["x"], {"start": 0.1}, {"start": 0.1, "stop": 0.2, "steps": 0}):
+        with pytest.raises(ValueError):
+            _rate_axis(bad, "wacc_range")
@@ -0,0 +1,30 @@
+"""Weight profile rescoring and sweep routes."""
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/alpha/api/weight-profiles/rescore", {"tickers": ["BBCA.JK"], "profile_id": 999}),
+    ("/alpha/api/weight-profiles/rescore", {"watchlist_id": 999}),
+    ("/alpha/api/weight-profiles/sweep", {"tickers": ["BBCA.JK"], "profiles": [999]}),
+])
+def test_unknown_ids_are_not_found(app, path, body):
+    resp = app.test_client().post(path, json=body)
+    assert resp.status_code == 404
+
+
+def test_sweep_checks_the_profile_cap_before_compiling(app, monkeypatch):
+    from stock_checker.alpha.services import weight_profiles
+
+    def compile_scoring_matrices(weights):
+        raise AssertionError("compiled a profile before the cap check")
+
+    monkeypatch.setattr(weight_profiles, "compile_scoring_matrices", compile_scoring_matrices)
+    with pytest.raises(ValueError, match="At most"):
+        weight_profiles.run_weight_sweep(["BBCA.JK"], [{}], step=0.01)
+
+    resp = app.test_client().post("/alpha/api/weight-profiles/sweep",
+                                  json={"tickers": ["BBCA.JK"], "pillar_step": 0.01})
+    assert resp.status_code == 400
+    assert "At most" in resp.get_json()["error"]
@@ -123,6 +123,68 @@ def test_covariance_shrinkage_available(analyzer, returns):
         pytest.skip("sklearn not installed")
 
 
+def test_rolling_covariance_matches_ledoit_wolf():
+    sklearn_cov = pytest.importorskip("sklearn.covariance")
+    from stock_checker.qpm_covariance import RollingCovariance
+
+    rng = np.random.default_rng(4)
+    x = rng.normal(0.0004, 0.015, (900, 8)) + rng.normal(0, 0.01, (900, 1))
+    rolling = RollingCovariance(x)
+    # Sliding forward, growing, shrinking and jumping past the old window
+    for start, stop in [(0, 60), (0, 252), (21, 273), (40, 280), (60, 280), (500, 752)]:
+        rolling.move_to(start, stop)
+        expected = sklearn_cov.LedoitWolf().fit(x[start:stop]).covariance_ * 252
+        np.testing.assert_allclose(rolling.covariance(), expected, rtol=1e-10, atol=1e-14)
+        np.testing.assert_allclose(rolling.covariance(shrinkage=False),
+                                   np.cov(x[start:stop], rowvar=False) * 252, rtol=1e-10)
+
+
+def test_rolling_covariance_rejects_bad_window():
+    from stock_checker.qpm_covariance import RollingCovariance
+
+    with pytest.raises(ValueError):
+        RollingCovariance(np.zeros((10, 3))).move_to(5, 11)
+
+
+def _factor_model(n: int = 40, seed: int = 9):
+    from stock_checker.qpm_covariance import FactorCovariance
+
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 0.01, (300, 3)) @ rng.normal(1.0, 0.5, (3, n)) + rng.normal(0, 0.02, (300, n))
+    return FactorCovariance.from_returns(x, n_factors=3)
+
+
+def test_factor_covariance_operations_match_dense():
+    model = _factor_model()
+    dense = model.to_dense()
+    rng = np.random.default_rng(1)
+    v, m = rng.normal(size=40), rng.normal(size=(40, 4))
+    mask = rng.random(40) < 0.6
+    shift = rng.uniform(0.1, 1.0, mask.sum())
+
+    np.testing.assert_allclose(model @ v, dense @ v, rtol=1e-12)
+    np.testing.assert_allclose(model @ m, dense @ m, rtol=1e-12)
+    np.testing.assert_allclose(v @ model, v @ dense, rtol=1e-12)
+    assert v @ model @ v == pytest.approx(v @ dense @ v, rel=1e-12)
+    np.testing.assert_allclose(model.diagonal(), np.diag(dense), rtol=1e-12)
+    block = dense[np.ix_(mask, mask)] + np.diag(shift)
+    np.testing.assert_allclose(model.solve(v[mask], mask, shift),
+                               np.linalg.solve(block, v[mask]), rtol=1e-9)
+    np.testing.assert_allclose(model.solve(m), np.linalg.solve(dense, m), rtol=1e-9)
+
+
+def test_factor_covariance_fit_explains_sample_variance():
+    from stock_checker.qpm_covariance import FactorCovariance
+
+    rng = np.random.default_rng(2)
+    x = rng.normal(0, 0.01, (250, 2)) @ rng.normal(1.0, 0.3, (2, 30)) + rng.normal(0, 0.005, (250, 30))
+    model = FactorCovariance.from_returns(x, n_factors=2)
+    assert model.loadings.shape == (30, 2)
+    assert np.all(model.specific_var > 0)
+    # The diagonal reproduces the sample variances exactly
+    np.testing.assert_allclose(model.diagonal(), np.var(x, axis=0, ddof=1) * 252, rtol=1e-10)
+
+
 # ── compute_factors ───────────────────────────────────────────────────────────
 
 
@@ -227,6 +289,174 @@ def test_factor_weighted_within_bounds(analyzer, prices):
     assert np.all(w <= MAX_WEIGHT + 1e-6)
 
 
+# ── Dedicated solvers ─────────────────────────────────────────────────────────
+
+
+def _factor_cov(n: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(1.0, 0.5, (3, n))
+    factors = rng.normal(0, 0.01, (750, 3))
+    rets = factors @ loadings + rng.normal(0, 0.02, (750, n)) * rng.uniform(0.5, 2, n)
+    return np.cov(rets, rowvar=False) * 252
+
+
+def test_box_budget_qp_matches_slsqp():
+    from scipy.optimize import minimize
+
+    from stock_checker.qpm_solvers import box_budget_qp
+
+    n, lo, hi = 60, 0.005, 0.06
+    cov = _factor_cov(n)
+    w = box_budget_qp(cov, lo=lo, hi=hi)
+    ref = minimize(lambda x: x @ cov @ x, np.ones(n) / n, jac=lambda x: 2 * cov @ x,
+                   method="SLSQP", bounds=[(lo, hi)] * n,
+                   constraints=[{"type": "eq", "fun": lambda x: x.sum() - 1}],
+                   options={"maxiter": 1000, "ftol": 1e-14})
+    assert w is not None
+    assert abs(w.sum() - 1) < 1e-9
+    assert np.all(w >= lo - 1e-12) and np.all(w <= hi + 1e-12)
+    assert w @ cov @ w <= ref.x @ cov @ ref.x + 1e-10
+
+
+def test_box_budget_qp_recovers_from_a_distant_warm_start():
+    from stock_checker.qpm_solvers import box_budget_qp, greedy_linear
+
+    n = 60
+    cov = _factor_cov(n)
+    mu = np.random.default_rng(0).normal(0.1, 0.2, n)
+    lowest = greedy_linear(-mu, 0.0, 0.2) @ mu
+    highest = greedy_linear(mu, 0.0, 0.2) @ mu
+    start = box_budget_qp(cov, lo=0.0, hi=0.2, A=mu, b=lowest + 0.01 * (highest - lowest))
+    target = lowest + 0.8 * (highest - lowest)
+    warm = box_budget_qp(cov, lo=0.0, hi=0.2, A=mu, b=target, w0=start)
+    cold = box_budget_qp(cov, lo=0.0, hi=0.2, A=mu, b=target)
+    assert warm is not None
+    np.testing.assert_allclose(warm, cold, atol=1e-10)
+
+
+def test_box_budget_qp_solves_linear_terms_the_pdas_cannot():
+    from scipy.optimize import minimize
+
+    from stock_checker.qpm_solvers import box_budget_qp
+
+    # The primal-dual iteration cycles on this one; the primal fallback must finish
+    n, lo, hi = 8, 0.0, 0.3
+    cov = _factor_cov(n, seed=0)
+    q = 2.0434 * np.random.default_rng(0).normal(0.1, 0.15, n)
+    w = box_budget_qp(cov, q=q, lo=lo, hi=hi)
+    objective = lambda x: 0.5 * x @ cov @ x - q @ x  # noqa: E731
+    ref = minimize(objective, np.ones(n) / n, jac=lambda x: cov @ x - q,
+                   method="SLSQP", bounds=[(lo, hi)] * n,
+                   constraints=[{"type": "eq", "fun": lambda x: x.sum() - 1}],
+                   options={"maxiter": 1000, "ftol": 1e-14})
+    assert w is not None
+    assert abs(w.sum() - 1) < 1e-9
+    assert np.all(w >= lo - 1e-12) and np.all(w <= hi + 1e-12)
+    assert objective(w) <= ref.fun + 1e-10
+
+
+def test_box_budget_qp_reaches_every_frontier_target():
+    from stock_checker.qpm_solvers import box_budget_qp, greedy_linear
+
+    n, lo, hi = 20, 0.01, 0.1
+    cov = _factor_cov(n, seed=0)
+    mu = np.random.default_rng(0).normal(0.1, 0.15, n)
+    lowest = box_budget_qp(cov, lo=lo, hi=hi) @ mu
+    highest = greedy_linear(mu, lo, hi) @ mu
+    for f in np.linspace(0.025, 0.975, 39):
+        w = box_budget_qp(cov, lo=lo, hi=hi, A=mu, b=lowest + f * (highest - lowest))
+        assert w is not None, f
+        assert abs(w @ mu - (lowest + f * (highest - lowest))) < 1e-9
+
+
+@pytest.mark.parametrize("rf", [0.0, 0.065, 0.15])
+def test_max_sharpe_frontier_matches_slsqp(rf):
+    from scipy.optimize import minimize
+
+    from stock_checker.qpm_solvers import box_budget_qp, max_sharpe_frontier
+
+    n, lo, hi = 20, 0.01, 0.1
+    cov = _factor_cov(n, seed=3)
+    mu = np.random.default_rng(3).normal(0.1, 0.15, n)
+    sharpe = lambda x: (x @ mu - rf) / np.sqrt(x @ cov @ x)  # noqa: E731
+    if rf == 0.15:
+        # rf above the min-variance return: the search starts at a negative Sharpe
+        assert box_budget_qp(cov, lo=lo, hi=hi) @ mu < rf
+    w = max_sharpe_frontier(cov, mu, rf, lo, hi)
+    ref = minimize(lambda x: -sharpe(x), np.ones(n) / n, method="SLSQP",
+                   bounds=[(lo, hi)] * n,
+                   constraints=[{"type": "eq", "fun": lambda x: x.sum() - 1}],
+                   options={"maxiter": 1000, "ftol": 1e-14})
+    assert w is not None
+    assert abs(w.sum() - 1) < 1e-9
+    assert np.all(w >= lo - 1e-12) and np.all(w <= hi + 1e-12)
+    assert sharpe(w) >= sharpe(ref.x) - 1e-8
+
+
+def test_max_sharpe_frontier_none_when_nothing_beats_rf():
+    from stock_checker.qpm_solvers import max_sharpe_frontier
+
+    cov = _factor_cov(10)
+    assert max_sharpe_frontier(cov, np.full(10, 0.05), rf=0.065, hi=0.3) is None
+
+
+def test_box_budget_qp_infeasible_bounds():
+    from stock_checker.qpm_solvers import box_budget_qp
+
+    assert box_budget_qp(np.eye(3), lo=0.0, hi=0.2) is None
+
+
+def test_greedy_linear_fills_best_scores():
+    from stock_checker.qpm_solvers import greedy_linear
+
+    w = greedy_linear(np.array([0.1, 0.5, 0.5, 0.9, 0.2, 0.3, 0.3]), 0.02, 0.2)
+    np.testing.assert_allclose(w, [0.02, 0.2, 0.2, 0.2, 0.02, 0.18, 0.18])
+
+
+def test_risk_parity_newton_equalizes_contributions():
+    from stock_checker.qpm_solvers import risk_parity_newton
+
+    cov = _factor_cov(200)
+    w = risk_parity_newton(cov)
+    rc = w * (cov @ w)
+    assert abs(w.sum() - 1) < 1e-12
+    assert rc.std() / rc.mean() < 1e-8
+
+
+def test_risk_parity_exact_within_bounds(analyzer):
+    cov = _factor_cov(12)
+    w = analyzer.optimize_risk_parity(cov)
+    rc = w * (cov @ w)
+    assert np.all(w >= MIN_WEIGHT) and np.all(w <= MAX_WEIGHT)
+    assert rc.std() / rc.mean() < 1e-8
+
+
+def test_solvers_accept_factor_covariance():
+    from stock_checker.qpm_solvers import box_budget_qp, risk_parity_newton
+
+    model = _factor_model()
+    dense = model.to_dense()
+    np.testing.assert_allclose(box_budget_qp(model, lo=0.01, hi=0.08),
+                               box_budget_qp(dense, lo=0.01, hi=0.08), atol=1e-10)
+    np.testing.assert_allclose(risk_parity_newton(model), risk_parity_newton(dense), atol=1e-10)
+
+
+def test_infeasible_bounds_fall_back_to_equal_weight(analyzer):
+    cov = _factor_cov(3)
+    returns = pd.DataFrame(np.zeros((10, 3)), columns=list("ABC"))
+    for method in ("min_variance", "max_sharpe", "risk_parity"):
+        np.testing.assert_allclose(analyzer.optimize(method, returns, cov), 1 / 3)
+
+
+def test_factor_weighted_caps_top_scores(analyzer):
+    tickers = [f"T{i}" for i in range(10)]
+    scores = pd.Series(np.arange(10, dtype=float), index=tickers)
+    w = analyzer.optimize_factor_weighted(tickers, scores)
+    assert abs(w.sum() - 1) < 1e-12
+    np.testing.assert_allclose(w[-4:], MAX_WEIGHT)
+    assert w[5] == pytest.approx(1 - 4 * MAX_WEIGHT - 5 * MIN_WEIGHT)
+
+
 # ── optimize dispatch ─────────────────────────────────────────────────────────
 
 
@@ -268,6 +498,20 @@ def test_risk_metrics_diversification_ratio_ge_one(analyzer, returns, cov):
     assert metrics["diversification_ratio"] >= 1.0 - 1e-6
 
 
+def test_factor_model_covariance_in_optimize_and_risk_metrics(analyzer):
+    from stock_checker.qpm_covariance import FactorCovariance
+
+    returns = QPMAnalyzer().compute_returns(_make_prices(n_tickers=20, seed=5))
+    model = analyzer.compute_covariance(returns, n_factors=3)
+    assert isinstance(model, FactorCovariance)
+    for method in ("min_variance", "max_sharpe", "risk_parity"):
+        w = analyzer.optimize(method, returns, model)
+        assert abs(w.sum() - 1) < 1e-6
+        metrics = analyzer.compute_risk_metrics(w, returns, model)
+        dense = analyzer.compute_risk_metrics(w, returns, model.to_dense())
+        assert metrics == pytest.approx(dense)
+
+
 # ── efficient_frontier ────────────────────────────────────────────────────────
 
 
@@ -286,6 +530,25 @@ def test_efficient_frontier_positive_vols(analyzer, returns, cov):
         assert p["volatility"] >= 0
 
 
+def test_efficient_frontier_matches_slsqp_points(analyzer):
+    rng = np.random.default_rng(5)
+    rets = pd.DataFrame(rng.normal(0.0004, 0.015, (500, 12)) + rng.normal(0, 0.0005, 12),
+                        columns=[f"T{i}" for i in range(12)])
+    cov = analyzer.compute_covariance(rets, shrinkage=False)
+    ann_ret = rets.mean().values * 252
+    points = analyzer.efficient_frontier(rets, cov, n_points=20)
+    assert points
+    for p in points[::5]:
+        w = analyzer._frontier_slsqp(cov, ann_ret, p["return"] / 100)
+        if w is not None:
+            assert p["volatility"] <= round(math.sqrt(w @ cov @ w) * 100, 2) + 0.01
+
+
+def test_efficient_frontier_parallel_matches_serial(analyzer, returns, cov):
+    serial = analyzer.efficient_frontier(returns, cov, n_points=60)
+    assert analyzer.efficient_frontier(returns, cov, n_points=60, workers=3) == serial
+
+
 # ── max drawdown ──────────────────────────────────────────────────────────────
 
 
@@ -329,8 +592,200 @@ def test_rolling_sharpe_positive_for_positive_returns(analyzer):
     assert float(np.mean(sharpes)) > 0
 
 
+def test_rolling_sharpe_matches_per_window_stats(analyzer):
+    rets = np.random.default_rng(8).normal(0.0005, 0.01, 300)
+    dates = [str(i) for i in range(300)]
+    result = analyzer._rolling_sharpe(dates, rets, window=63)
+    for i in (63, 150, 299):
+        chunk = rets[i - 63:i]
+        expected = (chunk.mean() * 252 - analyzer.rf) / (chunk.std() * math.sqrt(252))
+        assert result[i - 63] == {"date": str(i), "sharpe": round(float(expected), 3)}
+
+
+# ── backtest ──────────────────────────────────────────────────────────────────
+
+
+def test_backtest_applies_previous_month_end_weights(analyzer, prices, monkeypatch):
+    monkeypatch.setattr(analyzer, "_fetch_benchmark",
+                        lambda ticker, index: pd.Series(0.001, index=index))
+    tilt = np.array([0.4, 0.3, 0.1, 0.1, 0.1])
+    monkeypatch.setattr(analyzer, "optimize", lambda method, trail, cov, factor_scores=None: tilt)
+    result = analyzer.backtest(prices, "min_variance")
+
+    returns = analyzer.compute_returns(prices)
+    month_ends = returns.resample("ME").last().index
+    days = returns.index[returns.index > month_ends[0]]
+    # The first rebalance needs 60 days of history; until then weights are equal
+    first = pd.Timestamp(result["rebalance_dates"][0])
+    weights = np.where((days > first)[:, None], tilt, 0.2)
+    port = (returns.loc[days].to_numpy() * weights).sum(axis=1)
+
+    assert [p["date"] for p in result["portfolio"]] == days.strftime("%Y-%m-%d").tolist()
+    assert result["portfolio"][-1]["cumulative"] == pytest.approx(
+        (math.exp(port.sum()) - 1) * 100, abs=1e-3)
+    assert result["benchmark"][-1]["cumulative"] == pytest.approx(
+        (math.exp(0.001 * len(days)) - 1) * 100, abs=1e-3)
+    assert len(result["rolling_sharpe"]) == len(days) - 63
+
+
+def test_backtest_with_factor_model(analyzer, monkeypatch):
+    from stock_checker.qpm_covariance import FactorCovariance
+
+    monkeypatch.setattr(analyzer, "_fetch_benchmark",
+                        lambda ticker, index: pd.Series(0.0, index=index))
+    seen = []
+    optimize = analyzer.optimize
+
+    def recording(method, trail, cov, factor_scores=None):
+        seen.append(cov)
+        return optimize(method, trail, cov, factor_scores=factor_scores)
+
+    monkeypatch.setattr(analyzer, "optimize", recording)
+    prices = _make_prices(n_tickers=8, n_days=400, seed=6)
+    result = analyzer.backtest(prices, "min_variance", n_factors=2)
+    assert result["portfolio"] and result["rebalance_dates"]
+    assert len(seen) == len(result["rebalance_dates"])
+    assert all(isinstance(c, FactorCovariance) and c.loadings.shape == (8, 2) for c in seen)
+
+
+# ── backtest sweep ────────────────────────────────────────────────────────────
+
+
+def test_backtest_sweep_matches_single_backtests(analyzer, prices, monkeypatch):
+    monkeypatch.setattr(analyzer, "_fetch_benchmark",
+                        lambda ticker, index: pd.Series(0.0005, index=index))
+    result = analyzer.backtest_sweep(
+        prices, ["min_variance", "risk_parity"], lookbacks=[126, 252],
+        rebalances=["monthly", "quarterly"], bounds=[(MIN_WEIGHT, MAX_WEIGHT), (0.1, 0.3)],
+    )
+    runs = result["runs"]
+    assert len(runs) == 16
+    assert [r["id"] for r in runs] == list(range(16))
+    assert all(len(r["equity"]) == len(result["dates"]) for r in runs)
+    assert len(result["benchmark"]) == len(result["dates"])
+
+    for r in runs[::5]:
+        single = QPMAnalyzer(analyzer.rf, min_weight=r["min_weight"], max_weight=r["max_weight"])
+        monkeypatch.setattr(single, "_fetch_benchmark", analyzer._fetch_benchmark)
+        expected = single.backtest(prices, r["method"], lookback=r["lookback"],
+                                   rebalance=r["rebalance"])
+        curve = [v for v in r["equity"] if v is not None]
+        assert curve == [p["cumulative"] for p in expected["portfolio"]]
+        assert r["max_drawdown"] == expected["max_drawdown"]
+        assert r["rebalances"] == len(expected["rebalance_dates"])
+
+
+def test_backtest_sweep_rejects_bad_grid(analyzer, prices):
+    with pytest.raises(ValueError, match="Unknown optimization method"):
+        analyzer.backtest_sweep(prices, ["best"])
+    with pytest.raises(ValueError, match="rebalance"):
+        analyzer.backtest_sweep(prices, ["min_variance"], rebalances=["daily"])
+    with pytest.raises(ValueError, match="runs"):
+        analyzer.backtest_sweep(prices, ["min_variance"], lookbacks=list(range(60, 400, 5)))
+
+
 # ── MIN_TICKERS constant ──────────────────────────────────────────────────────
 
 
 def test_min_tickers_constant():
     assert MIN_TICKERS == 3
+
+
+# ── Point-in-time factors ─────────────────────────────────────────────────────
+
+
+def test_backtest_factor_weighted_makes_no_info_calls(analyzer, prices, monkeypatch):
+    from stock_checker.alpha.calculations.point_in_time import PointInTimeStore
+    from stock_checker.alpha.services import data_fetcher
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("network call during backtest")
+
+    monkeypatch.setattr(data_fetcher, "get_info", no_network)
+    monkeypatch.setattr(analyzer, "_fetch_benchmark",
+                        lambda ticker, index: pd.Series(0.0, index=index))
+    facts = pd.DataFrame([
+        {"ticker": t, "item": "Net Income", "period": "2019-12-31", "value": 10.0 * (i + 1)}
+        for i, t in enumerate(prices.columns)
+    ] + [
+        {"ticker": t, "item": "Stockholders Equity", "period": "2019-12-31", "value": 100.0}
+        for t in prices.columns
+    ])
+    result = analyzer.backtest(prices, "factor_weighted", fundamentals=PointInTimeStore(facts))
+    assert "error" not in result
+    assert result["rebalance_dates"]
+
+
+def test_point_in_time_factors_respect_availability(analyzer, prices):
+    from stock_checker.alpha.calculations.point_in_time import PointInTimeStore
+
+    facts = pd.DataFrame([
+        {"ticker": t, "item": "Net Income", "period": "2020-06-30", "value": 10.0 * (i + 1)}
+        for i, t in enumerate(prices.columns)
+    ] + [
+        {"ticker": t, "item": "Stockholders Equity", "period": "2020-06-30", "value": 100.0}
+        for t in prices.columns
+    ])
+    store = PointInTimeStore(facts, lag_days=90)
+    early = analyzer.compute_factors(prices.loc[:"2020-09-01"], fundamentals=store)
+    late = analyzer.compute_factors(prices.loc[:"2020-10-15"], fundamentals=store)
+    assert (early["quality"] == 0.5).all()          # nothing published yet
+    assert late["quality"].is_monotonic_increasing
+
+
+# ── /qpm/optimize route ───────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def qpm_client(monkeypatch):
+    from flask import Flask
+
+    from stock_checker.alpha.services import data_fetcher
+    from stock_checker.routes_qpm import init_qpm
+
+    prices = _make_prices(n_tickers=60, n_days=750, seed=1)
+    monkeypatch.setattr(QPMAnalyzer, "fetch_prices", lambda self, tickers, period="5y": prices)
+    monkeypatch.setattr(data_fetcher, "get_info", lambda symbol: {})
+    app = Flask(__name__)
+    init_qpm(app)
+    client = app.test_client()
+    client.tickers = list(prices.columns)
+    return client
+
+
+@pytest.mark.parametrize("method", ["min_variance", "max_sharpe", "risk_parity"])
+def test_optimize_route_scales_bounds_to_large_universes(qpm_client, method):
+    resp = qpm_client.post("/qpm/optimize", json={
+        "tickers": qpm_client.tickers, "method": method, "n_factors": 5, "frontier_points": 10,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    # 60 names cannot all hold the 2% floor, so it drops to 0
+    assert data["min_weight"] == 0.0
+    weights = np.array(list(data["weights"].values()))
+    assert weights.max() - weights.min() > 0.1
+    assert data["efficient_frontier"]
+
+
+def test_optimize_route_applies_explicit_bounds(qpm_client):
+    resp = qpm_client.post("/qpm/optimize", json={
+        "tickers": qpm_client.tickers, "method": "min_variance",
+        "min_weight": 0.005, "max_weight": 0.05,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert (data["min_weight"], data["max_weight"]) == (0.005, 0.05)
+    weights = np.array(list(data["weights"].values()))
+    assert weights.min() >= 0.5 - 1e-6 and weights.max() <= 5.0 + 1e-6
+
+
+@pytest.mark.parametrize("bounds, status", [
+    ({"max_weight": 0.01}, 422),              # 60 × 1% < 100%
+    ({"min_weight": 0.03}, 422),              # 60 × 3% > 100%
+    ({"min_weight": 0.3, "max_weight": 0.2}, 400),
+    ({"max_weight": "lots"}, 400),
+])
+def test_optimize_route_rejects_bad_bounds(qpm_client, bounds, status):
+    resp = qpm_client.post("/qpm/optimize", json={"tickers": qpm_client.tickers, **bounds})
+    assert resp.status_code == status
+    assert "error" in resp.get_json()